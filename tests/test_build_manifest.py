@@ -0,0 +1,80 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the build_manifest.py object.
+# Rev: Oct.18.2024
+
+import sys
+import os
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.build_manifest import (BuildManifest,
+                                                  fingerprint,
+                                                  MANIFEST,
+                                                  )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestBuildManifest(unittest.TestCase):
+    """Test case for the BuildManifest object"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.item = {'type': 'One pass',
+                     'source': os.path.join(self.tmpdir.name, 'src.mkv'),
+                     'destination': os.path.join(self.tmpdir.name,
+                                                 'out.mkv'),
+                     'args': ['-c:v libx264 -crf 23', '', ''],
+                     'start-time': '',
+                     'end-time': '',
+                     'duration': 1000,
+                     }
+        for name in (self.item['source'], self.item['destination']):
+            with open(name, 'w', encoding='utf-8') as fln:
+                fln.write('data')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_fingerprint(self):
+        fprint = fingerprint(self.item, 'ffmpeg version 7.0')
+        self.assertEqual(fprint, fingerprint(dict(self.item, duration=5),
+                                             'ffmpeg version 7.0'))
+        self.assertNotEqual(fprint, fingerprint(self.item,
+                                                'ffmpeg version 7.1'))
+        self.assertNotEqual(fprint, fingerprint(
+            dict(self.item, args=['-c:v libx264 -crf 20', '', '']),
+            'ffmpeg version 7.0'))
+        self.assertNotEqual(fprint, fingerprint(self.item,
+                                                'ffmpeg version 7.0',
+                                                content=True))
+        self.assertIsNone(fingerprint(dict(self.item, source='/missing'),
+                                      'ffmpeg version 7.0'))
+
+    def test_manifest(self):
+        output = self.item['destination']
+        fprint = fingerprint(self.item, 'ffmpeg version 7.0')
+        manifest = BuildManifest()
+        self.assertFalse(manifest.is_uptodate(output, fprint))
+        manifest.record(output, fprint)
+        self.assertTrue(os.path.isfile(os.path.join(self.tmpdir.name,
+                                                    MANIFEST)))
+        manifest = BuildManifest()  # reload from disk
+        self.assertTrue(manifest.is_uptodate(output, fprint))
+        self.assertFalse(manifest.is_uptodate(output, fprint[::-1]))
+        with open(output, 'a', encoding='utf-8') as fln:
+            fln.write('changed')
+        self.assertFalse(manifest.is_uptodate(output, fprint))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the chunked_encode.py functions.
+# Rev: Oct.18.2024
+
+import sys
+import os
+import tempfile
+import types
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_engine.chunked_encode import (ChunkedEncode,
+                                                      chunk_bounds,
+                                                      is_chunkable,
+                                                      )
+except ImportError as error:
+    sys.exit(error)
+
+
+def item(**kwargs):
+    """Returns a long 'One pass' item"""
+    kwa = {'type': 'One pass', 'args': ['-c:v libx264 -crf 23', '', ''],
+           'start-time': '', 'end-time': '', 'pre-input-1': '',
+           'source': 'in.mkv', 'destination': 'out.mkv',
+           'duration': 200000, 'volume': ''}
+    kwa.update(kwargs)
+    return kwa
+
+
+class TestChunkable(unittest.TestCase):
+    """Test case for the items which can be encoded by segments"""
+
+    def test_chunkable(self):
+        self.assertTrue(is_chunkable(item(), 4))
+
+    def test_not_chunkable(self):
+        self.assertFalse(is_chunkable(item(), 1))
+        self.assertFalse(is_chunkable(item(duration=100000), 4))
+        self.assertFalse(is_chunkable(item(args=['-c:v copy', '', '']), 4))
+        self.assertFalse(is_chunkable(item(args=['-crf 23', '', '']), 4))
+        self.assertFalse(is_chunkable(item(args=['-c:v libx264 -vn',
+                                                 '', '']), 4))
+        self.assertFalse(is_chunkable(item(args=['-c:v libx264 '
+                                                 '-filter_complex x',
+                                                 '', '']), 4))
+        self.assertFalse(is_chunkable(item(**{'start-time': '-ss 10'}), 4))
+        self.assertFalse(is_chunkable(item(destination='out.gif'), 4))
+        self.assertFalse(is_chunkable(item(type='Two pass'), 4))
+
+
+class TestBounds(unittest.TestCase):
+    """Test case for the segments of the source"""
+
+    def test_bounds(self):
+        times = [float(x) for x in range(0, 300, 10)]
+        self.assertEqual(chunk_bounds(times, 300, 4),
+                         [(0.0, 80.0), (80.0, 80.0), (160.0, 80.0),
+                          (240.0, None)])
+
+    def test_times_after_start(self):
+        # key frame times are relative to the container start
+        # time (see `PacketIndex`) and are used as they are
+        times = [x + 0.5 for x in range(0, 300, 10)]
+        self.assertEqual(chunk_bounds(times, 300, 4),
+                         [(0.0, 80.5), (80.5, 80.0), (160.5, 80.0),
+                          (240.5, None)])
+
+    def test_min_length(self):
+        times = [float(x) for x in range(0, 300, 10)]
+        self.assertEqual(len(chunk_bounds(times, 300, 10)), 5)  # 60 s
+        self.assertEqual(chunk_bounds(times, 300, 10, minlen=300),
+                         [(0.0, None)])
+        self.assertEqual(chunk_bounds([], 300, 4), [(0.0, None)])
+
+
+class TestFailure(unittest.TestCase):
+    """Test case for the encoding failures and stops"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.messages = []
+        engine = types.SimpleNamespace(
+            appdata={'chunk_jobs': 2, 'cachedir': self.tmpdir.name,
+                     'ffmpeg_cmd': 'ffmpeg', 'progress_rate': 4},
+            notify=lambda topic, **kwa: self.messages.append(kwa),
+            logfile=os.path.join(self.tmpdir.name, 'test.log'),
+            stop_work_thread=False, nargs=1)
+        self.chunked = ChunkedEncode(engine, 1, item(), '-y')
+        self.chunked.bounds = [(0.0, 100.0), (100.0, None)]
+        self.chunked.tmpdir = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_streams_failed(self):
+        self.chunked.execute = lambda *args: False
+        self.assertIsNone(self.chunked.encode_streams())
+        self.chunked.kwa['args'][0] += ' -an'
+        self.assertEqual(self.chunked.encode_streams(), '')
+
+    def test_stopped(self):
+        self.chunked.execute = lambda *args: False
+        self.assertEqual(self.chunked.run(), 'STOP')
+        self.assertEqual(self.messages[-1]['output'], 'STOP')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the conversion_pipeline.py module.
+# Rev: Oct.18.2024
+
+import sys
+import os
+import json
+import platform
+import shlex
+import subprocess
+import tempfile
+import threading
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_engine.conversion_pipeline import (ConversionPipeline,
+                                                           load_profile,
+                                                           load_profiles,
+                                                           profile_item,
+                                                           FILEPATH_MARK,
+                                                           FILEPATH_EXEC,
+                                                           )
+    from videomass.vdms_io.make_filelog import LogSink
+except ImportError as error:
+    sys.exit(error)
+
+PROFILE = {'Name': 'MP3 192k', 'Description': '',
+           'First_pass': '-vn  -c:a libmp3lame -b:a 192k',
+           'Second_pass': '', 'Supported_list': '',
+           'Output_extension': 'mp3', 'Preinput_1': '', 'Preinput_2': ''}
+
+
+class SlowPipeline(ConversionPipeline):
+    """Pipeline whose conversions wait for a release"""
+
+    def __init__(self, *args, **kwargs):
+        ConversionPipeline.__init__(self, *args, **kwargs)
+        self.release = threading.Event()
+        self.converted = []
+
+    def convert(self, job, item):
+        self.release.wait(5)
+        self.converted.append((job, item['source']))
+        return 'DONE'
+
+
+class TestProfile(unittest.TestCase):
+    """Test case for the profiles of the Presets Manager"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.tmpdir.name, 'Audio.json'), 'w',
+                  encoding='utf-8') as fln:
+            json.dump([PROFILE, {'Description': 'no name'}], fln)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_load(self):
+        self.assertEqual(len(load_profiles(self.tmpdir.name, 'Audio')), 1)
+        self.assertEqual(load_profile(self.tmpdir.name, 'Audio', 'MP3 192k'),
+                         PROFILE)
+        self.assertIsNone(load_profile(self.tmpdir.name, 'Audio', 'none'))
+        self.assertEqual(load_profiles(self.tmpdir.name, 'missing'), [])
+
+    def test_item(self):
+        appdata = {'outputdir_asinput': False, 'filesuffix': '',
+                   'outputdir': os.path.join('out', 'dir')}
+        source = os.path.join('down', 'clip.webm')
+        item = profile_item(PROFILE, 'Audio', source, appdata, 'yt.log')
+        self.assertEqual(item['type'], 'One pass')
+        self.assertEqual(item['args'], ['-vn -c:a libmp3lame -b:a 192k', ''])
+        self.assertEqual(item['destination'],
+                         os.path.join('out', 'dir', 'clip.mp3'))
+
+        appdata['outputdir_asinput'] = True
+        item = profile_item(dict(PROFILE, Output_extension='copy'), 'Audio',
+                            source, appdata, 'yt.log')
+        self.assertEqual(item['extension'], '')
+        self.assertEqual(item['destination'],
+                         os.path.join('down', 'clip_converted.webm'))
+
+
+class TestPipeline(unittest.TestCase):
+    """Test case for the conversions of the downloaded files"""
+
+    def test_submit_wait(self):
+        pipeline = SlowPipeline({'outputdir_asinput': True,
+                                 'filesuffix': '_new'}, None, None,
+                                PROFILE, 'Audio', jobs=1)
+        self.assertTrue(pipeline.submit('a.webm'))
+        self.assertFalse(pipeline.submit('a.webm'))  # already submitted
+        self.assertTrue(pipeline.submit('b.webm'))
+        timer = threading.Timer(0.1, pipeline.release.set)
+        timer.start()
+        self.assertEqual(pipeline.wait(), ['DONE', 'DONE'])
+        timer.join()
+        self.assertEqual([x[0] for x in pipeline.converted], [1, 2])
+
+    def test_stop(self):
+        pipeline = SlowPipeline({'outputdir_asinput': True,
+                                 'filesuffix': '_new'}, None, None,
+                                PROFILE, 'Audio', jobs=1)
+        pipeline.submit('a.webm')
+        pipeline.submit('b.webm')
+        pipeline.stop()
+        self.assertFalse(pipeline.submit('c.webm'))
+        pipeline.release.set()
+        status = pipeline.wait()
+        self.assertEqual(status[1], 'STOP')
+
+    def test_error(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            logfile = os.path.join(tmp, 'test.log')
+            # most of the options of the FFmpegEngine are missing
+            pipeline = ConversionPipeline({'outputdir_asinput': True,
+                                           'filesuffix': '_new'}, logfile,
+                                          None, PROFILE, 'Audio', jobs=1)
+            pipeline.submit('a.webm')
+            self.assertEqual(pipeline.wait(), ['ERROR'])
+            LogSink.close_all(logfile)
+            with open(logfile, encoding='utf-8') as fln:
+                self.assertIn('Conversion error', fln.read())
+
+
+@unittest.skipIf(platform.system() == 'Windows', 'requires a POSIX shell')
+class TestExec(unittest.TestCase):
+    """Test case for the pathname printed by the yt-dlp executable"""
+
+    def test_marker(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            open(os.path.join(tmp, 'V'), 'w', encoding='utf-8').close()
+            command = shlex.split(FILEPATH_EXEC)[1].replace(
+                '{}', shlex.quote('my [clip].mp4'))  # as yt-dlp does
+            out = subprocess.run(command, shell=True, cwd=tmp, check=True,
+                                 capture_output=True, text=True).stdout
+        self.assertEqual(out, f'{FILEPATH_MARK}my [clip].mp4\n')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the download_archive.py object.
+# Rev: Oct.18.2024
+
+import sys
+import os
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.download_archive import DownloadArchive, ARCHIVE
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestDownloadArchive(unittest.TestCase):
+    """Test case for the yt-dlp download archive"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, ARCHIVE)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_record(self):
+        """the recorded media are found again after reloading"""
+        archive = DownloadArchive(self.filename)
+        self.assertEqual(len(archive), 0)
+        key = DownloadArchive.key('Youtube', 'dQw4w9WgXcQ')
+        self.assertEqual(key, 'youtube dQw4w9WgXcQ')
+        archive.add(key)
+        archive.add(key)
+        archive.add('vimeo 12345')
+        self.assertIn(key, archive)
+
+        archive = DownloadArchive(self.filename)
+        self.assertEqual(len(archive), 2)
+        self.assertIn('vimeo 12345', archive)
+        with open(self.filename, encoding='utf-8') as fln:
+            self.assertEqual(fln.read(), 'youtube dQw4w9WgXcQ\nvimeo 12345\n')
+
+    def test_incomplete_line(self):
+        """a line left incomplete is never merged with the next one"""
+        with open(self.filename, 'w', encoding='utf-8') as fln:
+            fln.write('youtube aaa\nyoutube bb')
+        archive = DownloadArchive(self.filename)
+        self.assertIn('youtube aaa', archive)
+        self.assertNotIn('youtube bb', archive)
+        archive.add('youtube ccc')
+
+        archive = DownloadArchive(self.filename)
+        self.assertIn('youtube ccc', archive)
+        self.assertNotIn('youtube bbyoutube ccc', archive)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the download_scheduler.py object.
+# Rev: Oct.18.2024
+
+import sys
+import os
+import time
+import threading
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_engine.download_scheduler import (DownloadScheduler,
+                                                          hostname)
+except ImportError as error:
+    sys.exit(error)
+
+
+class Recorder:
+    """Worker which records the concurrent downloads"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.running = {}  # host: count
+        self.peak = {}  # host: max count
+        self.total = 0
+        self.peak_total = 0
+        self.started = []
+
+    def __call__(self, slot, index, url, opts):
+        host = hostname(url)
+        with self.lock:
+            self.started.append(index)
+            self.running[host] = self.running.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0),
+                                  self.running[host])
+            self.total += 1
+            self.peak_total = max(self.peak_total, self.total)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running[host] -= 1
+            self.total -= 1
+        return 'DONE'
+
+
+class TestDownloadScheduler(unittest.TestCase):
+    """Test case for the concurrent downloads"""
+
+    def test_hostname(self):
+        """the www prefix is ignored"""
+        self.assertEqual(hostname('https://www.Example.com/v?id=1'),
+                         'example.com')
+        self.assertEqual(hostname('not an url'), '')
+
+    def test_limits(self):
+        """global and per-host limits are respected"""
+        tasks = [(f'https://a.com/{x}', '') for x in range(6)]
+        tasks += [(f'https://b.org/{x}', '') for x in range(3)]
+        worker = Recorder()
+        status = DownloadScheduler(jobs=3, host_jobs=2).run(tasks, worker)
+        self.assertEqual(status, ['DONE'] * 9)
+        self.assertEqual(worker.peak_total, 3)
+        self.assertLessEqual(worker.peak['a.com'], 2)
+        self.assertLessEqual(worker.peak['b.org'], 2)
+        # the first host is busy, the third task is overtaken
+        self.assertEqual(sorted(worker.started[:3]), [0, 1, 6])
+
+    def test_errors(self):
+        """a failing task does not stop the others"""
+        def worker(slot, index, url, opts):
+            if index == 0:
+                raise ValueError('boom')
+            return 'DONE'
+
+        tasks = [(f'https://a.com/{x}', '') for x in range(3)]
+        status = DownloadScheduler(jobs=1).run(tasks, worker)
+        self.assertEqual(status, ['ERROR: boom', 'DONE', 'DONE'])
+
+    def test_stop(self):
+        """the tasks not started are cancelled"""
+        scheduler = DownloadScheduler(jobs=1)
+
+        def worker(slot, index, url, opts):
+            scheduler.stop()
+            return 'STOP'
+
+        tasks = [(f'https://a.com/{x}', '') for x in range(3)]
+        status = scheduler.run(tasks, worker)
+        self.assertEqual(status, ['STOP', None, None])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the ffmpeg_engine.py functions.
+# Rev: Oct.18.2024
+
+import sys
+import os
+import platform
+import tempfile
+import threading
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_engine.ffmpeg_engine import (FFmpegEngine,
+                                                     fusion_groups,
+                                                     fused_one_pass,
+                                                     )
+except ImportError as error:
+    sys.exit(error)
+
+APPDATA = {'ffmpeg_cmd': 'ffmpeg',
+           'ffmpeg_loglev': '-loglevel info',
+           'ffmpeg_progress_pipe': False,
+           }
+
+
+def item(source, destination, args='-c:v libx264', start='', kind='One pass'):
+    """Returns a queue item"""
+    return {'type': kind, 'source': source, 'destination': destination,
+            'args': [args, '', ''], 'start-time': start, 'end-time': '',
+            'pre-input-1': '', 'duration': 1000, 'volume': '',
+            }
+
+
+class TestFusion(unittest.TestCase):
+    """Test case for the single decoding of multiple outputs"""
+
+    def test_groups(self):
+        items = [item('a.mkv', '1.mp4'),
+                 item('b.mkv', '2.mp4'),
+                 item('a.mkv', '3.mp4', args='-c:v libx265'),
+                 item('a.mkv', '4.mp4', start='-ss 00:00:10'),
+                 item('a.mkv', '5.mp4', kind='Two pass'),
+                 item('a.mkv', '6.mp4', args='-filter_complex x'),
+                 item('b.mkv', '7.mp4'),
+                 ]
+        self.assertEqual(fusion_groups(items, 0),
+                         [[0, 2], [1, 6], [3], [4], [5]])
+        self.assertEqual(fusion_groups(items, 0, maxsize=1),
+                         [[x] for x in range(7)])
+
+    def test_command(self):
+        items = [item('a.mkv', '1.mp4', args='-b:v 1M'),
+                 item('a.mkv', '2.mp4', args='-b:v 2M')]
+        model = fused_one_pass(APPDATA, [1, 3], 4, items)
+        cmd = model['pass1']
+        if isinstance(cmd, str):  # MS Windows
+            cmd = cmd.split()
+        self.assertEqual(cmd.count('-i'), 1)
+        self.assertEqual(cmd[-6:], ['-b:v', '1M', '1.mp4',
+                                    '-b:v', '2M', '2.mp4'])
+        self.assertTrue(model['count1'].startswith('File 1, 3/4'))
+
+
+@unittest.skipIf(platform.system() == 'Windows', 'requires a shebang')
+class TestRun(unittest.TestCase):
+    """Test case for the processing of the items with a stub FFmpeg"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        stub = os.path.join(self.tmpdir.name, 'ffmpeg')
+        with open(stub, 'w', encoding='utf-8') as fln:
+            fln.write(f'#!{sys.executable}\nimport sys\nsys.exit(0)\n')
+        os.chmod(stub, 0o755)
+        self.appdata = dict(APPDATA, ffmpeg_cmd=stub, encoding='utf-8',
+                            progress_rate=4, ffmpeg_jobs=1,
+                            pass1_lookahead=0, skip_uptodate=False,
+                            fingerprint_hash=False, fuse_outputs=False,
+                            chunk_jobs=0, cachedir=self.tmpdir.name,
+                            ostype=platform.system())
+        self.logfile = os.path.join(self.tmpdir.name, 'test.log')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_engine(self, items):
+        messages = []
+        engine = FFmpegEngine(self.appdata, self.logfile, items,
+                              lambda topic, **kwa: messages.append(topic))
+        return engine.run(), messages
+
+    def test_unfused(self):
+        items = [item('a.mkv', '1.mp4'), item('a.mkv', '2.mp4')]
+        result, messages = self.run_engine(items)
+        self.assertEqual(result, ['DONE', 'DONE'])
+        self.assertEqual(messages[-1], 'END_EVT')
+
+    def test_lookahead(self):
+        self.appdata['pass1_lookahead'] = 2
+        items = [item('a.mkv', '1.mp4', kind='Two pass'),
+                 item('b.mkv', '2.mp4'),
+                 item('c.mkv', '3.mp4', kind='Two pass')]
+        for kwa in items[0], items[2]:
+            kwa['args'] = ['-pass 1', '-pass 2', '']
+        engine = FFmpegEngine(self.appdata, self.logfile, items,
+                              lambda topic, **kwa: None)
+        threads = {}
+        first_stage = engine.first_stage
+
+        def recorder(count, kwa, checked=False):
+            threads[count] = threading.current_thread()
+            return first_stage(count, kwa, checked)
+
+        engine.first_stage = recorder
+        self.assertEqual(engine.run(), ['DONE', 'DONE', 'DONE'])
+        # only the first passes run in advance
+        self.assertIs(threads[2], threading.current_thread())
+        self.assertIsNot(threads[1], threading.current_thread())
+        self.assertIsNot(threads[3], threading.current_thread())
+
+    def test_fused(self):
+        self.appdata['fuse_outputs'] = True
+        items = [item('a.mkv', '1.mp4'), item('a.mkv', '2.mp4'),
+                 item('b.mkv', '3.mp4')]
+        result = self.run_engine(items)[0]
+        self.assertEqual(result, ['DONE', 'DONE', 'DONE'])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
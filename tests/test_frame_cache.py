@@ -0,0 +1,117 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the frame_cache.py object.
+# Rev: Oct.18.2024
+
+import sys
+import os
+import platform
+import tempfile
+import threading
+import time
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.frame_cache import FrameCache, grab_frame
+except ImportError as error:
+    sys.exit(error)
+
+# fake FFmpeg which writes the second of the given seek time as pixels,
+# it takes a long time on the second 59
+FAKE_FFMPEG = '''#!{0}
+import sys, time
+args = sys.argv[1:]
+size = args[args.index('-vf') + 1][6:].split(':')
+sec = float(args[args.index('-ss') + 1]) if '-ss' in args else 0
+if sec == 59:
+    time.sleep(60)
+if sec > 60:
+    sys.exit('seek beyond the end')
+sys.stdout.buffer.write(bytes([int(sec)]) * int(size[0]) * int(size[1]) * 3)
+'''
+
+
+@unittest.skipIf(platform.system() == 'Windows', 'requires a shebang')
+class TestFrameCache(unittest.TestCase):
+    """Test case for the FrameCache object"""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ffmpeg = os.path.join(self.tmp.name, 'ffmpeg')
+        with open(self.ffmpeg, 'w', encoding='utf-8') as fln:
+            fln.write(FAKE_FFMPEG.format(sys.executable))
+        os.chmod(self.ffmpeg, 0o755)
+        self.video = os.path.join(self.tmp.name, 'video.mkv')
+        with open(self.video, 'wb') as fln:
+            fln.write(b'data')
+        self.cache = FrameCache(maxsize=3)
+
+    def tearDown(self):
+        """Method called immediately after the test method has been called"""
+        self.cache.shutdown()
+        self.tmp.cleanup()
+
+    def request(self, positions):
+        """Request the given positions and wait for the first frame"""
+        done = threading.Event()
+        result = []
+
+        def callback(*args):
+            result.extend(args)
+            done.set()
+
+        self.cache.request(self.ffmpeg, self.video, positions, (4, 2),
+                           callback)
+        self.assertTrue(done.wait(30))
+        return result
+
+    def test_grab(self):
+        data, error = grab_frame(self.ffmpeg, self.video, 2500, (4, 2))
+        self.assertIsNone(error)
+        self.assertEqual(data, bytes([2]) * 24)
+        data, error = grab_frame(self.ffmpeg, self.video, 90000, (4, 2))
+        self.assertIsNone(data)
+        self.assertEqual(error, 'seek beyond the end')
+
+    def test_request_and_prefetch(self):
+        self.assertEqual(self.request([1000, 2000, 3000]),
+                         [1000, bytes([1]) * 24, None])
+        for future in list(self.cache.pending.values()):
+            future.result()
+        self.assertEqual(self.cache.lookup(self.video, 3000, (4, 2)),
+                         bytes([3]) * 24)
+        self.assertIsNone(self.cache.lookup(self.video, 3000, (8, 4)))
+
+    def test_lru(self):
+        for sec in range(1, 5):
+            self.request([sec * 1000])
+        self.assertIsNone(self.cache.lookup(self.video, 1000, (4, 2)))
+        self.assertIsNotNone(self.cache.lookup(self.video, 2000, (4, 2)))
+        self.request([5000])  # 3000 is the least recently used
+        self.assertIsNone(self.cache.lookup(self.video, 3000, (4, 2)))
+        self.assertIsNotNone(self.cache.lookup(self.video, 2000, (4, 2)))
+
+    def test_error(self):
+        self.assertEqual(self.request([90000]),
+                         [90000, None, 'seek beyond the end'])
+        self.assertIsNone(self.cache.lookup(self.video, 90000, (4, 2)))
+
+    def test_shutdown(self):
+        self.cache.request(self.ffmpeg, self.video, [59000], (4, 2))
+        while not self.cache.running:
+            time.sleep(0.01)
+        proc = list(self.cache.running.values())[0]
+        self.cache.shutdown()  # the running grab is terminated
+        self.assertIsNotNone(proc.wait(30))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the job_journal.py object.
+# Rev: Oct.18.2024
+
+import sys
+import os
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.job_journal import JobJournal, file_checksum
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestJobJournal(unittest.TestCase):
+    """Test case for the JobJournal object"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, 'queue.journal')
+        self.items = [{'type': 'One pass',
+                       'source': f'/media/src{x}.mkv',
+                       'destination': os.path.join(self.tmpdir.name,
+                                                   f'out{x}.mkv'),
+                       'args': ['', '-c copy', ''],
+                       'start-time': '',
+                       'end-time': '',
+                       } for x in range(3)]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, item, text='data'):
+        with open(item['destination'], 'w', encoding='utf-8') as fln:
+            fln.write(text)
+
+    def test_checksum(self):
+        self.write(self.items[0], 'x' * 5000)
+        digest = file_checksum(self.items[0]['destination'], sample=1024)
+        self.assertEqual(len(digest), 64)
+        self.write(self.items[0], 'x' * 4999 + 'y')
+        self.assertNotEqual(file_checksum(self.items[0]['destination'],
+                                          sample=1024), digest)
+        self.assertIsNone(file_checksum(self.items[1]['destination']))
+
+    def test_resume(self):
+        done, crashed, pending = self.items
+        journal = JobJournal(self.filename)
+        journal.resume(self.items)
+        journal.begin(done)
+        self.write(done)
+        journal.end(done, 'DONE')
+        journal.begin(crashed)
+        self.write(crashed)  # the application crashes here
+
+        journal = JobJournal(self.filename)  # restart
+        self.assertTrue(journal.is_done(done))
+        self.assertFalse(journal.is_done(crashed))
+        self.assertFalse(journal.is_done(pending))
+        discarded = journal.resume(self.items)
+        self.assertEqual(discarded, [crashed['destination']])
+        self.assertFalse(os.path.exists(crashed['destination']))
+
+        self.write(done, 'modified')
+        self.assertFalse(journal.is_done(done))
+
+        journal.resume(self.items[2:])
+        self.assertEqual(len(journal.entries), 1)
+        journal.remove()
+        self.assertFalse(os.path.exists(self.filename))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
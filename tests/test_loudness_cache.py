@@ -0,0 +1,138 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the loudness_cache.py object.
+# Rev: Oct.18.2024
+
+import sys
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.loudness_cache import (LoudnessCache,
+                                                  LoudnessParser,
+                                                  loudnorm_targets,
+                                                  fused_filter,
+                                                  audio_index,
+                                                  detect_files,
+                                                  )
+except ImportError as error:
+    sys.exit(error)
+
+OUTPUT = """[Parsed_volumedetect_0 @ 0x55] n_samples: 2646000
+[Parsed_volumedetect_0 @ 0x55] mean_volume: -21.3 dB
+[Parsed_volumedetect_0 @ 0x55] max_volume: -1.2 dB
+[Parsed_loudnorm_1 @ 0x56]
+{
+	"input_i" : "-23.51",
+	"input_tp" : "-1.20",
+	"input_lra" : "5.60",
+	"input_thresh" : "-33.80",
+	"output_i" : "-16.04",
+	"output_tp" : "-1.50",
+	"output_lra" : "4.90",
+	"output_thresh" : "-26.30",
+	"normalization_type" : "dynamic",
+	"target_offset" : "0.04"
+}
+"""
+
+
+class TestLoudness(unittest.TestCase):
+    """Test case for the loudness_cache functions and parser"""
+
+    def test_targets_and_filter(self):
+        loud = 'loudnorm=I=-16:TP=-1.5:LRA=11:print_format=summary'
+        targets = loudnorm_targets(loud)
+        self.assertEqual(targets, ('-16', '-1.5', '11'))
+        self.assertIsNone(loudnorm_targets(''))
+        self.assertEqual(fused_filter(targets),
+                         'volumedetect,loudnorm=I=-16:TP=-1.5:'
+                         'LRA=11:print_format=json')
+        self.assertEqual(fused_filter(None), 'volumedetect')
+        self.assertEqual(audio_index('-map 0:v -map 0:a:2 -c copy'), '2')
+        self.assertEqual(audio_index('-vn'), '')
+
+    def test_parser(self):
+        parser = LoudnessParser()
+        for line in OUTPUT.splitlines():
+            parser.feed(line)
+        self.assertEqual(parser.data['max_volume'], '-1.2 dB')
+        self.assertEqual(parser.data['mean_volume'], '-21.3 dB')
+        summary = parser.ebu_summary()
+        self.assertEqual(summary['Input Integrated:'], '-23.51')
+        self.assertEqual(summary['Target Offset:'], '0.04')
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            name = os.path.join(tmpdir, 'media.wav')
+            with open(name, 'w', encoding='utf-8') as fln:
+                fln.write('x')
+            cache = LoudnessCache()
+            key = cache.key(name, ('-ss  00:00:01', ''), '0',
+                            ('-16', '-1.5', '11'))
+            cache.put(key, {'max_volume': '-1.2 dB'})
+            same = cache.key(name, ('-ss 00:00:01', ''), '0',
+                             ['-16', '-1.5', '11'])
+            self.assertEqual(cache.get(same), {'max_volume': '-1.2 dB'})
+            with open(name, 'a', encoding='utf-8') as fln:
+                fln.write('changed')
+            self.assertIsNone(cache.get(key))
+
+
+class TestDetectFiles(unittest.TestCase):
+    """Test case for the parallel analysis of the files"""
+
+    def setUp(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def detect(self, filename):
+        """Stub analysis, the first files are the slowest"""
+        with self.lock:
+            self.calls.append(filename)
+        index = int(filename.split('.')[0])
+        time.sleep(0.02 * (5 - index) if index < 5 else 0)
+        if filename.endswith('.bad'):
+            return (f'{index}', ''), ('ERROR', 'failed'), 'output'
+        return (f'{index}', ''), None, None
+
+    def test_order(self):
+        files = [f'{x}.wav' for x in range(6)]
+        volumes, status, output = detect_files(self.detect, files, 4)
+        self.assertEqual(volumes, [(f'{x}', '') for x in range(6)])
+        self.assertIsNone(status)
+        self.assertIsNone(output)
+
+    def test_first_failure(self):
+        files = ['0.wav', '1.wav', '2.bad', '3.wav', '4.bad', '5.wav'] + [
+            f'{x}.wav' for x in range(6, 20)]
+        volumes, status, output = detect_files(self.detect, files, 2)
+        self.assertEqual(volumes, [('0', ''), ('1', ''), ('2', '')])
+        self.assertEqual(status, ('ERROR', 'failed'))
+        self.assertEqual(output, 'output')
+        self.assertLess(len(self.calls), len(files))  # others cancelled
+
+    def test_skipped(self):
+        def detect(filename):
+            if filename == 'b.wav':
+                return None, None, None
+            return ('-1.0', '-20.0'), None, None
+
+        volumes, status = detect_files(detect, ['a.wav', 'b.wav',
+                                                'c.wav'], 1)[:2]
+        self.assertEqual(volumes, [('-1.0', '-20.0')])
+        self.assertIsNone(status)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
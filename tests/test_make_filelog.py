@@ -0,0 +1,75 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the make_filelog.py module.
+# Rev: Oct.18.2024
+
+import sys
+import os
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.make_filelog import (LogSink,
+                                                logwrite,
+                                                logappend,
+                                                logflush,
+                                                make_log_template,
+                                                )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestLogSink(unittest.TestCase):
+    """Test case for the buffered log writer"""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.logfile = make_log_template('test.log', self.tmpdir.name,
+                                         mode='w')
+
+    def tearDown(self):
+        """Method called after the test"""
+        LogSink.close_all()
+        self.tmpdir.cleanup()
+
+    def read(self, name=None):
+        with open(name or self.logfile, 'r', encoding='utf-8') as log:
+            return log.read()
+
+    def test_buffered_until_flush(self):
+        logappend('first line\n', self.logfile)
+        logwrite('', 'an error', self.logfile)
+        logflush(self.logfile)
+        text = self.read()
+        self.assertTrue(text.endswith('first line\n\nan error\n'))
+
+    def test_template_writes_pending_messages(self):
+        logappend('pending\n', self.logfile)
+        make_log_template('test.log', self.tmpdir.name, mode='a')
+        text = self.read()
+        self.assertLess(text.index('pending'), text.rindex('[DATE]'))
+
+    def test_rotation(self):
+        maxsize = LogSink.MAXSIZE
+        LogSink.MAXSIZE = 100
+        try:
+            logappend('x' * 200, self.logfile)
+            logflush(self.logfile)
+            logappend('new\n', self.logfile)
+            logflush(self.logfile)
+        finally:
+            LogSink.MAXSIZE = maxsize
+        self.assertTrue(self.read(f'{self.logfile}.1').endswith('x' * 200))
+        self.assertEqual(self.read(), 'new\n')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
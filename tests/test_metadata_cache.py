@@ -0,0 +1,128 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the metadata_cache.py object.
+# Rev: Oct.18.2024
+
+import sys
+import os
+import time
+import threading
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.metadata_cache import MetadataCache
+except ImportError as error:
+    sys.exit(error)
+
+
+class Extractor:
+    """Fake `extract_info` which counts the calls"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, url, kwargs):
+        with self.lock:
+            self.calls.append(url)
+        time.sleep(self.delay)
+        if 'bad' in url:
+            return None, 'ERROR: Unsupported URL'
+        return {'title': url.rsplit('/', 1)[1], 'formats': []}, None
+
+
+class TestMetadataCache(unittest.TestCase):
+    """Test case for the shared yt-dlp metadata cache"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dirname = os.path.join(self.tmpdir.name, 'ytdlp_metadata')
+        self.kwargs = {'noplaylist': True}
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_resolve(self):
+        """URLs are resolved in order, each one fetched once"""
+        cache = MetadataCache(self.dirname)
+        extractor = Extractor()
+        urls = ['https://a.com/v1', 'https://bad.com/v2', 'https://a.com/v1']
+        results = cache.resolve(urls, self.kwargs, extractor)
+        self.assertEqual(results[0][0]['title'], 'v1')
+        self.assertEqual(results[1], (None, 'ERROR: Unsupported URL'))
+        self.assertIs(results[2][0], results[0][0])
+        self.assertEqual(sorted(extractor.calls),
+                         ['https://a.com/v1', 'https://bad.com/v2'])
+
+        # errors are never cached, the others are not fetched again
+        cache.resolve(urls, self.kwargs, extractor)
+        self.assertEqual(extractor.calls.count('https://a.com/v1'), 1)
+        self.assertEqual(extractor.calls.count('https://bad.com/v2'), 2)
+        cache.shutdown()
+
+    def test_parallel(self):
+        """the URLs are fetched at the same time"""
+        cache = MetadataCache(self.dirname, workers=4)
+        urls = [f'https://a.com/v{x}' for x in range(4)]
+        start = time.time()
+        cache.resolve(urls, self.kwargs, Extractor(delay=0.2))
+        self.assertLess(time.time() - start, 0.6)
+        cache.shutdown()
+
+    def test_disk_and_ttl(self):
+        """entries are reloaded from disk until they expire"""
+        cache = MetadataCache(self.dirname, ttl=60)
+        cache.resolve(['https://a.com/v1'], self.kwargs, Extractor())
+        cache.shutdown()
+
+        cache = MetadataCache(self.dirname, ttl=60)
+        self.assertEqual(cache.get('https://a.com/v1', self.kwargs),
+                         {'title': 'v1', 'formats': []})
+        # other options, other metadata
+        self.assertIsNone(cache.get('https://a.com/v1', {}))
+        cache.shutdown()
+
+        cache = MetadataCache(self.dirname, ttl=1)
+        time.sleep(1.1)
+        self.assertIsNone(cache.get('https://a.com/v1', self.kwargs))
+        self.assertEqual(os.listdir(self.dirname), [])  # expired removed
+        cache.shutdown()
+
+    def test_size_limit(self):
+        """the least recently written files are removed at startup"""
+        cache = MetadataCache(self.dirname)
+        for num in range(4):
+            cache.put(f'https://a.com/v{num}', self.kwargs,
+                      {'title': 'x' * 1000})
+            name = cache.cachefile(cache.key(f'https://a.com/v{num}',
+                                             self.kwargs))
+            os.utime(name, (num, num))
+        cache.shutdown()
+        cache = MetadataCache(self.dirname, maxbytes=2500)
+        self.assertEqual(len(os.listdir(self.dirname)), 2)
+        self.assertIsNone(cache.get('https://a.com/v1', self.kwargs))
+        self.assertIsNotNone(cache.get('https://a.com/v3', self.kwargs))
+        cache.shutdown()
+
+    def test_disabled(self):
+        """a ttl of 0 disables the cache"""
+        cache = MetadataCache(self.dirname, ttl=0)
+        extractor = Extractor()
+        cache.resolve(['https://a.com/v1'], self.kwargs, extractor)
+        cache.resolve(['https://a.com/v1'], self.kwargs, extractor)
+        self.assertEqual(len(extractor.calls), 2)
+        self.assertFalse(os.path.exists(self.dirname))
+        cache.shutdown()
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the packet_index.py objects.
+# Rev: Oct.18.2024
+
+import sys
+import os
+import platform
+import tempfile
+import threading
+import time
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.packet_index import PacketIndex, PacketIndexCache
+    from videomass.vdms_threads.ffprobe import packets
+except ImportError as error:
+    sys.exit(error)
+
+# packets (pts, size, pos, key), B-frames are stored out of order,
+# the container starts at START and the first packet is later
+PACKETS = [(1.4, 1000, 48, True), (1.6, 200, 1048, False),
+           (1.5, 100, 1248, False), (2.4, 900, 1348, True),
+           (2.9, 300, 2248, False), (3.4, 800, 2548, True),
+           ]
+START = 1.0
+# the same packets relative to the start time, see `packets`
+RELATIVE = [(round(pts - START, 6), size, pos, key) for
+            pts, size, pos, key in PACKETS]
+# fake ffprobe which prints the PACKETS and the start time as
+# compact output, with a lot of warnings on stderr
+FAKE_FFPROBE = '''#!{0}
+import sys
+sys.stderr.write('warning\\n' * 100000)
+for pts, size, pos, key in {1}:
+    print(f'pts_time={{pts}}|size={{size}}|pos={{pos}}|'
+          f'flags={{"K_" if key else "__"}}')
+print('pts_time=N/A|size=10|pos=N/A|flags=__')
+print('start_time={2:.6f}')
+'''
+# fake ffprobe which takes a long time
+SLOW_FFPROBE = '''#!{0}
+import time
+time.sleep(60)
+'''
+
+
+class TestPacketIndex(unittest.TestCase):
+    """Test case for the PacketIndex object"""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.index = PacketIndex(RELATIVE)
+
+    def test_relative_times(self):
+        self.assertEqual(self.index.keys, [0.4, 1.4, 2.4])
+        self.assertEqual(self.index.times, [0.4, 0.5, 0.6, 1.4, 1.9, 2.4])
+        self.assertEqual(self.index.offsets[1], 1248)
+
+    def test_keyframes(self):
+        self.assertEqual(self.index.keyframe_before(2.1), 1.4)
+        self.assertEqual(self.index.keyframe_before(1.4), 1.4)
+        self.assertEqual(self.index.keyframe_before(0.1), 0.4)
+        self.assertEqual(self.index.keyframe_after(1.6), 2.4)
+        self.assertIsNone(self.index.keyframe_after(2.5))
+        self.assertEqual(self.index.nearest_keyframe(2.1), 2.4)
+        self.assertTrue(self.index.is_keyframe(1.4005))
+        self.assertFalse(self.index.is_keyframe(1.5))
+        self.assertEqual(self.index.offset_at(2.1), 1348)
+
+    def test_bitrate(self):
+        self.assertEqual(self.index.bitrate(), [10400, 9600, 6400])
+
+    def test_serialization(self):
+        index = PacketIndex.from_dict(self.index.to_dict())
+        self.assertEqual(index.to_dict(), self.index.to_dict())
+
+
+@unittest.skipIf(platform.system() == 'Windows', 'requires a shebang')
+class TestPacketIndexCache(unittest.TestCase):
+    """Test case for the PacketIndexCache object"""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ffprobe = os.path.join(self.tmp.name, 'ffprobe')
+        with open(self.ffprobe, 'w', encoding='utf-8') as fln:
+            fln.write(FAKE_FFPROBE.format(sys.executable, PACKETS, START))
+        os.chmod(self.ffprobe, 0o755)
+        self.video = os.path.join(self.tmp.name, 'video.mkv')
+        with open(self.video, 'wb') as fln:
+            fln.write(b'data')
+        self.dirname = os.path.join(self.tmp.name, 'packet_index')
+
+    def tearDown(self):
+        """Method called immediately after the test method has been called"""
+        self.tmp.cleanup()
+
+    def test_packets(self):
+        items, error = packets(self.video, self.ffprobe)
+        self.assertIsNone(error)
+        self.assertEqual(items, RELATIVE)
+
+    def test_build_and_reload(self):
+        cache = PacketIndexCache(self.dirname)
+        self.assertIsNone(cache.get(self.video))
+        index, error = cache.build(self.video, self.ffprobe)
+        self.assertIsNone(error)
+        self.assertEqual(index.keys, [0.4, 1.4, 2.4])
+        self.assertIs(cache.get(self.video), index)
+
+        cache = PacketIndexCache(self.dirname)  # from disk
+        self.assertEqual(cache.get(self.video).to_dict(), index.to_dict())
+
+        with open(self.video, 'ab') as fln:  # changed file
+            fln.write(b'more data')
+        self.assertIsNone(cache.get(self.video))
+
+    def test_request(self):
+        cache = PacketIndexCache(self.dirname)
+        done = threading.Event()
+        result = []
+
+        def callback(*args):
+            result.extend(args)
+            done.set()
+
+        cache.request(self.video, self.ffprobe, callback=callback)
+        self.assertTrue(done.wait(30))
+        self.assertIsNone(result[1])
+        self.assertEqual(result[0].keys, [0.4, 1.4, 2.4])
+        cache.shutdown()
+
+    def slow_ffprobe(self):
+        """Returns the pathname of a fake ffprobe taking a long time"""
+        slow = os.path.join(self.tmp.name, 'slow_ffprobe')
+        with open(slow, 'w', encoding='utf-8') as fln:
+            fln.write(SLOW_FFPROBE.format(sys.executable))
+        os.chmod(slow, 0o755)
+        return slow
+
+    def test_cancel(self):
+        slow = self.slow_ffprobe()
+        other = os.path.join(self.tmp.name, 'other.mkv')
+        with open(other, 'wb') as fln:
+            fln.write(b'data')
+        cache = PacketIndexCache(self.dirname)
+        done = threading.Event()
+        result = []
+
+        def callback(*args):
+            result.extend(args)
+            done.set()
+
+        cache.request(self.video, slow, callback=callback)
+        cache.request(other, slow)  # queued behind the first one
+        while not cache.running:
+            time.sleep(0.01)
+        start = time.monotonic()
+        cache.cancel(other)  # never started
+        cache.cancel(self.video)  # the running scan is terminated
+        self.assertTrue(done.wait(30))
+        self.assertLess(time.monotonic() - start, 30)
+        self.assertIsNone(result[0])
+        self.assertTrue(result[1])
+        cache.executor.shutdown(wait=True)
+        self.assertEqual(cache.pending, {})
+        self.assertEqual(cache.running, {})
+
+    def test_shutdown(self):
+        cache = PacketIndexCache(self.dirname)
+        cache.request(self.video, self.slow_ffprobe())
+        while not cache.running:
+            time.sleep(0.01)
+        proc = list(cache.running.values())[0]
+        cache.shutdown()
+        self.assertIsNotNone(proc.wait(30))
+
+    def test_prune(self):
+        os.makedirs(self.dirname)
+        for num in range(4):
+            name = os.path.join(self.dirname, f'{num}.json')
+            with open(name, 'w', encoding='utf-8') as fln:
+                fln.write('x' * 100)
+            os.utime(name, (num, num))
+        PacketIndexCache(self.dirname, maxbytes=250)
+        self.assertEqual(sorted(os.listdir(self.dirname)),
+                         ['2.json', '3.json'])  # least recently used
+
+    def test_error(self):
+        cache = PacketIndexCache(self.dirname)
+        index, error = cache.build(self.video, 'missing_ffprobe_cmd')
+        self.assertIsNone(index)
+        self.assertTrue(error)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
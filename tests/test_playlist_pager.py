@@ -0,0 +1,138 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the playlist_pager.py object.
+# Rev: Oct.18.2024
+
+import sys
+import os
+import threading
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.metadata_cache import MetadataCache
+    from videomass.vdms_ytdlp.playlist_pager import (PlaylistPager,
+                                                     is_playlist,
+                                                     page_options,
+                                                     index_ranges,
+                                                     )
+except ImportError as error:
+    sys.exit(error)
+
+
+def fake_channel(size, removed=(), count=False):
+    """
+    Returns a fake flat extractor of a channel of `size` videos,
+    the `removed` ones are listed as None, `count` adds the
+    playlist_count key
+    """
+    calls = []
+
+    def extractor(url, kwargs):
+        calls.append(kwargs['playlist_items'])
+        beg, end = [int(x) for x in kwargs['playlist_items'].split('-')]
+        entries = [{'id': f'v{x}', 'title': f'Video {x}',
+                    'url': f'https://a.com/watch?v=v{x}', 'duration': 60,
+                    'playlist_index': x}
+                   for x in range(beg, min(end, size) + 1)]
+        entries = [None if x['playlist_index'] in removed else x
+                   for x in entries]
+        if count:
+            return {'title': 'Channel', 'entries': entries,
+                    'playlist_count': size}, None
+        return {'title': 'Channel', 'entries': entries}, None
+    return extractor, calls
+
+
+class TestPlaylistPager(unittest.TestCase):
+    """Test case for the lazy playlist expansion"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = MetadataCache(os.path.join(self.tmpdir.name, 'meta'))
+
+    def tearDown(self):
+        self.cache.shutdown()
+        self.tmpdir.cleanup()
+
+    def load(self, pager):
+        """Load the next page and wait for it"""
+        done = threading.Event()
+        result = []
+
+        def callback(entries, error):
+            result.extend([entries, error])
+            done.set()
+
+        self.assertTrue(pager.next_page(callback))
+        self.assertTrue(done.wait(5))
+        return result
+
+    def test_helpers(self):
+        """page options, playlist URLs and index ranges"""
+        opts = page_options({'noplaylist': True}, 2, 10)
+        self.assertEqual(opts['playlist_items'], '21-30')
+        self.assertEqual(opts['extract_flat'], 'in_playlist')
+        self.assertFalse(opts['noplaylist'])
+        self.assertTrue(is_playlist('https://www.youtube.com/@name/videos'))
+        self.assertTrue(is_playlist('https://a.com/playlist?list=PL1'))
+        self.assertFalse(is_playlist('https://a.com/watch?v=x1'))
+        self.assertEqual(index_ranges([7, 1, 3, 2, 9, 10]), '1-3,7,9-10')
+
+    def test_pages(self):
+        """entries are loaded one page at a time until exhausted"""
+        extractor, calls = fake_channel(25)
+        pager = PlaylistPager('https://a.com/@name', {}, self.cache,
+                              extractor, pagesize=10)
+        entries, error = self.load(pager)
+        self.assertIsNone(error)
+        self.assertEqual([x['index'] for x in entries], list(range(1, 11)))
+        self.assertEqual(calls, ['1-10'])
+        self.assertFalse(pager.exhausted)
+        self.load(pager)
+        entries, error = self.load(pager)
+        self.assertEqual(len(entries), 5)
+        self.assertTrue(pager.exhausted)
+        self.assertEqual(len(pager.entries), 25)
+        self.assertFalse(pager.next_page(lambda entries, error: None))
+
+        # pages are never fetched twice
+        pager = PlaylistPager('https://a.com/@name', {}, self.cache,
+                              extractor, pagesize=10)
+        self.load(pager)
+        self.assertEqual(calls, ['1-10', '11-20', '21-30'])
+
+    def test_removed_entries(self):
+        """unavailable videos do not end the listing"""
+        extractor, calls = fake_channel(25, removed=(3, 4))
+        pager = PlaylistPager('https://a.com/@name', {}, self.cache,
+                              extractor, pagesize=10)
+        entries, error = self.load(pager)
+        self.assertEqual(len(entries), 8)
+        self.assertFalse(pager.exhausted)
+        self.load(pager)
+        self.load(pager)
+        self.assertTrue(pager.exhausted)
+        self.assertEqual(len(pager.entries), 23)
+
+    def test_playlist_count(self):
+        """the last page is known by the playlist count"""
+        extractor, calls = fake_channel(20, count=True)
+        pager = PlaylistPager('https://a.com/@name', {}, self.cache,
+                              extractor, pagesize=10)
+        self.load(pager)
+        self.assertFalse(pager.exhausted)
+        self.load(pager)
+        self.assertTrue(pager.exhausted)
+        self.assertEqual(calls, ['1-10', '11-20'])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
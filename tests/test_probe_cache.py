@@ -0,0 +1,154 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the probe_cache.py object.
+# Rev: Oct.18.2024
+
+import sys
+import os
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.probe_cache import ProbeCache, ProbeDataList
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestProbeCache(unittest.TestCase):
+    """Test case for the ProbeCache class"""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cachefile = os.path.join(self.tmpdir.name, 'probe_cache.json')
+        self.media = []
+        for num in range(3):
+            name = os.path.join(self.tmpdir.name, f'media_{num}.mkv')
+            with open(name, 'w', encoding='utf-8') as fln:
+                fln.write('x' * (num + 1))
+            self.media.append(name)
+
+    def tearDown(self):
+        """Method called after the test"""
+        self.tmpdir.cleanup()
+
+    def test_hit_and_miss(self):
+        cache = ProbeCache(self.cachefile, 10)
+        self.assertIsNone(cache.get(self.media[0]))
+        cache.put(self.media[0], {'format': {'duration': '1'}})
+        self.assertEqual(cache.get(self.media[0]),
+                         {'format': {'duration': '1'}})
+
+    def test_returns_copies(self):
+        cache = ProbeCache(self.cachefile, 10)
+        cache.put(self.media[0], {'format': {'duration': '1'}})
+        data = cache.get(self.media[0])
+        data['format'].pop('duration')
+        self.assertEqual(cache.get(self.media[0]),
+                         {'format': {'duration': '1'}})
+
+    def test_stale_entry(self):
+        cache = ProbeCache(self.cachefile, 10)
+        cache.put(self.media[0], {'format': {}})
+        with open(self.media[0], 'a', encoding='utf-8') as fln:
+            fln.write('changed')
+        self.assertIsNone(cache.get(self.media[0]))
+        self.assertEqual(len(cache.entries), 0)
+
+    def test_lru_eviction(self):
+        cache = ProbeCache(self.cachefile, 2)
+        cache.put(self.media[0], {'n': 0})
+        cache.put(self.media[1], {'n': 1})
+        cache.get(self.media[0])  # most recently used
+        cache.put(self.media[2], {'n': 2})
+        self.assertIsNone(cache.get(self.media[1]))
+        self.assertEqual(cache.get(self.media[0]), {'n': 0})
+        self.assertEqual(cache.get(self.media[2]), {'n': 2})
+
+    def test_persistence(self):
+        cache = ProbeCache(self.cachefile, 10)
+        cache.put(self.media[0], {'n': 0})
+        cache.save()
+        newcache = ProbeCache(self.cachefile, 10)
+        self.assertEqual(newcache.get(self.media[0]), {'n': 0})
+
+    def test_disabled(self):
+        cache = ProbeCache(self.cachefile, 0)
+        cache.put(self.media[0], {'n': 0})
+        self.assertIsNone(cache.get(self.media[0]))
+
+
+class TestProbeDataList(unittest.TestCase):
+    """Test case for the ProbeDataList class"""
+
+    def setUp(self):
+        """Method called to prepare the test fixture"""
+        self.loads = []
+        self.data = ProbeDataList(loader=self.loader, maxloaded=2)
+        for name in ('a', 'b', 'c'):
+            self.data.append(self.probe(name))
+
+    @staticmethod
+    def probe(name):
+        return {'format': {'filename': name}, 'streams': [{'n': name}]}
+
+    def loader(self, path):
+        self.loads.append(path)
+        return None if path == 'gone' else self.probe(path)
+
+    def test_lazy_loading(self):
+        self.assertEqual(len(self.data), 3)
+        self.assertEqual(self.data.filenames(), ['a', 'b', 'c'])
+        self.assertEqual(self.loads, [])
+        self.assertEqual(self.data[0]['streams'], [{'n': 'a'}])
+        self.assertEqual(self.loads, ['a'])
+        self.assertEqual(len(self.data.loaded), 2)
+
+    def test_reorder_and_delete(self):
+        self.data.reorder([2, 0, 1])
+        self.assertEqual(self.data.filenames(), ['c', 'a', 'b'])
+        del self.data[1]
+        self.assertEqual(self.data.filenames(), ['c', 'b'])
+        del self.data[:]
+        self.assertEqual(len(self.data), 0)
+        self.assertEqual(len(self.data.loaded), 0)
+        self.assertEqual(self.loads, [])
+
+    def test_failed_load(self):
+        self.data.append(self.probe('gone'))
+        self.data[0]
+        self.data[1]
+        self.assertEqual(self.data[3]['streams'], [])
+
+    def test_reload(self):
+        reloads = []
+        data = ProbeDataList(loader=lambda path: None,
+                             reloader=reloads.append, maxloaded=1)
+        for name in ('a', 'b', 'c'):
+            data.append(self.probe(name))
+        items = list(data)  # 'a' and 'b' are no longer in memory
+        self.assertEqual([x['streams'] for x in items],
+                         [[], [], [{'n': 'c'}]])
+        self.assertEqual(reloads, [['a', 'b']])  # scheduled at once
+        self.assertEqual(data.pending, {'a', 'b'})
+        data[0]
+        self.assertEqual(reloads, [['a', 'b']])  # already pending
+
+        data.reloaded('a', self.probe('a'))
+        self.assertEqual(data[0]['streams'], [{'n': 'a'}])
+        del data[1]
+        data.reloaded('b', self.probe('b'))  # removed in the meantime
+        self.assertEqual(data.pending, set())
+        self.assertEqual(data.filenames(), ['a', 'c'])
+        self.assertNotIn('b', data.loaded)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the progress_channel.py objects.
+# Rev: Oct.18.2024
+
+import sys
+import os
+import types
+import unittest
+from unittest import mock
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads import progress_channel
+    from videomass.vdms_threads.progress_channel import (ProgressChannel,
+                                                         ProgressParser,
+                                                         SegmentsChannel,
+                                                         parse_stats,
+                                                         record_to_progress,
+                                                         )
+except ImportError as error:
+    sys.exit(error)
+
+STATS = ('frame= 1178 fps=155 q=29.0 size=    2072kB time=00:00:39.02 '
+         'bitrate= 435.0kbits/s speed=5.15x    ')
+
+
+def block(usec, speed='5.15x', progress='continue'):
+    """Returns the lines of a `-progress` block"""
+    return ['frame=1178\n', 'fps=155.00\n', 'bitrate= 435.0kbits/s\n',
+            'total_size=2121728\n', f'out_time_us={usec}\n',
+            f'speed={speed}\n', f'progress={progress}\n']
+
+
+class Clock:
+    """Fake monotonic clock"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+
+class TestParsers(unittest.TestCase):
+    """Test case for the parsers of the FFmpeg statistics"""
+
+    def test_parse_stats(self):
+        progress = parse_stats(STATS)
+        self.assertEqual(progress['msec'], 39020)
+        self.assertEqual(progress['speed'], 5.15)
+        self.assertTrue(progress['stats'].startswith('frame: 1178 | fps: 155'))
+
+    def test_parse_stats_no_speed(self):
+        progress = parse_stats('size=N/A time=00:01:00.00 speed=N/A')
+        self.assertEqual(progress['msec'], 60000)
+        self.assertIsNone(progress['speed'])
+
+    def test_is_progress(self):
+        self.assertTrue(ProgressParser.is_progress('out_time_us=1000\n'))
+        self.assertTrue(ProgressParser.is_progress('stream_0_0_q=28.0\n'))
+        self.assertFalse(ProgressParser.is_progress(STATS))
+        self.assertFalse(ProgressParser.is_progress('Input #0, matroska\n'))
+        self.assertFalse(ProgressParser.is_progress('unknown=1\n'))
+
+    def test_feed(self):
+        parser = ProgressParser()
+        lines = block(39020000)
+        for line in lines[:-1]:
+            self.assertIsNone(parser.feed(line))
+        record = parser.feed(lines[-1])
+        self.assertEqual(record, {'out_time_us': 39020000, 'frame': 1178,
+                                  'fps': 155.0, 'bitrate': 435.0,
+                                  'total_size': 2121728, 'speed': 5.15,
+                                  'end': False})
+        for line in block('N/A', speed='N/A', progress='end')[:-1]:
+            parser.feed(line)
+        record = parser.feed('progress=end\n')
+        self.assertEqual(record['out_time_us'], 0)
+        self.assertIsNone(record['speed'])
+        self.assertTrue(record['end'])
+
+    def test_record_to_progress(self):
+        parser = ProgressParser()
+        for line in block(39020000):
+            record = parser.feed(line)
+        progress = record_to_progress(record)
+        self.assertEqual(progress['msec'], 39020)
+        self.assertEqual(progress['speed'], 5.15)
+        self.assertIn('bitrate: 435.0kbits/s', progress['stats'])
+
+
+class TestChannels(unittest.TestCase):
+    """Test case for the coalescing of the progress messages"""
+
+    def setUp(self):
+        self.messages = []
+        self.clock = Clock()
+        patcher = mock.patch.object(progress_channel, 'time',
+                                    types.SimpleNamespace(
+                                        monotonic=self.clock.monotonic))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def notify(self, topic, **kwargs):
+        self.messages.append((topic, kwargs))
+
+    def test_coalescing(self):
+        channel = ProgressChannel(60000, maxrate=2, notify=self.notify)
+        channel.send('Input #0\n')  # first message is sent at once
+        self.assertEqual(len(self.messages), 1)
+        self.assertEqual(self.messages[0][1]['lines'], ['Input #0\n'])
+
+        self.clock.now += 0.1
+        channel.send('Stream #0:0\n')
+        for usec in (1000000, 2000000, 3000000):
+            for line in block(usec):
+                channel.send(line)
+        self.assertEqual(len(self.messages), 1)  # rate limited
+
+        self.clock.now += 0.5
+        channel.send(STATS)  # only the latest statistics are kept
+        self.assertEqual(len(self.messages), 2)
+        topic, data = self.messages[1]
+        self.assertEqual(topic, 'PROGRESS_EVT')
+        self.assertEqual(data['lines'], ['Stream #0:0\n'])
+        self.assertEqual(data['progress']['msec'], 39020)
+        self.assertEqual(data['duration'], 60000)
+
+    def test_flush(self):
+        channel = ProgressChannel(60000, maxrate=2, notify=self.notify)
+        channel.flush()  # nothing to send
+        self.assertEqual(self.messages, [])
+        channel.send('Input #0\n')
+        self.clock.now += 0.1
+        for line in block(5000000):
+            channel.send(line)
+        channel.flush()
+        self.assertEqual(len(self.messages), 2)
+        self.assertEqual(self.messages[1][1]['lines'], [])
+        self.assertEqual(self.messages[1][1]['progress']['msec'], 5000)
+
+    def test_segments(self):
+        channel = SegmentsChannel(60000, 2, maxrate=2, notify=self.notify)
+        for line in block(10000000, speed='2.0x'):
+            channel.send(line, 0)
+        self.clock.now += 0.1
+        for line in block(5000000, speed='3.0x'):
+            channel.send(line, 1)
+        channel.flush()
+        progress = self.messages[-1][1]['progress']
+        self.assertEqual(progress['msec'], 15000)  # summed up timeline
+        self.assertEqual(progress['speed'], 5.0)
+        self.assertEqual(progress['stats'], 'segments: 0/2 | speed: 5.0x')
+
+        channel.done(0, 30000)
+        channel.flush()
+        progress = self.messages[-1][1]['progress']
+        self.assertEqual(progress['msec'], 35000)
+        self.assertEqual(progress['stats'], 'segments: 1/2 | speed: 3.0x')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the queue_runner.py and notify.py objects.
+# Rev: Oct.18.2024
+
+import sys
+import os
+import io
+import json
+import platform
+import signal
+import tempfile
+import threading
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_engine.queue_runner import (load_queue,
+                                                    run_queue,
+                                                    QUEUE_KEYS,
+                                                    )
+    from videomass.vdms_engine.notify import ConsoleNotify
+    from videomass.vdms_io.make_filelog import LogSink
+except ImportError as error:
+    sys.exit(error)
+
+
+def queue_item(destination):
+    """Returns a queue item with all the required keys"""
+    item = dict.fromkeys(QUEUE_KEYS, '')
+    item.update({'type': 'One pass', 'destination': destination})
+    return item
+
+
+class TestQueueRunner(unittest.TestCase):
+    """Test case for the headless queue processing"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.queuefile = os.path.join(self.tmpdir.name, 'queue.json')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, data):
+        with open(self.queuefile, 'w', encoding='utf-8') as fln:
+            json.dump(data, fln)
+
+    def test_load_queue(self):
+        self.write([queue_item('a.mkv'), queue_item('b.mkv')])
+        data, error = load_queue(self.queuefile)
+        self.assertIsNone(error)
+        self.assertEqual(len(data), 2)
+
+        self.write([queue_item('a.mkv'), queue_item('a.mkv')])
+        self.assertIsNone(load_queue(self.queuefile)[0])
+
+        item = queue_item('a.mkv')
+        del item['args']
+        self.write([item])
+        self.assertIsNone(load_queue(self.queuefile)[0])
+
+        self.write([dict(queue_item('a.mkv'), type='Unknown')])
+        self.assertIsNone(load_queue(self.queuefile)[0])
+
+        self.assertIsNone(load_queue(self.queuefile + '.missing')[0])
+
+    def test_console_notify(self):
+        logfile = os.path.join(self.tmpdir.name, 'test.log')
+        stream = io.StringIO()
+        notify = ConsoleNotify(logfile, stream, interval=0)
+        notify('COUNT_EVT', count='File 1/1', duration=1000, end='')
+        notify('PROGRESS_EVT', lines=['frame=1\n'],
+               progress={'msec': 500, 'stats': 'speed=1x'}, duration=1000)
+        notify('COUNT_EVT', count='', duration=1000, end='DONE')
+        output = stream.getvalue()
+        self.assertIn('File 1/1', output)
+        self.assertIn(' 50% | 00:00:00 of 00:00:01 | speed=1x',
+                      output)
+        self.assertTrue(output.endswith('Done\n'))
+        LogSink.close_all(logfile)
+        with open(logfile, encoding='utf-8') as fln:
+            self.assertIn('[FFMPEG]: frame=1', fln.read())
+
+
+@unittest.skipIf(platform.system() == 'Windows', 'requires a shebang')
+class TestInterrupt(unittest.TestCase):
+    """Test case for the Ctrl-C of a queue with a stub FFmpeg"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.calls = os.path.join(self.tmpdir.name, 'calls')
+        stub = os.path.join(self.tmpdir.name, 'ffmpeg')
+        with open(stub, 'w', encoding='utf-8') as fln:
+            fln.write(f'#!{sys.executable}\nimport sys, time\n'
+                      f'open({self.calls!r}, "a").write("x")\n'
+                      f'for i in range(20):\n'
+                      f'    sys.stderr.write(f"frame={{i}}\\n")\n'
+                      f'    sys.stderr.flush()\n'
+                      f'    time.sleep(0.05)\n')
+        os.chmod(stub, 0o755)
+        self.appdata = {'ffmpeg_cmd': stub, 'ffmpeg_loglev': '',
+                        'ffmpeg_progress_pipe': False, 'encoding': 'utf-8',
+                        'progress_rate': 4, 'ffmpeg_jobs': 2,
+                        'pass1_lookahead': 0, 'skip_uptodate': False,
+                        'fingerprint_hash': False, 'fuse_outputs': False,
+                        'chunk_jobs': 0, 'cachedir': self.tmpdir.name,
+                        'ostype': platform.system(),
+                        'logdir': self.tmpdir.name,
+                        'confdir': self.tmpdir.name,
+                        }
+        self.queuefile = os.path.join(self.tmpdir.name, 'queue.json')
+        items = []
+        for num in range(6):
+            item = queue_item(os.path.join(self.tmpdir.name, f'{num}.mkv'))
+            item.update({'source': 'in.mkv', 'args': ['', '', ''],
+                         'duration': 1000})
+            items.append(item)
+        with open(self.queuefile, 'w', encoding='utf-8') as fln:
+            json.dump(items, fln)
+
+    def tearDown(self):
+        LogSink.close_all()
+        self.tmpdir.cleanup()
+
+    def test_interrupt(self):
+        timer = threading.Timer(0.3, signal.raise_signal, (signal.SIGINT,))
+        timer.start()
+        stream = io.StringIO()
+        status = run_queue(self.queuefile, self.appdata, stream=stream)
+        timer.join()
+        self.assertEqual(status, 130)
+        self.assertIn('Interrupted by the user', stream.getvalue())
+        with open(self.calls, encoding='utf-8') as fln:
+            self.assertEqual(len(fln.read()), 2)  # queued items not run
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
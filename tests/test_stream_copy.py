@@ -0,0 +1,77 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the stream_copy.py functions.
+# Rev: Oct.18.2024
+
+import sys
+import os
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_utils.stream_copy import (stream_copy_params,
+                                                  parse_options,
+                                                  to_bits,
+                                                  )
+except ImportError as error:
+    sys.exit(error)
+
+PROBE = {'streams': [{'codec_type': 'video', 'codec_name': 'h264',
+                      'pix_fmt': 'yuv420p', 'profile': 'High',
+                      'level': 41, 'bit_rate': '1900000'},
+                     {'codec_type': 'audio', 'codec_name': 'aac',
+                      'sample_rate': '48000', 'channels': 2,
+                      'bit_rate': '128000'},
+                     {'codec_type': 'audio', 'codec_name': 'ac3',
+                      'sample_rate': '48000', 'channels': 6,
+                      'bit_rate': '448000'},
+                     ],
+         'format': {'bit_rate': '2500000'},
+         }
+VIDEO = ('-map 0:v? -c:v libx264 -b:v 2000k -g 12 -preset medium '
+         '-profile:v high -level 4.1 -pix_fmt yuv420p -movflags faststart')
+
+
+class TestStreamCopy(unittest.TestCase):
+    """Test case for the stream copy preflight analyzer"""
+
+    def test_parse(self):
+        self.assertEqual(parse_options('-map 0:v? -sn -c:a: aac'),
+                         [('-map', '0:v?'), ('-sn', ''), ('-c:a:', 'aac')])
+        self.assertEqual(to_bits('2500k'), 2500000)
+        self.assertEqual(to_bits('2M'), 2000000)
+        self.assertEqual(to_bits(''), 0)
+
+    def test_video(self):
+        vpar, apar = stream_copy_params(VIDEO, '', PROBE)
+        self.assertEqual(vpar, '-map 0:v? -movflags faststart -c:v copy')
+        self.assertEqual(apar, '')
+        for other in (VIDEO.replace('2000k', '1500k'),  # too high bitrate
+                      VIDEO.replace('-b:v 2000k', '-crf 23'),  # no envelope
+                      VIDEO.replace('yuv420p', 'yuv420p10le'),
+                      VIDEO.replace('libx264', 'libx265'),
+                      VIDEO + ' -r 25',
+                      ):
+            self.assertEqual(stream_copy_params(other, '', PROBE)[0], other)
+
+    def test_audio(self):
+        params = '-map 0:a:? -c:a: aac -b:a 128k -ar 48000 -ac 2'
+        self.assertEqual(stream_copy_params('', params, PROBE)[1], params)
+        params = '-map 0:a:0? -c:a: aac -b:a 128k -ar 48000 -ac 2'
+        self.assertEqual(stream_copy_params('', params, PROBE)[1],
+                         '-map 0:a:0? -c:a: copy')
+        params = '-map 0:a:? -c:a:1 ac3 -b:a 448k'
+        self.assertEqual(stream_copy_params('', params, PROBE)[1],
+                         '-map 0:a:? -c:a:1 copy')
+        params = '-map 0:a:0? -c:a: aac'  # no bitrate envelope
+        self.assertEqual(stream_copy_params('', params, PROBE)[1], params)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,7 @@
 
 import sys
 import os.path
+import tempfile
 import unittest
 
 PATH = os.path.realpath(os.path.abspath(__file__))
@@ -15,6 +16,8 @@ try:
                                             to_bytes,
                                             time_to_integer,
                                             integer_to_time,
+                                            write_concat_list,
+                                            image_codecs,
                                             )
 except ImportError as error:
     sys.exit(error)
@@ -99,6 +102,27 @@ class TestTimeHuman(unittest.TestCase):
                                          mills=False), '02:30:50')
 
 
+class TestConcatList(unittest.TestCase):
+    """Test case for the write_concat_list function."""
+
+    def test_still_images(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            listfile = os.path.join(tmp, 'list.txt')
+            write_concat_list(["a.png", "it's.jpg"], listfile, duration=3)
+            with open(listfile, encoding='utf-8') as fln:
+                lines = fln.read().split('\n')
+        self.assertEqual(lines, ["file 'a.png'", "duration 3",
+                                 "file 'it'\\''s.jpg'", "duration 3",
+                                 "file 'it'\\''s.jpg'"])
+
+    def test_image_codecs(self):
+        self.assertEqual(image_codecs(["a.jpg", "b.JPEG", "c.jpe"]),
+                         {'mjpeg'})
+        self.assertEqual(image_codecs(["a.png", "b.jpg", "c.webp"]),
+                         {'png', 'mjpeg', 'webp'})  # mixed formats
+        self.assertEqual(image_codecs(["a.png", "b.xyz"]), {'png', '.xyz'})
+
+
 def main():
     unittest.main()
 
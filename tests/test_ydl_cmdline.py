@@ -0,0 +1,72 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the ydl_cmdline.py functions.
+# Rev: Oct.18.2024
+
+import sys
+import os
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_ytdlp.ydl_cmdline import from_api_to_cli
+except ImportError as error:
+    sys.exit(error)
+
+
+def options(**kwargs):
+    """Returns the API options of a simple download"""
+    data = {'format': 'best', 'compat_opts': 'no-youtube-unavailable-videos',
+            'extractaudio': False, 'postprocessors': [],
+            'addmetadata': False, 'external_downloader': None,
+            'external_downloader_args': None, 'noplaylist': True,
+            'playlist_items': None, 'writesubtitles': False,
+            'subtitleslangs': [''], 'writeautomaticsub': False,
+            'skip_download': False, 'restrictfilenames': False,
+            'writethumbnail': False, 'overwrites': False,
+            'nocheckcertificate': False, 'proxy': '',
+            'geo_verification_proxy': '', 'geo_bypass': '',
+            'geo_bypass_country': '', 'geo_bypass_ip_block': '',
+            'username': '', 'password': '', 'videopassword': '',
+            'ffmpeg_location': 'ffmpeg', 'outtmpl': '%(title)s.%(ext)s',
+            }
+    data.update(kwargs)
+    return data
+
+
+class TestFromApiToCli(unittest.TestCase):
+    """Test case for the yt-dlp executable options"""
+
+    def test_single_url(self):
+        opt = from_api_to_cli(options(), 'yt-dlp')
+        self.assertIn('--no-playlist ', opt)
+        self.assertNotIn('--yes-playlist', opt)
+        self.assertNotIn('--download-archive', opt)
+
+    def test_playlist(self):
+        opt = from_api_to_cli(options(noplaylist=False,
+                                      playlist_items='1-3',
+                                      lazy_playlist=True), 'yt-dlp')
+        self.assertIn('--yes-playlist --playlist-items "1-3" '
+                      '--lazy-playlist ', opt)
+        self.assertNotIn('--no-playlist', opt)
+
+    def test_download_archive(self):
+        opt = from_api_to_cli(options(download_archive='arch.txt'),
+                              'yt-dlp')
+        self.assertIn('--no-playlist --download-archive "arch.txt" ', opt)
+        opt = from_api_to_cli(options(noplaylist=False,
+                                      download_archive='arch.txt'),
+                              'yt-dlp')
+        self.assertIn('--yes-playlist --download-archive "arch.txt" ', opt)
+        self.assertNotIn('--no-playlist', opt)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
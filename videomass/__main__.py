@@ -0,0 +1,48 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: __main__.py
+Porpose: entry point of videomass (also `python3 -m videomass`)
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2024
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import argparse
+
+
+def main():
+    """
+    Process a queue file without the GUI if the `--run-queue`
+    option is given, before `gui_app` (i.e. wxPython) is
+    imported, so that it also works where wxPython is not
+    installed. Otherwise starts the GUI (see `gui_app.main`).
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--run-queue')
+    if parser.parse_known_args()[0].run_queue:
+        from videomass.vdms_sys.argparser import arguments
+        arguments()  # process the queue and exit
+
+    from videomass import gui_app
+    gui_app.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -38,6 +38,12 @@ from videomass.vdms_sys.configurator import DataSource
 from videomass.vdms_sys import app_const as appC
 from videomass.vdms_utils.utils import del_filecontents
 from videomass.vdms_sys.external_package import importer_init_file
+from videomass.vdms_io.probe_cache import ProbeCache
+from videomass.vdms_io.loudness_cache import LoudnessCache
+from videomass.vdms_io.frame_cache import FrameCache
+from videomass.vdms_io.packet_index import PacketIndexCache
+from videomass.vdms_io.metadata_cache import MetadataCache
+from videomass.vdms_io.make_filelog import LogSink
 
 # add translation macro to builtin similar to what gettext does
 builtins.__dict__['_'] = wx.GetTranslation
@@ -74,6 +80,11 @@ class Videomass(wx.App):
         self.data = DataSource(kwargs)  # instance data
         self.appset.update(self.data.get_fileconf())  # data system
         self.iconset = None
+        self.probecache = None  # see `ProbeCache`
+        self.packetindex = None  # see `PacketIndexCache`
+        self.metadatacache = None  # see `MetadataCache`
+        self.loudnesscache = LoudnessCache()  # see `LoudnessCache`
+        self.framecache = FrameCache()  # see `FrameCache`
 
         wx.App.__init__(self, redirect, filename)  # constructor
         wx.SystemOptions.SetOption("osx.openfiledialog.always-show-types", "1")
@@ -93,6 +104,14 @@ class Videomass(wx.App):
             self.appset['IS_DARK_THEME'] = appear.IsDark()
 
         self.iconset = self.data.icons_set(self.appset['icontheme'])
+        self.probecache = ProbeCache(os.path.join(self.appset['confdir'],
+                                                  'probe_cache.json'),
+                                     self.appset['probe_cache_size'])
+        self.packetindex = PacketIndexCache(
+            os.path.join(self.appset['cachedir'], 'packet_index'))
+        self.metadatacache = MetadataCache(
+            os.path.join(self.appset['cachedir'], 'ytdlp_metadata'),
+            ttl=self.appset['ytdlp_metadata_ttl'])
 
         # locale
         wx.Locale.AddCatalogLookupPathPrefix(self.appset['localepath'])
@@ -207,6 +226,15 @@ class Videomass(wx.App):
         The ideal place to run the last few things before completely
         exiting the application, eg. delete temporary files etc.
         """
+        if self.probecache:
+            self.probecache.save()
+        self.framecache.shutdown()
+        if self.packetindex:
+            self.packetindex.shutdown()
+        if self.metadatacache:
+            self.metadatacache.shutdown()
+        LogSink.close_all()  # write pending log messages
+
         if self.appset['clearcache']:
             tmp = os.path.join(self.appset['cachedir'], 'tmp')
             if os.path.exists(tmp):
@@ -25,27 +25,23 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 import os
+from collections import OrderedDict
 import wx
 import wx.lib.statbmp
 import wx.lib.colourselect as csel
 from pubsub import pub
-from videomass.vdms_threads.generic_task import FFmpegGenericTask
 from videomass.vdms_utils.utils import time_to_integer
 from videomass.vdms_utils.utils import integer_to_time
 from videomass.vdms_utils.utils import clockset
-from videomass.vdms_io.make_filelog import make_log_template
 
 
-def make_bitmap(width, height, fname):
+def make_bitmap(width, height, data):
     """
-    Resize the image to the given size and convert it to a
-    bitmap object.
+    Convert the given raw RGB24 frame data (see `grab_frame`
+    on `frame_cache.py`) of the given size to a bitmap object.
     Returns a wx.Bitmap object
     """
-    img = wx.Image(fname)
-    img = img.Scale(int(width), int(height), wx.IMAGE_QUALITY_NORMAL)
-    bmp = img.ConvertToBitmap()
-    return bmp
+    return wx.Bitmap.FromBuffer(int(width), int(height), data)
 
 
 class Actor(wx.lib.statbmp.GenStaticBitmap):
@@ -176,10 +172,9 @@ class Crop(wx.Dialog):
     """
     get = wx.GetApp()
     OS = get.appset['ostype']
-    LOGDIR = get.appset['logdir']
     TMPROOT = os.path.join(get.appset['cachedir'], 'tmp', 'Crop')
-    TMPSRC = os.path.join(TMPROOT, 'tmpsrc')
-    os.makedirs(TMPSRC, mode=0o777, exist_ok=True)
+    os.makedirs(TMPROOT, mode=0o777, exist_ok=True)
+    PREFETCH = 3  # frames to prefetch on each side of the slider position
     BACKGROUND = '#1b0413'
 
     def __init__(self, parent, *args, **kwa):
@@ -195,6 +190,9 @@ class Crop(wx.Dialog):
             toscale         scale factor
             self.h_scaled   height ratio
             self.w_scaled   width ratio
+            self.step       slider step (ms) of the cached frames
+            self.seek       time position (ms) of the wanted frame
+            self.index      key frame index of the file, see `PacketIndex`
         """
         # pen/brush color, default RED color
         self.pencolor = (255, 0, 0, 255)
@@ -212,11 +210,13 @@ class Crop(wx.Dialog):
         self.w_scaled = round((self.width / self.height) * self.h_scaled)
         self.filename = kwa['filename']  # selected filename on file list
         name = os.path.splitext(os.path.basename(self.filename))[0]
-        self.frame = os.path.join(f'{Crop.TMPSRC}', f'{name}.png')  # image
         self.fileclock = os.path.join(Crop.TMPROOT, f'{name}.clock')
         tcheck = clockset(kwa['duration'], self.fileclock)
         self.clock = tcheck['duration']
         self.mills = tcheck['millis']
+        self.step = max(1000, int(round(self.mills / 250, -3)))
+        self.seek = time_to_integer(self.clock) if self.mills else 0
+        self.index = None
         wx.Dialog.__init__(self, parent, -1, style=wx.DEFAULT_DIALOG_STYLE)
         sizerBase = wx.BoxSizer(wx.VERTICAL)
         self.panelrect = wx.Panel(self, wx.ID_ANY,
@@ -312,10 +312,18 @@ class Crop(wx.Dialog):
         gridexit.Add(btn_ok, 0, wx.LEFT, 5)
         gridBtn.Add(gridexit, 0, wx.ALL | wx.ALIGN_RIGHT | wx.RIGHT, border=5)
         sizerBase.Add(gridBtn, 0, wx.EXPAND)
+        if Crop.get.packetindex:  # build the key frame index in background
+            Crop.get.packetindex.request(
+                self.filename, Crop.get.appset['ffprobe_cmd'],
+                Crop.get.appset['encoding'],
+                lambda *args: wx.CallAfter(self.on_index, *args))
         # instance to Actor widget
-        if os.path.exists(self.frame):
-            bmp = make_bitmap(self.w_scaled, self.h_scaled, self.frame)
+        data = Crop.get.framecache.lookup(self.filename, self.seek,
+                                          (self.w_scaled, self.h_scaled))
+        if data is not None:
+            bmp = make_bitmap(self.w_scaled, self.h_scaled, data)
             self.bob = Actor(self.panelrect, bmp, 1, "")
+            self.prefetch()
         else:  # make a temporary empty bitmap
             bmp = wx.Bitmap(self.w_scaled, self.h_scaled)
             self.bob = Actor(self.panelrect, bmp, 1, "")
@@ -382,46 +390,102 @@ class Crop(wx.Dialog):
 
     def on_Seek(self, event):
         """
-        Slider event on seek time position.
+        Slider event on seek time position. The position
+        is rounded to the slider step, if the frame is
+        already cached it is displayed immediately.
         """
-        seek = self.sld_time.GetValue()
-        clock = integer_to_time(seek, False)  # to 24-hour
+        seek = round(self.sld_time.GetValue() / self.step) * self.step
+        self.seek = self.snapped(min(seek, self.mills))
+        clock = integer_to_time(self.seek, False)  # to 24-hour
         self.txttime.SetLabel(clock)  # update StaticText
-        if not self.btn_load.IsEnabled():
+        data = Crop.get.framecache.lookup(self.filename, self.seek,
+                                          (self.w_scaled, self.h_scaled))
+        if data is not None:
+            self.on_frame(self.seek, data, None)
+        elif not self.btn_load.IsEnabled():
             self.btn_load.Enable()
     # ------------------------------------------------------------------#
 
+    def on_index(self, index, error):
+        """
+        Set the key frame index of the file when available,
+        see `PacketIndexCache.request`
+        """
+        if self and index is not None:
+            self.index = index
+    # ------------------------------------------------------------------#
+
+    def snapped(self, msec):
+        """
+        Returns the time position (ms) of the last key frame at or
+        before the given position if the key frame index is
+        available, since FFmpeg can seek a key frame instantly,
+        the given position otherwise.
+        """
+        if not self.index or not self.index.keys:
+            return msec
+        return int(round(self.index.keyframe_before(msec / 1000) * 1000))
+    # ------------------------------------------------------------------#
+
+    def positions(self):
+        """
+        Returns the list of the time positions (ms) of the
+        current frame and of the frames around it.
+        """
+        around = []
+        for idx in range(1, Crop.PREFETCH + 1 if self.mills else 1):
+            around += [self.seek + idx * self.step,
+                       self.seek - idx * self.step]
+        around = [self.snapped(x) for x in around if 0 <= x <= self.mills]
+        return list(OrderedDict.fromkeys([self.seek] + around))
+    # ------------------------------------------------------------------#
+
+    def prefetch(self):
+        """
+        Grab in background the frames around the
+        current slider position.
+        """
+        Crop.get.framecache.request(Crop.get.appset['ffmpeg_cmd'],
+                                    self.filename, self.positions(),
+                                    (self.w_scaled, self.h_scaled))
+    # ------------------------------------------------------------------#
+
     def make_frame_from_file(self, event):
         """
         This method is responsible for making available a
-        new frame from a given time position of a video file,
-        converting it into a bitmap object and displaying it
-        by the `bob` actor. Note, milliseconds must not be
-        greater than the max time nor less than the min time
-        (see the `seek` callback above)
+        new frame from a given time position of a video file.
+        The frame is grabbed in background by FFmpeg (see
+        `FrameCache` on `frame_cache.py`) along with the frames
+        around it, then it is displayed by the `on_frame`
+        callback. Note, milliseconds must not be greater than
+        the max time nor less than the min time (see the `seek`
+        callback above)
         """
-        logfile = make_log_template('generic_task.log', Crop.LOGDIR, mode="w")
-        if not self.mills:
-            sseg = ''
-        else:
-            seek = self.sld_time.GetValue()
-            self.clock = integer_to_time(seek, False)  # to 24-HH
-            sseg = f'-ss {self.clock}'
+        self.btn_load.Disable()
+        Crop.get.framecache.request(
+            Crop.get.appset['ffmpeg_cmd'], self.filename, self.positions(),
+            (self.w_scaled, self.h_scaled),
+            lambda *args: wx.CallAfter(self.on_frame, *args))
+    # ------------------------------------------------------------------#
 
-        arg = (f'{sseg} -i "{self.filename}" -f image2 '
-               f'-update 1 -frames:v 1 "{self.frame}"')
-        thread = FFmpegGenericTask(arg, 'Crop', logfile)
-        thread.join()  # wait end thread
-        error = thread.status
+    def on_frame(self, seek, data, error):
+        """
+        Display the frame of the given time position
+        (ms) if it is still the wanted one.
+        """
+        if not self or seek != self.seek:
+            return  # dialog destroyed or another frame wanted
         if error:
+            self.btn_load.Enable()
             wx.MessageBox(f'{error}', _('Videomass - Error!'), wx.ICON_ERROR)
             return
-        if sseg:
+        if self.mills:
+            self.clock = integer_to_time(seek, False)  # to 24-HH
             with open(self.fileclock, "w", encoding='utf-8') as atime:
                 atime.write(self.clock)
         self.btn_load.Disable()
-        bmp = make_bitmap(self.w_scaled, self.h_scaled, self.frame)
-        self.bob.setbitmap(bmp)
+        self.bob.setbitmap(make_bitmap(self.w_scaled, self.h_scaled, data))
+        self.prefetch()
     # ------------------------------------------------------------------#
 
     def to_real_scale_coords(self, msg):
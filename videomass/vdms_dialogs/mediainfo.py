@@ -35,8 +35,9 @@ class MediaStreams(wx.Dialog):
 
     def __init__(self, data, OS):
         """
-        list(data):
-            contains ffprobe data from `MainFrame.self.data_files`.
+        data:
+            `ProbeDataList` from `MainFrame.self.data_files`, the
+            ffprobe data of each file is only loaded when selected.
         """
         self.data = data
         get = wx.GetApp()  # get data from bootstrap
@@ -161,8 +162,7 @@ class MediaStreams(wx.Dialog):
         self.Layout()
         self.CentreOnScreen()
 
-        flist = [x['format']['filename'] for x in self.data
-                 if x['format']['filename']]
+        flist = self.data.filenames()  # does not load ffprobe data
         index = 0
         for files in flist:
             self.file_select.InsertItem(index, files)
@@ -316,18 +316,13 @@ class MediaStreams(wx.Dialog):
         self.audio_ctrl.DeleteAllItems()
         self.subt_ctrl.DeleteAllItems()
 
-        index = self.file_select.GetFocusedItem()
-        item = self.file_select.GetItemText(index)
+        select = self.data[self.file_select.GetFocusedItem()]
 
         index = 0
-
-        for x in self.data:
-            if x.get('format').get('filename') == item:
-                select = self.data[self.data.index(x)]
-                for k, v in x.get('format').items():
-                    self.format_ctrl.InsertItem(index, str(k))
-                    self.format_ctrl.SetItem(index, 1, str(v))
-                    index += 1
+        for k, v in select.get('format').items():
+            self.format_ctrl.InsertItem(index, str(k))
+            self.format_ctrl.SetItem(index, 1, str(v))
+            index += 1
 
         if select.get('streams'):
             index = 0
@@ -449,6 +449,151 @@ class SetUp(wx.Dialog):
         tabSev.SetSizer(sizerLog)
         notebook.AddPage(tabSev, _("FFmpeg logging levels"))
 
+        # -----tab 8
+        tabEight = wx.Panel(notebook, wx.ID_ANY)
+        sizerPerf = wx.BoxSizer(wx.VERTICAL)
+        sizerPerf.Add((0, 10))
+        msg = _("Parallel processing")
+        labperf = wx.StaticText(tabEight, wx.ID_ANY, msg)
+        sizerPerf.Add(labperf, 0, wx.ALL | wx.EXPAND, 5)
+        msg = (_("Batch and queue items can be processed by several FFmpeg "
+                 "processes at the same time.\nLight tasks such as audio "
+                 "conversions or stream copying may benefit greatly from "
+                 "this,\nwhile heavy video encoders are usually already "
+                 "able to use all available cores."))
+        labperfdescr = wx.StaticText(tabEight, wx.ID_ANY, msg)
+        sizerPerf.Add(labperfdescr, 0, wx.ALL | wx.EXPAND, 5)
+        sizerPerf.Add((0, 20))
+        sizerjobs = wx.BoxSizer(wx.HORIZONTAL)
+        labjobs = wx.StaticText(tabEight, wx.ID_ANY,
+                                _('Maximum number of simultaneous '
+                                  'FFmpeg jobs:'))
+        sizerjobs.Add(labjobs, 0, wx.LEFT | wx.ALIGN_CENTER_VERTICAL, 5)
+        self.spin_jobs = wx.SpinCtrl(tabEight, wx.ID_ANY,
+                                     value=str(self.settings['ffmpeg_jobs']),
+                                     min=1, max=max(os.cpu_count() or 1, 1),
+                                     style=wx.SP_ARROW_KEYS,
+                                     )
+        sizerjobs.Add(self.spin_jobs, 0, wx.ALL, 5)
+        sizerPerf.Add(sizerjobs, 0, wx.LEFT, 5)
+        sizervoljobs = wx.BoxSizer(wx.HORIZONTAL)
+        labvoljobs = wx.StaticText(tabEight, wx.ID_ANY,
+                                   _('Maximum number of simultaneous '
+                                     'audio volume analysis jobs:'))
+        sizervoljobs.Add(labvoljobs, 0, wx.LEFT | wx.ALIGN_CENTER_VERTICAL, 5)
+        self.spin_voljobs = wx.SpinCtrl(tabEight, wx.ID_ANY,
+                                        value=str(self.settings[
+                                            'volumedetect_jobs']),
+                                        min=1,
+                                        max=max(os.cpu_count() or 1, 1),
+                                        style=wx.SP_ARROW_KEYS,
+                                        )
+        sizervoljobs.Add(self.spin_voljobs, 0, wx.ALL, 5)
+        sizerPerf.Add(sizervoljobs, 0, wx.LEFT, 5)
+        sizerchunks = wx.BoxSizer(wx.HORIZONTAL)
+        labchunks = wx.StaticText(tabEight, wx.ID_ANY,
+                                  _('Maximum number of simultaneous jobs '
+                                    'encoding segments of a long video\n'
+                                    '(lower than 2 disables the segmented '
+                                    'encoding):'))
+        sizerchunks.Add(labchunks, 0, wx.LEFT | wx.ALIGN_CENTER_VERTICAL, 5)
+        self.spin_chunkjobs = wx.SpinCtrl(tabEight, wx.ID_ANY,
+                                          value=str(self.settings[
+                                              'chunk_jobs']),
+                                          min=0,
+                                          max=max(os.cpu_count() or 1, 1),
+                                          style=wx.SP_ARROW_KEYS,
+                                          )
+        sizerchunks.Add(self.spin_chunkjobs, 0, wx.ALL, 5)
+        sizerPerf.Add(sizerchunks, 0, wx.LEFT, 5)
+        sizerahead = wx.BoxSizer(wx.HORIZONTAL)
+        labahead = wx.StaticText(tabEight, wx.ID_ANY,
+                                 _('Number of two-pass items whose first '
+                                   'pass runs in advance (0 disables it):'))
+        sizerahead.Add(labahead, 0, wx.LEFT | wx.ALIGN_CENTER_VERTICAL, 5)
+        self.spin_lookahead = wx.SpinCtrl(tabEight, wx.ID_ANY,
+                                          value=str(self.settings[
+                                              'pass1_lookahead']),
+                                          min=0, max=8,
+                                          style=wx.SP_ARROW_KEYS,
+                                          )
+        sizerahead.Add(self.spin_lookahead, 0, wx.ALL, 5)
+        sizerPerf.Add(sizerahead, 0, wx.LEFT, 5)
+        msg = _("Render the outputs of the same source file with a "
+                "single decoding")
+        self.ckbx_fuse = wx.CheckBox(tabEight, wx.ID_ANY, (msg))
+        sizerPerf.Add(self.ckbx_fuse, 0, wx.ALL, 5)
+        msg = _("Copy the streams which already match the selected "
+                "encoding (A/V Conversions)")
+        self.ckbx_streamcopy = wx.CheckBox(tabEight, wx.ID_ANY, (msg))
+        sizerPerf.Add(self.ckbx_streamcopy, 0, wx.ALL, 5)
+        sizerPerf.Add((0, 20))
+        msg = _("Incremental processing")
+        labupdate = wx.StaticText(tabEight, wx.ID_ANY, msg)
+        sizerPerf.Add(labupdate, 0, wx.ALL | wx.EXPAND, 5)
+        msg = (_("Conversions whose output file was written from the same "
+                 "source file,\nwith the same arguments and FFmpeg version "
+                 "are skipped."))
+        labupdatedescr = wx.StaticText(tabEight, wx.ID_ANY, msg)
+        sizerPerf.Add(labupdatedescr, 0, wx.ALL | wx.EXPAND, 5)
+        msg = _("Skip conversions whose output files are up to date")
+        self.ckbx_uptodate = wx.CheckBox(tabEight, wx.ID_ANY, (msg))
+        sizerPerf.Add(self.ckbx_uptodate, 0, wx.ALL, 5)
+        msg = _("Also compare part of the contents of the source "
+                "files (slower)")
+        self.ckbx_fphash = wx.CheckBox(tabEight, wx.ID_ANY, (msg))
+        sizerPerf.Add(self.ckbx_fphash, 0, wx.ALL, 5)
+        sizerPerf.Add((0, 20))
+        msg = _("Media information cache")
+        labcache = wx.StaticText(tabEight, wx.ID_ANY, msg)
+        sizerPerf.Add(labcache, 0, wx.ALL | wx.EXPAND, 5)
+        msg = (_("Media information of imported files is stored in a "
+                 "persistent cache,\nso files that have not changed since "
+                 "their last import are loaded instantly."))
+        labcachedescr = wx.StaticText(tabEight, wx.ID_ANY, msg)
+        sizerPerf.Add(labcachedescr, 0, wx.ALL | wx.EXPAND, 5)
+        sizerprobe = wx.BoxSizer(wx.HORIZONTAL)
+        labprobe = wx.StaticText(tabEight, wx.ID_ANY,
+                                 _('Maximum number of cached files '
+                                   '(0 disables the cache):'))
+        sizerprobe.Add(labprobe, 0, wx.LEFT | wx.ALIGN_CENTER_VERTICAL, 5)
+        self.spin_probecache = wx.SpinCtrl(tabEight, wx.ID_ANY,
+                                           value=str(self.settings[
+                                               'probe_cache_size']),
+                                           min=0, max=1000000,
+                                           style=wx.SP_ARROW_KEYS,
+                                           )
+        sizerprobe.Add(self.spin_probecache, 0, wx.ALL, 5)
+        sizerPerf.Add(sizerprobe, 0, wx.LEFT, 5)
+        sizerPerf.Add((0, 20))
+        msg = _("Progress updates")
+        labprogress = wx.StaticText(tabEight, wx.ID_ANY, msg)
+        sizerPerf.Add(labprogress, 0, wx.ALL | wx.EXPAND, 5)
+        msg = (_("Lower values reduce the load on the user interface "
+                 "during processing,\nwhich may speed up the encoding "
+                 "of many small files."))
+        labprogressdescr = wx.StaticText(tabEight, wx.ID_ANY, msg)
+        sizerPerf.Add(labprogressdescr, 0, wx.ALL | wx.EXPAND, 5)
+        sizerrate = wx.BoxSizer(wx.HORIZONTAL)
+        labrate = wx.StaticText(tabEight, wx.ID_ANY,
+                                _('Maximum number of progress updates '
+                                  'per second:'))
+        sizerrate.Add(labrate, 0, wx.LEFT | wx.ALIGN_CENTER_VERTICAL, 5)
+        self.spin_prograte = wx.SpinCtrl(tabEight, wx.ID_ANY,
+                                         value=str(self.settings[
+                                             'progress_rate']),
+                                         min=1, max=60,
+                                         style=wx.SP_ARROW_KEYS,
+                                         )
+        sizerrate.Add(self.spin_prograte, 0, wx.ALL, 5)
+        sizerPerf.Add(sizerrate, 0, wx.LEFT, 5)
+        msg = _("Use machine-readable progress information "
+                "(more accurate percentage and ETA)")
+        self.ckbx_progpipe = wx.CheckBox(tabEight, wx.ID_ANY, (msg))
+        sizerPerf.Add(self.ckbx_progpipe, 0, wx.ALL, 5)
+        tabEight.SetSizer(sizerPerf)
+        notebook.AddPage(tabEight, _("Performance"))
+
         # ----- confirm buttons section
         grdBtn = wx.GridSizer(1, 2, 0, 0)
         grdhelp = wx.GridSizer(1, 1, 0, 0)
@@ -482,6 +627,14 @@ class SetUp(wx.Dialog):
             labrem.SetFont(wx.Font(13, wx.DEFAULT, wx.NORMAL, wx.BOLD))
             labenctitle.SetFont(wx.Font(13, wx.SWISS, wx.NORMAL, wx.BOLD))
             labencgen.SetFont(wx.Font(11, wx.SWISS, wx.NORMAL, wx.NORMAL))
+            labperf.SetFont(wx.Font(13, wx.DEFAULT, wx.NORMAL, wx.BOLD))
+            labperfdescr.SetFont(wx.Font(11, wx.SWISS, wx.NORMAL, wx.NORMAL))
+            labcache.SetFont(wx.Font(13, wx.DEFAULT, wx.NORMAL, wx.BOLD))
+            labprogress.SetFont(wx.Font(13, wx.DEFAULT, wx.NORMAL, wx.BOLD))
+            labprogressdescr.SetFont(wx.Font(11, wx.SWISS, wx.NORMAL,
+                                             wx.NORMAL))
+            labcachedescr.SetFont(wx.Font(11, wx.SWISS, wx.NORMAL,
+                                          wx.NORMAL))
         else:
             lablang.SetFont(wx.Font(10, wx.DEFAULT, wx.NORMAL, wx.BOLD))
             labdirtitle.SetFont(wx.Font(10, wx.DEFAULT, wx.NORMAL, wx.BOLD))
@@ -500,6 +653,13 @@ class SetUp(wx.Dialog):
             labrem.SetFont(wx.Font(10, wx.DEFAULT, wx.NORMAL, wx.BOLD))
             labenctitle.SetFont(wx.Font(10, wx.SWISS, wx.NORMAL, wx.BOLD))
             labencgen.SetFont(wx.Font(8, wx.SWISS, wx.NORMAL, wx.NORMAL))
+            labperf.SetFont(wx.Font(10, wx.DEFAULT, wx.NORMAL, wx.BOLD))
+            labperfdescr.SetFont(wx.Font(8, wx.SWISS, wx.NORMAL, wx.NORMAL))
+            labcache.SetFont(wx.Font(10, wx.DEFAULT, wx.NORMAL, wx.BOLD))
+            labcachedescr.SetFont(wx.Font(8, wx.SWISS, wx.NORMAL, wx.NORMAL))
+            labprogress.SetFont(wx.Font(10, wx.DEFAULT, wx.NORMAL, wx.BOLD))
+            labprogressdescr.SetFont(wx.Font(8, wx.SWISS, wx.NORMAL,
+                                             wx.NORMAL))
 
         tip = (_("By assigning an additional suffix you could avoid "
                  "overwriting files"))
@@ -547,6 +707,19 @@ class SetUp(wx.Dialog):
         self.Bind(wx.EVT_CHECKBOX, self.clear_Cache, self.ckbx_cacheclr)
         self.Bind(wx.EVT_CHECKBOX, self.clear_logs, self.ckbx_logclr)
         self.Bind(wx.EVT_TEXT, self.on_char_encoding, self.txtctrl_charenc)
+        self.Bind(wx.EVT_SPINCTRL, self.on_ffmpeg_jobs, self.spin_jobs)
+        self.Bind(wx.EVT_SPINCTRL, self.on_volumedetect_jobs,
+                  self.spin_voljobs)
+        self.Bind(wx.EVT_SPINCTRL, self.on_chunk_jobs, self.spin_chunkjobs)
+        self.Bind(wx.EVT_SPINCTRL, self.on_pass1_lookahead,
+                  self.spin_lookahead)
+        self.Bind(wx.EVT_CHECKBOX, self.on_fuse_outputs, self.ckbx_fuse)
+        self.Bind(wx.EVT_CHECKBOX, self.on_stream_copy, self.ckbx_streamcopy)
+        self.Bind(wx.EVT_CHECKBOX, self.on_skip_uptodate, self.ckbx_uptodate)
+        self.Bind(wx.EVT_CHECKBOX, self.on_fingerprint_hash, self.ckbx_fphash)
+        self.Bind(wx.EVT_SPINCTRL, self.on_probe_cache, self.spin_probecache)
+        self.Bind(wx.EVT_SPINCTRL, self.on_progress_rate, self.spin_prograte)
+        self.Bind(wx.EVT_CHECKBOX, self.on_progress_pipe, self.ckbx_progpipe)
         self.Bind(wx.EVT_BUTTON, self.on_help, btn_help)
         self.Bind(wx.EVT_BUTTON, self.on_cancel, btn_cancel)
         self.Bind(wx.EVT_BUTTON, self.on_ok, btn_ok)
@@ -569,6 +742,12 @@ class SetUp(wx.Dialog):
         self.ckbx_exitconfirm.SetValue(self.appdata['warnexiting'])
         self.ckbx_logclr.SetValue(self.appdata['clearlogfiles'])
         self.ckbx_trash.SetValue(self.settings['move_file_to_trash'])
+        self.ckbx_progpipe.SetValue(self.settings['ffmpeg_progress_pipe'])
+        self.ckbx_fuse.SetValue(self.settings['fuse_outputs'])
+        self.ckbx_streamcopy.SetValue(self.settings['stream_copy'])
+        self.ckbx_uptodate.SetValue(self.settings['skip_uptodate'])
+        self.ckbx_fphash.SetValue(self.settings['fingerprint_hash'])
+        self.ckbx_fphash.Enable(self.settings['skip_uptodate'])
         self.ckbx_ytdlp.SetValue(self.settings['enable-ytdlp'])
         self.ckbx_ytexe.SetValue(self.settings['ytdlp-useexec'])
         self.txtctrl_ytexec.SetValue(self.appdata['ytdlp-executable-path'])
@@ -1042,6 +1221,95 @@ class SetUp(wx.Dialog):
         self.settings['encoding'] = self.txtctrl_charenc.GetValue().strip()
     # --------------------------------------------------------------------#
 
+    def on_ffmpeg_jobs(self, event):
+        """
+        Set the maximum number of FFmpeg processes
+        running simultaneously
+        """
+        self.settings['ffmpeg_jobs'] = self.spin_jobs.GetValue()
+    # --------------------------------------------------------------------#
+
+    def on_volumedetect_jobs(self, event):
+        """
+        Set the maximum number of FFmpeg processes running
+        simultaneously during the audio volume analysis
+        """
+        self.settings['volumedetect_jobs'] = self.spin_voljobs.GetValue()
+    # --------------------------------------------------------------------#
+
+    def on_chunk_jobs(self, event):
+        """
+        Set the maximum number of FFmpeg processes encoding
+        simultaneously the segments of a single long video
+        """
+        self.settings['chunk_jobs'] = self.spin_chunkjobs.GetValue()
+    # --------------------------------------------------------------------#
+
+    def on_pass1_lookahead(self, event):
+        """
+        Set the maximum number of two-pass items whose
+        first pass runs in advance
+        """
+        self.settings['pass1_lookahead'] = self.spin_lookahead.GetValue()
+    # --------------------------------------------------------------------#
+
+    def on_fuse_outputs(self, event):
+        """
+        Enable/disable rendering the outputs of
+        the same source with a single decoding
+        """
+        self.settings['fuse_outputs'] = self.ckbx_fuse.GetValue()
+    # --------------------------------------------------------------------#
+
+    def on_stream_copy(self, event):
+        """
+        Enable/disable the stream copy of the streams
+        which already match the selected encoding
+        """
+        self.settings['stream_copy'] = self.ckbx_streamcopy.GetValue()
+    # --------------------------------------------------------------------#
+
+    def on_skip_uptodate(self, event):
+        """
+        Enable/disable skipping the conversions
+        whose output files are up to date
+        """
+        self.settings['skip_uptodate'] = self.ckbx_uptodate.GetValue()
+        self.ckbx_fphash.Enable(self.ckbx_uptodate.GetValue())
+    # --------------------------------------------------------------------#
+
+    def on_fingerprint_hash(self, event):
+        """
+        Enable/disable the partial hash of the
+        contents of the source files
+        """
+        self.settings['fingerprint_hash'] = self.ckbx_fphash.GetValue()
+    # --------------------------------------------------------------------#
+
+    def on_probe_cache(self, event):
+        """
+        Set the maximum number of entries of the
+        media information cache
+        """
+        self.settings['probe_cache_size'] = self.spin_probecache.GetValue()
+    # --------------------------------------------------------------------#
+
+    def on_progress_rate(self, event):
+        """
+        Set the maximum number of progress
+        updates per second
+        """
+        self.settings['progress_rate'] = self.spin_prograte.GetValue()
+    # --------------------------------------------------------------------#
+
+    def on_progress_pipe(self, event):
+        """
+        Enable/disable the FFmpeg machine-readable
+        progress information
+        """
+        self.settings['ffmpeg_progress_pipe'] = self.ckbx_progpipe.GetValue()
+    # --------------------------------------------------------------------#
+
     def on_help(self, event):
         """
         Open default web browser via Python Web-browser controller.
@@ -1077,6 +1345,8 @@ class SetUp(wx.Dialog):
             self.settings['toolbarpos'] == self.appdata['toolbarpos'])
         self.confmanager.write_options(**self.settings)
         self.appdata.update(self.settings)
+        if wx.GetApp().probecache:
+            wx.GetApp().probecache.resize(self.settings['probe_cache_size'])
         # do not store this data in the configuration file
         self.appdata["auto_exit"] = self.ckbx_exitapp.GetValue()
         self.appdata["shutdown"] = self.ckbx_turnoff.GetValue()
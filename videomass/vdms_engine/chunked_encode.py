@@ -0,0 +1,332 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: chunked_encode.py
+Porpose: Segmented parallel encoding of a single long source
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2024
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import shutil
+import tempfile
+import subprocess
+import platform
+from concurrent.futures import ThreadPoolExecutor
+from videomass.vdms_utils.utils import Popen, write_concat_list
+from videomass.vdms_io.make_filelog import logwrite
+from videomass.vdms_io.packet_index import PacketIndexCache
+from videomass.vdms_threads.progress_channel import SegmentsChannel
+if not platform.system() == 'Windows':
+    import shlex
+
+MINLEN = 60  # min length of a segment in seconds
+SEGMENTS_PER_JOB = 2  # segments per job, to balance uneven segments
+
+
+def video_codec(args):
+    """
+    Returns the name of the video encoder set by the
+    given FFmpeg arguments string, `None` if not set.
+    """
+    opts = args.split()
+    for opt in ('-c:v', '-vcodec', '-codec:v'):
+        if opt in opts and opts.index(opt) + 1 < len(opts):
+            return opts[opts.index(opt) + 1]
+    return None
+# ----------------------------------------------------------------------#
+
+
+def is_chunkable(kwa, jobs):
+    """
+    Returns True if the given 'One pass' item (`kwa`) can be
+    encoded by segments with `jobs` processes, i.e. a long source
+    without trimming, encoded by a single filtergraph per stream
+    to a video (not image) format.
+    """
+    args = kwa['args'][0].split()
+    codec = video_codec(kwa['args'][0])
+    ext = os.path.splitext(kwa['destination'])[1].lower()
+    return (jobs > 1
+            and kwa['type'] == 'One pass'
+            and not kwa['args'][1]
+            and not kwa['start-time'] and not kwa['end-time']
+            and not kwa.get('pre-input-1')
+            and codec not in (None, 'copy')
+            and '-vn' not in args and '-filter_complex' not in args
+            and ext not in ('.gif', '.apng', '.webp')
+            and kwa['duration'] >= MINLEN * 2000)
+# ----------------------------------------------------------------------#
+
+
+def chunk_bounds(times, duration, segments, minlen=MINLEN):
+    """
+    Split a media of the given `duration` (seconds) in up to
+    `segments` segments of at least `minlen` seconds, starting
+    on the given key frame `times` (seconds, sorted, relative to
+    the start time of the container, see `PacketIndex`).
+    Returns a list of (start, length) tuples where the length
+    of the last segment is `None` (up to the end).
+    """
+    length = max(duration / max(segments, 1), minlen)
+    starts = [0.0]
+    for pts in times:
+        if pts >= starts[-1] + length and duration - pts >= minlen / 2:
+            starts.append(pts)
+
+    bounds = [(x, round(y - x, 6)) for x, y in zip(starts, starts[1:])]
+    bounds.append((starts[-1], None))
+    return bounds
+# ----------------------------------------------------------------------#
+
+
+class ChunkedEncode:
+    """
+    Encodes a single long source by segments at the same time.
+    The video is split on key frames in consecutive segments,
+    each one encoded by its own FFmpeg process on a pool of
+    `chunk_jobs` worker threads, while all other streams (audio,
+    subtitles, chapters and metadata) are encoded only once by a
+    separate process. Finally the segments are joined without
+    re-encoding by the FFmpeg concat demuxer (see `ConcatDemuxer`),
+    muxing the other streams in the destination file.
+
+    The progress of all segments is sent to the main thread
+    as a single timeline (see `SegmentsChannel`).
+
+    Note that filters depending on the absolute time position
+    (e.g. fades) apply to each segment.
+
+    USAGE (from the `FFmpegEngine` worker threads):
+        >>> chunked = ChunkedEncode(engine, count, kwa, defargs)
+        >>> if chunked.plan():
+        >>>     status = chunked.run()
+
+    """
+    def __init__(self, engine, count, kwa, defargs):
+        """
+        engine: the `FFmpegEngine` instance
+        count: progressive number of the item
+        kwa: dict of the item
+        defargs: FFmpeg default args, see `ffmpeg.ffmpeg_cmd_args`
+        """
+        self.engine = engine
+        self.appdata = engine.appdata
+        self.notify = engine.notify
+        self.count = count
+        self.kwa = kwa
+        self.defargs = defargs
+        self.jobs = int(self.appdata['chunk_jobs'])
+        self.bounds = []
+        self.failed = None  # (status, output) of the first failure
+        self.tmpdir = None
+    # ----------------------------------------------------------------#
+
+    def plan(self):
+        """
+        Find the segments of the source. Returns False if the source
+        can not be split (e.g. not enough key frames), True otherwise.
+        """
+        cache = PacketIndexCache(os.path.join(self.appdata['cachedir'],
+                                              'packet_index'))
+        index, error = cache.build(self.kwa['source'],
+                                   self.appdata['ffprobe_cmd'],
+                                   self.appdata['encoding'])
+        if error:
+            return False
+        self.bounds = chunk_bounds(index.keys, self.kwa['duration'] / 1000,
+                                   self.jobs * SEGMENTS_PER_JOB)
+        return len(self.bounds) > 1
+    # ----------------------------------------------------------------#
+
+    def command(self, args, output, inputs=''):
+        """
+        Build a FFmpeg command with the given arguments
+        """
+        cmd = (f'"{self.appdata["ffmpeg_cmd"]}" {self.defargs} '
+               f'{inputs} {args} "{output}"')
+        logwrite(f'\n[COMMAND]:\n{cmd}', '', self.engine.logfile)
+
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+        return cmd
+    # ----------------------------------------------------------------#
+
+    def execute(self, cmd, channel=None, index=0):
+        """
+        Run a FFmpeg process, this method runs on the worker
+        threads of the pool. If `channel` is given, the output
+        is sent to the main thread. Returns True if successful.
+        """
+        if self.engine.stop_work_thread or self.failed:
+            return False
+        output = []
+        try:
+            with Popen(cmd,
+                       stderr=subprocess.PIPE,
+                       stdin=subprocess.PIPE,
+                       bufsize=1,
+                       universal_newlines=True,
+                       encoding=self.appdata['encoding'],
+                       ) as proc:
+                for line in proc.stderr:
+                    if channel:
+                        channel.send(line, index)
+                    else:
+                        output.append(line)
+                    if self.engine.stop_work_thread or self.failed:
+                        proc.stdin.write('q')  # stop ffmpeg
+                        proc.communicate()
+                        return False
+
+                if proc.wait():  # ..Failed
+                    if not self.failed:
+                        self.failed = ('FAILED',
+                                       f"[VIDEOMASS]: Error Exit Status: "
+                                       f"{proc.wait()} {''.join(output)}")
+                    return False
+
+        except (OSError, FileNotFoundError) as err:
+            self.failed = 'ERROR', err
+            return False
+
+        return True
+    # ----------------------------------------------------------------#
+
+    def encode_segment(self, index, channel):
+        """
+        Encode the video of the given segment `index`
+        """
+        start, length = self.bounds[index]
+        inputs = f'-ss {start:.6f} -i "{self.kwa["source"]}"'
+        trim = f'-t {length:.6f}' if length is not None else ''
+        output = os.path.join(self.tmpdir,
+                              f'segment_{index:04d}{self.extension()}')
+        cmd = self.command(f'{trim} {self.kwa["args"][0]} -an -sn -dn '
+                           f'-map_chapters -1', output, inputs)
+        if not self.execute(cmd, channel, index):
+            return None
+        if length is None:
+            length = self.kwa['duration'] / 1000 - start
+        channel.done(index, int(length * 1000))
+        return output
+    # ----------------------------------------------------------------#
+
+    def encode_streams(self):
+        """
+        Encode all streams except the video only once.
+        Returns the pathname of the encoded file, an empty string
+        if there are no other streams, `None` if the encoding
+        fails or is stopped.
+        """
+        if '-an' in self.kwa['args'][0].split():
+            return ''
+        output = os.path.join(self.tmpdir, f'streams{self.extension()}')
+        cmd = self.command(f'{self.kwa["args"][0]} '
+                           f'{self.kwa.get("volume", "")} -vn', output,
+                           f'-i "{self.kwa["source"]}"')
+        if not self.execute(cmd):
+            return None
+        return output
+    # ----------------------------------------------------------------#
+
+    def extension(self):
+        """
+        Returns the file extension of the destination
+        """
+        return os.path.splitext(self.kwa['destination'])[1]
+    # ----------------------------------------------------------------#
+
+    def run(self):
+        """
+        Encode the segments and join them. Returns the same
+        status strings of `FFmpeg.process_item`.
+        """
+        kwa = self.kwa
+        nseg = len(self.bounds)
+        count = (f'File {self.count}/{self.engine.nargs} - Encoding '
+                 f'{nseg} segments with up to {self.jobs} jobs\nSource: '
+                 f'"{kwa["source"]}"\nDestination: "{kwa["destination"]}"')
+        self.notify("COUNT_EVT",
+                    count=count,
+                    duration=kwa['duration'],
+                    end='CONTINUE',
+                    )
+        logwrite(count, '', self.engine.logfile)
+        tmp = os.path.join(self.appdata['cachedir'], 'tmp')
+        os.makedirs(tmp, exist_ok=True)
+        self.tmpdir = tempfile.mkdtemp(prefix='segments_', dir=tmp)
+        channel = SegmentsChannel(kwa['duration'], nseg,
+                                  self.appdata['progress_rate'],
+                                  self.notify)
+        joined = False
+        try:
+            with ThreadPoolExecutor(max_workers=self.jobs + 1) as executor:
+                streams = executor.submit(self.encode_streams)
+                segments = list(executor.map(self.encode_segment,
+                                             range(nseg), [channel] * nseg))
+                streams = streams.result()
+            channel.flush()
+            if streams is not None and None not in segments:
+                listfile = os.path.join(self.tmpdir, 'segments.txt')
+                write_concat_list(segments, listfile)
+                inputs = f'-f concat -safe 0 -i "{listfile}"'
+                args = '-map 0:v -c copy'
+                if streams:
+                    inputs = f'{inputs} -i "{streams}"'
+                    args = ('-map 0:v -map 1 -c copy -map_metadata 1 '
+                            '-map_chapters 1')
+                joined = self.execute(self.command(args, kwa['destination'],
+                                                   inputs))
+        finally:
+            shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+        if not joined and not self.failed:  # stopped by the user
+            self.notify("UPDATE_EVT",
+                        output='STOP',
+                        duration=kwa['duration'],
+                        status=1,
+                        )
+            return 'STOP'
+
+        if self.failed:
+            status, output = self.failed
+            if status == 'ERROR':
+                self.engine.fatal_error = True
+                self.notify("COUNT_EVT",
+                            count=output,
+                            duration=0,
+                            end='ERROR'
+                            )
+            else:
+                self.notify("UPDATE_EVT",
+                            output='FAILED',
+                            duration=kwa['duration'],
+                            status=1,
+                            )
+            logwrite('', output, self.engine.logfile)
+            return status
+
+        self.notify("COUNT_EVT",
+                    count='',
+                    duration=kwa['duration'],
+                    end='DONE'
+                    )
+        return 'DONE'
@@ -0,0 +1,234 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: conversion_pipeline.py
+Porpose: conversion of the downloaded files while downloading
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2024
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import json
+import platform
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+from threading import Lock
+from videomass.vdms_io.make_filelog import logwrite
+from videomass.vdms_engine.ffmpeg_engine import FFmpegEngine
+
+# line printed for each downloaded file by the yt-dlp executable
+# once moved to its final pathname, followed by that pathname
+FILEPATH_MARK = '[Videomass] Downloaded: '
+if platform.system() == 'Windows':
+    FILEPATH_EXEC = f'--exec "echo {FILEPATH_MARK}{{}}"'
+else:  # quoted, the brackets are a glob pattern for the shell
+    FILEPATH_EXEC = f'--exec "echo \'{FILEPATH_MARK}\'{{}}"'
+
+
+def load_profiles(presetsdir, preset):
+    """
+    Returns the list of the profiles (dict) of the given preset
+    (a JSON file of the Presets Manager without extension), an
+    empty list if not found or not readable.
+    """
+    try:
+        with open(os.path.join(presetsdir, f'{preset}.json'), 'r',
+                  encoding='utf-8') as fln:
+            data = json.load(fln)
+    except (OSError, json.JSONDecodeError):
+        return []
+    if not isinstance(data, list):
+        return []
+    return [x for x in data if isinstance(x, dict) and 'Name' in x]
+# ----------------------------------------------------------------------#
+
+
+def load_profile(presetsdir, preset, name):
+    """
+    Returns the profile (dict) with the given name of the
+    given preset, `None` if not found.
+    """
+    for profile in load_profiles(presetsdir, preset):
+        if profile['Name'] == name:
+            return profile
+    return None
+# ----------------------------------------------------------------------#
+
+
+def profile_item(profile, preset, source, appdata, logname):
+    """
+    Returns a queue item (see `queue_runner.QUEUE_KEYS`) to
+    convert the given source file with the given profile of the
+    Presets Manager, the output file is named as the Presets
+    Manager does (see `checkup.check_files`). The whole file is
+    converted and its duration is not known.
+    """
+    outext = profile.get('Output_extension', '')
+    extension = '' if outext == 'copy' else outext
+    dirname, basename = os.path.split(source)
+    name, srcext = os.path.splitext(basename)
+    ext = f'.{extension}' if extension else srcext
+    if appdata['outputdir_asinput']:
+        destination = os.path.join(dirname,
+                                   f"{name}{appdata['filesuffix']}{ext}")
+    else:
+        destination = os.path.join(appdata['outputdir'], f'{name}{ext}')
+    if os.path.abspath(destination) == os.path.abspath(source):
+        destination = os.path.join(os.path.dirname(destination),
+                                   f'{name}_converted{ext}')
+    pass1 = ' '.join(profile.get('First_pass', '').split())
+    pass2 = ' '.join(profile.get('Second_pass', '').split())
+    return {'type': 'Two pass' if pass2 else 'One pass',
+            'args': [pass1, pass2],
+            'pre-input-1': ' '.join(profile.get('Preinput_1', '').split()),
+            'pre-input-2': ' '.join(profile.get('Preinput_2', '').split()),
+            'preset name': f'Presets Manager - {preset}',
+            'extension': extension,
+            'logname': logname,
+            'source': source,
+            'destination': destination,
+            'duration': 0,
+            'start-time': '',
+            'end-time': '',
+            }
+# ----------------------------------------------------------------------#
+
+
+class ConversionPipeline:
+    """
+    Converts the downloaded files with a profile of the Presets
+    Manager as soon as each download is done, while the next
+    downloads go on, so the network-bound and the CPU-bound work
+    overlap. Each file is processed by its own `FFmpegEngine`
+    on a pool of `jobs` worker threads (the `ffmpeg_jobs` option
+    by default).
+
+    The messages of each conversion are given to the `notify`
+    callable as `notify(job, topic, kwargs)`, where `job` is the
+    number (1 based) of the conversion, see `FFmpegEngine`.
+
+    USAGE:
+        >>> pipeline = ConversionPipeline(appdata, logfile, notify,
+        >>>                               profile, preset)
+        >>> pipeline.submit(filename)  # e.g. by a download hook
+        >>> status = pipeline.wait()  # once the downloads are done
+
+    This class is thread-safe.
+    """
+    def __init__(self, appdata, logfile, notify, profile, preset,
+                 logname='YouTube Downloader.log', jobs=None):
+        """
+        appdata: dict of the application settings
+        logfile: log filename
+        notify: callable receiving the messages
+        profile: the profile (dict) of the Presets Manager
+        preset: the preset name of the profile
+        jobs: max number of conversions at the same time
+        """
+        self.appdata = appdata
+        self.logfile = logfile
+        self.notify = notify
+        self.profile = profile
+        self.preset = preset
+        self.logname = logname
+        self.stopped = False
+        self.sources = set()  # already submitted files
+        self.futures = []
+        self.engines = []
+        self.lock = Lock()
+        jobs = jobs or appdata['ffmpeg_jobs']
+        self.executor = ThreadPoolExecutor(max_workers=max(int(jobs), 1))
+    # ----------------------------------------------------------------#
+
+    def submit(self, filename):
+        """
+        Enqueue the conversion of the given downloaded file,
+        files already submitted are ignored. Returns False
+        if the file is not enqueued.
+        """
+        source = os.path.abspath(filename)
+        with self.lock:
+            if self.stopped or source in self.sources:
+                return False
+            self.sources.add(source)
+            job = len(self.futures) + 1
+            item = profile_item(self.profile, self.preset, source,
+                                self.appdata, self.logname)
+            self.futures.append(self.executor.submit(self.convert, job,
+                                                     item))
+        return True
+    # ----------------------------------------------------------------#
+
+    def convert(self, job, item):
+        """
+        Convert the given queue item, runs on a worker thread.
+        Returns the status of the item, see `FFmpegEngine`.
+        """
+        def notify(topic, **kwargs):
+            self.notify(job, topic, kwargs)
+
+        engine = FFmpegEngine(self.appdata, self.logfile, [item], notify)
+        with self.lock:
+            if self.stopped:
+                return 'STOP'
+            self.engines.append(engine)
+        try:
+            return engine.run()[0]
+        finally:
+            with self.lock:
+                self.engines.remove(engine)
+    # ----------------------------------------------------------------#
+
+    def wait(self):
+        """
+        Wait for all the conversions, including the ones
+        enqueued while waiting. Returns the list of their
+        statuses, 'STOP' for the cancelled ones, 'ERROR' for
+        the ones which raised an exception (e.g. a missing
+        option of the `FFmpegEngine`).
+        """
+        status = []
+        while True:
+            with self.lock:
+                futures = self.futures[len(status):]
+            if not futures:
+                break
+            for future in futures:
+                try:
+                    status.append(future.result())
+                except CancelledError:
+                    status.append('STOP')
+                except Exception as err:  # e.g. a missing appdata key
+                    logwrite('', f'[VIDEOMASS]: Conversion error: {err!r}',
+                             self.logfile)
+                    status.append('ERROR')
+        self.executor.shutdown(wait=False)
+        return status
+    # ----------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Cancel the conversions not started and stop the running ones
+        """
+        with self.lock:
+            self.stopped = True
+            for future in self.futures:
+                future.cancel()
+            for engine in self.engines:
+                engine.stop()
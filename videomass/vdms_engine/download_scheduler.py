@@ -0,0 +1,146 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: download_scheduler.py
+Porpose: concurrent scheduling of the downloads with per-host limits
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2024
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from threading import Thread, Condition
+from urllib.parse import urlparse
+
+
+def hostname(url):
+    """
+    Returns the host name (lowercase, without `www.`)
+    of the given URL, an empty string if not valid.
+    """
+    try:
+        host = urlparse(url.strip()).hostname or ''
+    except ValueError:
+        return ''
+    return host[4:] if host.startswith('www.') else host
+# ----------------------------------------------------------------------#
+
+
+class DownloadScheduler:
+    """
+    Runs the download tasks on several worker threads (the
+    download slots), starting at most `jobs` downloads at the
+    same time overall and at most `host_jobs` downloads at the
+    same time from the same host. Tasks are started in the given
+    order, a task whose host is busy is overtaken by the next
+    tasks of other hosts.
+
+    The `worker` callable is called on the slot thread as
+    `worker(slot, index, *task)` where `slot` is the index of
+    the download slot (0 to jobs - 1) and `index` the index of
+    the task; its return value is the status of the task.
+    A worker should check the `stopped` attribute to cancel
+    a running download.
+
+    USAGE:
+        >>> scheduler = DownloadScheduler(jobs=3, host_jobs=2)
+        >>> status = scheduler.run([(url, opts), ...], worker)
+        >>> scheduler.stop()  # e.g. from another thread
+
+    This class is thread-safe.
+    """
+    def __init__(self, jobs=3, host_jobs=2):
+        """
+        jobs: max number of concurrent downloads
+        host_jobs: max number of concurrent downloads per host
+        """
+        self.jobs = max(int(jobs), 1)
+        self.host_jobs = max(int(host_jobs), 1)
+        self.stopped = False
+        self.cond = Condition()
+        self.pending = []  # indexes of the tasks not started
+        self.active = {}  # host: number of running downloads
+    # ----------------------------------------------------------------#
+
+    def next_task(self, hosts):
+        """
+        Wait for the next task which can be started, returns
+        its index or `None` if there are no tasks left or the
+        scheduler was stopped.
+        """
+        with self.cond:
+            while not self.stopped and self.pending:
+                for index in self.pending:
+                    if self.active.get(hosts[index], 0) < self.host_jobs:
+                        self.pending.remove(index)
+                        self.active[hosts[index]] = self.active.get(
+                            hosts[index], 0) + 1
+                        return index
+                self.cond.wait()
+            return None
+    # ----------------------------------------------------------------#
+
+    def slot(self, slot, tasks, hosts, worker, status):
+        """
+        Download slot: runs the tasks one by one until there
+        are no tasks left or the scheduler is stopped.
+        """
+        while True:
+            index = self.next_task(hosts)
+            if index is None:
+                return
+            try:
+                status[index] = worker(slot, index, *tasks[index])
+            except Exception as err:  # the other slots must go on
+                status[index] = f'ERROR: {err}'
+            finally:
+                with self.cond:
+                    self.active[hosts[index]] -= 1
+                    self.cond.notify_all()
+    # ----------------------------------------------------------------#
+
+    def run(self, tasks, worker):
+        """
+        Run the given list of tasks (tuples whose first item
+        is the URL) and wait for them. Returns the list of the
+        statuses returned by the worker, `None` for the tasks
+        not started because the scheduler was stopped.
+        """
+        hosts = [hostname(task[0]) for task in tasks]
+        status = [None] * len(tasks)
+        with self.cond:
+            self.pending = list(range(len(tasks)))
+        slots = [Thread(target=self.slot,
+                        args=(slot, tasks, hosts, worker, status))
+                 for slot in range(min(self.jobs, len(tasks)))]
+        for thread in slots:
+            thread.start()
+        for thread in slots:
+            thread.join()
+        return status
+    # ----------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Cancel the tasks not started yet and set the `stopped`
+        attribute to let the workers cancel the running ones.
+        """
+        with self.cond:
+            self.stopped = True
+            self.pending.clear()
+            self.cond.notify_all()
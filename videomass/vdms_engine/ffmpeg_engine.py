@@ -0,0 +1,919 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: ffmpeg_engine.py
+Porpose: FFmpeg long processing task engine (wx-free)
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2024
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+import time
+import subprocess
+import platform
+from videomass.vdms_utils.utils import Popen
+from videomass.vdms_io.make_filelog import logwrite
+from videomass.vdms_io.job_journal import JobJournal
+from videomass.vdms_io.build_manifest import (BuildManifest,
+                                              fingerprint,
+                                              ffmpeg_version,
+                                              )
+from videomass.vdms_threads.progress_channel import ProgressChannel
+from videomass.vdms_io.loudness_cache import (LoudnessCache,
+                                              LoudnessParser,
+                                              loudnorm_targets,
+                                              fused_filter,
+                                              audio_index,
+                                              ebu_summary,
+                                              )
+from videomass.vdms_engine.chunked_encode import ChunkedEncode, is_chunkable
+if not platform.system() == 'Windows':
+    import shlex
+
+FUSE_MAX = 8  # max number of outputs of a single FFmpeg process
+
+
+def ffmpeg_cmd_args(appdata):
+    """
+    Get ffmpeg command and default args
+    """
+    if appdata['ffmpeg_progress_pipe']:  # machine-readable progress
+        stats = '-nostats -progress pipe:2'
+    else:
+        stats = '-stats'
+    defargs = f'-y {stats} -hide_banner {appdata["ffmpeg_loglev"]}'
+    return {"ffmpeg_cmd": appdata["ffmpeg_cmd"],
+            "ffmpeg-default-args": defargs}
+# ----------------------------------------------------------------------
+
+
+def one_pass(appdata, *args, **kwa):
+    """
+    Command builder for first pass of two
+    """
+    cmd = ffmpeg_cmd_args(appdata)
+    nul = 'NUL' if platform.system() == 'Windows' else '/dev/null'
+    pass1 = (f'"{cmd["ffmpeg_cmd"]}" '
+             f'{cmd["ffmpeg-default-args"]} '
+             f'{kwa.get("pre-input-1", "")} '
+             f'{kwa["start-time"]} '
+             f'-i "{kwa["source"]}" '
+             f'{kwa["end-time"]} '
+             f'{kwa["args"][0]} '
+             f'{nul}'
+             )
+    count1 = (f'File {args[0]}/{args[1]} - Pass One\n'
+              f'Source: "{kwa["source"]}"\nDestination: "{nul}"')
+    stamp1 = f'{count1}\n\n[COMMAND]:\n{pass1}'
+
+    if not platform.system() == 'Windows':
+        pass1 = shlex.split(pass1)
+
+    return {'pass1': pass1, 'count1': count1, 'stamp1': stamp1}
+# ----------------------------------------------------------------------
+
+
+def two_pass(appdata, *args, **kwa):
+    """
+    Command builder for second pass of two
+    """
+    cmd = ffmpeg_cmd_args(appdata)
+    pass2 = (f'"{cmd["ffmpeg_cmd"]}" '
+             f'{cmd["ffmpeg-default-args"]} '
+             f'{kwa.get("pre-input-2", "")} '
+             f'{kwa["start-time"]} '
+             f'-i "{kwa["source"]}" '
+             f'{kwa["end-time"]} '
+             f'{kwa["args"][1]} '
+             f'{kwa.get("volume", "")} '
+             f'"{kwa["destination"]}"'
+             )
+    count2 = (f'File {args[0]}/{args[1]} - Pass Two\n'
+              f'Source: "{kwa["source"]}"\nDestination: '
+              f'"{kwa["destination"]}"'
+              )
+    stamp2 = f'\n{count2}\n\n[COMMAND]:\n{pass2}'
+
+    if not platform.system() == 'Windows':
+        pass2 = shlex.split(pass2)
+
+    return {'pass2': pass2, 'count2': count2, 'stamp2': stamp2}
+# ----------------------------------------------------------------------
+
+
+def one_pass_stab(appdata, *args, **kwa):
+    """
+    Command builder for one pass video stabilizer
+    """
+    cmd = ffmpeg_cmd_args(appdata)
+    nul = 'NUL' if platform.system() == 'Windows' else '/dev/null'
+    pass1 = (f'"{cmd["ffmpeg_cmd"]}" '
+             f'{cmd["ffmpeg-default-args"]} '
+             f'{kwa.get("pre-input-1", "")} '
+             f'{kwa["start-time"]} '
+             f'-i "{kwa["source"]}" '
+             f'{kwa["end-time"]} '
+             f'{kwa["args"][0]} '
+             f'{nul}'
+             )
+    count1 = (f'File {args[0]}/{args[1]} - Pass One\n'
+              f'Detecting statistics for measurements...\n\nSource: '
+              f'"{kwa["source"]}"\nDestination: "{nul}"')
+    stamp1 = f'{count1}\n\n[COMMAND]:\n{pass1}'
+
+    if not platform.system() == 'Windows':
+        pass1 = shlex.split(pass1)
+
+    return {'pass1': pass1, 'count1': count1, 'stamp1': stamp1}
+# ----------------------------------------------------------------------
+
+
+def two_pass_stab(appdata, *args, **kwa):
+    """
+    Command builder for two pass video stabilizer
+    """
+    cmd = ffmpeg_cmd_args(appdata)
+    pass2 = (f'"{cmd["ffmpeg_cmd"]}" '
+             f'{cmd["ffmpeg-default-args"]} '
+             f'{kwa.get("pre-input-2", "")} '
+             f'{kwa["start-time"]} '
+             f'-i "{kwa["source"]}" '
+             f'{kwa["end-time"]} '
+             f'{kwa["args"][1]} '
+             f'{kwa.get("volume", "")} '
+             f'"{kwa["destination"]}"'
+             )
+    count2 = (f'File {args[0]}/{args[1]} - Pass Two\n'
+              f'Application of Audio/Video filters...\n\nSource: '
+              f'"{kwa["source"]}"\nDestination: "{kwa["destination"]}"')
+    stamp2 = f'\n{count2}\n\n[COMMAND]:\n{pass2}'
+
+    if not platform.system() == 'Windows':
+        pass2 = shlex.split(pass2)
+
+    return {'pass2': pass2, 'count2': count2, 'stamp2': stamp2}
+# ----------------------------------------------------------------------
+
+
+def simple_one_pass(appdata, *args, **kwa):
+    """
+    Command builder for one pass ebu
+    """
+    cmd = ffmpeg_cmd_args(appdata)
+    pass1 = (f'"{cmd["ffmpeg_cmd"]}" '
+             f'{cmd["ffmpeg-default-args"]} '
+             f'{kwa.get("pre-input-1", "")} '
+             f'{kwa["start-time"]} '
+             f'-i "{kwa["source"]}" '
+             f'{kwa["end-time"]} '
+             f'{kwa["args"][0]} '
+             f'{kwa.get("volume", "")} '
+             f'"{kwa["destination"]}"'
+             )
+    count1 = (f'File {args[0]}/{args[1]}\nSource: '
+              f'"{kwa["source"]}"\nDestination: "{kwa["destination"]}"')
+    stamp1 = f'{count1}\n\n[COMMAND]:\n{pass1}'
+
+    if not platform.system() == 'Windows':
+        pass1 = shlex.split(pass1)
+
+    return {'pass1': pass1, 'count1': count1, 'stamp1': stamp1}
+# ----------------------------------------------------------------------
+
+
+def is_fusable(kwa, chunk_jobs):
+    """
+    Returns True if the given item (`kwa`) can share the
+    decoding of its source with other items, see `fusion_groups`.
+    """
+    args = kwa['args'][0].split()
+    return (kwa['type'] == 'One pass'
+            and not kwa['args'][1]
+            and '-filter_complex' not in args and '-lavfi' not in args
+            and not is_chunkable(kwa, chunk_jobs))
+# ----------------------------------------------------------------------
+
+
+def fusion_groups(items, chunk_jobs, maxsize=FUSE_MAX):
+    """
+    Group the indexes of the given list of items (dicts) which
+    can be rendered by a single FFmpeg process with multiple
+    outputs, i.e. the 'One pass' items sharing the same source,
+    the same time selection and the same input options. Each
+    group has up to `maxsize` items and the items that cannot
+    be fused form groups of their own.
+    Returns the list of groups (lists of indexes) sorted by
+    their first item.
+    """
+    groups, open_groups = [], {}
+    for index, kwa in enumerate(items):
+        if not is_fusable(kwa, chunk_jobs):
+            groups.append([index])
+            continue
+        key = (os.path.abspath(kwa['source']), kwa['start-time'],
+               kwa['end-time'], kwa.get('pre-input-1', ''))
+        group = open_groups.get(key)
+        if group is None or len(group) >= maxsize:
+            group = open_groups[key] = []
+            groups.append(group)
+        group.append(index)
+    return groups
+# ----------------------------------------------------------------------
+
+
+def fused_one_pass(appdata, counts, nargs, items):
+    """
+    Command builder for one pass with multiple outputs of
+    the given items (see `fusion_groups`), the source is
+    decoded only once for all the outputs.
+    """
+    cmd = ffmpeg_cmd_args(appdata)
+    kwa = items[0]
+    outputs = ' '.join([f'{item["end-time"]} '
+                        f'{item["args"][0]} '
+                        f'{item.get("volume", "")} '
+                        f'"{item["destination"]}"' for item in items])
+    pass1 = (f'"{cmd["ffmpeg_cmd"]}" '
+             f'{cmd["ffmpeg-default-args"]} '
+             f'{kwa.get("pre-input-1", "")} '
+             f'{kwa["start-time"]} '
+             f'-i "{kwa["source"]}" '
+             f'{outputs}'
+             )
+    dest = '\n'.join([f'Destination: "{item["destination"]}"'
+                      for item in items])
+    count1 = (f'File {", ".join([str(x) for x in counts])}/{nargs} - '
+              f'{len(items)} outputs with a single decoding\nSource: '
+              f'"{kwa["source"]}"\n{dest}')
+    stamp1 = f'{count1}\n\n[COMMAND]:\n{pass1}'
+
+    if not platform.system() == 'Windows':
+        pass1 = shlex.split(pass1)
+
+    return {'pass1': pass1, 'count1': count1, 'stamp1': stamp1}
+# ----------------------------------------------------------------------
+
+
+def one_pass_ebu(appdata, *args, **kwa):
+    """
+    Command builder for one pass ebu
+    """
+    cmd = ffmpeg_cmd_args(appdata)
+    nul = 'NUL' if platform.system() == 'Windows' else '/dev/null'
+    args1 = kwa["args"][0]
+    targets = loudnorm_targets(kwa.get("EBU"))
+    if targets:  # measures volume and loudness with a single decode
+        args1 = args1.replace(kwa["EBU"], fused_filter(targets))
+    pass1 = (f'"{cmd["ffmpeg_cmd"]}" '
+             f'{cmd["ffmpeg-default-args"]} '
+             f'{kwa.get("pre-input-1", "")} '
+             f'{kwa["start-time"]} '
+             f'-i "{kwa["source"]}" '
+             f'{kwa["end-time"]} '
+             f'{args1} '
+             f'{nul}'
+             )
+    count1 = (f'File {args[0]}/{args[1]} - Pass One\n'
+              f'Detecting statistics for measurements...\n\nSource: '
+              f'"{kwa["source"]}"\nDestination: "{nul}"')
+    stamp1 = f'{count1}\n\n[COMMAND]:\n{pass1}'
+
+    if not platform.system() == 'Windows':
+        pass1 = shlex.split(pass1)
+
+    summary = {'Input Integrated:': None, 'Input True Peak:': None,
+               'Input LRA:': None, 'Input Threshold:': None,
+               'Output Integrated:': None, 'Output True Peak:': None,
+               'Output LRA:': None, 'Output Threshold:': None,
+               'Normalization Type:': None, 'Target Offset:': None
+               }
+    # the first pass can be skipped if it only performs the analysis
+    reusable = bool(targets and '-vn' in args1.split()
+                    and not kwa.get("pre-input-1"))
+    cachekey = LoudnessCache.key(kwa["source"],
+                                 (kwa["start-time"], kwa["end-time"]),
+                                 audio_index(args1), targets)
+    return {'pass1': pass1, 'count1': count1,
+            'stamp1': stamp1, 'summary': summary,
+            'reusable': reusable, 'cachekey': cachekey}
+# ----------------------------------------------------------------------
+
+
+def two_pass_ebu(appdata, *args, **kwa):
+    """
+    Command builder for two pass ebu
+    """
+    cmd = ffmpeg_cmd_args(appdata)
+    pass2 = (f'"{cmd["ffmpeg_cmd"]}" '
+             f'{cmd["ffmpeg-default-args"]} '
+             f'{kwa.get("pre-input-2", "")} '
+             f'{kwa["start-time"]} '
+             f'-i "{kwa["source"]}" '
+             f'{kwa["end-time"]} '
+             f'{kwa["args"][1]} '
+             f'-filter:a:{kwa["audiomap"][1]} '
+             f'{args[2]} '
+             f'"{kwa["destination"]}"'
+             )
+    count2 = (f'File {args[0]}/{args[1]} - Pass Two\n'
+              f'Application of Audio/Video filters...\n\nSource: '
+              f'"{kwa["source"]}"\nDestination: "{kwa["destination"]}"')
+    stamp2 = f'\n{count2}\n\n[COMMAND]:\n{pass2}'
+
+    if not platform.system() == 'Windows':
+        pass2 = shlex.split(pass2)
+
+    return {'pass2': pass2, 'count2': count2, 'stamp2': stamp2}
+# ----------------------------------------------------------------------
+
+
+class FFmpegEngine:
+    """
+    This class performs the FFmpeg long processing task of a list
+    of items (i.e. the 'One pass', 'Two pass', 'Two pass EBU' and
+    'Two pass VIDSTAB' types, also see `queue_utils`) without
+    depending on wxPython. It is able to pipe up to two FFmpeg
+    subprocesses to execute tasks in succession using command
+    concatenation.
+
+    All messages are given to the `notify` callable, with the
+    same topics and keyword arguments of the pubsub protocols
+    used by the GUI (COUNT_EVT, UPDATE_EVT, PROGRESS_EVT and
+    END_EVT), e.g. `notify("COUNT_EVT", count=..., duration=...,
+    end=...)`, see `vdms_engine.notify`. The `FFmpeg` thread is
+    the GUI consumer of this engine, `queue_runner` the command
+    line one.
+
+    If the `ffmpeg_jobs` option is greater than 1, the items are
+    distributed over a pool of worker threads, so that up to
+    `ffmpeg_jobs` items (each with its own FFmpeg subprocess) are
+    processed at the same time. Each item still sends its own
+    COUNT_EVT/UPDATE_EVT messages, while END_EVT is sent only
+    once at the end of the whole task.
+
+    If the items are processed one at a time and the `pass1_lookahead`
+    option is greater than 0, the first pass of the next two-pass
+    items runs in advance, see `run_pipelined`.
+
+    If the `chunk_jobs` option is greater than 1, a long 'One pass'
+    item is encoded by segments at the same time, see `ChunkedEncode`.
+
+    With the 'Two pass EBU' type, the first pass measures volume
+    and loudness with a single decode and caches the results (see
+    `LoudnessCache`). If the first pass only performs the audio
+    analysis and the measurements are already available (e.g. by
+    the PEAK/RMS volume analysis), it is skipped entirely.
+
+    If a `journal` pathname is given (e.g. for the queue), the
+    state of each item is recorded in a durable `JobJournal`, so
+    running the same items again after a crash or a stop only
+    processes the unfinished ones and discards their half-written
+    output files. The journal is removed once all items are done.
+
+    If the `skip_uptodate` option is enabled, the items whose output
+    file is up to date (i.e. same source, arguments and FFmpeg
+    version as the run which wrote it, see `BuildManifest`) are
+    skipped, so re-running a preset over the same files only
+    processes the changed ones.
+
+    If the `fuse_outputs` option is enabled, the 'One pass' items
+    sharing the same source and time selection (e.g. several
+    presets on the same file) are rendered by a single FFmpeg
+    process with multiple outputs, so the source is decoded only
+    once, see `process_group`.
+
+    NOTE capturing output in real-time (Windows, Unix):
+    https://stackoverflow.com/questions/1388753/how-to-get-output-
+    from-subprocess-popen-proc-stdout-readline-blocks-no-dat?rq=1
+
+    """
+    TWOPASS = ('Two pass', 'Two pass EBU', 'Two pass VIDSTAB')
+    MSG_reused = ('Loudness measurements already available, '
+                  'the analysis is skipped.')
+    MSG_completed = ('Already completed by a previous run, '
+                     'the item is skipped.')
+    MSG_uptodate = 'The output file is up to date, the item is skipped.'
+    MSG_unfused = ('Rendering of multiple outputs failed, '
+                   'the items are processed separately.')
+
+    def __init__(self, appdata, logfile, kwargs, notify, loudcache=None,
+                 journal=None):
+        """
+        appdata: dict of the application settings (see `DataSource`)
+        logfile: log filename
+        kwargs: list of dictionaries (the items)
+        notify: callable receiving the messages
+        loudcache: a `LoudnessCache` instance, if None a new one
+        journal: pathname of the `JobJournal` file, if None
+                 the state of the items is not recorded
+        """
+        self.appdata = appdata
+        self.notify = notify
+        self.stop_work_thread = False  # set stop ffmpeg
+        self.fatal_error = False  # set by any unrecoverable error
+        self.logfile = logfile  # log filename
+        self.kwargs = kwargs  # it is a list of dictionaries
+        self.nargs = len(self.kwargs)  # how many items...
+        self.jobs = min(max(int(self.appdata['ffmpeg_jobs']), 1),
+                        max(self.nargs, 1))
+        self.loudcache = loudcache or LoudnessCache()
+        self.lookahead = max(int(self.appdata['pass1_lookahead']), 0)
+        self.journal = JobJournal(journal) if journal else None
+        self.manifest = None
+        if self.appdata['skip_uptodate']:
+            self.manifest = BuildManifest()
+            self.version = ffmpeg_version(self.appdata['ffmpeg_cmd'],
+                                          self.appdata['ostype'])
+        self.fingerprints = {}  # destination: fingerprint
+    # --------------------------------------------------------------------#
+
+    def run(self):
+        """
+        Process all items. Returns the list of the status
+        strings of the processed items, see `process_item`.
+        """
+        if self.journal:
+            for output in self.journal.resume(self.kwargs):
+                logwrite(f'Half-written output file discarded: "{output}"',
+                         '', self.logfile)
+        groups = []
+        if self.appdata['fuse_outputs']:
+            groups = fusion_groups(self.kwargs,
+                                   int(self.appdata['chunk_jobs']))
+        if groups and len(groups) < self.nargs:  # some items fused
+            result = self.run_fused(groups)
+        elif self.jobs > 1:
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                result = list(executor.map(self.process_item,
+                                           range(1, self.nargs + 1),
+                                           self.kwargs))
+        elif self.lookahead and any(kwa['type'] in FFmpegEngine.TWOPASS
+                                    for kwa in self.kwargs):
+            result = self.run_pipelined()
+        else:
+            result = []
+            for count, kwa in enumerate(self.kwargs, start=1):
+                result.append(self.process_item(count, kwa))
+                if self.stop_work_thread or self.fatal_error:
+                    break
+
+        if self.journal and result.count('DONE') == self.nargs:
+            self.journal.remove()
+
+        if 'UNKNOWN' in result:
+            return result
+
+        time.sleep(.5)
+        if self.stop_work_thread:
+            self.notify("END_EVT", filetotrash=None)
+            return result
+
+        filedone = [kwa["source"] for kwa, res in
+                    zip(self.kwargs, result) if res == 'DONE']
+        self.notify("END_EVT", filetotrash=filedone)
+        return result
+    # --------------------------------------------------------------------#
+
+    def process_item(self, count, kwa):
+        """
+        Process a single item (dict) of the list of items to
+        be processed. This method may run concurrently on
+        several worker threads, see `run` method.
+
+        Returns one of the following status strings:
+            'DONE' if successfully completed
+            'FAILED' if FFmpeg exited with a non-zero status
+            'STOP' if the process was stopped by the user
+            'ERROR' if any fatal error was raised (i.e. OSError)
+            'SKIP' if the item was not processed at all
+            'UNKNOWN' if the type of process is not supported
+        """
+        status, model = self.first_stage(count, kwa)
+        if not status:
+            status = self.second_stage(count, kwa, model)
+        return self.finish(kwa, status)
+    # --------------------------------------------------------------------#
+
+    def finish(self, kwa, status):
+        """
+        Record the final status of the given item
+        on the journal (if any) and return it.
+        """
+        if self.journal:
+            self.journal.end(kwa, status)
+        if self.manifest and status == 'DONE':
+            self.manifest.record(kwa['destination'],
+                                 self.fingerprints.pop(kwa['destination'],
+                                                       None))
+        return status
+    # --------------------------------------------------------------------#
+
+    def completed(self, count, kwa, msg):
+        """
+        Notify that the given item was already completed
+        (see `JobJournal` and `BuildManifest`) and is skipped.
+        """
+        text = (f'File {count}/{self.nargs}\nSource: "{kwa["source"]}"\n'
+                f'Destination: "{kwa["destination"]}"\n\n{msg}')
+        self.notify("COUNT_EVT", count=text, duration=kwa['duration'],
+                    end='CONTINUE')
+        logwrite(text, '', self.logfile)
+        self.notify("COUNT_EVT", count='', duration=kwa['duration'],
+                    end='DONE')
+        return 'DONE'
+    # --------------------------------------------------------------------#
+
+    def run_fused(self, groups):
+        """
+        Process the given groups of items (see `fusion_groups`)
+        one at a time or on a pool of `ffmpeg_jobs` worker threads.
+        Returns the list of the status strings of the items.
+        """
+        result = ['SKIP'] * self.nargs
+        if self.jobs > 1:
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                for status in executor.map(self.process_group, groups):
+                    for index, stat in status:
+                        result[index] = stat
+        else:
+            for group in groups:
+                for index, stat in self.process_group(group):
+                    result[index] = stat
+                if self.stop_work_thread or self.fatal_error:
+                    break
+        return result
+    # --------------------------------------------------------------------#
+
+    def process_group(self, group):
+        """
+        Process the items of the given group (list of indexes)
+        with a single FFmpeg process and multiple outputs (see
+        `fused_one_pass`). If that process fails, the items are
+        processed again one by one, so each one reports its own
+        failure. Returns a list of (index, status) tuples.
+        """
+        status, members = [], []
+        for index in group:
+            stat = self.preflight(index + 1, self.kwargs[index])
+            if stat:
+                status.append((index, self.finish(self.kwargs[index], stat)))
+            else:
+                members.append(index)
+
+        if len(members) > 1:
+            items = [self.kwargs[x] for x in members]
+            model = fused_one_pass(self.appdata, [x + 1 for x in members],
+                                   self.nargs, items)
+            stat = self.first_pass(model, items[0], retry=True)
+            if stat == 'FAILED' and not self.stop_work_thread:
+                logwrite(FFmpegEngine.MSG_unfused, '', self.logfile)
+            else:
+                if not stat:
+                    self.notify("COUNT_EVT", count='',
+                                duration=items[0]['duration'], end='DONE')
+                    stat = 'DONE'
+                return status + [(x, self.finish(self.kwargs[x], stat))
+                                 for x in members]
+
+        for index in members:
+            stat = self.first_stage(index + 1, self.kwargs[index],
+                                    checked=True)[0]
+            status.append((index, self.finish(self.kwargs[index], stat)))
+        return status
+    # --------------------------------------------------------------------#
+
+    def run_pipelined(self):
+        """
+        Process the items one at a time, while the first pass
+        of the two-pass items among the next `lookahead` items runs
+        in advance on a pool of worker threads, the other items are
+        entirely processed in turn. The first pass is often bound
+        by the analysis and the second one by the encoding, so this
+        keeps the load more even. Each item has its own working
+        directory (see `first_stage`), so the pass log files and
+        the vidstab transforms of the items running ahead never
+        overwrite the ones of the item in the second pass.
+        Returns the list of the status strings of the items.
+        """
+        result = []
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.lookahead) as executor:
+            for count, kwa in enumerate(self.kwargs, start=1):
+                future = None
+                if kwa['type'] in FFmpegEngine.TWOPASS:
+                    future = executor.submit(self.first_stage, count, kwa)
+                pending.append((count, kwa, future))
+                if len(pending) > self.lookahead:
+                    result.append(self.complete(*pending.popleft()))
+            while pending:
+                result.append(self.complete(*pending.popleft()))
+        return result
+    # --------------------------------------------------------------------#
+
+    def complete(self, count, kwa, future):
+        """
+        Wait for the first stage of the given item (`future`),
+        or run it if not started in advance (`None`), and run its
+        second stage. Returns the status string of the item, see
+        `process_item`.
+        """
+        if future is None:
+            status, model = self.first_stage(count, kwa)
+        else:
+            status, model = future.result()
+        if status:
+            return self.finish(kwa, status)
+        if self.stop_work_thread or self.fatal_error:
+            shutil.rmtree(model['workdir'], ignore_errors=True)
+            return self.finish(kwa, 'SKIP')
+        return self.finish(kwa, self.second_stage(count, kwa, model))
+    # --------------------------------------------------------------------#
+
+    def preflight(self, count, kwa):
+        """
+        Check whether the given item has to be processed.
+        Returns a status string if it is skipped (see
+        `process_item`), `None` otherwise.
+        """
+        if self.stop_work_thread or self.fatal_error:
+            return 'SKIP'
+
+        if self.journal:
+            if self.journal.is_done(kwa):
+                return self.completed(count, kwa, FFmpegEngine.MSG_completed)
+        if self.manifest:
+            fprint = fingerprint(kwa, self.version,
+                                 self.appdata['fingerprint_hash'])
+            if self.manifest.is_uptodate(kwa['destination'], fprint):
+                return self.completed(count, kwa, FFmpegEngine.MSG_uptodate)
+            self.fingerprints[kwa['destination']] = fprint
+        if self.journal:
+            self.journal.begin(kwa)
+        return None
+    # --------------------------------------------------------------------#
+
+    def first_stage(self, count, kwa, checked=False):
+        """
+        Run the first (or the only) pass of the given item.
+        Returns a tuple (status, model) where `status` is `None`
+        if the second pass still has to be run by `second_stage`.
+        Two-pass items get their own working directory, where
+        FFmpeg writes the pass log files and the vidstab transforms.
+        If `checked` is True, the `preflight` was already done.
+        """
+        status = None if checked else self.preflight(count, kwa)
+        if status:
+            return status, None
+
+        if kwa['type'] == 'One pass':
+            if is_chunkable(kwa, int(self.appdata['chunk_jobs'])):
+                chunked = ChunkedEncode(self, count, kwa,
+                                        ffmpeg_cmd_args(self.appdata)[
+                                            "ffmpeg-default-args"])
+                if chunked.plan():
+                    return chunked.run(), None
+            model = simple_one_pass(self.appdata, count, self.nargs, **kwa)
+
+        elif kwa['type'] == 'Two pass EBU':
+            model = one_pass_ebu(self.appdata, count, self.nargs, **kwa)
+            if model['reusable']:
+                model['measured'] = ebu_summary(self.loudcache.get(
+                    model['cachekey']))
+
+        elif kwa['type'] == 'Two pass VIDSTAB':
+            model = one_pass_stab(self.appdata, count, self.nargs, **kwa)
+
+        elif kwa['type'] == 'Two pass':
+            model = one_pass(self.appdata, count, self.nargs, **kwa)
+        else:
+            return 'UNKNOWN', None
+
+        if kwa["args"][1]:
+            tmp = os.path.join(self.appdata['cachedir'], 'tmp')
+            os.makedirs(tmp, exist_ok=True)
+            model['workdir'] = tempfile.mkdtemp(prefix='passes_', dir=tmp)
+
+        if model.get('measured'):  # EBU loudness already measured
+            model['summary'].update(model['measured'])
+            reused = FFmpegEngine.MSG_reused
+            self.notify("COUNT_EVT",
+                        count=f"{model['count1']}\n\n{reused}",
+                        duration=kwa['duration'],
+                        end='CONTINUE',
+                        )
+            logwrite(f"{model['stamp1']}\n\n{reused}", '', self.logfile)
+        else:
+            status = self.first_pass(model, kwa)
+            if status:
+                if model.get('workdir'):
+                    shutil.rmtree(model['workdir'], ignore_errors=True)
+                return status, None
+
+        self.notify("COUNT_EVT",
+                    count='',
+                    duration=kwa['duration'],
+                    end='DONE'
+                    )
+        if not kwa["args"][1]:
+            return 'DONE', None
+        return None, model
+    # --------------------------------------------------------------------#
+
+    def second_stage(self, count, kwa, model):
+        """
+        Run the second pass of the given item (see `first_stage`)
+        and remove its working directory. Returns the status
+        string of the item, see `process_item`.
+        """
+        try:
+            return self.second_pass(count, kwa, model)
+        finally:
+            shutil.rmtree(model['workdir'], ignore_errors=True)
+    # --------------------------------------------------------------------#
+
+    def second_pass(self, count, kwa, model):
+        """
+        Run the second pass of the given item
+        """
+        workdir = model['workdir']
+        if kwa["type"] == 'Two pass EBU':
+            summary = model['summary']
+            filters = (f'{kwa["EBU"]}'
+                       f':measured_I={summary["Input Integrated:"]}'
+                       f':measured_LRA={summary["Input LRA:"]}'
+                       f':measured_TP={summary["Input True Peak:"]}'
+                       f':measured_thresh={summary["Input Threshold:"]}'
+                       f':offset={summary["Target Offset:"]}'
+                       f':linear=true:dual_mono=true'
+                       )
+            model = two_pass_ebu(self.appdata, count, self.nargs, filters,
+                                 **kwa)
+            time.sleep(.5)
+
+        elif kwa['type'] == 'Two pass VIDSTAB':
+            model = two_pass_stab(self.appdata, count, self.nargs, **kwa)
+
+        elif kwa['type'] == 'Two pass':
+            model = two_pass(self.appdata, count, self.nargs, **kwa)
+
+        self.notify("COUNT_EVT",
+                    count=model['count2'],
+                    duration=kwa['duration'],
+                    end='CONTINUE',
+                    )
+        logwrite(model['stamp2'], '', self.logfile)
+
+        with Popen(model['pass2'],
+                   stderr=subprocess.PIPE,
+                   stdin=subprocess.PIPE,
+                   bufsize=1,
+                   universal_newlines=True,
+                   encoding=self.appdata['encoding'],
+                   cwd=workdir,
+                   ) as proc2:
+
+            channel = ProgressChannel(kwa['duration'],
+                                      self.appdata['progress_rate'],
+                                      self.notify)
+            for line2 in proc2.stderr:
+                channel.send(line2)
+                if self.stop_work_thread:
+                    channel.flush()
+                    proc2.stdin.write('q')  # stop ffmpeg
+                    out = proc2.communicate()[1]
+                    proc2.wait()
+                    self.notify("UPDATE_EVT",
+                                output='STOP',
+                                duration=kwa['duration'],
+                                status=1,
+                                )
+                    logwrite('', out, self.logfile)
+                    return 'STOP'
+
+            channel.flush()
+            if proc2.wait():  # ..Failed
+                out = proc2.communicate()[1]
+                self.notify("UPDATE_EVT",
+                            output='FAILED',
+                            duration=kwa['duration'],
+                            status=proc2.wait(),
+                            )
+                logwrite('', (f"[VIDEOMASS]: Error Exit Status: "
+                              f"{proc2.wait()} {out}"), self.logfile)
+                time.sleep(1)
+                return 'FAILED'
+
+        self.notify("COUNT_EVT",
+                    count='',
+                    duration=kwa['duration'],
+                    end='DONE'
+                    )
+        return 'DONE'
+    # --------------------------------------------------------------------#
+
+    def first_pass(self, model, kwa, retry=False):
+        """
+        Run the first (or the only) pass of the given item.
+        With the 'Two pass EBU' type, the loudness measurements
+        are also stored on `model['summary']` and cached.
+        If `retry` is True a failure is only logged, since
+        the items are processed again (see `process_group`).
+        Returns `None` if successfully completed, a status
+        string otherwise (see `process_item`).
+        """
+        self.notify("COUNT_EVT",
+                    count=model['count1'],
+                    duration=kwa['duration'],
+                    end='CONTINUE',
+                    )
+        logwrite(model['stamp1'], '', self.logfile)
+        parser = LoudnessParser()
+        try:
+            with Popen(model['pass1'],
+                       stderr=subprocess.PIPE,
+                       stdin=subprocess.PIPE,
+                       bufsize=1,
+                       universal_newlines=True,
+                       encoding=self.appdata['encoding'],
+                       cwd=model.get('workdir'),
+                       ) as proc1:
+
+                channel = ProgressChannel(kwa['duration'],
+                                          self.appdata['progress_rate'],
+                                          self.notify)
+                for line in proc1.stderr:
+                    channel.send(line)
+                    if self.stop_work_thread:
+                        channel.flush()
+                        proc1.stdin.write('q')  # stop ffmpeg
+                        out = proc1.communicate()[1]
+                        proc1.wait()
+                        self.notify("UPDATE_EVT",
+                                    output='STOP',
+                                    duration=kwa['duration'],
+                                    status=1,
+                                    )
+                        logwrite('', out, self.logfile)
+                        return 'STOP'
+
+                    if kwa["type"] == 'Two pass EBU':
+                        parser.feed(line)
+
+                channel.flush()
+                if proc1.wait():  # ..Failed
+                    out = proc1.communicate()[1]
+                    if not retry:
+                        self.notify("UPDATE_EVT",
+                                    output='FAILED',
+                                    duration=kwa['duration'],
+                                    status=proc1.wait(),
+                                    )
+                    logwrite('', (f"[VIDEOMASS]: Error Exit Status: "
+                                  f"{proc1.wait()} {out}"), self.logfile)
+                    time.sleep(1)
+                    return 'FAILED'
+
+                if kwa["type"] == 'Two pass EBU':
+                    measured = parser.ebu_summary()
+                    if measured:
+                        model['summary'].update(measured)
+                        self.loudcache.put(model['cachekey'], parser.data)
+
+        except (OSError, FileNotFoundError) as err:
+            self.fatal_error = True
+            self.notify("COUNT_EVT",
+                        count=err,
+                        duration=0,
+                        end='ERROR'
+                        )
+            logwrite('', err, self.logfile)
+            return 'ERROR'
+        return None
+    # --------------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Sets the stop work flag to terminate the process
+        """
+        self.stop_work_thread = True
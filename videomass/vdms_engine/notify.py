@@ -0,0 +1,137 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: notify.py
+Porpose: consumers of the messages sent by the processing engine
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2024
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import sys
+import time
+from threading import Lock
+from videomass.vdms_utils.utils import integer_to_time
+from videomass.vdms_io.make_filelog import logappend
+
+
+def gui_notify(topic, **kwargs):
+    """
+    Send the given message to the GUI main thread
+    by the pubsub protocol of the same `topic`.
+    wxPython is only imported when this function
+    is called, so the engine never requires it.
+    """
+    import wx
+    from pubsub import pub
+    wx.CallAfter(pub.sendMessage, topic, **kwargs)
+# ----------------------------------------------------------------------#
+
+
+class ConsoleNotify:
+    """
+    Prints the messages sent by the processing engine (see
+    `FFmpegEngine`) on a text stream (stdout by default), e.g.
+    to run jobs from the command line without a display. As the
+    GUI does, the FFmpeg output lines are written to the log file.
+
+    If the stream is not a terminal, progress is printed at
+    most once every `interval` seconds per line, otherwise
+    the same line is updated in place.
+
+    This class is thread-safe.
+    """
+    def __init__(self, logfile, stream=None, interval=5.0):
+        """
+        logfile: log filename
+        stream: text stream, if None `sys.stdout`
+        interval: min seconds between progress lines (not a tty)
+        """
+        self.logfile = logfile
+        self.stream = stream or sys.stdout
+        self.isatty = hasattr(self.stream, 'isatty') and self.stream.isatty()
+        self.interval = interval
+        self.last = 0
+        self.inplace = False  # a progress line is being updated
+        self.lock = Lock()
+    # ----------------------------------------------------------------#
+
+    def __call__(self, topic, **kwargs):
+        """
+        Receive a message, see `FFmpegEngine`
+        """
+        with self.lock:
+            if topic == 'PROGRESS_EVT':
+                self.progress(**kwargs)
+            elif topic == 'COUNT_EVT':
+                self.count(**kwargs)
+            elif topic == 'UPDATE_EVT':
+                self.write(f"{kwargs['output']}: exit status "
+                           f"{kwargs['status']}")
+    # ----------------------------------------------------------------#
+
+    def write(self, text):
+        """
+        Write a line of text on the stream
+        """
+        if self.inplace:
+            self.stream.write('\n')
+            self.inplace = False
+        self.stream.write(f'{text}\n')
+        self.stream.flush()
+    # ----------------------------------------------------------------#
+
+    def count(self, count, duration, end):
+        """
+        COUNT_EVT messages
+        """
+        if end == 'DONE':
+            self.write('Done')
+        elif end == 'ERROR':
+            self.write(f'ERROR: {count}')
+        else:
+            self.write(f'\n{count}')
+    # ----------------------------------------------------------------#
+
+    def progress(self, lines, progress, duration):
+        """
+        PROGRESS_EVT messages
+        """
+        if lines:
+            logappend(''.join([f"[FFMPEG]: {x}" for x in lines]),
+                      self.logfile)
+        if not progress:
+            return
+        if not self.isatty and time.monotonic() - self.last < self.interval:
+            return
+        self.last = time.monotonic()
+
+        percent = 0
+        if duration:
+            percent = min(round(progress['msec'] / duration * 100), 100)
+        text = (f"{percent:3}% | "
+                f"{integer_to_time(progress['msec'], False)} of "
+                f"{integer_to_time(duration or 0, False)} | "
+                f"{progress['stats']}")
+        if self.isatty:
+            self.stream.write(f'\r{text}\x1b[K')
+            self.stream.flush()
+            self.inplace = True
+        else:
+            self.write(text)
@@ -0,0 +1,125 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: queue_runner.py
+Porpose: run a saved queue file from the command line
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2024
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import sys
+import json
+from shutil import which
+from threading import Thread
+from videomass.vdms_io.make_filelog import make_log_template, LogSink
+from videomass.vdms_engine.ffmpeg_engine import FFmpegEngine
+from videomass.vdms_engine.notify import ConsoleNotify
+
+QUEUE_KEYS = ('type', 'args', 'extension', 'logname', 'source',
+              'preset name', 'destination', 'duration', 'start-time',
+              'end-time',)
+
+
+def load_queue(queuefile):
+    """
+    Load and validate a queue json file (see `queue_utils`).
+    Returns a tuple (data, error) where `error` is a
+    message string, `None` if the queue is valid.
+    """
+    try:
+        with open(queuefile, 'r', encoding='utf-8') as fln:
+            data = json.load(fln)
+    except (OSError, json.decoder.JSONDecodeError) as err:
+        return None, f'{err}.\nInvalid file: «{queuefile}»'
+
+    if not isinstance(data, list) or not data:
+        return None, f'No items found in queue file: «{queuefile}»'
+
+    for item in data:
+        if [key for key in QUEUE_KEYS if key not in item]:
+            return None, ('Keys mismatched for requested data.\n'
+                          f'Invalid file: «{queuefile}»')
+        if item['type'] not in ('One pass',) + FFmpegEngine.TWOPASS:
+            return None, f"Unsupported item type: «{item['type']}»"
+
+    occurences = [item['destination'] for item in data]
+    if any(occurences.count(x) > 1 for x in occurences):
+        return None, ('Cannot contain multiple occurrences in '
+                      f'`destination` keys value: «{queuefile}»')
+    return data, None
+# ----------------------------------------------------------------------#
+
+
+def run_queue(queuefile, appdata, jobs=None, stream=None):
+    """
+    Process all items of the given queue file with the
+    `FFmpegEngine`, printing the progress on `stream`
+    (stdout by default). `appdata` is the dict of the
+    application settings (see `DataSource.get_fileconf`),
+    `jobs` overrides the `ffmpeg_jobs` option if given.
+    As the GUI does, the items completed by a previous
+    run of the same queue are skipped (see `JobJournal`).
+    The engine runs on a worker thread, so that a Ctrl-C
+    received by the main thread stops it at once and the
+    items still queued are not started.
+    Returns the exit status: 0 if all items were
+    successfully completed, 1 otherwise, 130 if
+    interrupted by the user.
+    """
+    stream = stream or sys.stdout
+    queue, error = load_queue(queuefile)
+    if error:
+        stream.write(f'ERROR: {error}\n')
+        return 1
+
+    appdata = dict(appdata)
+    if jobs:
+        appdata['ffmpeg_jobs'] = max(int(jobs), 1)
+    if not which(appdata['ffmpeg_cmd'], mode=os.F_OK | os.X_OK, path=None):
+        stream.write(f"ERROR: FFmpeg not found: «{appdata['ffmpeg_cmd']}»\n")
+        return 1
+
+    os.makedirs(appdata['logdir'], mode=0o777, exist_ok=True)
+    logfile = make_log_template('Queue Processing.log',
+                                appdata['logdir'], mode="w")
+    journal = os.path.join(appdata['confdir'], 'queue.journal')
+    engine = FFmpegEngine(appdata, logfile, queue,
+                          ConsoleNotify(logfile, stream),
+                          journal=journal)
+    result = []
+    worker = Thread(target=lambda: result.extend(engine.run()),
+                    daemon=True)
+    worker.start()
+    try:
+        while worker.is_alive():
+            worker.join(0.2)  # a timeout lets the signals through
+    except KeyboardInterrupt:
+        engine.stop()
+        worker.join()
+        stream.write('\nInterrupted by the user\n')
+        return 130
+    finally:
+        LogSink.close_all()
+
+    done = result.count('DONE')
+    stream.write(f'\n{done}/{len(queue)} items successfully completed.\n'
+                 f'Log file: «{logfile}»\n')
+    return 0 if done == len(queue) else 1
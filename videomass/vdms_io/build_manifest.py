@@ -0,0 +1,173 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: build_manifest.py
+Porpose: fingerprints of the output files to skip up-to-date jobs
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2024
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import json
+import hashlib
+from functools import lru_cache
+from threading import Lock
+from videomass.vdms_threads.check_bin import subp
+from videomass.vdms_io.job_journal import file_checksum
+
+MANIFEST = '.videomass_manifest.json'
+# keys of the queue items that never change the output file
+IGNORED_KEYS = ('source', 'duration', 'logname', 'preset name')
+
+
+@lru_cache(maxsize=8)
+def ffmpeg_version(ffmpeg_cmd, ostype):
+    """
+    Returns the output of `ffmpeg -version` (version
+    number, compiler and configuration flags) of the
+    given executable, an empty string if fails.
+    """
+    version = subp([ffmpeg_cmd, '-loglevel', 'error', '-version'], ostype)
+    if 'Not found' in version[0]:
+        return ''
+    return version[1].strip()
+# ----------------------------------------------------------------------#
+
+
+def fingerprint(item, version, content=False):
+    """
+    Returns the fingerprint (SHA-256 hex digest) of the output
+    file of the given queue item (dict), `None` if the source
+    file is not accessible. It combines the identity of the
+    source file (pathname, size, mtime and, if `content` is
+    True, a partial hash of its contents, see `file_checksum`),
+    the arguments of the item (i.e. the FFmpeg arguments, the
+    time selection and the destination) and the FFmpeg
+    `version` string.
+    """
+    source = os.path.abspath(item['source'])
+    try:
+        stat = os.stat(source)
+    except OSError:
+        return None
+    identity = [source, stat.st_size, stat.st_mtime_ns,
+                file_checksum(source) if content else None]
+    args = {key: val for key, val in item.items() if key not in IGNORED_KEYS}
+    data = json.dumps([identity, args, version], sort_keys=True)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+# ----------------------------------------------------------------------#
+
+
+class BuildManifest:
+    """
+    Records the fingerprints (see `fingerprint`) of the output
+    files successfully written, like a build system does. Each
+    output directory has its own manifest JSON file (`MANIFEST`)
+    next to the output files, so the same outputs are recognized
+    even if the application data or the queue change.
+
+    An output file is up to date if its fingerprint matches
+    the recorded one and its size and modification time did
+    not change since it was recorded.
+
+    USAGE:
+        >>> manifest = BuildManifest()
+        >>> fprint = fingerprint(item, version)
+        >>> if not manifest.is_uptodate(item['destination'], fprint):
+        >>>     ...
+        >>>     manifest.record(item['destination'], fprint)
+
+    This class is thread-safe.
+    """
+    VERSION = 1
+
+    def __init__(self):
+        """
+        The manifest files are loaded on demand
+        """
+        self.dirs = {}  # dirname: entries
+        self.lock = Lock()
+    # ----------------------------------------------------------------#
+
+    def entries(self, dirname):
+        """
+        Returns the entries of the manifest of the given
+        output directory, loading it if needed. Requires lock.
+        """
+        if dirname in self.dirs:
+            return self.dirs[dirname]
+        self.dirs[dirname] = {}
+        try:
+            with open(os.path.join(dirname, MANIFEST), 'r',
+                      encoding='utf-8') as fln:
+                data = json.load(fln)
+        except (OSError, json.JSONDecodeError):
+            return self.dirs[dirname]
+
+        if isinstance(data, dict) and data.get('version') == self.VERSION:
+            self.dirs[dirname] = data.get('entries', {})
+        return self.dirs[dirname]
+    # ----------------------------------------------------------------#
+
+    def is_uptodate(self, output, fprint):
+        """
+        Returns True if the given output file is
+        up to date with the given fingerprint.
+        """
+        if not fprint:
+            return False
+        dirname, basename = os.path.split(os.path.abspath(output))
+        with self.lock:
+            entry = self.entries(dirname).get(basename)
+        if not entry or entry['fingerprint'] != fprint:
+            return False
+        try:
+            stat = os.stat(output)
+        except OSError:
+            return False
+        return [stat.st_size, stat.st_mtime_ns] == entry['stat']
+    # ----------------------------------------------------------------#
+
+    def record(self, output, fprint):
+        """
+        Record the fingerprint of the given output file and
+        write the manifest of its directory. The file is first
+        written to a temporary file and then renamed.
+        """
+        if not fprint:
+            return
+        dirname, basename = os.path.split(os.path.abspath(output))
+        try:
+            stat = os.stat(output)
+        except OSError:
+            return
+        with self.lock:
+            entries = self.entries(dirname)
+            entries[basename] = {'fingerprint': fprint,
+                                 'stat': [stat.st_size, stat.st_mtime_ns]}
+            manifest = os.path.join(dirname, MANIFEST)
+            tmp = f'{manifest}.tmp'
+            try:
+                with open(tmp, 'w', encoding='utf-8') as fln:
+                    json.dump({'version': self.VERSION,
+                               'entries': entries}, fln, indent=1)
+                os.replace(tmp, manifest)
+            except OSError:
+                pass
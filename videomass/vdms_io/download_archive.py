@@ -0,0 +1,131 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: download_archive.py
+Porpose: archive of the media already downloaded by yt-dlp
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2024
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+from threading import Lock
+
+ARCHIVE = 'download_archive.txt'
+
+
+class DownloadArchive:
+    """
+    Persistent archive of the media downloaded by yt-dlp, keyed
+    by extractor and media id. The file has the same format of
+    the yt-dlp `--download-archive` file (a line "extractor id"
+    for each media), so it is shared by the yt-dlp executable
+    and by the yt-dlp module, to which an instance of this
+    class can be given as `download_archive` option: yt-dlp
+    looks up the archive before any network request for the
+    media (or for the playlist entries) and adds the media to
+    it once downloaded.
+
+    The file is loaded once in a set, so all the lookups are
+    done in memory. Each media is recorded by appending a single
+    line with a single write; a line left incomplete by a crash
+    is never merged with the next one.
+
+    USAGE:
+        >>> archive = DownloadArchive('/path/to/download_archive.txt')
+        >>> ydl_opts = {'download_archive': archive, ...}
+        >>> DownloadArchive.key('Youtube', 'dQw4w9WgXcQ') in archive
+
+    This class is thread-safe.
+    """
+
+    def __init__(self, filename):
+        """
+        filename: pathname of the archive file
+        """
+        self.filename = filename
+        self.keys = set()
+        self.newline = False  # True if the file has an incomplete line
+        self.lock = Lock()
+        self.load()
+    # ----------------------------------------------------------------#
+
+    def __repr__(self):
+        return f"DownloadArchive('{self.filename}')"
+    # ----------------------------------------------------------------#
+
+    @staticmethod
+    def key(extractor, media_id):
+        """
+        Returns the archive key of the given extractor
+        name and media id, as given by yt-dlp.
+        """
+        return f'{extractor.lower()} {media_id}'
+    # ----------------------------------------------------------------#
+
+    def load(self):
+        """
+        Load the archive file if exists
+        """
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as fln:
+                data = fln.read()
+        except OSError:
+            return
+        lines = data.split('\n')
+        self.newline = bool(lines[-1])  # missing final newline
+        with self.lock:
+            self.keys.update([x.strip() for x in lines[:-1] if x.strip()])
+    # ----------------------------------------------------------------#
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.keys
+    # ----------------------------------------------------------------#
+
+    def __len__(self):
+        with self.lock:
+            return len(self.keys)
+    # ----------------------------------------------------------------#
+
+    def add(self, key):
+        """
+        Record the given key (see `key`) and append it to
+        the archive file, if not already recorded.
+        """
+        key = key.strip()
+        with self.lock:
+            if not key or key in self.keys:
+                return
+            self.keys.add(key)
+            line = f'\n{key}\n' if self.newline else f'{key}\n'
+            try:
+                dirname = os.path.dirname(self.filename)
+                if dirname:
+                    os.makedirs(dirname, exist_ok=True)
+                fd = os.open(self.filename,
+                             os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, line.encode('utf-8'))
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+                self.newline = False
+            except OSError:
+                pass
@@ -0,0 +1,245 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: frame_cache.py
+Porpose: in-memory cache of the preview frames grabbed by FFmpeg
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2024
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import subprocess
+from collections import OrderedDict
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from threading import RLock
+from videomass.vdms_utils.utils import Popen
+
+
+def grab_frame(ffmpeg_cmd, filename, msec, size, started=None):
+    """
+    Grab a single frame from the given time position (`msec`,
+    milliseconds) of the given video file. The frame is scaled
+    by FFmpeg to the given `size` (tuple width, height) and read
+    via stdout as raw RGB24 pixels, so no image file is written.
+    Returns a tuple (data, error): `data` is a bytes object of
+    width * height * 3 bytes (`None` if fails), `error` is an
+    error message (`None` if succeeds).
+    If given, `started` is called with the FFmpeg `Popen`
+    object once started, e.g. to terminate it on exit.
+    """
+    width, height = size
+    seek = ['-ss', f'{msec / 1000:.3f}'] if msec else []
+    cmd = ([ffmpeg_cmd, '-hide_banner', '-nostdin', '-loglevel', 'error']
+           + seek + ['-i', filename, '-an', '-sn', '-dn', '-frames:v', '1',
+                     '-vf', f'scale={width}:{height}', '-f', 'rawvideo',
+                     '-pix_fmt', 'rgb24', 'pipe:1'])
+    try:
+        with Popen(cmd,
+                   stdout=subprocess.PIPE,
+                   stderr=subprocess.PIPE,
+                   stdin=subprocess.DEVNULL,
+                   ) as proc:
+            if started:
+                started(proc)
+            data, err = proc.communicate()
+    except OSError as error:
+        return None, f'{error}'
+
+    if proc.returncode or len(data) != width * height * 3:
+        error = err.decode('utf-8', errors='replace').strip()
+        return None, error or 'No frame found at the given time position'
+    return data, None
+# ----------------------------------------------------------------------#
+
+
+class FrameCache:
+    """
+    LRU in-memory cache of the preview frames (see `grab_frame`),
+    e.g. used by the Crop dialog. Each entry is keyed by the
+    absolute pathname, the time position and the size of the
+    frame, and is valid as long as the size and modification
+    time of the file do not change.
+
+    Frames are grabbed in background by a small pool of worker
+    threads; a request also prefetches the frames around the
+    requested position, so that moving on them is instant.
+    The grabs of a previous request that have not started yet
+    are cancelled by a new request, this keeps the workers busy
+    only on the last position while scrubbing.
+
+    USAGE:
+        >>> cache = FrameCache()
+        >>> data = cache.lookup(filename, msec, (width, height))
+        >>> if data is None:
+        >>>     cache.request(ffmpeg_cmd, filename, [msec, msec + 1000],
+        >>>                   (width, height), callback)
+
+    This class is thread-safe.
+    """
+    def __init__(self, maxsize=48, workers=2):
+        """
+        maxsize: max number of cached frames
+        workers: max number of concurrent FFmpeg processes
+        """
+        self.maxsize = max(int(maxsize), 1)
+        self.entries = OrderedDict()
+        self.pending = {}  # key: future of the grabs in progress
+        self.queued = {}  # key: future of the last request
+        self.running = {}  # key: Popen object of the grabs in progress
+        self.lock = RLock()  # cancelled futures call `forget`
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+    # ----------------------------------------------------------------#
+
+    @staticmethod
+    def key(filename, msec, size):
+        """
+        Returns the key of an entry, `None` if the
+        file is not accessible.
+        """
+        path = os.path.abspath(filename)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (path, stat.st_size, stat.st_mtime_ns, int(msec), tuple(size))
+    # ----------------------------------------------------------------#
+
+    def lookup(self, filename, msec, size):
+        """
+        Returns the cached frame data of the given file,
+        time position and size, `None` if not cached.
+        """
+        key = self.key(filename, msec, size)
+        with self.lock:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            return self.entries[key]
+    # ----------------------------------------------------------------#
+
+    def grab(self, key, ffmpeg_cmd):
+        """
+        Worker: grab the frame of the given key and store it
+        """
+        try:
+            data, error = grab_frame(ffmpeg_cmd, key[0], key[3], key[4],
+                                     started=partial(self.started, key))
+        finally:
+            with self.lock:
+                self.running.pop(key, None)
+        if data is not None:
+            with self.lock:
+                self.entries[key] = data
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.maxsize:
+                    self.entries.popitem(last=False)
+        return data, error
+    # ----------------------------------------------------------------#
+
+    def started(self, key, proc):
+        """
+        Keep the given FFmpeg process of the given key,
+        so that it can be terminated, see `shutdown`.
+        """
+        with self.lock:
+            self.running[key] = proc
+    # ----------------------------------------------------------------#
+
+    def forget(self, key, future):
+        """
+        Remove the given done (or cancelled) future from
+        the grabs in progress.
+        """
+        with self.lock:
+            if self.pending.get(key) is future:
+                del self.pending[key]
+    # ----------------------------------------------------------------#
+
+    def request(self, ffmpeg_cmd, filename, positions, size, callback=None):
+        """
+        Grab in background the frames at the given time positions
+        (list of milliseconds) which are not cached, the first is
+        the requested frame, the others are prefetched in the
+        given order. Pending grabs of the previous request not
+        started yet and not requested again are cancelled.
+
+        If given, `callback(msec, data, error)` is called with the
+        requested frame (see `grab_frame`), immediately if cached,
+        otherwise by a worker thread.
+        """
+        keys = [(msec, self.key(filename, msec, size)) for msec in positions]
+        if not keys or keys[0][1] is None:
+            if callback and positions:
+                callback(positions[0], None, f'No such file: "{filename}"')
+            return
+        queued, submitted, cached = {}, [], None
+        with self.lock:
+            for key, future in self.queued.items():
+                if key not in [k for _, k in keys]:
+                    future.cancel()
+            for idx, (_, key) in enumerate(keys):
+                if key in self.entries:
+                    if not idx:
+                        cached = self.entries[key]
+                    continue
+                future = self.pending.get(key)
+                if future is None or future.cancelled():
+                    future = self.executor.submit(self.grab, key, ffmpeg_cmd)
+                    self.pending[key] = future
+                    submitted.append((key, future))
+                queued[key] = future
+                if not idx:
+                    requested = future
+            self.queued = queued
+
+        for key, future in submitted:
+            future.add_done_callback(
+                lambda fut, key=key: self.forget(key, fut))
+        if not callback:
+            return
+        if cached is not None:
+            callback(positions[0], cached, None)
+        else:
+            requested.add_done_callback(
+                lambda fut: fut.cancelled()
+                or callback(positions[0], *fut.result()))
+    # ----------------------------------------------------------------#
+
+    def clear(self):
+        """
+        Remove all the cached frames
+        """
+        with self.lock:
+            self.entries.clear()
+    # ----------------------------------------------------------------#
+
+    def shutdown(self):
+        """
+        Cancel the pending grabs, terminate the grabs still
+        running and stop the worker threads, e.g. on exit.
+        """
+        with self.lock:
+            for future in self.pending.values():
+                future.cancel()
+            procs = list(self.running.values())
+        for proc in procs:
+            proc.terminate()
+        self.executor.shutdown(wait=False)
@@ -39,28 +39,36 @@ from videomass.vdms_dialogs.widget_utils import PopupDialog
 from videomass.vdms_ytdlp.ydl_extractinfo import YdlExtractInfo
 
 
-def youtubedl_getstatistics(url, kwargs, parent=None):
+def youtubedl_getstatistics(urls, kwargs, parent=None):
     """
-    Call `YdlExtractInfo` thread to extract data info.
-    During this process a wait pop-up dialog is shown.
+    Call `YdlExtractInfo` thread to extract data info of all
+    the given URLs at the same time, through the shared
+    `MetadataCache`. During this process a wait pop-up dialog
+    is shown, unless all URLs are already cached.
 
-    Returns a generator.
+    Returns a generator of tuples (meta, error), one
+    for each URL in the same order.
 
     Usage example without pop-up dialog:
-        thread = YdlExtractInfo(url)
+        thread = YdlExtractInfo(urls, kwargs)
         thread.join()
-        data = thread.data
-        yield data
+        for data in thread.data:
+            ...
     """
-    thread = YdlExtractInfo(url, kwargs)
+    cache = wx.GetApp().metadatacache
+    cached = [cache.get(url, kwargs) for url in urls]
+    if None not in cached:
+        yield from [(meta, None) for meta in cached]
+        return
+
+    thread = YdlExtractInfo(urls, kwargs)
     dlgload = PopupDialog(parent,
                           _("Videomass - Loading..."),
                           _("Wait....\nRetrieving required data."))
     dlgload.ShowModal()
-    # thread.join()
-    data = thread.data
+    thread.join()
     dlgload.Destroy()
-    yield data
+    yield from thread.data
 # --------------------------------------------------------------------------#
 
 
@@ -84,17 +92,20 @@ def stream_play(filepath, timeseq, param, autoexit):
 # -----------------------------------------------------------------------#
 
 
-def volume_detect_process(filelist, timeseq, audiomap, parent=None):
+def volume_detect_process(filelist, timeseq, audiomap, parent=None,
+                          loudnorm=None):
     """
     Run thread to get audio peak level data
     showing a pop-up message dialog.
+    The optional `loudnorm` targets are measured in
+    the same decode, see `VolumeDetectThread`.
     """
     if timeseq:
         splseq = timeseq.split()
         tseq = f'{splseq[0]} {splseq[1]}', f'{splseq[2]} {splseq[3]}'
     else:
         tseq = '', ''
-    thread = VolumeDetectThread(tseq, filelist, audiomap)
+    thread = VolumeDetectThread(tseq, filelist, audiomap, loudnorm=loudnorm)
     dlgload = PopupDialog(parent,
                           _("Videomass - Loading..."),
                           _("Wait....\nAudio peak analysis."),
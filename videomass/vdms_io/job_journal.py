@@ -0,0 +1,241 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: job_journal.py
+Porpose: durable state journal of the queue items
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2024
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import json
+import time
+import hashlib
+from threading import Lock
+
+
+def file_checksum(filename, sample=1048576):
+    """
+    Returns a SHA-256 hex digest of the size and of the first,
+    middle and last `sample` bytes of the given file, so that
+    even very large media files are checked in a few reads.
+    Returns `None` if the file is not accessible.
+    """
+    try:
+        size = os.path.getsize(filename)
+        sha = hashlib.sha256(str(size).encode('utf-8'))
+        with open(filename, 'rb') as fln:
+            for offset in sorted({0, max(size // 2 - sample // 2, 0),
+                                  max(size - sample, 0)}):
+                fln.seek(offset)
+                sha.update(fln.read(sample))
+    except OSError:
+        return None
+    return sha.hexdigest()
+# ----------------------------------------------------------------------#
+
+
+class JobJournal:
+    """
+    Durable journal of the state of each item of a queue, stored
+    as a JSON file which is rewritten atomically (and synced to
+    disk) at each state change, so it survives crashes and reboots.
+
+    Each entry is keyed by a digest of the item arguments, source
+    and destination, and records the state ('pending', 'running',
+    'done' or 'failed'), the output pathname, the start time and,
+    once done, the size and the checksum of the output file (see
+    `file_checksum`).
+
+    An item is only considered completed if its output file still
+    matches the recorded size and checksum; the output of an item
+    that was not completed (e.g. interrupted by a crash) and that
+    was written after it started is a half-written file and is
+    discarded, see `resume`.
+
+    USAGE:
+        >>> journal = JobJournal('/path/to/queue.journal')
+        >>> journal.resume(items)  # discard half-written outputs
+        >>> if not journal.is_done(item):
+        >>>     journal.begin(item)
+        >>>     ...
+        >>>     journal.end(item, 'DONE')
+        >>> journal.remove()  # e.g. when the whole queue is done
+
+    This class is thread-safe.
+    """
+    VERSION = 1
+
+    def __init__(self, filename):
+        """
+        filename: pathname of the JSON journal file
+        """
+        self.filename = filename
+        self.entries = {}
+        self.lock = Lock()
+        self.load()
+    # ----------------------------------------------------------------#
+
+    @staticmethod
+    def key(item):
+        """
+        Returns the journal key of the given queue item (dict)
+        """
+        data = [item.get(k) for k in ('type', 'source', 'destination',
+                                      'args', 'start-time', 'end-time')]
+        return hashlib.sha256(json.dumps(data).encode('utf-8')).hexdigest()
+    # ----------------------------------------------------------------#
+
+    def load(self):
+        """
+        Load the journal file if exists. A missing, unreadable
+        or incompatible journal is silently discarded.
+        """
+        if not os.path.isfile(self.filename):
+            return
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as fln:
+                data = json.load(fln)
+        except (OSError, json.JSONDecodeError):
+            return
+
+        if isinstance(data, dict) and data.get('version') == self.VERSION:
+            self.entries = data.get('entries', {})
+    # ----------------------------------------------------------------#
+
+    def save(self):
+        """
+        Write the journal file. It is first written and synced
+        to a temporary file and then renamed. Requires lock.
+        """
+        tmp = f'{self.filename}.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as fln:
+                json.dump({'version': self.VERSION,
+                           'entries': self.entries}, fln, indent=1)
+                fln.flush()
+                os.fsync(fln.fileno())
+            os.replace(tmp, self.filename)
+        except OSError:
+            pass
+    # ----------------------------------------------------------------#
+
+    def resume(self, items):
+        """
+        Prepare the journal to process the given list of
+        queue items: discard the half-written output files of
+        the entries not completed and remove the entries that
+        no longer belong to the queue. New items are recorded
+        as 'pending'. Returns the list of the discarded files.
+        """
+        discarded = []
+        with self.lock:
+            keys = {self.key(item): item for item in items}
+            for key, entry in list(self.entries.items()):
+                if entry['state'] != 'done':
+                    output = entry['destination']
+                    try:
+                        if os.path.getmtime(output) >= entry['started']:
+                            os.remove(output)
+                            discarded.append(output)
+                    except (OSError, KeyError, TypeError):
+                        pass
+                    entry['state'] = 'pending'
+                if key not in keys:
+                    del self.entries[key]
+
+            for key, item in keys.items():
+                if key not in self.entries:
+                    self.entries[key] = {'state': 'pending',
+                                         'destination': item['destination'],
+                                         'started': None,
+                                         }
+            self.save()
+        return discarded
+    # ----------------------------------------------------------------#
+
+    def is_done(self, item):
+        """
+        Returns True if the given item was successfully completed
+        and its output file was not modified since then.
+        """
+        with self.lock:
+            entry = self.entries.get(self.key(item))
+        if not entry or entry['state'] != 'done':
+            return False
+        try:
+            if os.path.getsize(entry['destination']) != entry['size']:
+                return False
+        except OSError:
+            return False
+        return file_checksum(entry['destination']) == entry['checksum']
+    # ----------------------------------------------------------------#
+
+    def begin(self, item):
+        """
+        Record the given item as 'running'
+        """
+        with self.lock:
+            self.entries[self.key(item)] = {
+                'state': 'running',
+                'destination': item['destination'],
+                'started': time.time(),
+            }
+            self.save()
+    # ----------------------------------------------------------------#
+
+    def end(self, item, status):
+        """
+        Record the final state of the given item from the
+        status string returned by the engine: 'DONE' is
+        recorded as 'done', 'STOP' and 'SKIP' as 'pending'
+        (to be resumed), anything else as 'failed'.
+        """
+        key = self.key(item)
+        with self.lock:
+            entry = self.entries.get(key)
+            if not entry or entry['state'] != 'running':
+                return
+            if status == 'DONE':
+                output = entry['destination']
+                entry['checksum'] = file_checksum(output)
+                if entry['checksum']:
+                    entry['size'] = os.path.getsize(output)
+                    entry['state'] = 'done'
+                else:
+                    entry['state'] = 'failed'
+            elif status in ('STOP', 'SKIP'):
+                entry['state'] = 'pending'
+            else:
+                entry['state'] = 'failed'
+            self.save()
+    # ----------------------------------------------------------------#
+
+    def remove(self):
+        """
+        Delete the journal file, e.g. when all
+        the items of the queue have been completed.
+        """
+        with self.lock:
+            self.entries.clear()
+            try:
+                os.remove(self.filename)
+            except OSError:
+                pass
@@ -0,0 +1,276 @@
+# -*- coding: UTF-8 -*-
+"""
+File Name: loudness_cache.py
+Porpose: fused loudness analysis data and cache
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2024
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import re
+import json
+import copy
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+
+
+def loudnorm_targets(loudnorm):
+    """
+    Returns a tuple (I, TP, LRA) of strings with the target values
+    of the given loudnorm filter string, e.g. 'loudnorm=I=-16:TP=-1.5:
+    LRA=11:print_format=summary', `None` if not a loudnorm filter.
+    """
+    if not loudnorm or 'loudnorm=' not in loudnorm:
+        return None
+    opts = loudnorm.split('loudnorm=', 1)[1].split()[0]
+    vals = dict(x.split('=', 1) for x in opts.split(':') if '=' in x)
+    return vals.get('I', '-24'), vals.get('TP', '-2'), vals.get('LRA', '7')
+# ----------------------------------------------------------------------#
+
+
+def audio_index(args):
+    """
+    Returns the index (str) of the first input audio stream
+    selected by the given FFmpeg arguments (e.g. '-map 0:a:1'),
+    an empty string if no audio stream is selected explicitly.
+    """
+    match = re.search(r'-map\s+0:a:(\d+)', args or '')
+    return match.group(1) if match else ''
+# ----------------------------------------------------------------------#
+
+
+def fused_filter(targets, ebur128=False):
+    """
+    Returns an audio filter graph that measures with a single
+    decode the volume (volumedetect), the loudness for the EBU R128
+    two-pass normalization (loudnorm with JSON output) with the given
+    `targets` (see `loudnorm_targets`), and optionally the ebur128
+    integrated loudness, loudness range and true peak.
+    """
+    graph = ['volumedetect']
+    if ebur128:
+        graph.append('ebur128=peak=true:framelog=quiet')
+    if targets:
+        graph.append(f'loudnorm=I={targets[0]}:TP={targets[1]}:'
+                     f'LRA={targets[2]}:print_format=json')
+    return ','.join(graph)
+# ----------------------------------------------------------------------#
+
+
+def detect_files(detect, filelist, jobs):
+    """
+    Run the analysis `detect(filename)` of the given files on a
+    pool of up to `jobs` worker threads. `detect` returns a tuple
+    (volume, status, output) where `status` is `None` if successful,
+    or (None, None, None) if the file was skipped (e.g. after a stop).
+
+    The results are always collected in the same order as `filelist`
+    and, as in a sequential run, end with the first file that failed
+    or was skipped, the files not started yet are cancelled.
+    Returns a tuple (volumes, status, output) where `status` and
+    `output` are the ones of the failed file, if any.
+    """
+    volumes, status, output = [], None, None
+    jobs = max(min(int(jobs), len(filelist)), 1)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(detect, x) for x in filelist]
+        for future in futures:
+            vol, status, output = future.result()
+            if status is None and vol is None:
+                break  # skipped after stop or error
+            volumes.append(vol)
+            if status:
+                break
+        for future in futures:
+            future.cancel()
+    return volumes, status, output
+# ----------------------------------------------------------------------#
+
+
+class LoudnessParser:
+    """
+    Incremental parser of the FFmpeg output produced by the
+    `fused_filter` graph. Lines are given one by one to the
+    `feed` method, the collected measurements are available
+    on the `data` attribute as a dict which may contain the
+    following keys (all values are strings):
+
+        'max_volume', 'mean_volume' (volumedetect, e.g. '-1.2 dB'),
+        'input_i', 'input_tp', 'input_lra', 'input_thresh',
+        'target_offset', ... (loudnorm JSON),
+        'ebur128_i', 'ebur128_lra', 'ebur128_tp' (ebur128 summary)
+    """
+    EBUR128 = {'I:': 'ebur128_i', 'LRA:': 'ebur128_lra',
+               'Peak:': 'ebur128_tp'}
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.data = {}
+        self.json = None  # lines of the loudnorm JSON block
+        self.summary = False  # inside the ebur128 summary
+    # ----------------------------------------------------------------#
+
+    def feed(self, line):
+        """
+        Parse the given output line
+        """
+        text = line.strip()
+        if self.json is not None:
+            self.json.append(text)
+            if text == '}':
+                try:
+                    self.data.update(json.loads(''.join(self.json)))
+                except json.JSONDecodeError:
+                    pass
+                self.json = None
+            return
+
+        if text == '{':
+            self.json = [text]
+        elif 'max_volume:' in text:
+            self.data['max_volume'] = text.split(':')[1].strip()
+        elif 'mean_volume:' in text:
+            self.data['mean_volume'] = text.split(':')[1].strip()
+        elif text.endswith('Summary:'):
+            self.summary = True
+        elif self.summary and text.split(' ', 1)[0] in self.EBUR128:
+            key, val = text.split(None, 1)
+            self.data.setdefault(self.EBUR128[key], val.split()[0])
+    # ----------------------------------------------------------------#
+
+    def ebu_summary(self):
+        """
+        Returns the loudnorm measurements in the same form of
+        the `summary` dict used by the EBU R128 two-pass process
+        (see `ffmpeg.one_pass_ebu`), `None` if not available.
+        """
+        return ebu_summary(self.data)
+# ----------------------------------------------------------------------#
+
+
+def ebu_summary(data):
+    """
+    Convert the loudnorm measurements of the given `data` dict
+    (see `LoudnessParser`) to the `summary` dict used by the EBU
+    R128 two-pass process, `None` if not available.
+    """
+    keys = {'Input Integrated:': 'input_i',
+            'Input True Peak:': 'input_tp',
+            'Input LRA:': 'input_lra',
+            'Input Threshold:': 'input_thresh',
+            'Output Integrated:': 'output_i',
+            'Output True Peak:': 'output_tp',
+            'Output LRA:': 'output_lra',
+            'Output Threshold:': 'output_thresh',
+            'Normalization Type:': 'normalization_type',
+            'Target Offset:': 'target_offset',
+            }
+    if not data or 'input_i' not in data:
+        return None
+    return {k: data.get(v) for k, v in keys.items()}
+# ----------------------------------------------------------------------#
+
+
+class LoudnessCache:
+    """
+    In-memory cache of the loudness measurements of the media
+    files (see `LoudnessParser`), so that the data measured once
+    by a fused analysis pass (e.g. the PEAK/RMS volume analysis)
+    can be reused by the encoding phase (e.g. the first pass of
+    the EBU R128 normalization) without decoding the files again.
+
+    Each entry is keyed by the absolute pathname, the time
+    segment, the input audio stream index and the loudnorm
+    targets, and is valid as long as the size and modification
+    time of the file do not change.
+
+    This class is thread-safe.
+    """
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.entries = {}
+        self.lock = Lock()
+    # ----------------------------------------------------------------#
+
+    @staticmethod
+    def key(path, timeseq, index, targets):
+        """
+        Returns the key of an entry.
+        path: pathname of the media file
+        timeseq: tuple (start time args, end time args)
+        index: input audio stream index, see `audio_index`
+        targets: loudnorm targets, see `loudnorm_targets`
+        """
+        return (os.path.abspath(path),
+                tuple(' '.join(x.split()) for x in timeseq),
+                index, tuple(targets) if targets else None)
+    # ----------------------------------------------------------------#
+
+    @staticmethod
+    def stat_key(path):
+        """
+        Returns a tuple (size, mtime_ns) of the given
+        pathname, `None` if the file is not accessible.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+    # ----------------------------------------------------------------#
+
+    def get(self, key):
+        """
+        Returns a copy of the measurements of the given
+        key, `None` if not cached or no longer valid.
+        """
+        stat = LoudnessCache.stat_key(key[0])
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if stat is None or entry[0] != stat:
+                del self.entries[key]
+                return None
+            return copy.deepcopy(entry[1])
+    # ----------------------------------------------------------------#
+
+    def put(self, key, data):
+        """
+        Store a copy of the given measurements (`data`, dict)
+        """
+        stat = LoudnessCache.stat_key(key[0])
+        if stat is None or not data:
+            return
+        with self.lock:
+            self.entries[key] = (stat, copy.deepcopy(data))
+    # ----------------------------------------------------------------#
+
+    def clear(self):
+        """
+        Remove all entries
+        """
+        with self.lock:
+            self.entries.clear()
@@ -27,6 +27,159 @@ This file is part of Videomass.
 
 import time
 import os
+from threading import Thread, Lock, Event
+
+
+class LogSink:
+    """
+    Buffered writer of a log file. Instead of opening, appending
+    and closing the log file for each message, a single file handle
+    is kept open for each log file and messages are buffered in
+    memory, then written when the buffer exceeds `FLUSH_SIZE` bytes,
+    every `FLUSH_INTERVAL` seconds (by a background daemon thread)
+    or when `flush` is called, e.g. at the end of a process.
+
+    When a log file exceeds `MAXSIZE` bytes, it is rotated to
+    `logname.1` (the previous one is discarded) and a new log
+    file is started.
+
+    Instances are shared, use the `LogSink.get` class method
+    (or the `logwrite`, `logappend` functions) to obtain the
+    sink of a given log file.
+
+    This class is thread-safe.
+    """
+    FLUSH_INTERVAL = 1.0  # seconds
+    FLUSH_SIZE = 65536  # bytes
+    MAXSIZE = 10485760  # 10 MiB, bytes
+    SINKS = {}
+    LOCK = Lock()
+    FLUSHER = None  # background flusher thread
+    WAKEUP = Event()
+
+    def __init__(self, logfile, txtenc="utf-8"):
+        """
+        logfile: pathname of the log file
+        txtenc: text encoding
+        """
+        self.logfile = logfile
+        self.txtenc = txtenc
+        self.buffer = []
+        self.size = 0
+        self.handle = None
+        self.lock = Lock()
+    # ----------------------------------------------------------------#
+
+    @classmethod
+    def get(cls, logfile, txtenc="utf-8"):
+        """
+        Returns the shared sink of the given `logfile`,
+        creating it if needed.
+        """
+        key = os.path.abspath(logfile)
+        with cls.LOCK:
+            sink = cls.SINKS.get(key)
+            if sink is None:
+                sink = cls.SINKS[key] = LogSink(logfile, txtenc)
+            if cls.FLUSHER is None:
+                cls.FLUSHER = Thread(target=cls.flusher, daemon=True)
+                cls.FLUSHER.start()
+        return sink
+    # ----------------------------------------------------------------#
+
+    @classmethod
+    def flusher(cls):
+        """
+        Body of the background flusher thread
+        """
+        while True:
+            cls.WAKEUP.wait(cls.FLUSH_INTERVAL)
+            cls.WAKEUP.clear()
+            cls.flush_all()
+    # ----------------------------------------------------------------#
+
+    @classmethod
+    def flush_all(cls):
+        """
+        Write the pending messages of all sinks
+        """
+        with cls.LOCK:
+            sinks = list(cls.SINKS.values())
+        for sink in sinks:
+            sink.flush()
+    # ----------------------------------------------------------------#
+
+    @classmethod
+    def close_all(cls, logfile=None):
+        """
+        Write the pending messages and close the file handle of
+        the given `logfile` or of all sinks if `logfile` is None.
+        """
+        with cls.LOCK:
+            if logfile is None:
+                sinks = list(cls.SINKS.values())
+                cls.SINKS.clear()
+            else:
+                sink = cls.SINKS.pop(os.path.abspath(logfile), None)
+                sinks = [sink] if sink else []
+        for sink in sinks:
+            sink.close()
+    # ----------------------------------------------------------------#
+
+    def write(self, text):
+        """
+        Append the given `text` to the buffer
+        """
+        with self.lock:
+            self.buffer.append(text)
+            self.size += len(text)
+            full = self.size >= LogSink.FLUSH_SIZE
+        if full:
+            LogSink.WAKEUP.set()  # let the flusher thread write it
+    # ----------------------------------------------------------------#
+
+    def flush(self):
+        """
+        Write all pending messages to the log file
+        """
+        with self.lock:
+            if not self.buffer:
+                return
+            text = ''.join(self.buffer)
+            self.buffer.clear()
+            self.size = 0
+            try:
+                if self.handle is None:
+                    self.handle = open(self.logfile, "a",
+                                       encoding=self.txtenc)
+                self.handle.write(text)
+                self.handle.flush()
+                if self.handle.tell() > LogSink.MAXSIZE:
+                    self.rotate()
+            except OSError:
+                self.handle = None  # e.g. logdir removed, retry later
+    # ----------------------------------------------------------------#
+
+    def rotate(self):
+        """
+        Rename the current log file to `logname.1`
+        and start a new one. Requires lock.
+        """
+        self.handle.close()
+        self.handle = None
+        os.replace(self.logfile, f'{self.logfile}.1')
+    # ----------------------------------------------------------------#
+
+    def close(self):
+        """
+        Write all pending messages and close the file handle
+        """
+        self.flush()
+        with self.lock:
+            if self.handle is not None:
+                self.handle.close()
+                self.handle = None
+# ----------------------------------------------------------------------#
 
 
 def logwrite(cmd, stderr, logfile, txtenc="utf-8"):
@@ -41,8 +194,27 @@ def logwrite(cmd, stderr, logfile, txtenc="utf-8"):
     else:
         apnd = f"{sep}{cmd}\n\n"
 
-    with open(logfile, "a", encoding=txtenc) as log:
-        log.write(apnd)
+    LogSink.get(logfile, txtenc).write(apnd)
+
+
+def logappend(text, logfile, txtenc="utf-8"):
+    """
+    Append the given `text` as it is to the
+    given `logfile` (buffered, see `LogSink`).
+    """
+    LogSink.get(logfile, txtenc).write(text)
+
+
+def logflush(logfile=None):
+    """
+    Write the pending messages of the given `logfile`
+    or of all log files if `logfile` is None, e.g. at
+    the end of a process or before reading log files.
+    """
+    if logfile is None:
+        LogSink.flush_all()
+    else:
+        LogSink.get(logfile).flush()
 
 
 def make_log_template(logname, logdir, mode="a", txtenc="utf-8"):
@@ -58,6 +230,7 @@ def make_log_template(logname, logdir, mode="a", txtenc="utf-8"):
     """
     current_date = time.strftime("%c")  # date/time
     logfile = os.path.join(logdir, logname)
+    LogSink.close_all(logfile)  # write pending messages first
 
     with open(logfile, mode, encoding=txtenc) as log:
         log.write(f"""
@@ -0,0 +1,269 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: metadata_cache.py
+Porpose: cache of the metadata of the URLs given by yt-dlp
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2024
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+from threading import RLock
+from videomass.vdms_utils.utils import prune_cachedir
+
+
+class MetadataCache:
+    """
+    Cache of the metadata of the URLs, i.e. the `extract_info`
+    results of yt-dlp, shared by the Statistics, the format codes,
+    the subtitles and the playlist indexing of the YouTube
+    Downloader, so the same URL is never fetched twice.
+
+    Metadata are kept in memory (LRU) and on disk, one JSON file
+    for each URL and options in the given cache directory. Each
+    entry expires after `ttl` seconds, since the remote contents
+    (e.g. the format URLs or the playlist entries) change over
+    time, its file is removed when found expired. Errors are never
+    cached. The least recently written files of the cache directory
+    are removed at startup beyond `maxbytes`.
+
+    Metadata are fetched by the `extractor` callable given to
+    the methods, as `extractor(url, kwargs)`, which must return a
+    tuple (meta, error) where `meta` is a JSON serializable dict
+    (see `yt_dlp.YoutubeDL.sanitize_info`). Several URLs are
+    fetched in parallel by `workers` threads, a URL already in
+    progress is never requested again.
+
+    USAGE:
+        >>> cache = MetadataCache('/path/to/cache/dir', ttl=3600)
+        >>> results = cache.resolve(urls, kwargs, extractor)
+        >>> for meta, error in results:
+        >>>     ...
+
+    The returned metadata are shared and must not be modified.
+    This class is thread-safe.
+    """
+    VERSION = 1
+
+    def __init__(self, dirname, ttl=3600, maxsize=64, workers=4,
+                 maxbytes=64 * 1024 ** 2):
+        """
+        dirname: pathname of the cache directory
+        ttl: life time of the entries in seconds, 0 to disable
+        maxsize: max number of entries kept in memory
+        workers: max number of URLs fetched at the same time
+        maxbytes: max size of the cache directory
+        """
+        self.dirname = dirname
+        self.ttl = max(int(ttl), 0)
+        self.maxsize = max(int(maxsize), 1)
+        self.entries = OrderedDict()  # key: (time, meta)
+        self.pending = {}  # key: future of the fetches in progress
+        self.lock = RLock()
+        self.executor = ThreadPoolExecutor(max_workers=max(int(workers), 1))
+        prune_cachedir(self.dirname, maxbytes)
+    # ----------------------------------------------------------------#
+
+    @staticmethod
+    def key(url, kwargs):
+        """
+        Returns the cache key (SHA-256 hex digest) of the given
+        URL and options (dict, e.g. `noplaylist`, `extract_flat`)
+        """
+        data = json.dumps([url.strip(), kwargs], sort_keys=True, default=str)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+    # ----------------------------------------------------------------#
+
+    def cachefile(self, key):
+        """
+        Returns the pathname of the cache file of the given key
+        """
+        return os.path.join(self.dirname, f'{key}.json')
+    # ----------------------------------------------------------------#
+
+    def remember(self, key, stamp, meta):
+        """
+        Keep the given metadata in memory. Requires lock.
+        """
+        self.entries[key] = (stamp, meta)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+    # ----------------------------------------------------------------#
+
+    def get(self, url, kwargs):
+        """
+        Returns the cached metadata of the given URL and
+        options, `None` if not cached or expired.
+        """
+        if not self.ttl:
+            return None
+        key = self.key(url, kwargs)
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and now - entry[0] < self.ttl:
+                self.entries.move_to_end(key)
+                return entry[1]
+        cache = self.cachefile(key)
+        try:
+            with open(cache, 'r', encoding='utf-8') as fln:
+                data = json.load(fln)
+        except OSError:
+            return None
+        except json.JSONDecodeError:
+            data = None
+        if (not isinstance(data, dict) or data.get('version') != self.VERSION
+                or not isinstance(data.get('time'), (int, float))
+                or not now - data['time'] < self.ttl
+                or not isinstance(data.get('meta'), dict)):
+            try:
+                os.remove(cache)  # expired or invalid
+            except OSError:
+                pass
+            return None
+        with self.lock:
+            self.remember(key, data['time'], data['meta'])
+        return data['meta']
+    # ----------------------------------------------------------------#
+
+    def put(self, url, kwargs, meta):
+        """
+        Store the given metadata of the given URL and options.
+        The cache file is first written to a temporary file
+        and then renamed.
+        """
+        if not self.ttl:
+            return
+        key = self.key(url, kwargs)
+        stamp = time.time()
+        with self.lock:
+            self.remember(key, stamp, meta)
+        cache = self.cachefile(key)
+        tmp = f'{cache}.tmp'
+        try:
+            os.makedirs(self.dirname, exist_ok=True)
+            with open(tmp, 'w', encoding='utf-8') as fln:
+                json.dump({'version': self.VERSION, 'url': url.strip(),
+                           'time': stamp, 'meta': meta},
+                          fln, separators=(',', ':'), default=str)
+            os.replace(tmp, cache)
+        except (OSError, TypeError, ValueError):
+            pass
+    # ----------------------------------------------------------------#
+
+    def fetch(self, url, kwargs, extractor):
+        """
+        Returns a tuple (meta, error) with the metadata of the
+        given URL and options, fetched by `extractor` and stored
+        if not cached. On error returns (None, str(error)).
+        """
+        meta = self.get(url, kwargs)
+        if meta is not None:
+            return meta, None
+        try:
+            meta, error = extractor(url, kwargs)
+        except Exception as err:  # errors of the extractor or of yt-dlp
+            return None, f'{err}'
+        if error or not meta:
+            return None, f'{error or "No data available"}'
+        self.put(url, kwargs, meta)
+        return meta, None
+    # ----------------------------------------------------------------#
+
+    def forget(self, key, future):
+        """
+        Remove the given done (or cancelled) future from
+        the fetches in progress.
+        """
+        with self.lock:
+            if self.pending.get(key) is future:
+                del self.pending[key]
+    # ----------------------------------------------------------------#
+
+    def request(self, url, kwargs, extractor):
+        """
+        Fetch in background the metadata of the given URL and
+        options if not already in progress. Returns a future
+        whose result is a tuple (meta, error), see `fetch`.
+        """
+        key = self.key(url, kwargs)
+        with self.lock:
+            future = self.pending.get(key)
+            submitted = future is None
+            if submitted:
+                future = self.executor.submit(self.fetch, url,
+                                              kwargs, extractor)
+                self.pending[key] = future
+        if submitted:
+            future.add_done_callback(lambda fut: self.forget(key, fut))
+        return future
+    # ----------------------------------------------------------------#
+
+    def resolve(self, urls, kwargs, extractor):
+        """
+        Returns the list of the tuples (meta, error) of the given
+        URLs, in the same order, fetching in parallel the ones
+        not cached. This method blocks until all URLs are done.
+        """
+        results = [self.get(url, kwargs) for url in urls]
+        futures = {idx: self.request(url, kwargs, extractor)
+                   for idx, url in enumerate(urls) if results[idx] is None}
+        for idx, meta in enumerate(results):
+            if idx not in futures:
+                results[idx] = (meta, None)
+        for idx, future in futures.items():
+            try:
+                results[idx] = future.result()
+            except CancelledError:  # on shutdown
+                results[idx] = (None, 'Cancelled')
+        return results
+    # ----------------------------------------------------------------#
+
+    def clear(self):
+        """
+        Remove all entries from memory and disk
+        """
+        with self.lock:
+            self.entries.clear()
+        if not os.path.isdir(self.dirname):
+            return
+        for name in os.listdir(self.dirname):
+            if name.endswith(('.json', '.tmp')):
+                try:
+                    os.remove(os.path.join(self.dirname, name))
+                except OSError:
+                    pass
+    # ----------------------------------------------------------------#
+
+    def shutdown(self):
+        """
+        Cancel the pending fetches and stop the
+        worker threads, e.g. on exit.
+        """
+        with self.lock:
+            for future in self.pending.values():
+                future.cancel()
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,365 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: packet_index.py
+Porpose: cached index of the key frames and packets of the media files
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2024
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import json
+import hashlib
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from threading import RLock
+from videomass.vdms_threads.ffprobe import packets
+from videomass.vdms_utils.utils import prune_cachedir
+
+
+class PacketIndex:
+    """
+    Index of the packets of the video stream of a media file
+    (see `ffprobe.packets`), sorted by presentation time: the
+    key frame times, the size and the byte offset of each packet.
+    It allows to snap the time positions on the key frames, e.g.
+    to cut with stream copy or to seek the previews instantly,
+    and to compute the bitrate over time.
+
+    All time values are in seconds (float) and are relative to the
+    start time of the container, like the FFmpeg seek positions
+    (`-ss`), as given by `ffprobe.packets`.
+    """
+    def __init__(self, items):
+        """
+        items: list of the packets, see `ffprobe.packets`
+        """
+        items = sorted(items)
+        self.times = [x[0] for x in items]
+        self.sizes = [x[1] for x in items]
+        self.offsets = [x[2] for x in items]
+        self.keys = [x[0] for x in items if x[3]]
+    # ----------------------------------------------------------------#
+
+    def to_dict(self):
+        """
+        Returns a JSON serializable representation
+        """
+        return {'times': self.times, 'sizes': self.sizes,
+                'offsets': self.offsets, 'keys': self.keys}
+    # ----------------------------------------------------------------#
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Returns a new object from the given representation
+        """
+        index = cls([])
+        index.times = data['times']
+        index.sizes = data['sizes']
+        index.offsets = data['offsets']
+        index.keys = data['keys']
+        return index
+    # ----------------------------------------------------------------#
+
+    def keyframe_before(self, pts):
+        """
+        Returns the time of the last key frame at or before
+        the given time, the first key frame if none, `None`
+        if there are no key frames.
+        """
+        if not self.keys:
+            return None
+        idx = bisect_right(self.keys, pts + 1e-6)
+        return self.keys[max(idx - 1, 0)]
+    # ----------------------------------------------------------------#
+
+    def keyframe_after(self, pts):
+        """
+        Returns the time of the first key frame at or after the
+        given time, `None` if there are no key frames after it.
+        """
+        idx = bisect_left(self.keys, pts - 1e-6)
+        return self.keys[idx] if idx < len(self.keys) else None
+    # ----------------------------------------------------------------#
+
+    def nearest_keyframe(self, pts):
+        """
+        Returns the time of the nearest key frame to the given
+        time, `None` if there are no key frames.
+        """
+        near = [x for x in (self.keyframe_before(pts),
+                            self.keyframe_after(pts)) if x is not None]
+        return min(near, key=lambda x: abs(x - pts)) if near else None
+    # ----------------------------------------------------------------#
+
+    def is_keyframe(self, pts, tolerance=0.001):
+        """
+        Returns True if the given time is the time
+        of a key frame within the given tolerance.
+        """
+        near = self.nearest_keyframe(pts)
+        return near is not None and abs(near - pts) <= tolerance
+    # ----------------------------------------------------------------#
+
+    def offset_at(self, pts):
+        """
+        Returns the byte offset of the key frame at or before the
+        given time, i.e. where a decoder must start reading to
+        show the frame at that time, -1 if not known.
+        """
+        keyframe = self.keyframe_before(pts)
+        if keyframe is None:
+            return -1
+        return self.offsets[bisect_left(self.times, keyframe)]
+    # ----------------------------------------------------------------#
+
+    def bitrate(self, interval=1.0):
+        """
+        Returns the list of the bitrates (bits/s) of the stream
+        computed on consecutive intervals of the given length,
+        starting from the start time of the container.
+        """
+        if not self.times:
+            return []
+        rates = [0] * (max(int(self.times[-1] / interval), 0) + 1)
+        for pts, size in zip(self.times, self.sizes):
+            rates[max(int(pts / interval), 0)] += size * 8
+        return [int(x / interval) for x in rates]
+# ----------------------------------------------------------------------#
+
+
+class PacketIndexCache:
+    """
+    Cache of the packet indexes (see `PacketIndex`) of the media
+    files, kept in memory (LRU) and on disk, one JSON file for
+    each media file in the given cache directory. Each entry is
+    valid as long as the size and modification time of the file
+    do not change. The least recently used files of the cache
+    directory are removed at startup beyond `maxbytes`.
+
+    Indexes are built in background by a single worker thread,
+    since a packet scan reads the whole file. A build no longer
+    needed can be cancelled, see `cancel`.
+
+    USAGE:
+        >>> cache = PacketIndexCache('/path/to/cache/dir')
+        >>> index = cache.get(filename)
+        >>> if index is None:
+        >>>     cache.request(filename, ffprobe_cmd, txtenc, callback)
+        >>> cache.cancel(filename)  # e.g. on selection change
+
+    This class is thread-safe.
+    """
+    VERSION = 2
+
+    def __init__(self, dirname, maxsize=16, maxbytes=128 * 1024 ** 2):
+        """
+        dirname: pathname of the cache directory
+        maxsize: max number of indexes kept in memory
+        maxbytes: max size of the cache directory
+        """
+        self.dirname = dirname
+        self.maxsize = max(int(maxsize), 1)
+        self.entries = OrderedDict()  # path: (stat, index)
+        self.pending = {}  # path: future of the builds in progress
+        self.running = {}  # path: Popen object of the ffprobe scans
+        self.lock = RLock()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        prune_cachedir(self.dirname, maxbytes)
+    # ----------------------------------------------------------------#
+
+    @staticmethod
+    def stat_key(path):
+        """
+        Returns a list [size, mtime_ns] of the given
+        pathname, `None` if the file is not accessible.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+    # ----------------------------------------------------------------#
+
+    def cachefile(self, path):
+        """
+        Returns the pathname of the cache file of the given file
+        """
+        digest = hashlib.sha256(path.encode('utf-8')).hexdigest()
+        return os.path.join(self.dirname, f'{digest}.json')
+    # ----------------------------------------------------------------#
+
+    def remember(self, path, stat, index):
+        """
+        Keep the given index in memory. Requires lock.
+        """
+        self.entries[path] = (stat, index)
+        self.entries.move_to_end(path)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+    # ----------------------------------------------------------------#
+
+    def get(self, filename):
+        """
+        Returns the cached index (see `PacketIndex`) of the
+        given file, `None` if not cached or not up to date.
+        """
+        path = os.path.abspath(filename)
+        stat = self.stat_key(path)
+        if stat is None:
+            return None
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry and entry[0] == stat:
+                self.entries.move_to_end(path)
+                return entry[1]
+        cache = self.cachefile(path)
+        try:
+            with open(cache, 'r', encoding='utf-8') as fln:
+                data = json.load(fln)
+            os.utime(cache)  # recently used, see `prune_cachedir`
+        except (OSError, json.JSONDecodeError):
+            return None
+        if (not isinstance(data, dict) or data.get('version') != self.VERSION
+                or data.get('path') != path or data.get('stat') != stat):
+            return None
+        try:
+            index = PacketIndex.from_dict(data['index'])
+        except (KeyError, TypeError):
+            return None
+        with self.lock:
+            self.remember(path, stat, index)
+        return index
+    # ----------------------------------------------------------------#
+
+    def build(self, filename, ffprobe_cmd, txtenc='utf-8'):
+        """
+        Returns a tuple (index, error) with the index of the given
+        file, built by scanning its packets if not cached, and
+        stores it. On error returns (None, str(error)).
+        """
+        index = self.get(filename)
+        if index is not None:
+            return index, None
+        path = os.path.abspath(filename)
+        stat = self.stat_key(path)
+        try:
+            items, error = packets(path, cmd=ffprobe_cmd, txtenc=txtenc,
+                                   started=partial(self.started, path))
+        finally:
+            with self.lock:
+                self.running.pop(path, None)
+        if error:
+            return None, f'{error}'
+        index = PacketIndex(items)
+        with self.lock:
+            self.remember(path, stat, index)
+        cache = self.cachefile(path)
+        tmp = f'{cache}.tmp'
+        try:
+            os.makedirs(self.dirname, exist_ok=True)
+            with open(tmp, 'w', encoding='utf-8') as fln:
+                json.dump({'version': self.VERSION, 'path': path,
+                           'stat': stat, 'index': index.to_dict()},
+                          fln, separators=(',', ':'))
+            os.replace(tmp, cache)
+        except OSError:
+            pass
+        return index, None
+    # ----------------------------------------------------------------#
+
+    def started(self, path, proc):
+        """
+        Keep the given ffprobe process of the given file, so
+        that it can be terminated, see `cancel` and `shutdown`.
+        """
+        with self.lock:
+            self.running[path] = proc
+    # ----------------------------------------------------------------#
+
+    def forget(self, path, future):
+        """
+        Remove the given done (or cancelled) future from
+        the builds in progress.
+        """
+        with self.lock:
+            if self.pending.get(path) is future:
+                del self.pending[path]
+    # ----------------------------------------------------------------#
+
+    def request(self, filename, ffprobe_cmd, txtenc='utf-8', callback=None):
+        """
+        Build in background the index of the given file if not
+        cached nor already in progress. If given, `callback(index,
+        error)` is called when the index is available, immediately
+        if cached, otherwise by the worker thread.
+        """
+        index = self.get(filename)
+        if index is not None:
+            if callback:
+                callback(index, None)
+            return
+        path = os.path.abspath(filename)
+        with self.lock:
+            future = self.pending.get(path)
+            submitted = future is None
+            if submitted:
+                future = self.executor.submit(self.build, path,
+                                              ffprobe_cmd, txtenc)
+                self.pending[path] = future
+        if submitted:
+            future.add_done_callback(
+                lambda fut: self.forget(path, fut))
+        if callback:
+            future.add_done_callback(
+                lambda fut: fut.cancelled() or callback(*fut.result()))
+    # ----------------------------------------------------------------#
+
+    def cancel(self, filename):
+        """
+        Cancel the build of the index of the given file, if
+        pending, and terminate its packet scan if running.
+        """
+        path = os.path.abspath(filename)
+        with self.lock:
+            future = self.pending.get(path)
+            if future:
+                future.cancel()
+            proc = self.running.get(path)
+        if proc:
+            proc.terminate()
+    # ----------------------------------------------------------------#
+
+    def shutdown(self):
+        """
+        Cancel the pending builds, terminate the packet scans
+        still running and stop the worker thread, e.g. on exit,
+        so that the exit is not delayed by a scan in progress.
+        """
+        with self.lock:
+            for future in self.pending.values():
+                future.cancel()
+            procs = list(self.running.values())
+        for proc in procs:
+            proc.terminate()
+        self.executor.shutdown(wait=False)
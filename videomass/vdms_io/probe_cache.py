@@ -0,0 +1,392 @@
+# -*- coding: UTF-8 -*-
+"""
+File Name: probe_cache.py
+Porpose: persistent cache and lazy list for ffprobe data
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2024
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import json
+import copy
+from collections import OrderedDict
+from collections.abc import MutableSequence
+from threading import Lock
+
+
+class ProbeCache:
+    """
+    Persistent LRU cache of the ffprobe data (see `ffprobe.ffprobe`)
+    stored as a JSON file. Each entry is keyed by the absolute
+    pathname of the media file and is valid as long as the size
+    and the modification time (in nanoseconds) of that file do
+    not change; a single `os.stat` call is enough to revalidate
+    an entry, so cache hits never spawn any ffprobe subprocess.
+
+    When the number of entries exceeds `maxsize`, the least
+    recently used ones are discarded. A `maxsize` of 0 disables
+    the cache entirely.
+
+    USAGE:
+        >>> cache = ProbeCache('/path/to/probe_cache.json', 5000)
+        >>> data = cache.get(filename)
+        >>> if data is None:
+        >>>     data = ffprobe(filename, ...)[0]
+        >>>     cache.put(filename, data)
+        >>> cache.save()  # e.g. before exiting the application
+
+    This class is thread-safe.
+    """
+    VERSION = 1
+
+    def __init__(self, filename, maxsize=5000):
+        """
+        filename: pathname of the JSON cache file
+        maxsize: max number of cached entries, 0 to disable
+        """
+        self.filename = filename
+        self.maxsize = max(int(maxsize), 0)
+        self.entries = OrderedDict()
+        self.changed = False
+        self.lock = Lock()
+        self.load()
+    # ----------------------------------------------------------------#
+
+    @staticmethod
+    def stat_key(path):
+        """
+        Returns a tuple (size, mtime_ns) of the given
+        pathname, `None` if the file is not accessible.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+    # ----------------------------------------------------------------#
+
+    def load(self):
+        """
+        Load the cache file if exists. A missing, unreadable or
+        incompatible cache file is silently discarded.
+        """
+        if not self.maxsize or not os.path.isfile(self.filename):
+            return
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as fln:
+                data = json.load(fln)
+        except (OSError, json.JSONDecodeError):
+            return
+
+        if not isinstance(data, dict) or data.get('version') != self.VERSION:
+            return
+        with self.lock:
+            for path, size, mtime, probe in data.get('entries', []):
+                self.entries[path] = (size, mtime, probe)
+            self.evict()
+    # ----------------------------------------------------------------#
+
+    def save(self):
+        """
+        Write the cache file, only if something has changed.
+        The file is first written to a temporary file and
+        then renamed, so a crash never leaves it truncated.
+        """
+        if not self.changed:
+            return
+        with self.lock:
+            entries = [[path, *val] for path, val in self.entries.items()]
+            self.changed = False
+        tmp = f'{self.filename}.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as fln:
+                json.dump({'version': self.VERSION, 'entries': entries}, fln)
+            os.replace(tmp, self.filename)
+        except OSError:
+            pass
+    # ----------------------------------------------------------------#
+
+    def evict(self):
+        """
+        Discard the least recently used entries
+        exceeding `maxsize`. Requires lock.
+        """
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.changed = True
+    # ----------------------------------------------------------------#
+
+    def get(self, path):
+        """
+        Returns a copy of the cached ffprobe data of the given
+        pathname, `None` if not cached or if the cached entry
+        is no longer valid (stale entries are discarded).
+        """
+        if not self.maxsize:
+            return None
+        path = os.path.abspath(path)
+        key = ProbeCache.stat_key(path)
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is None:
+                return None
+            if key is None or tuple(entry[:2]) != key:
+                del self.entries[path]
+                self.changed = True
+                return None
+            self.entries.move_to_end(path)
+            return copy.deepcopy(entry[2])
+    # ----------------------------------------------------------------#
+
+    def put(self, path, probe):
+        """
+        Store a copy of the given ffprobe data
+        (`probe`, dict) for the given pathname.
+        """
+        if not self.maxsize:
+            return
+        path = os.path.abspath(path)
+        key = ProbeCache.stat_key(path)
+        if key is None:
+            return
+        with self.lock:
+            self.entries[path] = (*key, copy.deepcopy(probe))
+            self.entries.move_to_end(path)
+            self.changed = True
+            self.evict()
+    # ----------------------------------------------------------------#
+
+    def resize(self, maxsize):
+        """
+        Set a new `maxsize`, discarding the exceeding entries
+        """
+        with self.lock:
+            self.maxsize = max(int(maxsize), 0)
+            self.evict()
+    # ----------------------------------------------------------------#
+
+    def clear(self):
+        """
+        Remove all entries
+        """
+        with self.lock:
+            if self.entries:
+                self.entries.clear()
+                self.changed = True
+
+
+class ProbeDataList(MutableSequence):
+    """
+    List-like container of the ffprobe data of the imported files,
+    (see `MainFrame.data_files`) designed to scale to very large
+    file lists. Only the pathnames are always kept in memory,
+    while the complete ffprobe data (which can be several KiB per
+    file) are only held for the `maxloaded` most recently used
+    items. The data of the discarded items are loaded again on
+    demand by the given `loader` callable, e.g. from `ProbeCache`,
+    which receives a pathname and must return the ffprobe data
+    or `None` on error.
+
+    The `loader` should never run ffprobe itself, since items are
+    accessed by the GUI thread. If a `reloader` callable is given,
+    the items that `loader` can not provide are passed to it (as
+    a list of pathnames, once for each access) to be analyzed in
+    background, e.g. by the `ProbeImport` thread, which should
+    then return the results by the `reloaded` method. In the
+    meantime these items are returned as minimal data without
+    streams and their pathnames are kept in the `pending` set.
+
+    Items are always keyed by `probe['format']['filename']`, so
+    the same pathname must not be added twice.
+
+    USAGE:
+        >>> data = ProbeDataList(loader=load_probe_data,
+        >>>                      reloader=reload_probe_data)
+        >>> data.append(probe)
+        >>> data[0]['streams']
+        >>> data.filenames()  # does not load anything
+        >>> data.reloaded(path, probe)  # on reloader results
+
+    """
+    MAXLOADED = 256
+
+    def __init__(self, loader=None, reloader=None, maxloaded=MAXLOADED):
+        """
+        loader: callable to load the ffprobe data of a pathname,
+                if `None` all items are always kept in memory.
+        reloader: callable to schedule the analysis of the items
+                  that `loader` can not provide, or `None`.
+        maxloaded: max number of ffprobe data kept in memory.
+        """
+        self.loader = loader
+        self.reloader = reloader
+        self.maxloaded = max(int(maxloaded), 1)
+        self.paths = []
+        self.loaded = OrderedDict()
+        self.pending = set()
+    # ----------------------------------------------------------------#
+
+    def __len__(self):
+        return len(self.paths)
+    # ----------------------------------------------------------------#
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.fetch(self.paths[index])
+        return self.fetch([self.paths[index]])[0]
+    # ----------------------------------------------------------------#
+
+    def __iter__(self):
+        return iter(self.fetch(self.paths))
+    # ----------------------------------------------------------------#
+
+    def __setitem__(self, index, probe):
+        if isinstance(index, slice):
+            probes = list(probe)
+            for path in self.paths[index]:
+                self.loaded.pop(path, None)
+                self.pending.discard(path)
+            self.paths[index] = [x['format']['filename'] for x in probes]
+            for item in probes:
+                self.keep(item)
+            return
+        self.loaded.pop(self.paths[index], None)
+        self.pending.discard(self.paths[index])
+        self.paths[index] = probe['format']['filename']
+        self.keep(probe)
+    # ----------------------------------------------------------------#
+
+    def __delitem__(self, index):
+        paths = self.paths[index]
+        for path in paths if isinstance(index, slice) else [paths]:
+            self.loaded.pop(path, None)
+            self.pending.discard(path)
+        del self.paths[index]
+    # ----------------------------------------------------------------#
+
+    def insert(self, index, probe):
+        """
+        Insert the given ffprobe data before index
+        """
+        self.paths.insert(index, probe['format']['filename'])
+        self.keep(probe)
+    # ----------------------------------------------------------------#
+
+    def keep(self, probe):
+        """
+        Hold the given ffprobe data in memory, discarding
+        the least recently used ones exceeding `maxloaded`.
+        """
+        path = probe['format']['filename']
+        self.loaded[path] = probe
+        self.loaded.move_to_end(path)
+        if self.loader is None:
+            return
+        while len(self.loaded) > self.maxloaded:
+            self.loaded.popitem(last=False)
+    # ----------------------------------------------------------------#
+
+    @staticmethod
+    def placeholder(path):
+        """
+        Returns a minimal ffprobe data without
+        streams of the given pathname.
+        """
+        return {'format': {'filename': path,
+                           'time': '00:00:00.000',
+                           'duration': 0},
+                'streams': []}
+    # ----------------------------------------------------------------#
+
+    def load(self, path):
+        """
+        Returns the ffprobe data of the given pathname, loading
+        it by `loader` if it is no longer held in memory, `None`
+        if the data can not be loaded.
+        """
+        probe = self.loaded.get(path)
+        if probe is not None:
+            self.loaded.move_to_end(path)
+            return probe
+
+        probe = self.loader(path)
+        if probe is not None:
+            self.keep(probe)
+        return probe
+    # ----------------------------------------------------------------#
+
+    def fetch(self, paths):
+        """
+        Returns the list of the ffprobe data of the given
+        pathnames. Items that can not be loaded (e.g. the file
+        was removed from disk, or it is being reloaded) are
+        returned as minimal data without streams. The missing
+        ones are passed to `reloader` all at once.
+        """
+        items, missing = [], []
+        for path in paths:
+            probe = self.load(path)
+            if probe is None:
+                probe = ProbeDataList.placeholder(path)
+                if self.reloader and path not in self.pending:
+                    self.pending.add(path)
+                    missing.append(path)
+            items.append(probe)
+        if missing:
+            self.reloader(missing)
+        return items
+    # ----------------------------------------------------------------#
+
+    def reloaded(self, path, probe):
+        """
+        Receives the ffprobe data (`probe`) of a pathname passed
+        to `reloader`, or `None` on error. Failed items are held
+        as minimal data without streams, so they are not reloaded
+        again as long as they are held in memory.
+        """
+        if path in self.pending:  # otherwise removed in the meantime
+            self.pending.discard(path)
+            self.keep(probe or ProbeDataList.placeholder(path))
+    # ----------------------------------------------------------------#
+
+    def filenames(self):
+        """
+        Returns a list of all pathnames without loading
+        any ffprobe data.
+        """
+        return list(self.paths)
+    # ----------------------------------------------------------------#
+
+    def reorder(self, perm):
+        """
+        Rearrange the items according to the given index
+        permutation (`perm`) without loading any data.
+        """
+        self.paths[:] = [self.paths[x] for x in perm]
+    # ----------------------------------------------------------------#
+
+    def clear(self):
+        """
+        Remove all items
+        """
+        self.paths.clear()
+        self.loaded.clear()
+        self.pending.clear()
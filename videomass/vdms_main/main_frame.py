@@ -57,6 +57,7 @@ from videomass.vdms_panels import sequence_to_video
 from videomass.vdms_panels.long_processing_task import LogOut
 from videomass.vdms_panels import presets_manager
 from videomass.vdms_io import io_tools
+from videomass.vdms_io.probe_cache import ProbeDataList
 from videomass.vdms_sys.about_app import VERSION
 from videomass.vdms_sys.settings_manager import ConfigManager
 from videomass.vdms_sys.argparser import info_this_platform
@@ -92,7 +93,9 @@ class MainFrame(wx.Frame):
         self.appdata = appdata
         self.icons = get.iconset
         # -------------------------------#
-        self.data_files = []  # list of items in list control
+        # ffprobe data of the items in list control (lazily loaded)
+        self.data_files = ProbeDataList(loader=filedrop.load_probe_data,
+                                        reloader=filedrop.reload_probe_data)
         self.outputnames = []  # output file basenames (even renames)
         self.file_src = []  # input full file names list
         self.filedropselected = None  # int(index) or None filedrop selected
@@ -196,6 +199,7 @@ class MainFrame(wx.Frame):
         self.Bind(wx.EVT_CLOSE, self.on_close)
 
         pub.subscribe(self.check_modeless_window, "DESTROY_ORPHANED_WINDOWS")
+        pub.subscribe(self.reload_update, "RELOAD_EVT")
         pub.subscribe(self.process_terminated, "PROCESS TERMINATED")
         pub.subscribe(self.end_queue_processing, "QUEUE PROCESS SUCCESSFULLY")
 
@@ -213,6 +217,10 @@ class MainFrame(wx.Frame):
                     self.queue_tool_counter()
             else:
                 os.remove(fque)
+                fjournal = os.path.join(self.appdata["confdir"],
+                                        'queue.journal')
+                if os.path.exists(fjournal):
+                    os.remove(fjournal)
 
     # -------------------Status bar settings--------------------#
 
@@ -304,6 +312,17 @@ class MainFrame(wx.Frame):
         elif msg == 'AudioVolNormal':
             self.audivolnormalize.Destroy()
             self.audivolnormalize = False
+    # ------------------------------------------------------------------#
+
+    def reload_update(self, path, probe, error, count):
+        """
+        Receives the ffprobe data reloaded in background for the
+        `data_files` (see `filedrop.reload_probe_data`). This method
+        is called using pub/sub protocol subscribing "RELOAD_EVT".
+        """
+        if probe and not error:
+            filedrop.adjust_probe_data(probe)
+        self.data_files.reloaded(path, None if error else probe)
 
     # ---------------------- Event handler (callback) ------------------#
 
@@ -719,9 +738,7 @@ class MainFrame(wx.Frame):
 
             self.switch_file_import(self)
             paths = filedlg.GetPaths()
-            for path in paths:
-                self.fileDnDTarget.flCtrl.dropUpdate(path)
-            self.fileDnDTarget.flCtrl.rejected_files()
+            self.fileDnDTarget.flCtrl.add_files(paths)
     # -------------------------------------------------------------------#
 
     def open_dest_encodings(self, event):
@@ -187,6 +187,8 @@ class Float_TL(wx.MiniFrame):
         self.bar_x = 0
         self.pointpx = [0, 0]  # see `on_move()` `on_leftdown()`
         self.sourcedur = _('No source duration:')
+        self.source = None  # selected file, see `set_values()`
+        self.snap = False  # snap the start on key frames
 
         wx.MiniFrame.__init__(self, parent, -1, style=wx.CAPTION | wx.CLOSE_BOX
                               | wx.SYSTEM_MENU | wx.FRAME_FLOAT_ON_PARENT
@@ -251,14 +253,18 @@ class Float_TL(wx.MiniFrame):
             popupID2 = wx.ID_ANY
             popupID3 = wx.ID_ANY
             popupID4 = wx.ID_ANY
+            popupID5 = wx.ID_ANY
             self.Bind(wx.EVT_MENU, self.onPopup, id=popupID1)
             self.Bind(wx.EVT_MENU, self.onPopup, id=popupID2)
             self.Bind(wx.EVT_MENU, self.onPopup, id=popupID3)
             self.Bind(wx.EVT_MENU, self.onPopup, id=popupID4)
+            self.Bind(wx.EVT_MENU, self.onPopup, id=popupID5)
         # build the menu
         menu = wx.Menu()
         menu.Append(popupID1, _("End adjustment"))
         menu.Append(popupID2, _("Start adjustment"))
+        snap = menu.AppendCheckItem(popupID5, _("Snap start to key frames"))
+        snap.Check(self.snap)
         menu.Append(popupID3, _("Reset"))
         menu.Append(popupID4, _("Read me"))
         # show the popup menu
@@ -278,6 +284,12 @@ class Float_TL(wx.MiniFrame):
             self.on_set_pos(None, mode='duration')
         elif menuItem.GetItemLabel() == _("Start adjustment"):
             self.on_set_pos(None, mode='start')
+        elif menuItem.GetItemLabel() == _("Snap start to key frames"):
+            self.snap = menuItem.IsChecked()
+            if self.snap:
+                self.request_index()
+            if self.snap and self.bar_w > self.bar_x:
+                self.on_leftup(None)
         elif menuItem.GetItemLabel() == _("Reset"):
             self.on_trim_time_reset()
         elif menuItem.GetItemLabel() == _("Read me"):
@@ -310,9 +322,16 @@ class Float_TL(wx.MiniFrame):
         removing imported files (see`filedrop.py`).
         """
         self.sourcedur = _('No source duration:')
+        get = wx.GetApp()
+        if self.source and get.packetindex:  # no longer needed
+            get.packetindex.cancel(self.source)
+        self.source = None
         if msg is None:
             self.milliseconds = 86399999
         else:
+            self.source = self.parent.file_src[msg]
+            if self.snap:
+                self.request_index()
             if self.duration[msg] < 100:
                 self.milliseconds = 86399999
             else:
@@ -388,7 +407,46 @@ class Float_TL(wx.MiniFrame):
             self.statusbar_msg(f'{msg}', Float_TL.ORANGE, Float_TL.BLACK)
             return
 
+        snapped = self.snap_to_keyframe() if self.snap else True
         self.set_time_seq(isset=True)
+        if not snapped:
+            msg = _('Key frames not available yet, the start was not snapped')
+            self.statusbar_msg(f'{msg}', Float_TL.YELLOW, Float_TL.BLACK)
+    # ------------------------------------------------------------------#
+
+    def request_index(self):
+        """
+        Build in background the key frame index of the selected
+        file (see `PacketIndexCache`), only needed to snap the
+        start, since a packet scan reads the whole file.
+        """
+        get = wx.GetApp()
+        if self.source and get.packetindex:
+            get.packetindex.request(self.source,
+                                    self.appdata['ffprobe_cmd'],
+                                    self.appdata['encoding'])
+    # ------------------------------------------------------------------#
+
+    def snap_to_keyframe(self):
+        """
+        Move the start of the selection to the last key frame
+        at or before it (see `PacketIndex`), so that the segment
+        can be cut without re-encoding (stream copy) and is seeked
+        instantly. Returns False if the key frame index of the
+        selected file is not available (yet).
+        """
+        get = wx.GetApp()
+        if not self.source or not get.packetindex:
+            return False
+        index = get.packetindex.get(self.source)
+        if index is None or not index.keys:
+            return False
+        pts = index.keyframe_before(self.mills_start / 1000)
+        self.mills_start = int(round(pts * 1000))
+        self.clock_start = integer_to_time(self.mills_start)
+        self.bar_x = self.mills_start * self.pix
+        self.onRedraw(wx.ClientDC(self.paneltime))
+        return True
     # ------------------------------------------------------------------#
 
     def on_set_pos(self, event, mode=None):
@@ -787,10 +787,19 @@ class AudioEncoders(scrolled.ScrolledPanel):
                           'Videomass', wx.ICON_INFORMATION, self)
             return
 
+        # EBU R128 loudness is measured in the same decode (and cached)
+        # only for the two-pass normalization, loudnorm is far slower
+        # than volumedetect (it resamples the audio to 192 kHz)
+        targets = None
+        if self.rdbx_normalize.GetSelection() == 4:  # EBU High-Quality
+            targets = (str(self.spin_i.GetValue()),
+                       str(self.spin_tp.GetValue()),
+                       str(self.spin_lra.GetValue()))
         data = volume_detect_process(self.maindata.file_src,
                                      self.maindata.time_seq,  # from -ss to -t
                                      self.opt["AudioIndex"],
                                      parent=self.GetParent(),
+                                     loudnorm=targets,
                                      )
         if data[1]:
             if data[1][0] == 'ERROR':
@@ -30,6 +30,8 @@ import wx
 import wx.lib.scrolledpanel as scrolled
 from pubsub import pub
 from videomass.vdms_utils.utils import update_timeseq_duration
+from videomass.vdms_utils.utils import time_to_integer
+from videomass.vdms_utils.stream_copy import stream_copy_params
 from videomass.vdms_utils.get_bmpfromsvg import get_bmp
 from videomass.vdms_io.io_tools import stream_play
 from videomass.vdms_io.checkup import check_files
@@ -913,10 +915,47 @@ class AV_Conv(wx.Panel):
             kwargs["volume"] = kwargs["volume"][index]
         else:
             kwargs["volume"] = ''
+        self.stream_copy(kwargs, index)
 
         return kwargs
     # ------------------------------------------------------------------#
 
+    def stream_copy(self, kwa, index):
+        """
+        Stream copy fast path of the given 'One pass' item: the
+        video and/or audio streams of the source file (`index` of
+        the file list) which already match the selected encoding
+        and have no filters applied are copied instead of being
+        encoded again, see `stream_copy_params`. A trimmed item
+        is copied only if its start is on a key frame of the source
+        file, according to the key frame index (see `PacketIndex`,
+        e.g. using the timeline "Snap start to key frames" option).
+        """
+        if not self.appdata['stream_copy'] or kwa['type'] != 'One pass':
+            return
+        if kwa['start-time'] or kwa['end-time']:
+            get = wx.GetApp()
+            pindex = (get.packetindex.get(kwa['source'])
+                      if get.packetindex else None)
+            start = kwa['start-time'].split()[-1] if kwa['start-time'] else '0'
+            if pindex is None or not pindex.is_keyframe(
+                    time_to_integer(start) / 1000, tolerance=0.002):
+                return
+        vparams, aparams = '', ''
+        if self.opt["Media"] == 'Video' and not self.opt["VFilters"]:
+            vparams = " ".join(self.opt["CmdVideoParams"].split())
+        if not kwa['volume'] and not self.opt["EBU"][1]:
+            aparams = " ".join(self.opt["CmdAudioParams"].split())
+
+        newv, newa = stream_copy_params(vparams, aparams,
+                                        self.parent.data_files[index])
+        if (newv, newa) == (vparams, aparams):
+            return
+        kwa['args'] = [self.std_args(newv or self.opt["CmdVideoParams"],
+                                     newa or self.opt["CmdAudioParams"]),
+                       kwa['args'][1]]
+    # ------------------------------------------------------------------#
+
     def batch_mode(self):
         """
         build batch mode arguments. This method is called
@@ -947,6 +986,7 @@ class AV_Conv(wx.Panel):
                 kw["volume"] = kw["volume"][index[0]]
             else:
                 kw["volume"] = ''
+            self.stream_copy(kw, index[0])
             batchlist.append(kw)
 
         keyval = self.update_dict(len(f_src), **kwargs)
@@ -1032,12 +1072,9 @@ class AV_Conv(wx.Panel):
 
         if self.cmb_vencoder.GetValue() == "Copy":
 
-            args = (f'{self.opt["CmdVideoParams"]} '
-                    f'{self.opt["CmdAudioParams"]} {self.opt["EBU"][1]} '
-                    f'{self.opt["SubtitleMap"]} {self.opt["Chapters"]} '
-                    f'{self.opt["MetaData"]}'
-                    )
-            pass1, pass2 = " ".join(args.split()), ''
+            pass1 = self.std_args(self.opt["CmdVideoParams"],
+                                  self.opt["CmdAudioParams"])
+            pass2 = ''
             kwargs = {'type': 'One pass', 'args': [pass1, pass2],
                       'volume': [vol[5] for vol in audnorm],
                       'preset name': 'A/V Conversions - Video standard',
@@ -1058,12 +1095,9 @@ class AV_Conv(wx.Panel):
                       'preset name': 'A/V Conversions - Video standard.',
                       }
         elif self.opt["Passes"] == "Auto":
-            args = (f'{self.opt["CmdVideoParams"]} {self.opt["VFilters"]} '
-                    f'{self.opt["CmdAudioParams"]} {self.opt["EBU"][1]} '
-                    f'{self.opt["SubtitleMap"]} {self.opt["Chapters"]} '
-                    f'{self.opt["MetaData"]}'
-                    )
-            pass1, pass2 = " ".join(args.split()), ''
+            pass1 = self.std_args(self.opt["CmdVideoParams"],
+                                  self.opt["CmdAudioParams"])
+            pass2 = ''
             kwargs = {'type': 'One pass', 'args': [pass1, pass2],
                       'volume': [vol[5] for vol in audnorm],
                       'preset name': 'A/V Conversions - Video standard',
@@ -1071,6 +1105,33 @@ class AV_Conv(wx.Panel):
         return kwargs
     # ------------------------------------------------------------------#
 
+    def std_args(self, vparams, aparams):
+        """
+        Returns the ffmpeg args string of the 'One pass' standard
+        conversions with the given video and audio parameters,
+        e.g. `CmdVideoParams` and `CmdAudioParams` or the ones to
+        copy the streams (see `stream_copy`). `vparams` is not
+        used by the audio conversions.
+        """
+        if self.opt["Media"] == 'Audio':
+            args = (f'{aparams} '
+                    f'{self.opt["EBU"][1]} -vn -sn {self.opt["MetaData"]}'
+                    )
+        elif self.cmb_vencoder.GetValue() == "Copy":
+            args = (f'{vparams} '
+                    f'{aparams} {self.opt["EBU"][1]} '
+                    f'{self.opt["SubtitleMap"]} {self.opt["Chapters"]} '
+                    f'{self.opt["MetaData"]}'
+                    )
+        else:
+            args = (f'{vparams} {self.opt["VFilters"]} '
+                    f'{aparams} {self.opt["EBU"][1]} '
+                    f'{self.opt["SubtitleMap"]} {self.opt["Chapters"]} '
+                    f'{self.opt["MetaData"]}'
+                    )
+        return " ".join(args.split())
+    # ------------------------------------------------------------------#
+
     def video_ebu(self):
         """
         Build the ffmpeg args strings for video conversions
@@ -1139,10 +1200,8 @@ class AV_Conv(wx.Panel):
         """
         audnorm = self.opt["RMS"] if not self.opt["PEAK"] else self.opt["PEAK"]
 
-        args = (f'{self.opt["CmdAudioParams"]} '
-                f'{self.opt["EBU"][1]} -vn -sn {self.opt["MetaData"]}'
-                )
-        pass1, pass2 = " ".join(args.split()), ''
+        pass1 = self.std_args(None, self.opt["CmdAudioParams"])
+        pass2 = ''
         kwargs = {'type': 'One pass', 'args': [pass1, pass2],
                   'volume': [vol[5] for vol in audnorm],
                   'preset name': 'A/V Conversions - Audio standard',
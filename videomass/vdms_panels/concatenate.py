@@ -28,7 +28,7 @@ import os
 import wx
 import wx.lib.agw.hyperlink as hpl
 from videomass.vdms_dialogs.widget_utils import NormalTransientPopup
-from videomass.vdms_utils.utils import integer_to_time
+from videomass.vdms_utils.utils import integer_to_time, write_concat_list
 from videomass.vdms_io.checkup import check_files
 from videomass.vdms_dialogs.epilogue import Formula
 
@@ -193,23 +193,22 @@ class Conc_Demuxer(wx.Panel):
         ftext = os.path.join(self.cachedir, 'tmp', 'flist.txt')
 
         diff = compare_media_param(self.parent.data_files)
+        if self.parent.data_files.pending:
+            wx.MessageBox(_('Please wait, the media data of the imported '
+                            'files are still being loaded. Try again '
+                            'later.'), 'Videomass', wx.ICON_INFORMATION, self)
+            return
         if diff[0] == 'error':
             wx.MessageBox(diff[1], _('Videomass - Error!'),
                           wx.ICON_ERROR, self)
             return
 
         self.mediatype = diff[1]
-        textstr = []
         self.ext = os.path.splitext(self.parent.file_src[0])[1].split('.')[1]
         self.duration = sum(self.parent.duration)
-        for f in self.parent.file_src:
-            escaped = f.replace(r"'", r"'\''")  # need escaping some chars
-            textstr.append(f"file '{escaped}'")
         self.args = (f'"{ftext}" -map 0:v? -map_chapters 0 '
                      f'-map 0:s? -map 0:a? -map_metadata 0 -c copy')
-
-        with open(ftext, 'w', encoding='utf-8') as txt:
-            txt.write('\n'.join(textstr))
+        write_concat_list(self.parent.file_src, ftext)
 
         checking = check_files((fsource[0],),
                                self.appdata['outputdir'],
@@ -30,6 +30,7 @@ import wx
 from pubsub import pub
 from videomass.vdms_io.io_tools import stream_play
 from videomass.vdms_threads.ffprobe import ffprobe
+from videomass.vdms_threads.probe_import import ProbeImport
 from videomass.vdms_utils.utils import time_to_integer
 from videomass.vdms_utils.utils import to_bytes
 from videomass.vdms_dialogs.renamer import Renamer
@@ -96,10 +97,63 @@ def filename_sanitize(newname, outputnames):
 # ----------------------------------------------------------------------
 
 
+def adjust_probe_data(probe):
+    """
+    Adds the custom 'time' key (duration as timestamp) to the
+    format section of the given ffprobe data and converts the
+    'duration' key into milliseconds (integer).
+    Returns the same `probe` dict.
+    """
+    if 'duration' not in probe['format'].keys():
+        # NOTE these are my custom adds to probe data
+        probe['format']['time'] = '00:00:00.000'
+        probe['format']['duration'] = 0
+    else:
+        probe['format']['time'] = probe.get('format').pop('duration')
+        time = time_to_integer(probe.get('format')['time'])
+        probe['format']['duration'] = time
+
+    return probe
+# ----------------------------------------------------------------------
+
+
+def load_probe_data(path):
+    """
+    Loader for the `ProbeDataList` of the imported files.
+    Returns the (adjusted) ffprobe data of the given pathname
+    from the persistent ffprobe cache, `None` on cache miss.
+    Note that this function never runs ffprobe, since it is
+    called by the GUI thread, see `reload_probe_data`.
+    """
+    probe = wx.GetApp().probecache.get(path)
+    if probe is None:
+        return None
+
+    return adjust_probe_data(probe)
+# ----------------------------------------------------------------------
+
+
+def reload_probe_data(paths):
+    """
+    Reloader for the `ProbeDataList` of the imported files.
+    The given pathnames are analyzed by the `ProbeImport`
+    thread, which sends the results by pubsub "RELOAD_EVT"
+    protocol, see `MainFrame.reload_update`.
+    """
+    ProbeImport(paths, wx.GetApp().probecache, topic="RELOAD_EVT")
+# ----------------------------------------------------------------------
+
+
 class MyListCtrl(wx.ListCtrl):
     """
     This is the listControl widget.
     Note that this wideget has DnDPanel parented.
+
+    This is a virtual list control (wx.LC_VIRTUAL): rows are not
+    stored by the widget but rendered on demand by `OnGetItemText`
+    from the shared data lists (`file_src`, `outputnames`) and from
+    `rows`, a compact list of tuples holding the text of the other
+    columns, so that very large file lists remain responsive.
     """
     def __init__(self, parent):
         """
@@ -109,76 +163,69 @@ class MyListCtrl(wx.ListCtrl):
         """
         get = wx.GetApp()
         self.appdata = get.appset
+        self.probecache = get.probecache  # persistent ffprobe data cache
         self.index = None
         self.parent = parent  # parent is DnDPanel class
         self.data = self.parent.data
         self.file_src = self.parent.file_src
         self.duration = self.parent.duration
         self.outputnames = self.parent.outputnames
+        self.rows = []  # (duration, media type, size) of each row
         self.errors = {}
+        self.importing = None  # ProbeImport thread instance
+        self.progress = None  # wx.ProgressDialog instance
         wx.ListCtrl.__init__(self,
                              parent,
                              style=wx.LC_REPORT
+                             | wx.LC_VIRTUAL
                              | wx.LC_SINGLE_SEL,
                              )
+        pub.subscribe(self.import_update, "IMPORT_EVT")
+        pub.subscribe(self.import_end, "END_IMPORT_EVT")
+    # ----------------------------------------------------------------------#
+
+    def OnGetItemText(self, item, col):
+        """
+        Returns the text of the given row (`item`) and
+        column (`col`), required by wx.LC_VIRTUAL style.
+        """
+        if col == 0:
+            return str(item + 1)
+        if col == 1:
+            return self.file_src[item]
+        if col == 5:
+            return self.outputnames[item]
+        return self.rows[item][col - 2]
     # ----------------------------------------------------------------------#
 
     def dropUpdate(self, path, newname=None):
         """
         Update list-control during drag and drop.
-        Note that the optional 'newname' argument is given by
-        the 'on_col_click' method in the 'FileDnD' class to preserve
-        the related renames in column 5 of wx.ListCtrl.
+        The optional 'newname' argument sets the destination
+        file name in column 5 of wx.ListCtrl.
+        Also see `add_files` method to import many files at once
+        without blocking the GUI.
 
         """
-        self.index = self.GetItemCount()
         warn = fullpathname_sanitize(path)  # check for fullname sanitize
         if warn:
             self.errors[f'"{path}"'] = warn
             return
 
-        if not [x for x in self.data if x['format']['filename'] == path]:
-            probe = ffprobe(path, cmd=self.appdata['ffprobe_cmd'],
-                            txtenc=self.appdata['encoding'],
-                            hide_banner=None, pretty=None)
-            if probe[1]:
-                self.errors[f'"{path}"'] = probe[1]
-                return
-
-            probe = probe[0]
-            self.InsertItem(self.index, str(self.index + 1))
-            self.SetItem(self.index, 1, path)
+        if path not in self.file_src:
+            probe = self.probecache.get(path)
+            if probe is None:
+                probe = ffprobe(path, cmd=self.appdata['ffprobe_cmd'],
+                                txtenc=self.appdata['encoding'],
+                                hide_banner=None, pretty=None)
+                if probe[1]:
+                    self.errors[f'"{path}"'] = probe[1]
+                    return
 
-            if 'duration' not in probe['format'].keys():
-                self.SetItem(self.index, 2, 'N/A')
-                # NOTE these are my custom adds to probe data
-                probe['format']['time'] = '00:00:00.000'
-                probe['format']['duration'] = 0
+                probe = probe[0]
+                self.probecache.put(path, probe)
 
-            else:
-                tdur = probe['format']['duration'].split(':')
-                sec, msec = tdur[2].split('.')[0], tdur[2].split('.')[1]
-                tdur = f'{tdur[0]}h : {tdur[1]}m : {sec} : {msec}'
-                self.SetItem(self.index, 2, tdur)
-                probe['format']['time'] = probe.get('format').pop('duration')
-                time = time_to_integer(probe.get('format')['time'])
-                probe['format']['duration'] = time
-
-            media = probe['streams'][0]['codec_type']
-            formatname = probe['format']['format_long_name']
-            self.SetItem(self.index, 3, f'{media}: {formatname}')
-            self.SetItem(self.index, 4, probe['format']['size'])
-            if newname:
-                self.SetItem(self.index, 5, newname)
-                self.outputnames.append(newname)
-            else:
-                fname = os.path.splitext(os.path.basename(path))[0]
-                self.SetItem(self.index, 5, fname)
-                self.outputnames.append(fname)
-            self.index += 1
-            self.data.append(probe)
-            self.file_src.append(path)
-            self.duration.append(probe['format']['duration'])
+            self.add_item(path, probe, newname)
             # self.parent.statusbar_msg('', None)
             self.parent.changes_in_progress()
         else:
@@ -186,6 +233,124 @@ class MyListCtrl(wx.ListCtrl):
             self.errors[f'"{path}"'] = mess
     # ----------------------------------------------------------------------#
 
+    def add_item(self, path, probe, newname=None):
+        """
+        Append a new row to the list-control with the
+        given ffprobe data (`probe`) of the given `path`.
+        """
+        if 'duration' not in probe['format'].keys():
+            tdur = 'N/A'
+        else:
+            tdur = probe['format']['duration'].split(':')
+            sec, msec = tdur[2].split('.')[0], tdur[2].split('.')[1]
+            tdur = f'{tdur[0]}h : {tdur[1]}m : {sec} : {msec}'
+        adjust_probe_data(probe)
+
+        media = probe['streams'][0]['codec_type']
+        formatname = probe['format']['format_long_name']
+        self.rows.append((tdur, f'{media}: {formatname}',
+                          probe['format']['size']))
+        if newname:
+            self.outputnames.append(newname)
+        else:
+            fname = os.path.splitext(os.path.basename(path))[0]
+            self.outputnames.append(fname)
+        self.data.append(probe)
+        self.file_src.append(path)
+        self.duration.append(probe['format']['duration'])
+        self.index = len(self.file_src)
+        self.SetItemCount(self.index)
+    # ----------------------------------------------------------------------#
+
+    def add_files(self, paths):
+        """
+        Import a list of files. Invalid and duplicate files are
+        rejected here before starting, then the remaining files
+        are analyzed concurrently by the `ProbeImport` thread.
+        Rows are added as soon as results arrive (see
+        `import_update`), always in the same order as `paths`.
+        """
+        if self.importing:
+            self.parent.parent.statusbar_msg(_("Please wait, the import of "
+                                               "files is still in progress"),
+                                             self.parent.YELLOW,
+                                             self.parent.BLACK)
+            return
+
+        known = set(self.file_src)
+        queue = []
+        for path in paths:
+            warn = fullpathname_sanitize(path)  # check for fullname sanitize
+            if warn:
+                self.errors[f'"{path}"'] = warn
+            elif path in known:
+                mess = _("Duplicate file, it has already been added "
+                         "to the list.")
+                self.errors[f'"{path}"'] = mess
+            else:
+                known.add(path)
+                queue.append(path)
+
+        if not queue:
+            self.rejected_files()
+            return
+
+        if len(queue) > 1:
+            self.progress = wx.ProgressDialog(_("Videomass - Importing..."),
+                                              _("Analyzing files..."),
+                                              maximum=len(queue),
+                                              parent=self.GetParent(),
+                                              style=wx.PD_CAN_ABORT
+                                              | wx.PD_AUTO_HIDE
+                                              | wx.PD_ELAPSED_TIME
+                                              | wx.PD_REMAINING_TIME
+                                              )
+        self.importing = ProbeImport(queue, self.probecache)
+    # ----------------------------------------------------------------------#
+
+    def import_update(self, path, probe, error, count):
+        """
+        Receive messages from `ProbeImport` thread by
+        pubsub "IMPORT_EVT" protocol.
+        """
+        if not self.importing or self.importing.stop_work_thread:
+            return  # discard results received after stop
+        if error:
+            self.errors[f'"{path}"'] = error
+        elif probe:
+            self.add_item(path, probe)
+
+        if self.progress:
+            total = len(self.importing.filelist)
+            cont = self.progress.Update(count, _("Analyzing files... "
+                                                 "{0}/{1}").format(count,
+                                                                   total))[0]
+            if not cont:
+                self.importing.stop()
+    # ----------------------------------------------------------------------#
+
+    def import_end(self, msg):
+        """
+        Receive message from `ProbeImport` thread by
+        pubsub "END_IMPORT_EVT" protocol.
+        """
+        if self.progress:
+            self.progress.Destroy()
+            self.progress = None
+        self.importing = None
+        if self.GetItemCount():
+            self.parent.changes_in_progress()
+        self.rejected_files()
+    # ----------------------------------------------------------------------#
+
+    def stop_import(self):
+        """
+        Stop any import in progress
+        """
+        if self.importing:
+            self.importing.stop()
+    # ----------------------------------------------------------------------#
+
     def rejected_files(self):
         """
         Handles all rejected files if any
@@ -220,9 +385,7 @@ class FileDrop(wx.FileDropTarget):
         When files are dropped, write where they were dropped and then
         the file paths themselves
         """
-        for filepath in filenames:
-            self.window.dropUpdate(filepath)  # update list control
-        self.window.rejected_files()  # call parent.rejected_files at end
+        self.window.add_files(filenames)  # update list control
 
         return True
     # ----------------------------------------------------------------------#
@@ -397,41 +560,35 @@ class FileDnD(wx.Panel):
         """
         Sort items by LEFT clicking on column headers
         (from ascending to descending and back to ascending).
-        For this feature is required to delete all items from
-        listctrl and data list before re-loading the same
-        items with the new sorted order using `dropUpdate` method.
+        Sorting is entirely performed in memory: an index
+        permutation is computed over the data already held
+        (`file_src`, `duration`, `outputnames` and the rows
+        text), then the same permutation is applied to all
+        of them and the virtual list is refreshed, so no
+        file is probed again.
 
         if plane to use wx.EVT_LIST_COL_RIGHT_CLICK event:
             `if event.GetEventType() == wx.EVT_LIST_COL_RIGHT_CLICK.typeId:`
-                `curritems.reverse()`
+                `perm.reverse()`
         see: <https://discuss.wxpython.org/t/event-geteventtype/22860/4>
         """
         count = self.flCtrl.GetItemCount()
-        curritems = []
+        if self.flCtrl.importing:
+            return
         if count > 1:
-            if event.GetColumn() in (0, -1):
+            column = event.GetColumn()
+            if column in (0, -1):
                 return
 
-            for x in range(count):
-                curritems.append((self.flCtrl.GetItemText(x, col=1),
-                                  self.flCtrl.GetItemText(x, col=2),
-                                  self.flCtrl.GetItemText(x, col=3),
-                                  self.flCtrl.GetItemText(x, col=4),
-                                  self.flCtrl.GetItemText(x, col=5),
-                                  ))
-            if event.GetColumn() == 1:
-                curritems.sort(key=lambda item: item[0])
-            elif event.GetColumn() == 2:
-                curritems.sort(key=lambda item: item[1])
-            elif event.GetColumn() == 3:
-                curritems.sort(key=lambda item: item[2])
-            elif event.GetColumn() == 4:
-                curritems.sort(key=lambda item:
-                               to_bytes(''.join(item[3].split()), 'ffmpeg'))
-            elif event.GetColumn() == 5:
-                curritems.sort(key=lambda item: item[4])
-
-            self.delete_all(None, setstate=False)  # does not setstate here
+            rows = self.flCtrl.rows
+            sortkeys = {1: lambda x: self.file_src[x],
+                        2: lambda x: self.duration[x],
+                        3: lambda x: rows[x][1],
+                        4: lambda x: to_bytes(''.join(rows[x][2].split()),
+                                              'ffmpeg'),
+                        5: lambda x: self.outputnames[x],
+                        }
+            perm = sorted(range(count), key=sortkeys[column])
 
             if self.sortingstate == 'descending':
                 self.sortingstate = 'ascending'
@@ -441,10 +598,16 @@ class FileDnD(wx.Panel):
                 self.sortingstate = 'ascending'
 
             if self.sortingstate == 'descending':
-                curritems.reverse()
+                perm.reverse()
+
+            self.data.reorder(perm)
+            for items in (self.file_src, self.duration,
+                          self.outputnames, rows):
+                items[:] = [items[x] for x in perm]  # keep the same objects
 
-            for data in curritems:
-                self.flCtrl.dropUpdate(data[0], data[4])
+            self.flCtrl.Refresh()
+
+            self.changes_in_progress()
     # ----------------------------------------------------------------------
 
     def changes_in_progress(self, setfocus=True):
@@ -476,7 +639,7 @@ class FileDnD(wx.Panel):
                           'Videomass', wx.ICON_INFORMATION, self)
             return
         index = self.flCtrl.GetFocusedItem()
-        item = self.flCtrl.GetItemText(index, 1)
+        item = self.file_src[index]
         if self.parent.checktimestamp:
             tstamp = f'-vf "{self.parent.cmdtimestamp}"'
         else:
@@ -507,17 +670,16 @@ class FileDnD(wx.Panel):
             return
 
         for num in sorted(indexes, reverse=True):
-            self.flCtrl.DeleteItem(num)  # remove selected items
-            self.data.pop(num)  # remove selected items
+            del self.data[num]  # remove selected items
             self.outputnames.pop(num)  # remove selected items
             self.file_src.pop(num)
             self.duration.pop(num)
+            self.flCtrl.rows.pop(num)
+            self.flCtrl.SetItemCount(len(self.file_src))
             self.flCtrl.Select(num - 1)  # select the previous one
         self.changes_in_progress(setfocus=False)  # reset timeline
         # self.on_deselect(self)  # deselect removed file
-
-        for x in range(self.flCtrl.GetItemCount()):
-            self.flCtrl.SetItem(x, 0, str(x + 1))  # re-load counter
+        self.flCtrl.Refresh()  # re-load counter
         return
     # ----------------------------------------------------------------------
 
@@ -526,10 +688,13 @@ class FileDnD(wx.Panel):
         Clear all lines on the listCtrl and delete
         self.data list. If already empty, return None.
         """
+        if event:
+            self.flCtrl.stop_import()
         if self.flCtrl.GetItemCount() == 0:
             return
         # self.flCtrl.ClearAll()
-        self.flCtrl.DeleteAllItems()
+        self.flCtrl.SetItemCount(0)
+        del self.flCtrl.rows[:]
         del self.data[:]
         del self.outputnames[:]
         del self.file_src[:]
@@ -550,7 +715,7 @@ class FileDnD(wx.Panel):
         Selecting line with mouse or up/down keyboard buttons
         """
         index = self.flCtrl.GetFocusedItem()
-        item = self.flCtrl.GetItemText(index, 1)
+        item = self.file_src[index]
         self.parent.filedropselected = item
         self.parent.rename.Enable(True)
         pub.sendMessage("RESET_ON_CHANGED_LIST", msg=index)
@@ -590,7 +755,7 @@ class FileDnD(wx.Panel):
             return
 
         row_id = self.flCtrl.GetFocusedItem()  # Get the current row
-        oldname = self.flCtrl.GetItemText(row_id, 5)  # Get current name
+        oldname = self.outputnames[row_id]  # Get current name
         newname = ''
         title = _('Rename the file destination')
         msg = _('Rename the selected file to:')
@@ -615,8 +780,8 @@ class FileDnD(wx.Panel):
             self.parent.statusbar_msg(sanitize, FileDnD.YELLOW, FileDnD.BLACK)
             return
 
-        self.flCtrl.SetItem(row_id, 5, newname)
         self.outputnames[row_id] = newname
+        self.flCtrl.RefreshItem(row_id)
         self.parent.statusbar_msg(_('Add Files'), None)
 # -----------------------------------------------------------------------
 
@@ -645,7 +810,7 @@ class FileDnD(wx.Panel):
                 return
 
         for num, name in enumerate(newname):
-            self.flCtrl.SetItem(num, 5, name)
             self.outputnames[num] = name
+        self.flCtrl.Refresh()
 
         self.parent.statusbar_msg(_('Add Files'), None)
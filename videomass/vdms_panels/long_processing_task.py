@@ -30,12 +30,16 @@ from shutil import move
 from pubsub import pub
 import wx
 from videomass.vdms_dialogs.widget_utils import notification_area
-from videomass.vdms_io.make_filelog import make_log_template
+from videomass.vdms_io.make_filelog import (make_log_template,
+                                            logappend,
+                                            logflush,
+                                            )
 from videomass.vdms_threads.ffmpeg import FFmpeg
 from videomass.vdms_threads.image_extractor import PicturesFromVideo
 from videomass.vdms_threads.concat_demuxer import ConcatDemuxer
 from videomass.vdms_threads.slideshow import SlideshowMaker
-from videomass.vdms_utils.utils import (time_to_integer, integer_to_time)
+from videomass.vdms_threads.progress_channel import parse_stats
+from videomass.vdms_utils.utils import integer_to_time
 from videomass.vdms_io import io_tools
 
 
@@ -68,36 +72,6 @@ def delete_file_source(flist, trashdir):
                 move(name, dest)
 
 
-def pairwise(iterable):
-    """
-    Return a zip object from iterable.
-    This function is used by the update_display method.
-    ----
-    USE:
-
-    after splitting ffmpeg's progress strings such as:
-    output = "frame= 1178 fps=155 q=29.0 size=    2072kB time=00:00:39.02
-              bitrate= 435.0kbits/s speed=5.15x  "
-    in a list as:
-    iterable = ['frame', '1178', 'fps', '155', 'q', '29.0', 'size', '2072kB',
-                'time', '00:00:39.02', 'bitrate', '435.0kbits/s', speed',
-                '5.15x']
-    1)
-        for x, y in pairwise(iterable):
-            x, y
-    2)
-        dict(pairwise(iterable))
-
-    Return: a zip object pairs from list iterable object.
-
-    <https://stackoverflow.com/questions/5389507/iterating-over-every-
-    two-elements-in-a-list>
-    """
-    itobj = iter(iterable)  # list_iterator object
-    return zip(itobj, itobj)  # zip object pairs from list iterable object
-# ----------------------------------------------------------------------#
-
-
 class LogOut(wx.Panel):
     """
     displays a text control for the output logging, a progress bar
@@ -181,6 +155,7 @@ class LogOut(wx.Panel):
         self.Bind(wx.EVT_BUTTON, self.view_log, self.btn_viewlog)
 
         pub.subscribe(self.update_display, "UPDATE_EVT")
+        pub.subscribe(self.update_progress, "PROGRESS_EVT")
         pub.subscribe(self.update_count, "COUNT_EVT")
         pub.subscribe(self.end_proc, "END_EVT")
     # ----------------------------------------------------------------------
@@ -190,6 +165,7 @@ class LogOut(wx.Panel):
         Opens the log file corresponding to the last executed process.
         """
         if self.logfile:
+            logflush(self.logfile)
             fname = str(self.logfile)
             if os.path.exists(fname) and os.path.isfile(fname):
                 io_tools.openpath(fname)
@@ -215,9 +191,13 @@ class LogOut(wx.Panel):
                                          mode,  # w or a
                                          )
         if args[0] in ('One pass', 'Two pass', 'Two pass EBU',
-                       'Two pass VIDSTAB', 'Queue Processing'):
+                       'Two pass VIDSTAB'):
             self.thread_type = FFmpeg(self.logfile, data)
 
+        elif args[0] == 'Queue Processing':
+            journal = os.path.join(self.appdata['confdir'], 'queue.journal')
+            self.thread_type = FFmpeg(self.logfile, data, journal=journal)
+
         elif args[0] == 'video_to_sequence':
             self.with_eta, self.maxrotate = False, None
             self.thread_type = PicturesFromVideo(self.logfile, **data)
@@ -231,31 +211,40 @@ class LogOut(wx.Panel):
             self.thread_type = ConcatDemuxer(self.logfile, **data)
     # ----------------------------------------------------------------------
 
-    def append_messages(self, output):
+    def append_messages(self, *output):
         """
         Append all others lines on the textctrl and log file.
         Since not all ffmpeg messages are errors, sometimes
         it happens to see more output marked with yellow color.
+        Many lines can be given at once: they are written to the
+        log file at once and consecutive lines with the same color
+        are appended to the textctrl with a single call.
         """
-        with open(self.logfile, "a", encoding='utf-8') as logerr:
-            logerr.write(f"[FFMPEG]: {output}")
+        logappend(''.join([f"[FFMPEG]: {x}" for x in output]), self.logfile)
 
-        if [x for x in ('info', 'Info') if x in output]:
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['INFO']))
-            self.txtout.AppendText(f'{output}')
+        chunks = []  # list of [color, text]
+        for line in output:
+            if [x for x in ('info', 'Info') if x in line]:
+                color = self.clr['INFO']
 
-        elif [x for x in ('Failed', 'failed', 'Error', 'error')
-                if x in output]:
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['ERR0']))
-            self.txtout.AppendText(f'{output}')
+            elif [x for x in ('Failed', 'failed', 'Error', 'error')
+                    if x in line]:
+                color = self.clr['ERR0']
 
-        elif [x for x in ('warning', 'Warning', 'warn') if x in output]:
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['WARN']))
-            self.txtout.AppendText(f'{output}')
+            elif [x for x in ('warning', 'Warning', 'warn') if x in line]:
+                color = self.clr['WARN']
 
-        else:
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT3']))
-            self.txtout.AppendText(f'{output}')
+            else:
+                color = self.clr['TXT3']
+
+            if chunks and chunks[-1][0] == color:
+                chunks[-1][1] += line
+            else:
+                chunks.append([color, line])
+
+        for color, text in chunks:
+            self.txtout.SetDefaultStyle(wx.TextAttr(color))
+            self.txtout.AppendText(text)
     # ----------------------------------------------------------------------
 
     def update_display(self, output, duration, status):
@@ -276,42 +265,56 @@ class LogOut(wx.Panel):
             return  # must be return here
 
         if 'time=' in output:  # ...in processing
-            i = output.index('time=') + 5
-            pos = output[i:].split()[0]
-            msec = time_to_integer(pos)
-
-            if msec > duration:
-                self.barprog.SetValue(duration)
-            elif msec == 0:
-                self.barprog.SetValue(self.barprog.GetValue())
-            else:
-                self.barprog.SetValue(msec)
-
-            percentage = round((msec / duration) * 100 if
-                               duration != 0 else 100)
-            out = [a for a in "=".join(output.split()).split('=') if a]
-            ffprog = []
-            for key, val in pairwise(out):
-                ffprog.append(f"{key}: {val}")
+            self.set_progress(parse_stats(output), duration)
+        else:
+            self.append_messages(output)
+    # ----------------------------------------------------------------------
 
-            if self.with_eta:
-                if 'speed=' in output:
-                    speed = output.split('speed=')[-1].strip().split('x')[0]
-                    if speed in ('N/A', '0'):
-                        eta = "   ETA: N/A"
-                    else:  # is float
-                        rem = (duration - msec) / float(speed)
-                        remaining = integer_to_time(round(rem))
-                        eta = f"   ETA: {remaining}"
-                else:
-                    eta = "   ETA: N/A"
-            else:
-                eta = ""
-            self.labprog.SetLabel(f'Processing: {str(int(percentage))}% {eta}')
-            self.labffmpeg.SetLabel(' | '.join(ffprog))
+    def update_progress(self, lines, progress, duration):
+        """
+        Receive the coalesced messages from thread by pubsub
+        PROGRESS_EVT protocol (see `ProgressChannel`): `lines`
+        are the output lines collected since the last message,
+        `progress` is the latest parsed statistics line or None.
+        """
+        if lines:
+            self.append_messages(*lines)
+        if progress:
+            self.set_progress(progress, duration)
+    # ----------------------------------------------------------------------
 
+    def set_progress(self, progress, duration):
+        """
+        Update the bar progress value, the percentage label and
+        the FFmpeg statistics label with the given `progress`
+        data, see `progress_channel.parse_stats`.
+        """
+        msec = progress['msec']
+        # with parallel jobs the gauge range may belong to another item
+        maxrange = self.barprog.GetRange()
+
+        if msec > maxrange:
+            self.barprog.SetValue(maxrange)
+        elif msec == 0:
+            self.barprog.SetValue(self.barprog.GetValue())
         else:
-            self.append_messages(output)
+            self.barprog.SetValue(msec)
+
+        percentage = round((msec / duration) * 100 if
+                           duration != 0 else 100)
+
+        if self.with_eta:
+            speed = progress['speed']
+            if not speed:
+                eta = "   ETA: N/A"
+            else:  # is float
+                rem = max(duration - msec, 0) / speed
+                remaining = integer_to_time(round(rem))
+                eta = f"   ETA: {remaining}"
+        else:
+            eta = ""
+        self.labprog.SetLabel(f'Processing: {str(int(percentage))}% {eta}')
+        self.labffmpeg.SetLabel(progress['stats'])
     # ----------------------------------------------------------------------
 
     def update_count(self, count, duration, end):
@@ -393,6 +396,7 @@ class LogOut(wx.Panel):
                     delete_file_source(filetotrash, trashdir)  # filelist, dir
 
         self.txtout.AppendText('\n')
+        logflush(self.logfile)
         self.reset_all()
         pub.sendMessage("PROCESS TERMINATED", msg='Terminated')
     # ----------------------------------------------------------------------
@@ -41,10 +41,20 @@ from videomass.vdms_utils.utils import integer_to_time
 def check_images_size(flist):
     """
     Check for images size, if not equal return True,
-    None otherwise.
+    None otherwise. Also returns True if the data of
+    some items (`ProbeDataList`) are still pending.
     """
+    items = flist[:]
+    if flist.pending:
+        wx.MessageBox(_('Please wait, the media data of the imported '
+                        'files are still being loaded. Try again later.'),
+                      'Videomass', wx.ICON_INFORMATION)
+        return True
+
     sizes = []
-    for index in flist:
+    for index in items:
+        if not index.get('streams'):
+            continue
         if 'video' in index.get('streams')[0]['codec_type']:
             width = index['streams'][0]['width']
             height = index['streams'][0]['height']
@@ -486,22 +496,20 @@ class SequenceToVideo(wx.Panel):
         """
         Set ffmpeg arguments for a slideshow.
         """
-        loop = ''
         if (self.ckbx_audio.IsChecked()
                 and self.txt_apath.GetValue().strip()
                 and not self.opt["Shortest"][0]):
             self.opt["Clock"] = integer_to_time(self.opt["ADuration"])
             sec = time_to_integer(timeline, sec=True, rnd=True)
             duration = self.opt["ADuration"]
-            loop = f'-loop 1 -t {self.opt["Clock"]}'
         else:
             sec = time_to_integer(timeline, sec=True, rnd=True)
-            duration = sec * len(self.parent.file_src) * 1000
+            duration = max(sec, 1) * len(self.parent.file_src) * 1000
             self.opt["Clock"] = integer_to_time(duration)
 
-        framerate = '-framerate 1/1' if not sec else f'-framerate 1/{sec}'
-        self.opt["Preinput"] = f'{loop} {framerate}'
-        self.opt["Interval"] = sec
+        # images are read by the concat demuxer, see `SlideshowMaker`
+        self.opt["Preinput"] = f'-f concat -safe 0 -t {self.opt["Clock"]}'
+        self.opt["Interval"] = max(sec, 1)
 
         if self.txt_addparams.IsEnabled():
             addparam = self.txt_addparams.GetValue()
@@ -666,6 +674,8 @@ class SequenceToVideo(wx.Panel):
                   'args': args[0], 'nmax': countmax, 'duration': args[1],
                   'pre-input-1': self.opt["Preinput"],
                   'resize': self.opt["RESIZE"],
+                  'interval': (None if self.ckbx_static_img.IsChecked()
+                               else self.opt["Interval"]),
                   'start-time': '', 'end-time': '',
                   'preset name': 'Still Image Maker',
                   }
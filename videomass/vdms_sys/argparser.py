@@ -87,6 +87,21 @@ def arguments():
                               ),
                         metavar='DIRNAME',
                         )
+    parser.add_argument('--run-queue',
+                        help=('Process a queue file (exported from the '
+                              'Queue Manager) without the graphical user '
+                              'interface, then exit. Progress is printed on '
+                              'standard output and the exit status is 0 if '
+                              'all items were successfully completed'),
+                        metavar='FILENAME',
+                        )
+    parser.add_argument('--jobs',
+                        help=('Number of queue items to process at the same '
+                              'time with --run-queue, overrides the setting '
+                              'of the user preferences'),
+                        metavar='N',
+                        type=int,
+                        )
 
     argmts = parser.parse_args()
 
@@ -117,6 +132,16 @@ def arguments():
         print(info_this_platform())
         parser.exit(status=0, message=None)
 
+    elif argmts.run_queue:
+        from videomass.vdms_sys.configurator import DataSource
+        from videomass.vdms_engine.queue_runner import run_queue
+        appdata = DataSource({'make_portable': argmts.make_portable}
+                             ).get_fileconf()
+        if appdata.get('ERROR'):
+            parser.exit(status=1, message=f"ERROR: {appdata['ERROR']}\n")
+        parser.exit(status=run_queue(argmts.run_queue, appdata,
+                                     argmts.jobs), message=None)
+
     else:
         print("Type -h for help.")
 
@@ -220,8 +220,104 @@ class ConfigManager:
     fcode_column_width (list of int)
         column width in the format code panel (ytdownloader).
 
+    ffmpeg_jobs (int):
+        Maximum number of FFmpeg processes running simultaneously
+        during batch and queue processing, default is 1 (one
+        job at a time).
+
+    probe_cache_size (int):
+        Maximum number of media files whose ffprobe data is kept
+        in the persistent cache (see `probe_cache.ProbeCache`),
+        0 disables the cache, default is 5000.
+
+    progress_rate (int):
+        Maximum number of progress updates per second sent by
+        each FFmpeg process to the GUI, default is 10.
+
+    ffmpeg_progress_pipe (bool):
+        If True, FFmpeg writes machine-readable progress information
+        (`-progress pipe:2`) instead of the `-stats` lines during
+        conversions, default is False.
+
+    volumedetect_jobs (int):
+        Maximum number of FFmpeg processes running simultaneously
+        during the audio volume analysis (PEAK/RMS normalization),
+        default is 4.
+
+    chunk_jobs (int):
+        Maximum number of FFmpeg processes encoding at the same
+        time the segments of a single long video (see
+        `vdms_engine.chunked_encode`), values lower than 2
+        disable the segmented encoding, default is 0.
+
+    pass1_lookahead (int):
+        Maximum number of two-pass items whose first pass runs in
+        advance while the second pass of the current item is in
+        progress (one job at a time only), 0 disables it, default
+        is 0.
+
+    skip_uptodate (bool):
+        If True, the conversions whose output file is up to date
+        (same source file, arguments and FFmpeg version as the
+        run which wrote it, see `build_manifest.BuildManifest`)
+        are skipped, default is False.
+
+    fingerprint_hash (bool):
+        If True, the identity of the source files used by the
+        `skip_uptodate` option also includes a partial hash of
+        their contents (slower), otherwise only their size and
+        modification time, default is False.
+
+    fuse_outputs (bool):
+        If True, the items to be processed sharing the same source
+        file, time selection and input options (e.g. several presets
+        on the same file) are rendered by a single FFmpeg process
+        with multiple outputs, decoding the source only once,
+        default is False.
+
+    stream_copy (bool):
+        If True, the A/V Conversions copy the video and/or audio
+        streams of the source files which already match the
+        selected codec, pixel format, sample rate, channels and
+        bitrate envelope without filters, instead of encoding them
+        again (see `stream_copy.stream_copy_params`), default is False.
+
+    ytdlp_jobs (int):
+        max number of URLs downloaded at the same time by the
+        YouTube Downloader, default is 3.
+
+    ytdlp_host_jobs (int):
+        max number of URLs of the same host downloaded at the same
+        time (see `DownloadScheduler`), default is 2.
+
+    ytdlp_metadata_ttl (int):
+        life time in seconds of the cached metadata of the URLs
+        (see `MetadataCache`), 0 to disable the cache, default
+        is 3600.
+
+    ytdlp_download_archive (bool):
+        If True, the media downloaded by the YouTube Downloader
+        are recorded in the `download_archive.txt` file of the
+        configuration directory and skipped by the next downloads
+        (see `DownloadArchive`), default is False.
+
+    ytdlp_convert (bool):
+        If True, each file downloaded by the YouTube Downloader
+        is converted with the `ytdlp_convert_profile` profile of
+        the `ytdlp_convert_preset` preset as soon as it is done,
+        while the next downloads go on (see `ConversionPipeline`),
+        default is False.
+
+    ytdlp_convert_preset (str):
+        name of the preset of the Presets Manager used to convert
+        the downloaded files, default is empty.
+
+    ytdlp_convert_profile (str):
+        name of the profile of `ytdlp_convert_preset` used to
+        convert the downloaded files, default is empty.
+
     """
-    VERSION = 8.0
+    VERSION = 9.4
     DEFAULT_OPTIONS = {"confversion": VERSION,
                        "shutdown": False,
                        "sudo_password": "",
@@ -289,6 +385,24 @@ class ConfigManager:
                        "filedrop_column_width": [30, 200, 200, 200, 150, 200],
                        "fcode_column_width": [120, 60, 200, 80, 160,
                                               110, 80, 110, 100],
+                       "ffmpeg_jobs": 1,
+                       "probe_cache_size": 5000,
+                       "progress_rate": 10,
+                       "ffmpeg_progress_pipe": False,
+                       "volumedetect_jobs": 4,
+                       "chunk_jobs": 0,
+                       "pass1_lookahead": 0,
+                       "skip_uptodate": False,
+                       "fingerprint_hash": False,
+                       "fuse_outputs": False,
+                       "stream_copy": False,
+                       "ytdlp_jobs": 3,
+                       "ytdlp_host_jobs": 2,
+                       "ytdlp_metadata_ttl": 3600,
+                       "ytdlp_download_archive": False,
+                       "ytdlp_convert": False,
+                       "ytdlp_convert_preset": "",
+                       "ytdlp_convert_profile": "",
                        }
 
     def __init__(self, filename, makeportable=None):
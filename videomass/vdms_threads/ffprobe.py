@@ -26,6 +26,7 @@ This file is part of FFcuesplitter.
    along with FFcuesplitter.  If not, see <http://www.gnu.org/licenses/>.
 """
 import subprocess
+import tempfile
 import shlex
 import platform
 import json
@@ -96,3 +97,78 @@ def ffprobe(filename, cmd='ffprobe', txtenc='utf-8', **kwargs):
         return (None, excepterr)
 
     return json.loads(output), None
+
+
+def packets(filename, cmd='ffprobe', txtenc='utf-8', stream='v:0',
+            started=None):
+    """
+    Returns a tuple (packets, error) where `packets` is the list
+    of the packets of the given `stream` of `filename` in file
+    order, each one is a tuple (pts, size, pos, key): presentation
+    time (float, in seconds), size and byte offset (int, -1 if
+    not known) and True if it is a key frame. Packets without a
+    presentation time are omitted. Only the packets are read (no
+    frame is decoded), so this is quite fast even on long media
+    files. On error returns (None, str(error)).
+
+    The presentation times are relative to the start time of
+    the container, like the FFmpeg seek positions (`-ss`).
+
+    If given, `started` is called with the ffprobe `Popen` object
+    once started, e.g. to terminate a scan no longer needed.
+    """
+    args = (f'"{cmd}" -v error -select_streams {stream} '
+            f'-show_entries packet=pts_time,size,pos,flags:format=start_time '
+            f'-of compact=print_section=0 "{filename}"'
+            )
+    args = shlex.split(args) if platform.system() != 'Windows' else args
+    items, start = [], 0.0
+    try:
+        # errors go to a file, a full stderr pipe would block ffprobe
+        with tempfile.TemporaryFile(mode='w+', encoding=txtenc) as errfile:
+            with Popen(args,
+                       stdout=subprocess.PIPE,
+                       stderr=errfile,
+                       bufsize=1,
+                       universal_newlines=True,
+                       encoding=txtenc,
+                       ) as proc:
+                if started:
+                    started(proc)
+                for line in proc.stdout:
+                    pkt = dict(x.split('=', 1) for x in
+                               line.strip().split('|') if '=' in x)
+                    if 'start_time' in pkt:  # the format section
+                        if pkt['start_time'] != 'N/A':
+                            start = float(pkt['start_time'])
+                        continue
+                    if pkt.get('pts_time', 'N/A') == 'N/A':
+                        continue
+                    pos = pkt.get('pos', 'N/A')
+                    items.append((float(pkt['pts_time']),
+                                  int(pkt.get('size', 0)),
+                                  -1 if pos == 'N/A' else int(pos),
+                                  'K' in pkt.get('flags', '')))
+                if proc.wait() != 0:
+                    errfile.seek(0)
+                    return (None, f'ffprobe: {errfile.read()}')
+
+    except (OSError, FileNotFoundError, UnicodeDecodeError,
+            ValueError) as excepterr:
+        return (None, excepterr)
+
+    return [(round(pts - start, 6), size, pos, key) for
+            pts, size, pos, key in items], None
+
+
+def keyframes(filename, cmd='ffprobe', txtenc='utf-8', stream='v:0'):
+    """
+    Returns a tuple (times, error) where `times` is the sorted
+    list of the presentation times (float, in seconds) of the key
+    frames of the given `stream` of `filename`, see `packets`.
+    On error returns (None, str(error)).
+    """
+    items, error = packets(filename, cmd=cmd, txtenc=txtenc, stream=stream)
+    if error:
+        return (None, error)
+    return sorted(pts for pts, size, pos, key in items if key), None
@@ -30,6 +30,7 @@ import subprocess
 import wx
 from pubsub import pub
 from videomass.vdms_utils.utils import Popen
+from videomass.vdms_io.make_filelog import logappend, logflush
 if not platform.system() == 'Windows':
     import shlex
 
@@ -38,8 +39,7 @@ def logwrite(logfile, cmd):
     """
     write ffmpeg command log
     """
-    with open(logfile, "a", encoding='utf-8') as log:
-        log.write(f"{cmd}\n")
+    logappend(f"{cmd}\n", logfile)
 # ----------------------------------------------------------------#
 
 
@@ -47,8 +47,7 @@ def logerror(logfile, output):
     """
     write ffmpeg errors
     """
-    with open(logfile, "a", encoding='utf-8') as logerr:
-        logerr.write(f"\n[FFMPEG] generic_task ERRORS:\n{output}\n")
+    logappend(f"\n[FFMPEG] generic_task ERRORS:\n{output}\n", logfile)
 # ----------------------------------------------------------------#
 
 
@@ -147,6 +146,7 @@ class FFmpegGenericTaskOutLines(Thread):
         else:
             output = ''.join(outlist)
             logwrite(self.logfile, f'[FFMPEG]:\n{output}')
+        logflush(self.logfile)
 
         wx.CallAfter(pub.sendMessage,
                      "RESULT_EVT",
@@ -235,6 +235,7 @@ class FFmpegGenericTask(Thread):
 
         if self.status:
             logerror(self.logfile, self.status)
+        logflush(self.logfile)
 
         wx.CallAfter(pub.sendMessage,
                      "RESULT_EVT",
@@ -32,6 +32,7 @@ import wx
 from pubsub import pub
 from videomass.vdms_utils.utils import Popen
 from videomass.vdms_io.make_filelog import logwrite
+from videomass.vdms_threads.progress_channel import ProgressChannel
 if not platform.system() == 'Windows':
     import shlex
 
@@ -104,14 +105,12 @@ class PicturesFromVideo(Thread):
                        universal_newlines=True,
                        encoding=self.appdata['encoding'],
                        ) as proc:
+                channel = ProgressChannel(self.duration,
+                                          self.appdata['progress_rate'])
                 for line in proc.stderr:
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
-                                 output=line,
-                                 duration=self.duration,
-                                 status=0,
-                                 )
+                    channel.send(line)
                     if self.stop_work_thread:
+                        channel.flush()
                         proc.stdin.write('q')  # stop ffmpeg
                         out = proc.communicate()[1]
                         proc.wait()
@@ -127,6 +126,7 @@ class PicturesFromVideo(Thread):
                                      filetotrash=None)
                         return
 
+                channel.flush()
                 if proc.wait():  # error
                     out = proc.communicate()[1]
                     wx.CallAfter(pub.sendMessage,
@@ -0,0 +1,128 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: probe_import.py
+Porpose: Concurrent ffprobe analysis of imported files
+Compatibility: Python3, wxPython4 Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2024
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
+import wx
+from pubsub import pub
+from videomass.vdms_threads.ffprobe import ffprobe
+
+
+class ProbeImport(Thread):
+    """
+    Runs ffprobe on a list of files using a bounded pool of
+    worker threads, so that many files are analyzed at the same
+    time without blocking the GUI. Files already available on
+    the `ProbeCache` (if any) never spawn any subprocess.
+
+    Results are sent to the main thread as soon as they are
+    available, always in the same order as the given `filelist`,
+    through the pubsub "IMPORT_EVT" protocol, e.g.:
+
+        (path=str, probe=dict or None, error=str or None, count=int)
+
+    The "END_IMPORT_EVT" protocol is sent at the end of the task
+    or after the stop() method has been called. Other protocol
+    names can be given with `topic`, e.g. "RELOAD_EVT" and
+    "END_RELOAD_EVT" with topic="RELOAD_EVT".
+
+    USAGE:
+        >>> thread = ProbeImport(filelist, probecache)
+        >>> thread.stop()  # to cancel
+
+    """
+    MAXJOBS = 8  # max number of ffprobe subprocesses at the same time
+
+    def __init__(self, filelist, probecache=None, topic="IMPORT_EVT"):
+        """
+        filelist: list of pathnames to analyze
+        probecache: a `ProbeCache` instance or None
+        topic: pubsub protocol name of the results
+        """
+        get = wx.GetApp()  # get data from bootstrap
+        self.appdata = get.appset
+        self.stop_work_thread = False  # set stop
+        self.filelist = filelist
+        self.probecache = probecache
+        self.topic = topic
+
+        Thread.__init__(self)
+        self.start()
+    # ----------------------------------------------------------------#
+
+    def probe(self, path):
+        """
+        Returns a tuple (data, error) of the given pathname,
+        see `ffprobe.ffprobe`. This method runs on the worker
+        threads of the pool.
+        """
+        if self.stop_work_thread:
+            return None, None
+
+        if self.probecache:
+            data = self.probecache.get(path)
+            if data is not None:
+                return data, None
+
+        data, error = ffprobe(path, cmd=self.appdata['ffprobe_cmd'],
+                              txtenc=self.appdata['encoding'],
+                              hide_banner=None, pretty=None)
+        if not error and self.probecache:
+            self.probecache.put(path, data)
+
+        return data, error
+    # ----------------------------------------------------------------#
+
+    def run(self):
+        """
+        Run the separated thread. Note that `executor.map`
+        yields the results in the same order as the
+        `filelist`, while still probing concurrently.
+        """
+        jobs = max(min(ProbeImport.MAXJOBS, os.cpu_count() or 1,
+                       len(self.filelist)), 1)
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            results = executor.map(self.probe, self.filelist)
+            for count, (path, res) in enumerate(zip(self.filelist,
+                                                    results), start=1):
+                if self.stop_work_thread:
+                    break
+                wx.CallAfter(pub.sendMessage,
+                             self.topic,
+                             path=path,
+                             probe=res[0],
+                             error=res[1],
+                             count=count,
+                             )
+        wx.CallAfter(pub.sendMessage, f"END_{self.topic}", msg=None)
+    # ----------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Sets the stop work thread to terminate the process
+        """
+        self.stop_work_thread = True
@@ -0,0 +1,357 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: progress_channel.py
+Porpose: coalescing channel for FFmpeg progress messages
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2024
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import re
+import time
+from threading import RLock
+from videomass.vdms_utils.utils import time_to_integer, format_bytes
+from videomass.vdms_engine.notify import gui_notify
+
+
+def pairwise(iterable):
+    """
+    Return a zip object from iterable.
+    This function is used by the `parse_stats` function.
+    ----
+    USE:
+
+    after splitting ffmpeg's progress strings such as:
+    output = "frame= 1178 fps=155 q=29.0 size=    2072kB time=00:00:39.02
+              bitrate= 435.0kbits/s speed=5.15x  "
+    in a list as:
+    iterable = ['frame', '1178', 'fps', '155', 'q', '29.0', 'size', '2072kB',
+                'time', '00:00:39.02', 'bitrate', '435.0kbits/s', speed',
+                '5.15x']
+    1)
+        for x, y in pairwise(iterable):
+            x, y
+    2)
+        dict(pairwise(iterable))
+
+    Return: a zip object pairs from list iterable object.
+
+    <https://stackoverflow.com/questions/5389507/iterating-over-every-
+    two-elements-in-a-list>
+    """
+    itobj = iter(iterable)  # list_iterator object
+    return zip(itobj, itobj)  # zip object pairs from list iterable object
+# ----------------------------------------------------------------------#
+
+
+def parse_stats(output):
+    """
+    Parse a FFmpeg statistics line (i.e. "frame= ... time=... speed=...")
+    and returns a dict as:
+
+        {'msec': int,  # time position in milliseconds
+         'speed': float or None,  # e.g. 5.15, None if not available
+         'stats': str,  # e.g. 'frame: 1178 | fps: 155 | ...'
+         }
+    """
+    i = output.index('time=') + 5
+    msec = time_to_integer(output[i:].split()[0])
+    out = [a for a in "=".join(output.split()).split('=') if a]
+    stats = ' | '.join([f"{key}: {val}" for key, val in pairwise(out)])
+    speed = None
+    if 'speed=' in output:
+        speed = to_float(output.split('speed=')[-1].strip().split('x')[0])
+
+    return {'msec': msec, 'speed': speed, 'stats': stats}
+# ----------------------------------------------------------------------#
+
+
+def to_float(value):
+    """
+    Convert a FFmpeg numeric string (e.g. '5.15x', '435.0kbits/s')
+    to float, returns `None` if not available (e.g. 'N/A').
+    """
+    match = re.match(r'\s*(-?\d+(?:\.\d+)?)', value)
+    return float(match.group(1)) if match else None
+# ----------------------------------------------------------------------#
+
+
+class ProgressParser:
+    """
+    Incremental parser of the machine-readable progress
+    information written by FFmpeg with the `-progress pipe:2`
+    option, i.e. blocks of "key=value" lines as:
+
+        frame=1178
+        fps=155.00
+        bitrate= 435.0kbits/s
+        total_size=2121728
+        out_time_us=39020000
+        speed=5.15x
+        progress=continue
+
+    Lines are given one by one to the `feed` method, which
+    returns a typed progress record at the end of each block:
+
+        {'out_time_us': int, 'frame': int, 'fps': float or None,
+         'bitrate': float or None,  # kbits/s
+         'total_size': int, 'speed': float or None,
+         'end': bool,  # True on the last block
+         }
+    """
+    KEYS = ('frame', 'fps', 'bitrate', 'total_size', 'out_time_us',
+            'out_time_ms', 'out_time', 'dup_frames', 'drop_frames',
+            'speed', 'progress')
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.block = {}
+    # ----------------------------------------------------------------#
+
+    @staticmethod
+    def is_progress(line):
+        """
+        Returns True if the given line belongs to a progress block,
+        i.e. a single "key=value" pair, while a statistics line (e.g.
+        "frame= 1178 fps=155 ...") has many of them.
+        """
+        key = line.split('=', 1)[0]
+        if line.count('=') != 1 or ' ' in key:
+            return False
+        return key in ProgressParser.KEYS or key.startswith('stream_')
+    # ----------------------------------------------------------------#
+
+    def feed(self, line):
+        """
+        Parse a progress line (see `is_progress`). Returns the
+        progress record when the block is complete, None otherwise.
+        """
+        key, val = line.strip().split('=', 1)
+        if key != 'progress':
+            self.block[key] = val.strip()
+            return None
+
+        block, self.block = self.block, {}
+        # out_time_ms is expressed in microseconds on all ffmpeg versions
+        usec = block.get('out_time_us', block.get('out_time_ms', 'N/A'))
+        return {'out_time_us': max(int(to_float(usec) or 0), 0),
+                'frame': int(to_float(block.get('frame', '0')) or 0),
+                'fps': to_float(block.get('fps', 'N/A')),
+                'bitrate': to_float(block.get('bitrate', 'N/A')),
+                'total_size': int(to_float(block.get('total_size',
+                                                     '0')) or 0),
+                'speed': to_float(block.get('speed', 'N/A')),
+                'end': val.strip() == 'end',
+                }
+# ----------------------------------------------------------------------#
+
+
+def record_to_progress(record):
+    """
+    Convert a `ProgressParser` record to the same dict
+    returned by `parse_stats`.
+    """
+    stats = [f"frame: {record['frame']}"]
+    if record['fps'] is not None:
+        stats.append(f"fps: {record['fps']}")
+    stats.append(f"size: {format_bytes(record['total_size'])}")
+    if record['bitrate'] is not None:
+        stats.append(f"bitrate: {record['bitrate']}kbits/s")
+    if record['speed'] is not None:
+        stats.append(f"speed: {record['speed']}x")
+
+    return {'msec': record['out_time_us'] // 1000,
+            'speed': record['speed'],
+            'stats': ' | '.join(stats),
+            }
+# ----------------------------------------------------------------------#
+
+
+class ProgressChannel:
+    """
+    Coalescing channel for the FFmpeg output lines read by the
+    worker threads. Instead of sending a pubsub message for each
+    line, statistics lines (both `-stats` lines and `-progress`
+    blocks, see `ProgressParser`) are parsed right away in the
+    worker thread, keeping only the latest state, while all other
+    lines are collected; both are sent to the main thread at most
+    `maxrate` times per second by the pubsub "PROGRESS_EVT"
+    protocol, e.g.:
+
+        (lines=list, progress=dict or None, duration=int)
+
+    where `progress` is the dict returned by `parse_stats`.
+
+    The `flush` method must be called at the end of the output
+    and before sending any other message (e.g. "COUNT_EVT"),
+    so that the main thread receives the messages in order.
+
+    Messages are given to the `notify` callable (see
+    `vdms_engine.notify`), by default to the GUI.
+
+    USAGE:
+        >>> channel = ProgressChannel(duration, maxrate=10)
+        >>> for line in proc.stderr:
+        >>>     channel.send(line)
+        >>> channel.flush()
+
+    """
+    def __init__(self, duration, maxrate=10, notify=None):
+        """
+        duration: duration in milliseconds of the current item
+        maxrate: max number of messages per second
+        notify: callable receiving the messages, if None the GUI
+        """
+        self.notify = notify or gui_notify
+        self.duration = duration
+        self.interval = 1 / max(int(maxrate), 1)
+        self.lines = []
+        self.progress = None
+        self.last = 0
+        self.parser = ProgressParser()
+    # ----------------------------------------------------------------#
+
+    def send(self, line):
+        """
+        Add an output line, sending all pending data
+        if the time interval is elapsed.
+        """
+        if ProgressParser.is_progress(line):
+            record = self.parser.feed(line)
+            if record is None:
+                return
+            self.progress = record_to_progress(record)
+        elif 'time=' in line:
+            self.progress = parse_stats(line)
+        else:
+            self.lines.append(line)
+
+        if time.monotonic() - self.last >= self.interval:
+            self.flush()
+    # ----------------------------------------------------------------#
+
+    def flush(self):
+        """
+        Send all pending data, if any.
+        """
+        if not self.lines and self.progress is None:
+            return
+        self.notify("PROGRESS_EVT",
+                    lines=self.lines,
+                    progress=self.progress,
+                    duration=self.duration,
+                    )
+        self.lines = []
+        self.progress = None
+        self.last = time.monotonic()
+# ----------------------------------------------------------------------#
+
+
+class SegmentsChannel(ProgressChannel):
+    """
+    Coalescing channel for the output of several FFmpeg processes
+    encoding at the same time consecutive segments of the same item
+    (see `vdms_engine.chunked_encode`). The positions of all
+    segments are summed up, so that the main thread receives a single
+    timeline of the whole item by the same "PROGRESS_EVT" protocol
+    used by `ProgressChannel`; the speed is the sum of the speeds of
+    the running processes.
+
+    USAGE:
+        >>> channel = SegmentsChannel(duration, segments=8, maxrate=10)
+        >>> for line in proc.stderr:  # on each worker thread
+        >>>     channel.send(line, index)
+        >>> channel.done(index, msec)  # segment completed
+        >>> channel.flush()
+
+    This class is thread-safe.
+    """
+    def __init__(self, duration, segments, maxrate=10, notify=None):
+        """
+        duration: duration in milliseconds of the whole item
+        segments: number of segments
+        maxrate: max number of messages per second
+        notify: callable receiving the messages, if None the GUI
+        """
+        super().__init__(duration, maxrate, notify)
+        self.lock = RLock()
+        self.parsers = [ProgressParser() for _ in range(segments)]
+        self.position = [0] * segments
+        self.speeds = [None] * segments
+        self.finished = 0
+    # ----------------------------------------------------------------#
+
+    def send(self, line, index=0):
+        """
+        Add an output line of the given segment `index`,
+        sending all pending data if the time interval is elapsed.
+        """
+        with self.lock:
+            if ProgressParser.is_progress(line):
+                record = self.parsers[index].feed(line)
+                if record is None:
+                    return
+                self.update(index, record_to_progress(record))
+            elif 'time=' in line:
+                self.update(index, parse_stats(line))
+            else:
+                self.lines.append(line)
+
+            if time.monotonic() - self.last >= self.interval:
+                self.flush()
+    # ----------------------------------------------------------------#
+
+    def update(self, index, progress):
+        """
+        Set the progress (see `parse_stats`) of the given
+        segment `index` and the progress of the whole item.
+        """
+        with self.lock:
+            self.position[index] = progress['msec']
+            self.speeds[index] = progress['speed']
+            speeds = [x for x in self.speeds if x]
+            speed = round(sum(speeds), 2) if speeds else None
+            stats = f'segments: {self.finished}/{len(self.position)}'
+            if speed:
+                stats = f'{stats} | speed: {speed}x'
+            self.progress = {'msec': sum(self.position),
+                             'speed': speed,
+                             'stats': stats,
+                             }
+    # ----------------------------------------------------------------#
+
+    def done(self, index, msec):
+        """
+        Mark the given segment `index` as completed,
+        `msec` is the duration of the segment.
+        """
+        with self.lock:
+            self.finished += 1
+            self.update(index, {'msec': msec, 'speed': None})
+    # ----------------------------------------------------------------#
+
+    def flush(self):
+        """
+        Send all pending data, if any.
+        """
+        with self.lock:
+            super().flush()
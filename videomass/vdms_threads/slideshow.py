@@ -25,187 +25,72 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 import os
+import math
 import tempfile
 from threading import Thread
 import time
 import subprocess
 import platform
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import wx
 from pubsub import pub
-from videomass.vdms_utils.utils import Popen
+from videomass.vdms_utils.utils import (Popen,
+                                        write_concat_list,
+                                        image_codecs,
+                                        )
 from videomass.vdms_io.make_filelog import logwrite
+from videomass.vdms_threads.progress_channel import ProgressChannel
 if not platform.system() == 'Windows':
     import shlex
 
 
-def convert_images(*varargs, **kwargs):
+def merge_filters(args, resize):
     """
-    Convert images to PNG format and assign
-    progressive digits to them.
+    Prepend the resizing filters (e.g. '-vf "scale=640:-1"')
+    to the video filters of the given arguments, so that
+    the images are normalized by the same filtergraph.
     """
-    flist = varargs[0]
-    tmpdir = varargs[1]
-    logname = varargs[2]
-    imagenames = varargs[3]
+    flt = resize.split('"')[1] if resize.count('"') >= 2 else ''
+    if not flt:
+        return args
+    if '-vf "' not in args:
+        return f'{resize} {args}'
+    return args.replace('-vf "', f'-vf "{flt},', 1)
 
-    count1 = (f'Preparing temporary files...\nSource: Imported file list\n'
-              f'Destination: "{tmpdir}"\n')
-    wx.CallAfter(pub.sendMessage,
-                 "COUNT_EVT",
-                 count=count1,
-                 duration=len(flist),
-                 end='CONTINUE',
-                 )
-    prognum = 0
-    args = (f'"{kwargs["ffmpeg_cmd"]}" '
-            f'{kwargs["ffmpeg-default-args"]} '
-            f'{kwargs["ffmpeg_loglev"]} ')
-    logwrite(f'Preparing temporary files...\n'
-             f'\n[COMMAND:]\n{args}', '', logname)
 
-    for files in flist:
-        prognum += 1
-        tmpf = os.path.join(tmpdir, f'{imagenames}{prognum}.bmp')
-        cmd_1 = f'{args} -i "{files}" "{tmpf}"'
-
-        if not platform.system() == 'Windows':
-            cmd_1 = shlex.split(cmd_1)
-        try:
-            with Popen(cmd_1,
-                       stderr=subprocess.PIPE,
-                       bufsize=1,
-                       universal_newlines=True,
-                       encoding=kwargs['encoding'],
-                       ) as proc1:
-                error = proc1.communicate()[1]
-
-            if proc1.returncode:  # ffmpeg error
-                if error:
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
-                                 output='FAILED',
-                                 duration=0,
-                                 status=proc1.wait(),
-                                 )
-                    logwrite('', (f"[VIDEOMASS]: Error Exit Status: "
-                                  f"{proc1.wait()} {error}"), logname)
-                    time.sleep(1)
-                    return error
-
-            else:  # ok
-                wx.CallAfter(pub.sendMessage,
-                             "UPDATE_EVT",
-                             output=f' |{prognum}|  {files}  >  {tmpf}\n',
-                             duration=0,
-                             status=0,
-                             )
-        except (OSError, FileNotFoundError) as err:  # cmd not found
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_EVT",
-                         count=err,
-                         duration=0,
-                         end='ERROR',
-                         )
-            return err
-
-    time.sleep(.5)
-    wx.CallAfter(pub.sendMessage,
-                 "COUNT_EVT",
-                 count='',
-                 duration=0,
-                 end='DONE'
-                 )
-    return None
-
-
-def resizing_process(*varargs, **kwargs):
+def convert_image(cmd, encoding):
     """
-    After the images have been converted to the required format,
-    this process performs the resizing using ffmpeg filters.
-    This is a necessary workaround for proper video playback.
+    Converts a single image with the given FFmpeg command.
+    Returns a tuple (exit status, stderr output); the status
+    is None if the FFmpeg executable could not be run.
     """
-    flist = varargs[0]
-    tmpdir = varargs[1]
-    cmdargs = varargs[2]
-    logname = varargs[3]
-
-    count1 = (f'\n\nFile resizing...\nSource: Temporary directory\n'
-              f'Destination: "{tmpdir}"')
-
-    wx.CallAfter(pub.sendMessage,
-                 "COUNT_EVT",
-                 count=count1,
-                 duration=len(flist),
-                 end='CONTINUE',
-                 )
-
-    tmpf = os.path.join(tmpdir, 'TMP_%d.bmp')
-    tmpfout = os.path.join(tmpdir, 'IMAGE_%d.bmp')
-    cmd_1 = (f'"{kwargs["ffmpeg_cmd"]}" '
-             f'{kwargs["ffmpeg-default-args"]} '
-             f'{kwargs["ffmpeg_loglev"]} '
-             f'-i "{tmpf}" {cmdargs} "{tmpfout}"'
-             )
-    logwrite(f'\nFile resizing...\n\n[COMMAND]:\n{cmd_1}', '', logname)
-
     if not platform.system() == 'Windows':
-        cmd_1 = shlex.split(cmd_1)
+        cmd = shlex.split(cmd)
     try:
-        with Popen(cmd_1,
+        with Popen(cmd,
                    stderr=subprocess.PIPE,
-                   bufsize=1,
                    universal_newlines=True,
-                   encoding=kwargs['encoding'],
-                   ) as proc1:
-            error = proc1.communicate()[1]
-
-        if proc1.returncode:  # ffmpeg error
-            if error:
-                wx.CallAfter(pub.sendMessage,
-                             "UPDATE_EVT",
-                             output='FAILED',
-                             duration=0,
-                             status=proc1.wait(),
-                             )
-                logwrite('', (f"[VIDEOMASS]: Error Exit Status: "
-                              f"{proc1.wait()} {error}"), logname)
-                time.sleep(1)
-                return error
-
-        else:  # ok
-            wx.CallAfter(pub.sendMessage,
-                         "UPDATE_EVT",
-                         output='',
-                         duration=0,
-                         status=0,
-                         )
-            logwrite('', error, logname)
-            time.sleep(1)
-
+                   encoding=encoding,
+                   ) as proc:
+            error = proc.communicate()[1]
     except (OSError, FileNotFoundError) as err:  # cmd not found
-        wx.CallAfter(pub.sendMessage,
-                     "COUNT_EVT",
-                     count=err,
-                     duration=0,
-                     end='ERROR',
-                     )
-        return err
+        return None, err
 
-    time.sleep(.5)
-    wx.CallAfter(pub.sendMessage,
-                 "COUNT_EVT",
-                 count='',
-                 duration=0,
-                 end='DONE'
-                 )
-    return None
+    return proc.returncode, error
 
 
 class SlideshowMaker(Thread):
     """
     Represents the ffmpeg subprocess to produce a video in
-    mkv format from a sequence of images already converted
-    and resized in a temporary context.
+    mkv format from a sequence of images.
+
+    The images are read by the FFmpeg concat demuxer from a list
+    which sets the duration of each image, and are resized by the
+    same filtergraph of the video encoding. The concat demuxer
+    opens a single decoder for the whole list, so if the images
+    have different formats (e.g. PNG and JPEG) they are first
+    converted to temporary 24-bit BMP files by a pool of FFmpeg
+    processes, see `normalize_images`.
     """
 
     def __init__(self, *args, **kwargs):
@@ -227,58 +112,139 @@ class SlideshowMaker(Thread):
 
         self.start()
 
+    def input_args(self, tempdir):
+        """
+        Returns the FFmpeg input arguments of the images. A static
+        video takes a single looped image, a slideshow takes a
+        concat list of the images, each one lasting `interval`
+        seconds, repeated to fill the duration of the video (e.g.
+        to match a longer audio track, see `pre-input-1`).
+        Returns None if the images could not be converted to
+        a common format.
+        """
+        if self.kwa['interval'] is None:  # static video
+            return f'{self.kwa["pre-input-1"]} -i "{self.kwa["source"][0]}"'
+
+        files = list(self.kwa['source'])
+        if len(image_codecs(files)) > 1:  # mixed image formats
+            files = self.normalize_images(files, tempdir)
+            if files is None:
+                return None
+        repeat = math.ceil(self.duration
+                           / (self.kwa['interval'] * 1000 * len(files)))
+        listfile = os.path.join(tempdir, 'slideshow.txt')
+        write_concat_list(files * max(repeat, 1), listfile,
+                          duration=self.kwa['interval'])
+        return f'{self.kwa["pre-input-1"]} -i "{listfile}"'
+
+    def normalize_images(self, files, tempdir):
+        """
+        Converts the given images to 24-bit BMP files in the
+        `tempdir` concurrently, so that the concat demuxer reads
+        a single image format. Returns the list of the converted
+        files in the same order or None if a conversion fails
+        or the process is stopped.
+        """
+        sources = list(dict.fromkeys(files))  # once each, in order
+        tmpfiles = {src: os.path.join(tempdir, f'IMAGE_{num}.bmp')
+                    for num, src in enumerate(sources, start=1)}
+        count = (f'Preparing temporary files...\nSource: Imported file '
+                 f'list\nDestination: "{tempdir}"\n')
+        wx.CallAfter(pub.sendMessage,
+                     "COUNT_EVT",
+                     count=count,
+                     duration=len(sources),
+                     end='CONTINUE',
+                     )
+        args = (f'"{self.appdata["ffmpeg_cmd"]}" '
+                f'{self.appdata["ffmpeg-default-args"]} '
+                f'{self.appdata["ffmpeg_loglev"]}')
+        logwrite(f'{count}\n[COMMAND]:\n{args} -i "IMAGE" '
+                 f'-pix_fmt bgr24 "IMAGE.bmp"', '', self.logfile)
+
+        def convert(src):
+            if self.stop_work_thread:  # skip the remaining images
+                return 'STOP', None
+            return convert_image(f'{args} -i "{src}" -pix_fmt bgr24 '
+                                 f'"{tmpfiles[src]}"',
+                                 self.appdata['encoding'])
+
+        status, error = 0, None
+        jobs = max(min(len(sources), os.cpu_count() or 1), 1)
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = {executor.submit(convert, src): src for src in sources}
+            for prognum, future in enumerate(as_completed(futures), start=1):
+                status, error = future.result()
+                if status == 0:
+                    src = futures[future]
+                    wx.CallAfter(pub.sendMessage,
+                                 "UPDATE_EVT",
+                                 output=(f' |{prognum}|  {src}  >  '
+                                         f'{tmpfiles[src]}\n'),
+                                 duration=0,
+                                 status=0,
+                                 )
+                    continue
+                for pending in futures:  # no further conversions
+                    pending.cancel()
+                break
+
+        if self.stop_work_thread:
+            wx.CallAfter(pub.sendMessage,
+                         "UPDATE_EVT",
+                         output='STOP',
+                         duration=0,
+                         status=1,
+                         )
+            time.sleep(1)
+            return None
+        if status is None:  # cmd not found
+            wx.CallAfter(pub.sendMessage,
+                         "COUNT_EVT",
+                         count=error,
+                         duration=0,
+                         end='ERROR',
+                         )
+            logwrite('', error, self.logfile)
+            return None
+        if status:  # ffmpeg error
+            wx.CallAfter(pub.sendMessage,
+                         "UPDATE_EVT",
+                         output='FAILED',
+                         duration=0,
+                         status=status,
+                         )
+            logwrite('', (f"[VIDEOMASS]: Error Exit Status: "
+                          f"{status} {error}"), self.logfile)
+            time.sleep(1)
+            return None
+
+        wx.CallAfter(pub.sendMessage,
+                     "COUNT_EVT",
+                     count='',
+                     duration=0,
+                     end='DONE'
+                     )
+        return [tmpfiles[src] for src in files]
+
     def run(self):
         """
         Subprocess initialize thread.
         """
-        imgtmpnames = 'TMP_' if self.kwa["resize"] else 'IMAGE_'
         filedone = []
         with tempfile.TemporaryDirectory() as tempdir:  # make tmp dir
-            tmpproc1 = convert_images(self.kwa['source'],
-                                      tempdir,
-                                      self.logfile,
-                                      imgtmpnames,
-                                      **self.appdata,
-                                      )
-            if tmpproc1 is not None or self.stop_work_thread:
-                wx.CallAfter(pub.sendMessage,
-                             "UPDATE_EVT",
-                             output='ERROR',
-                             duration=self.kwa['duration'],
-                             status=1,
-                             )
-                self.end_process(None)
+            inputs = self.input_args(tempdir)
+            if inputs is None:  # image conversion failed
+                self.end_process(filedone)
                 return
-
-            if imgtmpnames == 'TMP_':
-                tmpproc2 = resizing_process(self.kwa['source'],
-                                            tempdir,
-                                            self.kwa["resize"],
-                                            self.logfile,
-                                            **self.appdata,
-                                            )
-
-                if tmpproc2 is not None or self.stop_work_thread:
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
-                                 output='ERROR',
-                                 duration=self.kwa['duration'],
-                                 status=1,
-                                 )
-                    self.end_process(None)
-                    return
-
-            # ------------------------------- make video
-            tmpgroup = os.path.join(tempdir, 'IMAGE_%d.bmp')
             cmd_2 = (f'"{self.appdata["ffmpeg_cmd"]}" '
                      f'{self.appdata["ffmpeg-default-args"]} '
                      f'{self.appdata["ffmpeg_loglev"]} '
-                     f'{self.kwa["pre-input-1"]} '
-                     f'-i "{tmpgroup}" '
-                     f'{self.kwa["args"]} '
+                     f'{inputs} '
+                     f'{merge_filters(self.kwa["args"], self.kwa["resize"])} '
                      f'"{self.destination}"'
                      )
-            count = (f'\n\nVideo production...\nSource: "{tempdir}"\n'
+            count = (f'Video production...\nSource: Imported file list\n'
                      f'Destination: "{self.destination}"\n')
             log = f'{count}\n\n[COMMAND]:\n{cmd_2}'
 
@@ -290,7 +256,6 @@ class SlideshowMaker(Thread):
                          )
 
             logwrite(log, '', self.logfile)
-            time.sleep(1)
 
             if not self.appdata['ostype'] == 'Windows':
                 cmd_2 = shlex.split(cmd_2)
@@ -303,14 +268,12 @@ class SlideshowMaker(Thread):
                            universal_newlines=True,
                            encoding=self.appdata['encoding'],
                            ) as proc2:
+                    channel = ProgressChannel(self.duration,
+                                              self.appdata['progress_rate'])
                     for line in proc2.stderr:
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output=line,
-                                     duration=self.duration,
-                                     status=0,
-                                     )
+                        channel.send(line)
                         if self.stop_work_thread:
+                            channel.flush()
                             proc2.stdin.write('q')  # stop ffmpeg
                             out = proc2.communicate()[1]
                             proc2.wait()
@@ -325,6 +288,7 @@ class SlideshowMaker(Thread):
                             self.end_process(None)
                             return
 
+                    channel.flush()
                     if proc2.wait():  # error
                         out = proc2.communicate()[1]
                         wx.CallAfter(pub.sendMessage,
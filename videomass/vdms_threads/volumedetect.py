@@ -31,7 +31,16 @@ import platform
 import wx
 from pubsub import pub
 from videomass.vdms_utils.utils import Popen
-from videomass.vdms_io.make_filelog import make_log_template
+from videomass.vdms_io.loudness_cache import (LoudnessCache,
+                                              LoudnessParser,
+                                              fused_filter,
+                                              audio_index,
+                                              detect_files,
+                                              )
+from videomass.vdms_io.make_filelog import (make_log_template,
+                                            logappend,
+                                            logflush,
+                                            )
 if not platform.system() == 'Windows':
     import shlex
 
@@ -46,11 +55,20 @@ class VolumeDetectThread(Thread):
     existence of files) is entrusted to ffmpeg, except for the
     lack of ffmpeg of course.
 
+    If the `loudnorm` targets are given (see `loudness_cache.
+    loudnorm_targets`), the same decode also measures the loudness
+    for the EBU R128 normalization (and optionally the ebur128
+    data): all measurements are stored on the application
+    `LoudnessCache` so that they can be reused later without
+    decoding the files again. Files already measured are not
+    decoded at all.
+
     """
     ERROR = 'Please, see volumedetected.log file for error details.\n'
     STOP = '[Videomass]: STOP command received.'
 
-    def __init__(self, timeseq, filelist, audiomap):
+    def __init__(self, timeseq, filelist, audiomap, loudnorm=None,
+                 ebur128=False):
         """
         Replace /dev/null with NUL on Windows.
 
@@ -67,7 +85,12 @@ class VolumeDetectThread(Thread):
         self.filelist = filelist
         self.time_seq = timeseq
         self.audiomap = audiomap
+        self.loudnorm = loudnorm  # loudnorm targets, tuple or None
+        self.ebur128 = ebur128
+        self.loudcache = get.loudnesscache
         self.status = None
+        self.failed = False  # set by any error to skip the next items
+        self.jobs = int(self.appdata['volumedetect_jobs'])
         self.data = None
         self.nul = 'NUL' if platform.system() == 'Windows' else '/dev/null'
         self.logf = os.path.join(self.appdata['logdir'], 'volumedetected.log')
@@ -86,61 +109,20 @@ class VolumeDetectThread(Thread):
               dialog, but a empty string that is useful to get
               the end of the process to close of the pop-up
 
+        Files are analyzed concurrently by up to `jobs` FFmpeg
+        subprocesses, but the results are always collected in
+        the same order as `filelist`: as in a sequential run,
+        the volume data ends with the first item that failed
+        or was stopped, if any (see `detect_files`).
         """
-        volume = []
-        for files in self.filelist:
-            cmd = (f'"{self.appdata["ffmpeg_cmd"]}" '
-                   f'{self.appdata["ffmpeg-default-args"]} '
-                   f'{self.appdata["ffmpeg_loglev"]} '
-                   f'{self.time_seq[0]} '
-                   f'-i "{files}" '
-                   f'{self.time_seq[1]} '
-                   f'{self.audiomap} '
-                   f'-af volumedetect -vn -sn -dn -f null '
-                   f'{self.nul}'
-                   )
-            self.logwrite(cmd)
-
-            if not platform.system() == 'Windows':
-                cmd = shlex.split(cmd)
-            try:
-                with Popen(cmd,
-                           stderr=subprocess.PIPE,
-                           stdin=subprocess.PIPE,
-                           bufsize=1,
-                           universal_newlines=True,
-                           encoding=self.appdata['encoding'],
-                           ) as proc:
-                    meanv, maxv = '', ''
-                    for line in proc.stderr:
-                        if 'max_volume:' in line:
-                            maxv = line.split(':')[1].strip()
-                        if 'mean_volume:' in line:
-                            meanv = line.split(':')[1].strip()
-
-                        if self.stop_work_thread:
-                            proc.stdin.write('q')  # stop ffmpeg
-                            output = proc.communicate()[1]
-                            proc.wait()
-                            self.status = 'INFO', VolumeDetectThread.STOP
-                            break
-
-                        if proc.wait():
-                            output = proc.communicate()[1]
-                            self.status = 'ERROR', VolumeDetectThread.ERROR
-                            break
-
-                    volume.append((maxv, meanv))
-
-            except (OSError, FileNotFoundError) as err:
-                self.status = 'ERROR', VolumeDetectThread.ERROR
-                output = err
-
-            if self.status:
-                self.logerror(output)
-                break
+        volume, status, output = detect_files(self.detect, self.filelist,
+                                              self.jobs)
+        if status:
+            self.status = status
+            self.logerror(output)
 
         self.data = (volume, self.status)
+        logflush(self.logf)
 
         wx.CallAfter(pub.sendMessage,
                      "RESULT_EVT",
@@ -148,21 +130,88 @@ class VolumeDetectThread(Thread):
                      )
     # ----------------------------------------------------------------#
 
+    def detect(self, files):
+        """
+        Run the volumedetect analysis of a single file, this
+        method runs on the worker threads of the pool.
+        Returns a tuple (volume, status, output) where volume is
+        a tuple (maxv, meanv) and status is None if successful.
+        Returns (None, None, None) if the item was skipped.
+        """
+        if self.stop_work_thread or self.failed:
+            return None, None, None
+
+        key = LoudnessCache.key(files, self.time_seq,
+                                audio_index(self.audiomap), self.loudnorm)
+        cached = self.loudcache.get(key)
+        if cached and 'max_volume' in cached:
+            return (cached['max_volume'], cached['mean_volume']), None, None
+
+        cmd = (f'"{self.appdata["ffmpeg_cmd"]}" '
+               f'{self.appdata["ffmpeg-default-args"]} '
+               f'{self.appdata["ffmpeg_loglev"]} '
+               f'{self.time_seq[0]} '
+               f'-i "{files}" '
+               f'{self.time_seq[1]} '
+               f'{self.audiomap} '
+               f'-af {fused_filter(self.loudnorm, self.ebur128)} '
+               f'-vn -sn -dn -f null '
+               f'{self.nul}'
+               )
+        self.logwrite(cmd)
+
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+        status, output = None, None
+        parser = LoudnessParser()
+        try:
+            with Popen(cmd,
+                       stderr=subprocess.PIPE,
+                       stdin=subprocess.PIPE,
+                       bufsize=1,
+                       universal_newlines=True,
+                       encoding=self.appdata['encoding'],
+                       ) as proc:
+                for line in proc.stderr:
+                    parser.feed(line)
+
+                    if self.stop_work_thread:
+                        proc.stdin.write('q')  # stop ffmpeg
+                        output = proc.communicate()[1]
+                        proc.wait()
+                        status = 'INFO', VolumeDetectThread.STOP
+                        break
+
+                if not status and proc.wait():
+                    output = proc.communicate()[1]
+                    status = 'ERROR', VolumeDetectThread.ERROR
+
+        except (OSError, FileNotFoundError) as err:
+            status = 'ERROR', VolumeDetectThread.ERROR
+            output = err
+
+        if status and status[0] == 'ERROR':
+            self.failed = True  # do not start other items
+        elif not status:
+            self.loudcache.put(key, parser.data)
+
+        maxv = parser.data.get('max_volume', '')
+        meanv = parser.data.get('mean_volume', '')
+        return (maxv, meanv), status, output
+    # ----------------------------------------------------------------#
+
     def logwrite(self, cmd):
         """
         write ffmpeg command log
         """
-        with open(self.logf, "a", encoding='utf-8') as log:
-            log.write(f"{cmd}\n")
+        logappend(f"{cmd}\n", self.logf)
     # ----------------------------------------------------------------#
 
     def logerror(self, output):
         """
         write ffmpeg volumedected errors
         """
-        with open(self.logf, "a", encoding='utf-8') as logerr:
-            logerr.write(f"\n[FFMPEG] volumedetect "
-                         f"ERRORS:\n{output}\n")
+        logappend(f"\n[FFMPEG] volumedetect ERRORS:\n{output}\n", self.logf)
     # ----------------------------------------------------------------#
 
     def stop(self):
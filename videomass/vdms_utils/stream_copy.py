@@ -0,0 +1,233 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: stream_copy.py
+Porpose: stream copy of the streams that already match the target
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2024
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import re
+
+# encoder names: codec names given by ffprobe
+VIDEO_ENCODERS = {'libx264': 'h264',
+                  'libx265': 'hevc',
+                  'libvpx-vp9': 'vp9',
+                  'libaom-av1': 'av1',
+                  'libsvtav1': 'av1',
+                  'mpeg4': 'mpeg4',
+                  'libxvid': 'mpeg4',
+                  }
+AUDIO_ENCODERS = {'aac': 'aac',
+                  'libfdk_aac': 'aac',
+                  'libmp3lame': 'mp3',
+                  'libopus': 'opus',
+                  'libvorbis': 'vorbis',
+                  'ac3': 'ac3',
+                  'flac': 'flac',
+                  'alac': 'alac',
+                  'pcm_s16le': 'pcm_s16le',
+                  'pcm_s24le': 'pcm_s24le',
+                  'pcm_s32le': 'pcm_s32le',
+                  }
+LOSSLESS = ('flac', 'alac', 'pcm_s16le', 'pcm_s24le', 'pcm_s32le')
+# options of the mapping and of the muxer, kept with stream copy
+KEEP = ('-map', '-movflags', '-vtag')
+# options which only tune the encoder, they never change the
+# codec, the pixel format or the bitrate envelope of the output
+TUNING = ('-preset', '-preset:v', '-tune', '-tune:v', '-g', '-bufsize',
+          '-crf', '-qscale:v', '-cpu-used', '-tile-rows', '-tile-columns',
+          '-row-mt', '-deadline', '-usage', '-x265-params',
+          '-svtav1-params',)
+TOLERANCE = 1.05  # bitrate tolerance on the target bitrate
+
+
+def parse_options(params):
+    """
+    Split the given FFmpeg arguments string in a list
+    of (option, value) tuples, `value` is an empty string
+    for the options without value (e.g. `-sn`).
+    """
+    tokens = params.split()
+    options = []
+    for idx, tok in enumerate(tokens):
+        if not tok.startswith('-') or re.match(r'^-\d', tok):
+            continue
+        nxt = tokens[idx + 1] if idx + 1 < len(tokens) else ''
+        if nxt.startswith('-') and not re.match(r'^-\d', nxt):
+            nxt = ''
+        options.append((tok, nxt))
+    return options
+# ----------------------------------------------------------------------#
+
+
+def to_bits(value):
+    """
+    Convert an FFmpeg bitrate value (e.g. `2500k`, `2M`)
+    to bits per second. Returns 0 if not valid.
+    """
+    match = re.match(r'^(\d+(?:\.\d+)?)([kKmM]?)$', value or '')
+    if not match:
+        return 0
+    mult = {'': 1, 'k': 1000, 'm': 1000000}[match.group(2).lower()]
+    return int(float(match.group(1)) * mult)
+# ----------------------------------------------------------------------#
+
+
+def stream_bitrate(stream, probedata, streams):
+    """
+    Returns the bitrate (bits/s) of the given stream or, if the
+    stream bitrate is not available (e.g. Matroska), of the whole
+    file except the other streams, 0 if it cannot be known.
+    """
+    bitrate = int(stream.get('bit_rate') or 0)
+    if bitrate or len(streams) != 1:
+        return bitrate
+    total = int(probedata.get('format', {}).get('bit_rate') or 0)
+    others = [int(s.get('bit_rate') or 0) for s in probedata['streams']
+              if s is not stream]
+    return 0 if 0 in others else max(total - sum(others), 0)
+# ----------------------------------------------------------------------#
+
+
+def copy_params(options, codeckey):
+    """
+    Returns the arguments string to copy the streams
+    selected by the given options.
+    """
+    keep = [f'{opt} {val}' for opt, val in options if opt in KEEP]
+    return ' '.join(keep + [f'{codeckey} copy'])
+# ----------------------------------------------------------------------#
+
+
+def video_complies(params, probedata):
+    """
+    Returns True if all the video streams of the given ffprobe
+    data (`probedata`) already match the given video arguments
+    (`params`, e.g. `CmdVideoParams`): same codec, pixel format,
+    profile and level, a bitrate within the envelope given by
+    `-b:v`, `-minrate` and `-maxrate` (a quality-based encoding
+    has no envelope and never matches), no frame rate and no
+    aspect ratio changes. Unknown options never match.
+    """
+    options = dict(parse_options(params))
+    codec = VIDEO_ENCODERS.get(options.get('-c:v'))
+    if not codec:
+        return False
+    checked = ('-c:v', '-b:v', '-minrate', '-maxrate', '-pix_fmt',
+               '-profile:v', '-level', '-level:v')
+    if [opt for opt in options if opt not in checked + KEEP + TUNING]:
+        return False
+
+    streams = [s for s in probedata.get('streams', [])
+               if s.get('codec_type') == 'video'
+               and not s.get('disposition', {}).get('attached_pic')]
+    maxrate = to_bits(options.get('-maxrate'))
+    bitrate = to_bits(options.get('-b:v'))
+    minrate = to_bits(options.get('-minrate'))
+    if not streams or not (maxrate or bitrate):
+        return False
+
+    for stream in streams:
+        if stream.get('codec_name') != codec:
+            return False
+        if options.get('-pix_fmt', stream.get('pix_fmt')) != stream.get(
+                'pix_fmt'):
+            return False
+        profile = options.get('-profile:v')
+        if profile and (profile.lower() != str(stream.get(
+                'profile', '')).lower().replace(' ', '')):
+            return False
+        level = options.get('-level', options.get('-level:v'))
+        if level and (codec != 'h264' or round(float(level) * 10)
+                      != int(stream.get('level', 0))):
+            return False
+        rate = stream_bitrate(stream, probedata, streams)
+        if (not rate or (maxrate and rate > maxrate)
+                or (bitrate and rate > bitrate * TOLERANCE)
+                or (minrate and rate < minrate)):
+            return False
+    return True
+# ----------------------------------------------------------------------#
+
+
+def audio_complies(params, probedata):
+    """
+    Returns True if the audio streams of the given ffprobe data
+    (`probedata`) selected by the given audio arguments (`params`,
+    e.g. `CmdAudioParams`) already match them: same codec, sample
+    rate, channels and sample format, and for lossy codecs a
+    bitrate not higher than `-b:a`. Unknown options never match.
+    """
+    options = parse_options(params)
+    codeckey = [opt for opt, val in options if opt.startswith('-c:a')]
+    opts = dict(options)
+    codec = AUDIO_ENCODERS.get(opts.get(codeckey[0])) if codeckey else None
+    if not codec:
+        return False
+    checked = ('-b:a', '-ar', '-ac', '-sample_fmt')
+    if [opt for opt in opts if opt not in checked + KEEP + (codeckey[0],)]:
+        return False
+    if codec not in LOSSLESS and not to_bits(opts.get('-b:a')):
+        return False
+
+    streams = [s for s in probedata.get('streams', [])
+               if s.get('codec_type') == 'audio']
+    mapped = re.match(r'^0:a:(\d+)\??$', opts.get('-map', ''))
+    if mapped:  # selected input audio stream only
+        streams = streams[int(mapped.group(1)):int(mapped.group(1)) + 1]
+    index = codeckey[0].split(':')[2:]  # -c:a:1, output stream index
+    if index and index[0]:
+        streams = streams[int(index[0]):int(index[0]) + 1]
+    if not streams:
+        return False
+
+    for stream in streams:
+        if stream.get('codec_name') != codec:
+            return False
+        for opt, key in (('-ar', 'sample_rate'), ('-ac', 'channels'),
+                         ('-sample_fmt', 'sample_fmt')):
+            if opt in opts and str(stream.get(key)) != opts[opt]:
+                return False
+        if codec not in LOSSLESS:
+            rate = int(stream.get('bit_rate') or 0)
+            if not rate or rate > to_bits(opts['-b:a']) * TOLERANCE:
+                return False
+    return True
+# ----------------------------------------------------------------------#
+
+
+def stream_copy_params(vparams, aparams, probedata):
+    """
+    Preflight analyzer of the stream copy fast path: given the
+    video and audio arguments (`CmdVideoParams`, `CmdAudioParams`)
+    and the ffprobe data of a source file, returns a tuple of the
+    video and audio arguments where the arguments of each kind of
+    streams which already match the target are replaced by the
+    ones to copy them (e.g. `-map 0:v? -c:v copy`), the same
+    arguments otherwise. No filters must be applied to the streams.
+    """
+    if vparams.strip() and video_complies(vparams, probedata):
+        vparams = copy_params(parse_options(vparams), '-c:v')
+    if aparams.strip() and audio_complies(aparams, probedata):
+        options = parse_options(aparams)
+        codeckey = [opt for opt, val in options if opt.startswith('-c:a')]
+        aparams = copy_params(options, codeckey[0])
+    return vparams, aparams
@@ -425,6 +425,76 @@ def del_filecontents(filename):
 # ------------------------------------------------------------------#
 
 
+def prune_cachedir(dirname, maxbytes, ext='.json'):
+    """
+    Remove the least recently modified files with the given
+    extension (`ext`) from the cache directory `dirname`, until
+    their total size does not exceed `maxbytes`. Returns the
+    number of removed files.
+    """
+    try:
+        with os.scandir(dirname) as entries:
+            files = [(x.stat().st_mtime, x.stat().st_size, x.path)
+                     for x in entries if x.name.endswith(ext)
+                     and x.is_file()]
+    except OSError:
+        return 0
+    total = sum(x[1] for x in files)
+    removed = 0
+    for mtime, size, path in sorted(files):
+        if total <= maxbytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+# ------------------------------------------------------------------#
+
+
+def write_concat_list(filelist, listfile, duration=None):
+    """
+    Write the given list of pathnames (`filelist`) on `listfile`
+    in the format read by the FFmpeg concat demuxer (i.e.
+    `-f concat -safe 0 -i listfile`), escaping the quotes.
+    If `duration` (seconds) is given, it is set for each file,
+    e.g. still images, and the last file is repeated since the
+    concat demuxer ignores the duration of the last one.
+    """
+    textstr = []
+    for f in filelist:
+        escaped = f.replace(r"'", r"'\''")  # need escaping some chars
+        textstr.append(f"file '{escaped}'")
+        if duration is not None:
+            textstr.append(f"duration {duration}")
+    if duration is not None and filelist:
+        textstr.append(textstr[-2])
+
+    with open(listfile, 'w', encoding='utf-8') as txt:
+        txt.write('\n'.join(textstr))
+# ------------------------------------------------------------------#
+
+
+def image_codecs(filelist) -> set:
+    """
+    Returns the set of the image codecs of the given pathnames,
+    guessed from their file name extensions (e.g. `.jpg` and
+    `.jpeg` are both 'mjpeg'). The FFmpeg concat demuxer opens
+    a single decoder for all the files of the list, so images
+    can only be concatenated as they are if the set has one item.
+    """
+    codecs = {'.jpg': 'mjpeg', '.jpeg': 'mjpeg', '.jpe': 'mjpeg',
+              '.jfif': 'mjpeg', '.png': 'png', '.apng': 'apng',
+              '.webp': 'webp', '.bmp': 'bmp', '.gif': 'gif',
+              '.tif': 'tiff', '.tiff': 'tiff', '.tga': 'targa',
+              }
+    return {codecs.get(os.path.splitext(f)[1].lower(),
+                       os.path.splitext(f)[1].lower()) for f in filelist}
+# ------------------------------------------------------------------#
+
+
 def trailing_name_with_prog_digit(destpath, argname) -> str:
     """
     Returns a new name with the same name as `argname`
@@ -203,21 +203,21 @@ class FormatCode(wx.Panel):
     def set_formatcode(self, data_url, kwargs):
         """
         Get URLs data and format codes by generator object
-        `youtubedl_getstatistics`. Return `True` if `meta[1]`
-        (error), otherwise return None as exit status.
+        `youtubedl_getstatistics`, all URLs at the same time.
+        Return the error message if `meta[1]` (error),
+        otherwise return None as exit status.
         """
         self.urls = data_url.copy()
-        meta = None, None
-        index = 0
-        for link in data_url:
-            data = youtubedl_getstatistics(link,
-                                           kwargs,
-                                           parent=self.GetParent(),
-                                           )
-            for meta in data:
-                if meta[1]:
-                    return meta[1]
+        data = list(youtubedl_getstatistics(data_url,
+                                            kwargs,
+                                            parent=self.GetParent(),
+                                            ))
+        for meta in data:
+            if meta[1]:
+                return meta[1]
 
+        index = 0
+        for link, meta in zip(data_url, data):
             formats = iter(meta[0].get('formats', [meta[0]]))
             for n, f in enumerate(formats):
                 if f.get('vcodec'):
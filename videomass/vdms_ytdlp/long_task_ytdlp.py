@@ -28,7 +28,10 @@ import os
 from pubsub import pub
 import wx
 from videomass.vdms_dialogs.widget_utils import notification_area
-from videomass.vdms_io.make_filelog import make_log_template
+from videomass.vdms_io.make_filelog import (make_log_template,
+                                            logappend,
+                                            logflush,
+                                            )
 from videomass.vdms_ytdlp.ydl_downloader import YdlDownloader, YtdlExecDL
 from videomass.vdms_io import io_tools
 
@@ -71,6 +74,7 @@ class LogOut(wx.Panel):
         self.result = []  # result of the final process
         self.count = 0  # keeps track of the counts (see `update_count`)
         self.maxrotate = 0  # max num text rotation (see `update_count`)
+        self.progress = {}  # progress text of each download/conversion
         self.clr = self.appdata['colorscheme']
 
         wx.Panel.__init__(self, parent=parent)
@@ -110,6 +114,7 @@ class LogOut(wx.Panel):
         pub.subscribe(self.downloader_activity, "UPDATE_YDL_EVT")
         pub.subscribe(self.update_count, "COUNT_YTDL_EVT")
         pub.subscribe(self.end_proc, "END_YTDL_EVT")
+        pub.subscribe(self.conversion_activity, "CONVERSION_YTDL_EVT")
     # ----------------------------------------------------------------------
 
     def view_log(self, event):
@@ -117,6 +122,7 @@ class LogOut(wx.Panel):
         Opens the log file corresponding to the last executed process.
         """
         if self.logfile:
+            logflush(self.logfile)
             fname = str(self.logfile)
             if os.path.exists(fname) and os.path.isfile(fname):
                 io_tools.openpath(fname)
@@ -143,12 +149,37 @@ class LogOut(wx.Panel):
             self.thread_type = YdlDownloader(args[1], urls, self.logfile)
     # ----------------------------------------------------------------------
 
-    def youtubedl_exec(self, output, duration, status):
+    def set_progress(self, slot, text=None):
+        """
+        Set the progress text of the given download slot (int)
+        or conversion (str), remove it if `text` is None. The
+        progress of each concurrent task is shown on its own line.
+        """
+        if text is None:
+            self.progress.pop(slot, None)
+        else:
+            self.progress[slot] = text
+        if len(self.progress) == 1:
+            label = list(self.progress.values())[0]
+        else:
+            label = '\n'.join([f'[{key + 1}] {val}' if isinstance(key, int)
+                               else f'[{key}] {val}' for key, val in
+                               sorted(self.progress.items(),
+                                      key=lambda x: str(x[0]))])
+        self.labprog.SetLabel(label)
+        self.Layout()
+    # ----------------------------------------------------------------------
+
+    def youtubedl_exec(self, output, duration, status, slot=0):
         """
         Receiving output messages from yt-dlp command line execution
         via pubsub "UPDATE_YDL_EXECUTABLE_EVT" .
-
+        `slot` is the download slot which sent the message.
         """
+        if status == 'FINISHED':  # the slot download is terminated
+            self.set_progress(slot)
+            return
+
         if status == 'ERROR':  # error, exit status of the p.wait
             if output == 'STOP':
                 msg, color = LogOut.MSG_stop, self.clr['ABORT']
@@ -164,7 +195,7 @@ class LogOut(wx.Panel):
             self.txtout.AppendText(f'{output}')
 
         elif '[download]' in output:
-            self.labprog.SetLabel(output)
+            self.set_progress(slot, output.strip())
 
         else:
             if 'WARNING:' in output:
@@ -180,14 +211,14 @@ class LogOut(wx.Panel):
                 self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT1']))
                 self.txtout.AppendText(f'{output}')
 
-            with open(self.logfile, "a", encoding='utf-8') as logerr:
-                logerr.write(f"[YT_DLP]: {output}")
+            logappend(f"[YT_DLP]: {output}", self.logfile)
     # ---------------------------------------------------------------------#
 
-    def downloader_activity(self, output, duration, status):
+    def downloader_activity(self, output, duration, status, slot=0):
         """
         Receiving output messages from youtube_dl library via
         pubsub "UPDATE_YDL_EVT" .
+        `slot` is the download slot which sent the message.
         """
         if status == 'ERROR':
             self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['ERR0']))
@@ -212,24 +243,66 @@ class LogOut(wx.Panel):
             elif '[download]' not in output:
                 self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT1']))
                 self.txtout.AppendText(f'{output}\n')
-                with open(self.logfile, "a", encoding='utf-8') as logerr:
-                    logerr.write(f"[YT_DLP]: {status} > {output}\n")
+                logappend(f"[YT_DLP]: {status} > {output}\n", self.logfile)
 
         elif status == 'DOWNLOAD':
             perc = duration['_percent_str'].strip()
             tbytes = duration['_total_bytes_str'].strip()
             speed = duration['_speed_str'].strip()
             eta = duration['_eta_str'].strip()
-            self.labprog.SetLabel(f'Downloading: {perc}  |  Size: {tbytes}  '
-                                  f'|  Speed: {speed} |  ETA: {eta}')
+            self.set_progress(slot, f'Downloading: {perc}  |  Size: '
+                              f'{tbytes}  |  Speed: {speed} |  ETA: {eta}')
 
         elif status == 'FINISHED':
+            self.set_progress(slot)
             self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT1']))
             self.txtout.AppendText(f'{duration}\n')
 
         if status in ['ERROR', 'WARNING']:
-            with open(self.logfile, "a", encoding='utf-8') as logerr:
-                logerr.write(f"[YT_DLP]: {output}\n")
+            logappend(f"[YT_DLP]: {output}\n", self.logfile)
+    # ---------------------------------------------------------------------#
+
+    def conversion_activity(self, job, topic, data):
+        """
+        Receiving the messages of the conversions of the downloaded
+        files via pubsub "CONVERSION_YTDL_EVT" (see `make_pipeline`).
+        `job` is the conversion number, `topic` and `data` are the
+        topic and keyword arguments sent by the `FFmpegEngine`.
+        """
+        slot = f'FFmpeg {job}'
+        if topic == 'COUNT_EVT':
+            if data['end'] == 'DONE':
+                self.set_progress(slot)
+                self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['SUCCESS']))
+                self.txtout.AppendText(f"{LogOut.MSG_done}\n")
+            elif data['end'] == 'ERROR':
+                self.set_progress(slot)
+                self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['ERR1']))
+                self.txtout.AppendText(f"\n{data['count']}\n")
+                self.result.append('failed')
+            elif data['count']:
+                self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT0']))
+                self.txtout.AppendText(f"\n{_('Conversion')} {job}: "
+                                       f"{data['count']}\n")
+                self.count += 1
+
+        elif topic == 'PROGRESS_EVT':
+            if data['progress']:
+                self.set_progress(slot, f"Converting: "
+                                  f"{data['progress']['stats']}")
+
+        elif topic == 'UPDATE_EVT' and data['status'] != 0:
+            self.set_progress(slot)
+            if data['output'] == 'STOP':
+                msg, color = LogOut.MSG_stop, self.clr['ABORT']
+            else:
+                msg, color = LogOut.MSG_failed, self.clr['ERR1']
+                self.result.append('failed')
+            self.txtout.SetDefaultStyle(wx.TextAttr(color))
+            self.txtout.AppendText(f"\n{msg}\n")
+
+        elif topic == 'END_EVT':
+            self.set_progress(slot)
     # ---------------------------------------------------------------------#
 
     def update_count(self, count, fsource, destination, duration, end):
@@ -247,7 +320,8 @@ class LogOut(wx.Panel):
         else:
             if self.maxrotate == 1:
                 self.maxrotate = 0
-                self.txtout.Clear()
+                if not self.progress:  # no other downloads in progress
+                    self.txtout.Clear()
             self.maxrotate += 1
             self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT0']))
             self.txtout.AppendText(f'\n{count}\n')
@@ -300,6 +374,7 @@ class LogOut(wx.Panel):
             self.txtout.AppendText(f"{endmsg}\n")
 
         self.txtout.AppendText('\n')
+        logflush(self.logfile)
         self.reset_all()
         pub.sendMessage("PROCESS_TERMINATED_YTDLP", msg='Terminated')
     # ----------------------------------------------------------------------
@@ -325,6 +400,7 @@ class LogOut(wx.Panel):
         self.result.clear()
         self.count = 0
         self.maxrotate = 0
+        self.progress.clear()
         self.parent.statusbar_msg(_('Done'), None)
         self.btn_viewlog.Enable()
     # ----------------------------------------------------------------------
@@ -27,6 +27,12 @@ This file is part of Videomass.
 import re
 import wx
 import wx.lib.mixins.listctrl as listmix
+from videomass.vdms_utils.utils import integer_to_time
+from videomass.vdms_ytdlp.ydl_extractinfo import extract_info
+from videomass.vdms_ytdlp.playlist_pager import (PlaylistPager,
+                                                 is_playlist,
+                                                 index_ranges,
+                                                 )
 
 
 class ListCtrl(wx.ListCtrl,
@@ -75,16 +81,24 @@ class Indexing(wx.Dialog):
                 'you want to download the indexed media at 1, 2, 5, 8 of the '
                 'playlist.\nIt is also possible to specify intervals, e.g. '
                 '"1-3,7,10-13" with which the media at index 1, 2, 3, 7, 10, '
-                '11, 12 and 13 will be downloaded.\n'))
+                '11, 12 and 13 will be downloaded.\n'
+                'Otherwise select a playlist line to list its media, then '
+                'select the media to download and click on "Index '
+                'selected".\n'))
 
-    def __init__(self, parent, url, data):
+    def __init__(self, parent, url, data, kwargs=None):
         """
         NOTE Use 'parent, -1' param. to make parent, use 'None' otherwise
-
+        `kwargs` are the yt-dlp options used to list the media of
+        the playlists (see `PlaylistPager`), if `None` the media
+        are not listed.
         """
         self.clrs = Indexing.appdata['colorscheme']
         self.urls = url
         self.data = data
+        self.kwargs = kwargs
+        self.pagers = {}  # url: PlaylistPager
+        self.current = None  # url of the selected playlist
 
         wx.Dialog.__init__(self, parent, -1, style=wx.DEFAULT_DIALOG_STYLE)
 
@@ -97,6 +111,16 @@ class Indexing(wx.Dialog):
                               | wx.LC_HRULES
                               | wx.LC_VRULES
                               )
+        self.elist = wx.ListCtrl(self,
+                                 wx.ID_ANY,
+                                 style=wx.LC_REPORT
+                                 | wx.SUNKEN_BORDER
+                                 | wx.LC_HRULES
+                                 )
+        self.btn_more = wx.Button(self, wx.ID_ANY, _("Load more"))
+        self.btn_more.Disable()
+        self.btn_use = wx.Button(self, wx.ID_ANY, _("Index selected"))
+        self.btn_use.Disable()
         self.tctrl = wx.TextCtrl(self,
                                  wx.ID_ANY, "",
                                  style=wx.TE_MULTILINE
@@ -108,11 +132,23 @@ class Indexing(wx.Dialog):
         self.SetTitle(_('Playlist Editor'))
         self.SetMinSize((800, 400))
         self.lctrl.SetMinSize((800, 200))
+        self.elist.SetMinSize((800, 200))
+        self.elist.InsertColumn(0, '#', width=60)
+        self.elist.InsertColumn(1, _('Title'), width=600)
+        self.elist.InsertColumn(2, _('Duration'), width=120)
         self.tctrl.SetMinSize((800, 200))
 
         # ------ set Layout
         sizer_1 = wx.BoxSizer(wx.VERTICAL)
         sizer_1.Add(self.lctrl, 0, wx.ALL | wx.EXPAND, 5)
+        labentries = _('Playlist media')
+        labent = wx.StaticText(self, label=labentries)
+        sizer_1.Add(labent, 0, wx.LEFT, 5)
+        sizer_1.Add(self.elist, 0, wx.ALL | wx.EXPAND, 5)
+        sizer_entries = wx.BoxSizer(wx.HORIZONTAL)
+        sizer_entries.Add(self.btn_more, 0)
+        sizer_entries.Add(self.btn_use, 0, wx.LEFT, 5)
+        sizer_1.Add(sizer_entries, 0, wx.ALL, 5)
 
         labtstr = _('Help viewer')
         lab = wx.StaticText(self, label=labtstr)
@@ -147,7 +183,7 @@ class Indexing(wx.Dialog):
         for link in url:
             self.lctrl.InsertItem(index, str(index + 1))
             self.lctrl.SetItem(index, 1, link)
-            if '/playlist' in link:
+            if is_playlist(link):
                 self.lctrl.SetItemBackgroundColour(index, Indexing.GREEN)
 
             if not self.data == {'': ''}:
@@ -158,17 +194,25 @@ class Indexing(wx.Dialog):
 
         if Indexing.OS == 'Darwin':
             self.lctrl.SetFont(wx.Font(12, wx.MODERN, wx.NORMAL, wx.NORMAL))
+            self.elist.SetFont(wx.Font(12, wx.MODERN, wx.NORMAL, wx.NORMAL))
             self.tctrl.SetFont(wx.Font(12, wx.MODERN, wx.NORMAL, wx.NORMAL))
         else:
             self.lctrl.SetFont(wx.Font(9, wx.MODERN, wx.NORMAL, wx.NORMAL))
+            self.elist.SetFont(wx.Font(9, wx.MODERN, wx.NORMAL, wx.NORMAL))
             self.tctrl.SetFont(wx.Font(9, wx.MODERN, wx.NORMAL, wx.NORMAL))
             lab.SetLabelMarkup(f"<b>{labtstr}</b>")
+            labent.SetLabelMarkup(f"<b>{labentries}</b>")
 
         self.tctrl.SetBackgroundColour(self.clrs['BACKGRD'])
 
         # ----------------------Binding (EVT)----------------------#
         self.lctrl.Bind(wx.EVT_LIST_BEGIN_LABEL_EDIT, self.on_edit_begin)
         self.lctrl.Bind(wx.EVT_LIST_END_LABEL_EDIT, self.on_edit_end)
+        self.lctrl.Bind(wx.EVT_LIST_ITEM_SELECTED, self.on_select)
+        self.elist.Bind(wx.EVT_LIST_ITEM_SELECTED, self.on_entry_select)
+        self.elist.Bind(wx.EVT_LIST_ITEM_DESELECTED, self.on_entry_select)
+        self.Bind(wx.EVT_BUTTON, self.on_more, self.btn_more)
+        self.Bind(wx.EVT_BUTTON, self.on_use, self.btn_use)
         self.Bind(wx.EVT_BUTTON, self.on_close, btn_cancel)
         self.Bind(wx.EVT_BUTTON, self.on_ok, btn_ok)
         self.Bind(wx.EVT_BUTTON, self.on_reset, btn_reset)
@@ -195,9 +239,123 @@ class Indexing(wx.Dialog):
             if txt:
                 diz[url] = ''.join(txt.split())
         return diz
+    # ------------------------------------------------------------------#
+
+    def append_entries(self, entries):
+        """
+        Append the given playlist entries to the media list
+        """
+        for entry in entries:
+            row = self.elist.GetItemCount()
+            self.elist.InsertItem(row, str(entry['index']))
+            self.elist.SetItem(row, 1, entry['title'])
+            if entry['duration']:
+                duration = integer_to_time(round(entry['duration'] * 1000),
+                                           mills=False)
+            else:
+                duration = 'N/A'
+            self.elist.SetItem(row, 2, duration)
+    # ------------------------------------------------------------------#
+
+    def load_page(self, pager):
+        """
+        Request the next page of the given playlist
+        """
+        def callback(entries, error):
+            wx.CallAfter(self.on_page, pager, entries, error)
 
+        if pager.next_page(callback):
+            self.btn_more.Disable()
+            self.statusmsg(_('Loading playlist media...'), self.clrs['TXT1'])
+    # ------------------------------------------------------------------#
+
+    def statusmsg(self, msg, colour):
+        """
+        Write a time stamped message on the help viewer
+        """
+        date = wx.DateTime.Now().Format('%H:%M:%S')
+        self.tctrl.SetDefaultStyle(wx.TextAttr(colour))
+        self.tctrl.AppendText(f'\n{date}: {msg}\n')
     # ----------------------Event handler (callback)----------------------#
 
+    def on_page(self, pager, entries, error):
+        """
+        Receives the entries of a page of the given playlist
+        (see `load_page`), the dialog may be already closed.
+        """
+        if not self:
+            return
+        if error:
+            self.statusmsg(error, self.clrs['ERR1'])
+        if pager.url != self.current:
+            return
+        self.append_entries(entries)
+        self.btn_more.Enable(not pager.exhausted)
+    # ------------------------------------------------------------------#
+
+    def on_select(self, event):
+        """
+        Shows the media of the selected playlist, loading
+        the first page if not loaded yet.
+        """
+        url = self.urls[event.GetIndex()]
+        if url == self.current:
+            return
+        self.current = None
+        self.elist.DeleteAllItems()
+        self.btn_more.Disable()
+        self.btn_use.Disable()
+        if (self.kwargs is None or not is_playlist(url)
+                or Indexing.appdata['yt_dlp'] is not True):
+            return
+        self.current = url
+        if url not in self.pagers:
+            self.pagers[url] = PlaylistPager(url, self.kwargs,
+                                             wx.GetApp().metadatacache,
+                                             extract_info)
+        pager = self.pagers[url]
+        self.append_entries(pager.entries)
+        if not pager.entries:
+            self.load_page(pager)
+        else:
+            self.btn_more.Enable(not pager.exhausted and not pager.loading)
+    # ------------------------------------------------------------------#
+
+    def on_entry_select(self, event):
+        """
+        Enable the "Index selected" button if any media is selected
+        """
+        self.btn_use.Enable(self.elist.GetSelectedItemCount() > 0)
+    # ------------------------------------------------------------------#
+
+    def on_more(self, event):
+        """
+        Load the next page of the selected playlist
+        """
+        if self.current in self.pagers:
+            self.load_page(self.pagers[self.current])
+    # ------------------------------------------------------------------#
+
+    def on_use(self, event):
+        """
+        Set the indexes of the selected media as the
+        "Playlist Items" of the selected playlist.
+        """
+        if self.current not in self.urls:
+            return
+        indexes = []
+        row = self.elist.GetFirstSelected()
+        while row != -1:
+            indexes.append(int(self.elist.GetItemText(row, 0)))
+            row = self.elist.GetNextSelected(row)
+        if not indexes:
+            return
+        items = index_ranges(indexes)
+        self.lctrl.SetItem(self.urls.index(self.current), 2, items)
+        self.statusmsg(f"{_('OK: Indexes to download')}: \"{items}\"",
+                       self.clrs['TXT3'])
+    # ------------------------------------------------------------------#
+
     def on_edit_end(self, event):
         """
         Checking event-entered strings using REGEX:
@@ -0,0 +1,178 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: playlist_pager.py
+Porpose: lazy paged expansion of the playlists and channels
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2024
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from threading import Lock
+
+PAGESIZE = 50  # entries extracted by each request
+# URL parts of the playlists and of the channel tabs
+PLAYLIST_MARKS = ('/playlist', '/channel/', '/c/', '/user/', '/@')
+
+
+def is_playlist(url):
+    """
+    Returns True if the given URL refers to a playlist
+    or to a channel, i.e. to a list of entries.
+    """
+    return any(mark in url for mark in PLAYLIST_MARKS)
+# ----------------------------------------------------------------------#
+
+
+def page_options(kwargs, page, pagesize=PAGESIZE):
+    """
+    Returns the yt-dlp options to extract flat the given page
+    (0 based) of a playlist: only the entries of that page are
+    listed and no entry is resolved (e.g. formats), so even a
+    channel with thousands of videos needs a single request.
+    """
+    start = page * pagesize + 1
+    return {**kwargs,
+            'noplaylist': False,
+            'extract_flat': 'in_playlist',
+            'lazy_playlist': True,
+            'playlist_items': f'{start}-{start + pagesize - 1}',
+            }
+# ----------------------------------------------------------------------#
+
+
+def flat_entries(meta, start):
+    """
+    Returns the list of the entries (dict) of the given flat
+    playlist metadata, whose first entry is at the given
+    index (1 based) of the playlist.
+    """
+    items = []
+    for num, entry in enumerate((meta or {}).get('entries') or []):
+        if not entry:
+            continue
+        items.append({'index': entry.get('playlist_index') or start + num,
+                      'id': entry.get('id'),
+                      'title': entry.get('title') or entry.get('id') or 'N/A',
+                      'url': entry.get('url') or entry.get('webpage_url'),
+                      'duration': entry.get('duration'),
+                      })
+    return items
+# ----------------------------------------------------------------------#
+
+
+def is_last_page(meta, page, pagesize=PAGESIZE):
+    """
+    Returns True if the given flat page (0 based) of a playlist
+    is the last one. This depends on the raw entries, since
+    unavailable videos (e.g. removed) are listed as `None`,
+    or on the `playlist_count` reported by yt-dlp, if any.
+    """
+    meta = meta or {}
+    count = meta.get('playlist_count')
+    if count is not None and (page + 1) * pagesize >= count:
+        return True
+    return len(meta.get('entries') or []) < pagesize
+# ----------------------------------------------------------------------#
+
+
+def index_ranges(indexes):
+    """
+    Returns the given playlist indexes (int) as the yt-dlp
+    `playlist_items` string, e.g. [1, 2, 3, 7] > '1-3,7'
+    """
+    ranges = []
+    for idx in sorted(set(indexes)):
+        if ranges and idx == ranges[-1][1] + 1:
+            ranges[-1][1] = idx
+        else:
+            ranges.append([idx, idx])
+    return ','.join([f'{beg}' if beg == end else f'{beg}-{end}'
+                     for beg, end in ranges])
+# ----------------------------------------------------------------------#
+
+
+class PlaylistPager:
+    """
+    Lazy expansion of a playlist or channel URL: the entries
+    are extracted flat one page at a time (see `page_options`),
+    in background through the shared `MetadataCache`, so the
+    first entries are available at once and a page is never
+    fetched twice. Formats are resolved by the download only
+    for the entries selected.
+
+    USAGE:
+        >>> pager = PlaylistPager(url, kwargs, cache, extract_info)
+        >>> pager.next_page(callback)  # callback(entries, error)
+        >>> if not pager.exhausted:
+        >>>     pager.next_page(callback)  # e.g. on "Load more"
+
+    """
+    def __init__(self, url, kwargs, cache, extractor, pagesize=PAGESIZE):
+        """
+        url: the playlist URL
+        kwargs: the yt-dlp options
+        cache: the `MetadataCache`
+        extractor: see `MetadataCache`
+        """
+        self.url = url
+        self.kwargs = kwargs
+        self.cache = cache
+        self.extractor = extractor
+        self.pagesize = max(int(pagesize), 1)
+        self.page = 0  # next page to load
+        self.entries = []  # loaded entries
+        self.exhausted = False  # True if there are no more entries
+        self.loading = False
+        self.lock = Lock()
+    # ----------------------------------------------------------------#
+
+    def next_page(self, callback):
+        """
+        Request the next page, `callback(entries, error)` is called
+        with the new entries when available, by a worker thread
+        or at once if cached. Returns False if there are no more
+        pages or a page is already loading.
+        """
+        with self.lock:
+            if self.exhausted or self.loading:
+                return False
+            self.loading = True
+            page = self.page
+        opts = page_options(self.kwargs, page, self.pagesize)
+        future = self.cache.request(self.url, opts, self.extractor)
+        future.add_done_callback(
+            lambda fut: fut.cancelled() or self.on_page(page, fut.result(),
+                                                        callback))
+        return True
+    # ----------------------------------------------------------------#
+
+    def on_page(self, page, result, callback):
+        """
+        Add the entries of the given loaded page
+        """
+        meta, error = result
+        items = [] if error else flat_entries(meta, page * self.pagesize + 1)
+        with self.lock:
+            self.loading = False
+            if not error:
+                self.page = page + 1
+                self.entries.extend(items)
+                self.exhausted = is_last_page(meta, page, self.pagesize)
+        callback(items, error)
@@ -56,10 +56,11 @@ class SubtitleEditor(wx.Dialog):
                  "zh": _("Chinese"),
                  }
 
-    def __init__(self, parent, data):
+    def __init__(self, parent, data, available=None):
         """
         NOTE Use 'parent, -1' param. to make parent, use 'None' otherwise
-
+        `available` is a list of the language codes of the subtitles
+        available for the URLs, if known.
         """
         self.data = data
 
@@ -106,6 +107,11 @@ class SubtitleEditor(wx.Dialog):
                                     name="custom_subs",
                                     )
         sizcustsub.Add(self.addlangs, 1, wx.LEFT | wx.EXPAND, 5)
+        if available:
+            msg = _('Available subtitles: {0}').format(', '.join(available))
+            labavail = wx.StaticText(self, label=msg)
+            labavail.Wrap(580)
+            sizbase.Add(labavail, 0, wx.ALL, 5)
         sizbase.Add(10, 10)
         labtstr3 = _('Subtitle options')
         self.lab3 = wx.StaticText(self, label=labtstr3)
@@ -0,0 +1,102 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: ydl_cmdline.py
+Porpose: yt-dlp command line options
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2024 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2024
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+def from_api_to_cli(data, execpath):
+    """
+    Revert API arguments to command line options
+    """
+    if not data["format"]:
+        dformat = ''
+    else:
+        dformat = f'--format "{data["format"]}"'
+    opt = (f'"{execpath}" {dformat} --progress-template '
+           f'"download-title:%(info.id)s-%(progress.eta)s" '
+           f'--newline --compat-options "{data["compat_opts"]}" '
+           f'--ignore-errors --ignore-config --no-color ')
+
+    if data['extractaudio']:
+        opt += '--extract-audio '
+    if data['postprocessors']:
+        for pp in data['postprocessors']:
+            for key, val in pp.items():
+                if 'preferredcodec' in key:
+                    opt += f'--audio-format {val} '
+                if 'EmbedThumbnail' in val:
+                    opt += '--embed-thumbnail '
+                if 'FFmpegEmbedSubtitle' in val:
+                    opt += '--embed-subs '
+    if data['addmetadata']:
+        opt += '--embed-metadata '
+    if data['external_downloader']:
+        opt += f'--downloader "{data["external_downloader"]}" '
+    if data['external_downloader_args']:
+        dwargs = ' '.join(data["external_downloader_args"])
+        opt += (f'--downloader-args "{data["external_downloader"]}:{dwargs}" ')
+    if data['noplaylist'] is False:
+        opt += '--yes-playlist '
+        if data['playlist_items']:
+            opt += f'--playlist-items "{data["playlist_items"]}" '
+        if data.get('lazy_playlist'):
+            opt += '--lazy-playlist '
+    else:
+        opt += '--no-playlist '
+    if data.get('download_archive'):
+        opt += f'--download-archive "{data["download_archive"]}" '
+    if data['writesubtitles']:
+        opt += '--write-subs '
+        if data['subtitleslangs'][0]:
+            sublang = ','.join(data["subtitleslangs"])
+            opt += f'--sub-langs "{sublang}" '
+        if data['writeautomaticsub']:
+            opt += '--write-auto-subs '
+        if data['skip_download']:
+            opt += '--skip-download '
+    opt += '--restrict-filenames ' if data['restrictfilenames'] else ''
+    opt += '--write-thumbnail ' if data['writethumbnail'] else ''
+    opt += '--force-overwrites ' if data['overwrites'] else ''
+    opt += '--no-check-certificates ' if data['nocheckcertificate'] else ''
+    opt += f'--proxy "{data["proxy"]}" ' if data["proxy"] else ''
+    if data['geo_verification_proxy']:
+        opt += f'--geo-verification-proxy "{data["geo_verification_proxy"]}" '
+    geo = (f'{data["geo_bypass"]} {data["geo_bypass_country"]} '
+           f'{data["geo_bypass_ip_block"]}')
+    if geo.strip():
+        opt += f'--xff "{geo}" '
+    if data['username']:
+        opt += f'--username {data["username"]} '
+        opt += f'--password {data["password"]} '
+    if data['videopassword']:
+        opt += f'--video-password {data["videopassword"]} '
+    if data.get("cookiefile"):
+        opt += f'--cookies "{data["cookiefile"]}" '
+    if data.get("cookiesfrombrowser"):
+        opt += f'--cookies-from-browser "{data["cookiesfrombrowser"][0]}" '
+    opt += f'--ffmpeg-location "{data["ffmpeg_location"]}" '
+    opt += f'--output "{data["outtmpl"]}" '
+
+    return opt
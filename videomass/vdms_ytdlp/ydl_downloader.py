@@ -25,9 +25,9 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 import os
-from threading import Thread
+from threading import Thread, Lock
+from functools import partial
 import signal
-import time
 import itertools
 import platform
 import subprocess
@@ -35,17 +35,80 @@ import wx
 from pubsub import pub
 from videomass.vdms_utils.utils import Popen
 from videomass.vdms_io.make_filelog import logwrite
+from videomass.vdms_engine.download_scheduler import DownloadScheduler
+from videomass.vdms_io.download_archive import DownloadArchive
+from videomass.vdms_engine.conversion_pipeline import (ConversionPipeline,
+                                                       load_profile,
+                                                       FILEPATH_MARK,
+                                                       FILEPATH_EXEC,
+                                                       )
 if not platform.system() == 'Windows':
     import shlex
 if wx.GetApp().appset['yt_dlp'] is True:
     import yt_dlp
 
 
-def killbill(pid):
+def killbill(proc):
     """
-    kill the process sending a Ctrl+C event to yt-dlp
+    Stop the given yt-dlp process, sending a Ctrl+C
+    (SIGINT) to it, terminate it on MS Windows.
     """
-    lambda: os.kill(pid, signal.CTRL_C_EVENT)
+    if platform.system() == 'Windows':
+        proc.terminate()
+    else:
+        proc.send_signal(signal.SIGINT)
+
+
+def make_scheduler():
+    """
+    Returns a `DownloadScheduler` with the limits of
+    concurrent downloads set by the user preferences.
+    """
+    appdata = wx.GetApp().appset
+    return DownloadScheduler(jobs=appdata['ytdlp_jobs'],
+                             host_jobs=appdata['ytdlp_host_jobs'])
+
+
+def conversion_notify(job, topic, kwargs):
+    """
+    Send the messages of the conversions of the downloaded
+    files (see `ConversionPipeline`) to the GUI
+    """
+    wx.CallAfter(pub.sendMessage,
+                 "CONVERSION_YTDL_EVT",
+                 job=job,
+                 topic=topic,
+                 data=kwargs,
+                 )
+
+
+def make_pipeline(logfile):
+    """
+    Returns a `ConversionPipeline` converting each downloaded
+    file with the profile of the Presets Manager set by the
+    user preferences, `None` if disabled or if the profile
+    is not found.
+    """
+    appdata = wx.GetApp().appset
+    if not appdata['ytdlp_convert']:
+        return None
+    preset = appdata['ytdlp_convert_preset']
+    profile = load_profile(os.path.join(appdata['confdir'], 'presets'),
+                           preset, appdata['ytdlp_convert_profile'])
+    if profile is None:
+        msg = (f"WARNING: Profile not found: «{preset} - "
+               f"{appdata['ytdlp_convert_profile']}», the downloaded "
+               f"files will not be converted.")
+        wx.CallAfter(pub.sendMessage,
+                     "UPDATE_YDL_EVT",
+                     output=msg,
+                     duration='',
+                     status='WARNING',
+                     )
+        logwrite('', msg, logfile)
+        return None
+    return ConversionPipeline(dict(appdata), logfile, conversion_notify,
+                              profile, preset)
 
 
 class YtdlExecDL(Thread):
@@ -53,6 +116,8 @@ class YtdlExecDL(Thread):
     YtdlExecDL represents a separate thread for running
     youtube-dl executable with subprocess class to download
     media and capture its stdout/stderr output in real time .
+    Several URLs are downloaded at the same time by different
+    download slots, see `DownloadScheduler`.
 
     """
     STOP = '[Videomass]: STOP command received.'
@@ -65,13 +130,19 @@ class YtdlExecDL(Thread):
         self.urls - type list
         self.logfile - str path object to log file
         self.arglist - option arguments list
+        self.scheduler - the download scheduler
+        self.procs - running processes by download slot
+        self.pipeline - converts the downloaded files, if enabled
         """
         self.stop_work_thread = False  # process terminate
         self.urls = urls
         self.logfile = logfile
         self.arglist = args
         self.countmax = len(self.arglist)
-        self.count = 0
+        self.scheduler = make_scheduler()
+        self.procs = {}
+        self.pipeline = make_pipeline(logfile)
+        self.lock = Lock()
 
         Thread.__init__(self)
         self.start()  # start the thread (va in self.run())
@@ -80,96 +151,125 @@ class YtdlExecDL(Thread):
         """
         Subprocess run thread.
         """
-        for url, opts in itertools.zip_longest(self.urls,
-                                               self.arglist,
-                                               fillvalue='',
-                                               ):
-            self.count += 1
-            count = f"URL {self.count}/{self.countmax}"
+        tasks = list(itertools.zip_longest(self.urls, self.arglist,
+                                           fillvalue=''))
+        self.scheduler.run(tasks, self.download)
+        if self.pipeline:
+            self.pipeline.wait()  # the last conversions
+        if self.stop_work_thread:
+            wx.CallAfter(pub.sendMessage,
+                         "UPDATE_YDL_EXECUTABLE_EVT",
+                         output='STOP',
+                         duration=100,
+                         status='ERROR',
+                         )
+            logwrite('', YtdlExecDL.STOP, self.logfile)
+        wx.CallAfter(pub.sendMessage, "END_YTDL_EVT")
+    # --------------------------------------------------------------------#
+
+    def download(self, slot, index, url, opts):
+        """
+        Download the given URL with the given options,
+        this method runs on the download slot threads.
+        """
+        count = f"URL {index + 1}/{self.countmax}"
+        wx.CallAfter(pub.sendMessage,
+                     "COUNT_YTDL_EVT",
+                     count=count,
+                     fsource=f'Source: {url}',
+                     destination='',
+                     duration=100,
+                     end='CONTINUE',
+                     )
+        if self.pipeline:
+            opts = f'{opts} {FILEPATH_EXEC}'
+        cmd = f'{opts} "{url}"'
+        logwrite(f'{count}\n{cmd}\n', '', self.logfile)  # write log cmd
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+        try:
+            with Popen(cmd,
+                       stdout=subprocess.PIPE,
+                       stderr=subprocess.STDOUT,
+                       bufsize=1,
+                       universal_newlines=True,
+                       encoding='utf-8',
+                       ) as proc:
+                with self.lock:
+                    self.procs[slot] = proc
+                    if self.stop_work_thread:
+                        killbill(proc)
+                for line in proc.stdout:
+                    if self.pipeline and line.startswith(FILEPATH_MARK):
+                        filename = line[len(FILEPATH_MARK):].strip()
+                        self.pipeline.submit(filename.strip('"'))
+                    wx.CallAfter(pub.sendMessage,
+                                 "UPDATE_YDL_EXECUTABLE_EVT",
+                                 output=line,
+                                 duration=100,
+                                 status=0,
+                                 slot=slot,
+                                 )
+                with self.lock:
+                    del self.procs[slot]
+            wx.CallAfter(pub.sendMessage,
+                         "UPDATE_YDL_EXECUTABLE_EVT",
+                         output='',
+                         duration=100,
+                         status='FINISHED',
+                         slot=slot,
+                         )
 
+        except (OSError, FileNotFoundError) as err:
             wx.CallAfter(pub.sendMessage,
                          "COUNT_YTDL_EVT",
-                         count=count,
-                         fsource=f'Source: {url}',
+                         count=err,
+                         fsource='',
                          destination='',
+                         duration=0,
+                         end='ERROR'
+                         )
+            logwrite('', err, self.logfile)
+            self.scheduler.stop()  # the executable is not usable
+            return 'ERROR'
+
+        if self.stop_work_thread:
+            return 'STOP'
+
+        if proc.returncode:
+            wx.CallAfter(pub.sendMessage,
+                         "UPDATE_YDL_EXECUTABLE_EVT",
+                         output='FAILED',
                          duration=100,
-                         end='CONTINUE',
+                         status='ERROR',
                          )
-            cmd = f'{opts} "{url}"'
-            logwrite(f'{count}\n{cmd}\n', '', self.logfile)  # write log cmd
-            if not platform.system() == 'Windows':
-                cmd = shlex.split(cmd)
-            try:
-                with Popen(cmd,
-                           stdout=subprocess.PIPE,
-                           stderr=subprocess.STDOUT,
-                           bufsize=1,
-                           universal_newlines=True,
-                           encoding='utf-8',
-                           ) as proc:
-                    for line in proc.stdout:
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_YDL_EXECUTABLE_EVT",
-                                     output=line,
-                                     duration=100,
-                                     status=0,
-                                     )
-                        if self.stop_work_thread:
-                            killbill(proc.pid)
-                            wx.CallAfter(pub.sendMessage,
-                                         "UPDATE_YDL_EXECUTABLE_EVT",
-                                         output='STOP',
-                                         duration=100,
-                                         status='ERROR',
-                                         )
-                            logwrite('', YtdlExecDL.STOP, self.logfile)
-                            time.sleep(.5)
-                            wx.CallAfter(pub.sendMessage, "END_YTDL_EVT")
-                            return
-
-                    if proc.wait():
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_YDL_EXECUTABLE_EVT",
-                                     output='FAILED',
-                                     duration=100,
-                                     status='ERROR',
-                                     )
-                        logwrite('', (f"[VIDEOMASS]: Error Exit Status: "
-                                      f"{proc.wait()}"), self.logfile)
-                        time.sleep(1)
-                        continue
-
-            except (OSError, FileNotFoundError) as err:
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_YTDL_EVT",
-                             count=err,
-                             fsource='',
-                             destination='',
-                             duration=0,
-                             end='ERROR'
-                             )
-                logwrite('', err, self.logfile)
-                break
-
-            if proc.wait() == 0:  # ..Finished
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_YTDL_EVT",
-                             count='',
-                             fsource='',
-                             destination='',
-                             duration=100,
-                             end='DONE',
-                             )
-                time.sleep(1)
-        time.sleep(.5)
-        wx.CallAfter(pub.sendMessage, "END_YTDL_EVT")
+            logwrite('', (f"[VIDEOMASS]: Error Exit Status: "
+                          f"{proc.returncode}"), self.logfile)
+            return 'FAILED'
+
+        wx.CallAfter(pub.sendMessage,
+                     "COUNT_YTDL_EVT",
+                     count='',
+                     fsource='',
+                     destination='',
+                     duration=100,
+                     end='DONE',
+                     )
+        return 'DONE'
     # --------------------------------------------------------------------#
 
     def stop(self):
         """
-        Sets the stop work thread to terminate the process
+        Sets the stop work thread to terminate the process:
+        stops all the running downloads and cancels the others.
         """
         self.stop_work_thread = True
+        self.scheduler.stop()
+        if self.pipeline:
+            self.pipeline.stop()
+        with self.lock:
+            for proc in self.procs.values():
+                killbill(proc)
 # ------------------------------------------------------------------------#
 
 
@@ -181,11 +281,13 @@ class MyLogger:
     7df2457df7274d0c842421945#embedding-youtube-dl>
     """
 
-    def __init__(self):
+    def __init__(self, slot=0):
         """
         define instace attributes
+        slot: the download slot, see `DownloadScheduler`
         """
         self.msg = None
+        self.slot = slot
 
     def debug(self, msg):
         """
@@ -198,6 +300,7 @@ class MyLogger:
                      output=msg,
                      duration='',
                      status='DEBUG',
+                     slot=self.slot,
                      )
         self.msg = msg
 
@@ -211,6 +314,7 @@ class MyLogger:
                      output=msg,
                      duration='',
                      status='WARNING',
+                     slot=self.slot,
                      )
 
     def error(self, msg):
@@ -222,15 +326,21 @@ class MyLogger:
                      output=msg,
                      duration='',
                      status='ERROR',
+                     slot=self.slot,
                      )
 # -------------------------------------------------------------------------#
 
 
-def my_hook(data):
+def my_hook(data, slot=0, scheduler=None):
     """
     progress_hooks is A list of functions that get called on
     download progress. See  `help(youtube_dl.YoutubeDL)`
+    The progress is sent for the given download `slot`, the
+    download is cancelled if the given `scheduler` is stopped.
     """
+    if scheduler and scheduler.stopped:
+        raise yt_dlp.utils.DownloadCancelled()
+
     if data['status'] == 'downloading':
         keys = ('_percent_str', '_total_bytes_str', '_speed_str', '_eta_str')
 
@@ -239,6 +349,7 @@ def my_hook(data):
                      output='',
                      duration={x: data.get(x, 'N/A') for x in keys},
                      status='DOWNLOAD',
+                     slot=slot,
                      )
     if data['status'] == 'finished':
         wx.CallAfter(pub.sendMessage,
@@ -254,6 +365,7 @@ def my_hook(data):
                      output='',
                      duration='Done downloading, now converting ...',
                      status='FINISHED',
+                     slot=slot,
                      )
 # -------------------------------------------------------------------------#
 
@@ -262,6 +374,9 @@ class YdlDownloader(Thread):
     """
     Embed youtube-dl as module into a separated thread in order
     to get output in real time during downloading and conversion .
+    Several URLs are downloaded at the same time by different
+    download slots, each one with its own `yt_dlp.YoutubeDL`
+    session, see `DownloadScheduler`.
     For a list of available options see:
 
     <https://github.com/ytdl-org/youtube-dl/blob/master/youtube_dl/YoutubeDL.py#L129-L279>
@@ -277,13 +392,21 @@ class YdlDownloader(Thread):
         self.urls - type list
         self.logfile - str path object to log file
         self.arglist - option arguments list
+        self.scheduler - the download scheduler
+        self.archives - the download archives by pathname,
+                        shared by all download slots
+        self.pipeline - converts the downloaded files, if enabled
         """
         self.stop_work_thread = False  # process terminate
         self.urls = urls
         self.logfile = logfile
         self.arglist = args
         self.countmax = len(self.arglist)
-        self.count = 0
+        self.scheduler = make_scheduler()
+        paths = {opts.get('download_archive') for opts in self.arglist}
+        self.archives = {path: DownloadArchive(path) for path in paths
+                         if path}
+        self.pipeline = make_pipeline(logfile)
 
         Thread.__init__(self)
         self.start()  # run()
@@ -293,43 +416,55 @@ class YdlDownloader(Thread):
         Apply the option arguments passed by
         the user for the download process.
         """
-        for url, opts in itertools.zip_longest(self.urls,
-                                               self.arglist,
-                                               fillvalue='',
-                                               ):
-            if not opts['format']:
-                del opts['format']
-            self.count += 1
-            count = f"URL {self.count}/{self.countmax}"
-
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_YTDL_EVT",
-                         count=count,
-                         fsource=f'Source: {url}',
-                         destination='',
-                         duration=100,
-                         end='CONTINUE',
-                         )
-            if self.stop_work_thread:
-                break
-            ydl_opts = {**opts,
-                        'logger': MyLogger(),
-                        'progress_hooks': [my_hook],
-                        }
-            logtxt = f'{count}\n{ydl_opts}'
-            logwrite(logtxt, '', self.logfile)  # write log cmd
-            if wx.GetApp().appset['yt_dlp'] is True:
-                try:
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        ydl.download([f"{url}"])
-                except Exception:
-                    break
+        tasks = list(itertools.zip_longest(self.urls, self.arglist,
+                                           fillvalue=''))
+        if wx.GetApp().appset['yt_dlp'] is True:
+            self.scheduler.run(tasks, self.download)
+        if self.pipeline:
+            self.pipeline.wait()  # the last conversions
 
         wx.CallAfter(pub.sendMessage, "END_YTDL_EVT")
 
+    def download(self, slot, index, url, opts):
+        """
+        Download the given URL with the given options,
+        this method runs on the download slot threads.
+        """
+        count = f"URL {index + 1}/{self.countmax}"
+        wx.CallAfter(pub.sendMessage,
+                     "COUNT_YTDL_EVT",
+                     count=count,
+                     fsource=f'Source: {url}',
+                     destination='',
+                     duration=100,
+                     end='CONTINUE',
+                     )
+        opts = {key: val for key, val in opts.items()
+                if key != 'format' or val}
+        if opts.get('download_archive'):
+            opts['download_archive'] = self.archives[opts['download_archive']]
+        ydl_opts = {**opts,
+                    'logger': MyLogger(slot),
+                    'progress_hooks': [partial(my_hook, slot=slot,
+                                               scheduler=self.scheduler)],
+                    }
+        if self.pipeline:  # called with the final pathname of each file
+            ydl_opts['post_hooks'] = [self.pipeline.submit]
+        logtxt = f'{count}\n{ydl_opts}'
+        logwrite(logtxt, '', self.logfile)  # write log cmd
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                ydl.download([f"{url}"])
+        except Exception:
+            return 'ERROR'
+        return 'DONE'
+
     def stop(self):
         """
-        Sets the stop work thread to
-        terminate the current process
+        Sets the stop work thread to terminate the
+        current downloads and cancel the others.
         """
         self.stop_work_thread = True
+        self.scheduler.stop()
+        if self.pipeline:
+            self.pipeline.stop()
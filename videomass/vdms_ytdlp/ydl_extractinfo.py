@@ -68,21 +68,45 @@ class MyLogger:
         return None if len(self.msg_error) == 0 else self.msg_error.pop()
 
 
+def extract_info(url, kwargs):
+    """
+    Extract the metadata of the given URL with the given
+    options (see help(yt_dlp.YoutubeDL)) without downloading.
+    Returns a tuple (meta, error), where `meta` is a JSON
+    serializable dict. This is the `extractor` of the
+    `MetadataCache`.
+    """
+    mylogger = MyLogger()
+    ydl_opts = {**kwargs, 'logger': mylogger}
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        meta = ydl.extract_info(url, download=False)
+        if meta:
+            meta = ydl.sanitize_info(meta)
+    error = mylogger.get_message()
+
+    if error:
+        return None, error
+    return meta, None
+# --------------------------------------------------------------------------#
+
+
 class YdlExtractInfo(Thread):
     """
     Embed youtube-dl as module into a separated thread in order
-    to get output during process (see help(youtube_dl.YoutubeDL) ) .
+    to get the metadata of the given URLs, all at the same time,
+    from the shared `MetadataCache` (see help(youtube_dl.YoutubeDL)).
 
     """
-    def __init__(self, url, kwargs):
+    def __init__(self, urls, kwargs):
         """
         Attributes defined here:
-        self.url  str('url')
-        self.data  tupla(None, None)
+        self.urls  list of URLs
+        self.data  list of tuples (meta, error) for each URL
         """
         get = wx.GetApp()  # get videomass wx.App attribute
         self.appdata = get.appset
-        self.url = url
+        self.cache = get.metadatacache
+        self.urls = urls
         self.data = None
         self.kwargs = kwargs
 
@@ -94,16 +118,10 @@ class YdlExtractInfo(Thread):
         Defines options to extract_info with youtube_dl
         """
         if wx.GetApp().appset['yt_dlp'] is True:
-            mylogger = MyLogger()
-            ydl_opts = {**self.kwargs, 'logger': mylogger}
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                meta = ydl.extract_info(self.url, download=False)
-            error = mylogger.get_message()
-
-            if error:
-                self.data = (None, error)
-            elif meta:
-                self.data = (meta, None)
+            self.data = self.cache.resolve(self.urls, self.kwargs,
+                                           extract_info)
+        else:
+            self.data = [(None, 'yt_dlp not available')] * len(self.urls)
 
         wx.CallAfter(pub.sendMessage,
                      "RESULT_EVT",
@@ -29,6 +29,7 @@ import webbrowser
 import wx
 import wx.lib.agw.hyperlink as hpl
 from videomass.vdms_sys.settings_manager import ConfigManager
+from videomass.vdms_engine.conversion_pipeline import load_profiles
 
 
 class Ytdlp_Options(wx.Dialog):
@@ -161,6 +162,78 @@ class Ytdlp_Options(wx.Dialog):
         self.txtctrl_extdw_args = wx.TextCtrl(tabThree, wx.ID_ANY, args)
         sizerextdown.Add(self.txtctrl_extdw_args, 0, wx.EXPAND | wx.LEFT
                          | wx.RIGHT | wx.BOTTOM, 5)
+        sizerextdown.Add((0, 20))
+        msg = _("Simultaneous downloads")
+        labjobstitle = wx.StaticText(tabThree, wx.ID_ANY, msg)
+        sizerextdown.Add(labjobstitle, 0, wx.ALL | wx.EXPAND, 5)
+        sizerjobs = wx.BoxSizer(wx.HORIZONTAL)
+        labjobs = wx.StaticText(tabThree, wx.ID_ANY,
+                                _('Maximum number of simultaneous '
+                                  'downloads:'))
+        sizerjobs.Add(labjobs, 0, wx.LEFT | wx.ALIGN_CENTER_VERTICAL, 5)
+        self.spin_jobs = wx.SpinCtrl(tabThree, wx.ID_ANY,
+                                     value=str(self.appdata['ytdlp_jobs']),
+                                     min=1, max=16, style=wx.SP_ARROW_KEYS,
+                                     )
+        sizerjobs.Add(self.spin_jobs, 0, wx.ALL, 5)
+        sizerextdown.Add(sizerjobs, 0)
+        sizerhostjobs = wx.BoxSizer(wx.HORIZONTAL)
+        labhostjobs = wx.StaticText(tabThree, wx.ID_ANY,
+                                    _('Maximum number of simultaneous '
+                                      'downloads from the same site:'))
+        sizerhostjobs.Add(labhostjobs, 0, wx.LEFT
+                          | wx.ALIGN_CENTER_VERTICAL, 5)
+        val = str(self.appdata['ytdlp_host_jobs'])
+        self.spin_hostjobs = wx.SpinCtrl(tabThree, wx.ID_ANY, value=val,
+                                         min=1, max=16,
+                                         style=wx.SP_ARROW_KEYS,
+                                         )
+        sizerhostjobs.Add(self.spin_hostjobs, 0, wx.ALL, 5)
+        sizerextdown.Add(sizerhostjobs, 0)
+        sizerextdown.Add((0, 20))
+        msg = _("Skip the media already downloaded (download archive)")
+        self.ckbx_archive = wx.CheckBox(tabThree, wx.ID_ANY, msg)
+        self.ckbx_archive.SetValue(self.appdata['ytdlp_download_archive'])
+        self.ckbx_archive.SetToolTip(_('The downloaded media are recorded '
+                                       'in the "download_archive.txt" file '
+                                       'of the configuration folder'))
+        sizerextdown.Add(self.ckbx_archive, 0, wx.ALL, 5)
+        msg = _("Convert each downloaded file with a profile of the "
+                "Presets Manager")
+        self.ckbx_convert = wx.CheckBox(tabThree, wx.ID_ANY, msg)
+        self.ckbx_convert.SetValue(self.appdata['ytdlp_convert'])
+        self.ckbx_convert.SetToolTip(_('Each file is converted as soon as '
+                                       'it is downloaded, while the next '
+                                       'downloads go on'))
+        sizerextdown.Add(self.ckbx_convert, 0, wx.ALL, 5)
+        sizerconvert = wx.BoxSizer(wx.HORIZONTAL)
+        self.presetsdir = os.path.join(self.appdata['confdir'], 'presets')
+        try:
+            presets = sorted([os.path.splitext(x)[0] for x in
+                              os.listdir(self.presetsdir)
+                              if x.endswith('.json')])
+        except OSError:
+            presets = []
+        self.cmbx_preset = wx.ComboBox(tabThree, wx.ID_ANY,
+                                       choices=presets,
+                                       size=(200, -1),
+                                       style=wx.CB_DROPDOWN | wx.CB_READONLY,
+                                       )
+        if self.appdata['ytdlp_convert_preset'] in presets:
+            self.cmbx_preset.SetValue(self.appdata['ytdlp_convert_preset'])
+        sizerconvert.Add(self.cmbx_preset, 0, wx.ALL, 5)
+        self.cmbx_profile = wx.ComboBox(tabThree, wx.ID_ANY,
+                                        choices=[],
+                                        size=(300, -1),
+                                        style=wx.CB_DROPDOWN
+                                        | wx.CB_READONLY,
+                                        )
+        sizerconvert.Add(self.cmbx_profile, 0, wx.ALL, 5)
+        sizerextdown.Add(sizerconvert, 0)
+        self.on_convert_preset(None)
+        if self.appdata['ytdlp_convert_profile'] in self.cmbx_profile.Items:
+            self.cmbx_profile.SetValue(self.appdata['ytdlp_convert_profile'])
+        self.on_convert(None)
         tabThree.SetSizer(sizerextdown)
         notebook.AddPage(tabThree, _("Download Options"))
 
@@ -419,6 +492,8 @@ class Ytdlp_Options(wx.Dialog):
         self.Bind(wx.EVT_CHECKBOX, self.on_autogen_cookie, self.ckbx_autocook)
         self.Bind(wx.EVT_COMBOBOX, self.on_autogen_cookie, self.cmbx_browser)
         self.Bind(wx.EVT_CHECKBOX, self.on_enable_cookie, self.ckbx_usecook)
+        self.Bind(wx.EVT_CHECKBOX, self.on_convert, self.ckbx_convert)
+        self.Bind(wx.EVT_COMBOBOX, self.on_convert_preset, self.cmbx_preset)
         # --------------------------------------------#
 
     def on_enable_cookie(self, event):
@@ -530,6 +605,29 @@ class Ytdlp_Options(wx.Dialog):
         self.sett["external_downloader_args"] = args
     # -------------------------------------------------------------------#
 
+    def on_convert(self, event):
+        """
+        Enable or disable the choice of the profile used to
+        convert the downloaded files.
+        """
+        enable = self.ckbx_convert.GetValue()
+        self.cmbx_preset.Enable(enable)
+        self.cmbx_profile.Enable(enable)
+    # -------------------------------------------------------------------#
+
+    def on_convert_preset(self, event):
+        """
+        Event on choosing the preset used to convert the
+        downloaded files, lists its profiles.
+        """
+        names = [x['Name'] for x in load_profiles(self.presetsdir,
+                                                  self.cmbx_preset.GetValue())]
+        self.cmbx_profile.Clear()
+        self.cmbx_profile.AppendItems(names)
+        if names:
+            self.cmbx_profile.SetSelection(0)
+    # -------------------------------------------------------------------#
+
     def on_help(self, event):
         """
         Open default web browser via Python Web-browser controller.
@@ -568,6 +666,12 @@ class Ytdlp_Options(wx.Dialog):
         self.sett['geo_bypass_country'] = self.txtctrl_geocountry.GetValue()
         self.sett['geo_bypass_ip_block'] = self.txtctrl_geoipblock.GetValue()
         self.sett['cookiefile'] = self.txtctrl_cook.GetValue()
+        self.sett['ytdlp_jobs'] = self.spin_jobs.GetValue()
+        self.sett['ytdlp_host_jobs'] = self.spin_hostjobs.GetValue()
+        self.sett['ytdlp_download_archive'] = self.ckbx_archive.GetValue()
+        self.sett['ytdlp_convert'] = self.ckbx_convert.GetValue()
+        self.sett['ytdlp_convert_preset'] = self.cmbx_preset.GetValue()
+        self.sett['ytdlp_convert_profile'] = self.cmbx_profile.GetValue()
         self.confmanager.write_options(**self.sett)
         self.appdata.update(self.sett)
         # do not store this data in the configuration file
@@ -24,6 +24,7 @@ This file is part of Videomass.
    You should have received a copy of the GNU General Public License
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
+import os
 import sys
 import itertools
 import wx
@@ -31,83 +32,14 @@ from videomass.vdms_io.io_tools import youtubedl_getstatistics
 from videomass.vdms_utils.utils import integer_to_time as totimesec
 from videomass.vdms_utils.get_bmpfromsvg import get_bmp
 from videomass.vdms_ytdlp.playlist_indexing import Indexing
+from videomass.vdms_ytdlp.playlist_pager import is_playlist
+from videomass.vdms_io.download_archive import ARCHIVE
 from videomass.vdms_ytdlp.subtitles_editor import SubtitleEditor
 from videomass.vdms_ytdlp.formatcode import FormatCode
+from videomass.vdms_ytdlp.ydl_cmdline import from_api_to_cli
 from videomass.vdms_sys.settings_manager import ConfigManager
 
 
-def from_api_to_cli(data, execpath):
-    """
-    Revert API arguments to command line options
-    """
-    if not data["format"]:
-        dformat = ''
-    else:
-        dformat = f'--format "{data["format"]}"'
-    opt = (f'"{execpath}" {dformat} --progress-template '
-           f'"download-title:%(info.id)s-%(progress.eta)s" '
-           f'--newline --compat-options "{data["compat_opts"]}" '
-           f'--ignore-errors --ignore-config --no-color ')
-
-    if data['extractaudio']:
-        opt += '--extract-audio '
-    if data['postprocessors']:
-        for pp in data['postprocessors']:
-            for key, val in pp.items():
-                if 'preferredcodec' in key:
-                    opt += f'--audio-format {val} '
-                if 'EmbedThumbnail' in val:
-                    opt += '--embed-thumbnail '
-                if 'FFmpegEmbedSubtitle' in val:
-                    opt += '--embed-subs '
-    if data['addmetadata']:
-        opt += '--embed-metadata '
-    if data['external_downloader']:
-        opt += f'--downloader "{data["external_downloader"]}" '
-    if data['external_downloader_args']:
-        dwargs = ' '.join(data["external_downloader_args"])
-        opt += (f'--downloader-args "{data["external_downloader"]}:{dwargs}" ')
-    if data['noplaylist'] is False:
-        opt += '--yes-playlist '
-        if data['playlist_items']:
-            opt += f'--playlist-items "{data["playlist_items"]}" '
-    else:
-        opt += '--no-playlist '
-    if data['writesubtitles']:
-        opt += '--write-subs '
-        if data['subtitleslangs'][0]:
-            sublang = ','.join(data["subtitleslangs"])
-            opt += f'--sub-langs "{sublang}" '
-        if data['writeautomaticsub']:
-            opt += '--write-auto-subs '
-        if data['skip_download']:
-            opt += '--skip-download '
-    opt += '--restrict-filenames ' if data['restrictfilenames'] else ''
-    opt += '--write-thumbnail ' if data['writethumbnail'] else ''
-    opt += '--force-overwrites ' if data['overwrites'] else ''
-    opt += '--no-check-certificates ' if data['nocheckcertificate'] else ''
-    opt += f'--proxy "{data["proxy"]}" ' if data["proxy"] else ''
-    if data['geo_verification_proxy']:
-        opt += f'--geo-verification-proxy "{data["geo_verification_proxy"]}" '
-    geo = (f'{data["geo_bypass"]} {data["geo_bypass_country"]} '
-           f'{data["geo_bypass_ip_block"]}')
-    if geo.strip():
-        opt += f'--xff "{geo}" '
-    if data['username']:
-        opt += f'--username {data["username"]} '
-        opt += f'--password {data["password"]} '
-    if data['videopassword']:
-        opt += f'--video-password {data["videopassword"]} '
-    if data.get("cookiefile"):
-        opt += f'--cookies "{data["cookiefile"]}" '
-    if data.get("cookiesfrombrowser"):
-        opt += f'--cookies-from-browser "{data["cookiesfrombrowser"][0]}" '
-    opt += f'--ffmpeg-location "{data["ffmpeg_location"]}" '
-    opt += f'--output "{data["outtmpl"]}" '
-
-    return opt
-
-
 class Downloader(wx.Panel):
     """
     This panel represents the main interface to yt-dlp
@@ -292,9 +224,20 @@ class Downloader(wx.Panel):
     # ----------------------------------------------------------------------
     def on_subtitles_editor(self, event):
         """
-        Event by clicking on the subtitles button
+        Event by clicking on the subtitles button. The subtitle
+        languages available are taken from the cached metadata
+        of the URLs, if any (see `MetadataCache`).
         """
-        with SubtitleEditor(self, self.opt["SUBS"]) as subeditor:
+        cache = wx.GetApp().metadatacache
+        kwa = self.default_statistics_options()
+        langs = set()
+        for url in self.parent.data_url:
+            meta = cache.get(url, kwa)
+            if meta:
+                langs.update(meta.get('subtitles') or {})
+
+        with SubtitleEditor(self, self.opt["SUBS"],
+                            sorted(langs)) as subeditor:
             if subeditor.ShowModal() == wx.ID_OK:
                 data = subeditor.getvalue()
                 self.opt["SUBS"] = data
@@ -326,29 +269,26 @@ class Downloader(wx.Panel):
                 self.format_dict.clear()
     # -----------------------------------------------------------------#
 
-    def get_statistics(self, link):
+    def get_statistics(self, urls):
         """
         Get media URLs informations by generator object
-        `youtubedl_getstatistics`: This method `Return` a
-        two elements list ['ERROR', (message error)]
-        if `meta[1]` (error), [None, dictobject] otherwise.
+        `youtubedl_getstatistics`, all URLs at the same time.
+        This method `Return` a two elements list
+        ['ERROR', (message error)] if `meta[1]` (error) for
+        any URL, [None, list of dict objects] otherwise.
         Check the first item of list to recognize the exit
         status, which is 'ERROR' or None.
         """
         kwa = self.default_statistics_options()
-        data = youtubedl_getstatistics(link,
+        data = youtubedl_getstatistics(urls,
                                        kwa,
                                        parent=self.GetParent(),
                                        )
-        for meta in data:
+        info = []
+        for link, meta in zip(urls, data):
             if meta[1]:
                 return ('ERROR', meta[1])
 
-            if 'entries' in meta[0]:
-                try:
-                    meta[0]['entries'][0]  # don't parse all playlist
-                except IndexError:
-                    pass
             if 'duration' in meta[0]:
 
                 ftime = (f"{totimesec(round(meta[0]['duration'] * 1000))} "
@@ -357,21 +297,22 @@ class Downloader(wx.Panel):
                 ftime = 'N/A'
 
             date = meta[0].get('upload_date')
-            return (None, {'url': link,
-                           'title': meta[0].get('title'),
-                           'categories': meta[0].get('categories'),
-                           'license': meta[0].get('license'),
-                           'format': meta[0].get('format'),
-                           'upload_date': date,
-                           'uploader': meta[0].get('uploader'),
-                           'view': meta[0].get('view_count'),
-                           'like': meta[0].get('like_count'),
-                           'dislike': meta[0].get('dislike_count'),
-                           'avr_rat': meta[0].get('average_rating'),
-                           'id': meta[0].get('id'),
-                           'duration': ftime,
-                           'description': meta[0].get('description'),
-                           })
+            info.append({'url': link,
+                         'title': meta[0].get('title'),
+                         'categories': meta[0].get('categories'),
+                         'license': meta[0].get('license'),
+                         'format': meta[0].get('format'),
+                         'upload_date': date,
+                         'uploader': meta[0].get('uploader'),
+                         'view': meta[0].get('view_count'),
+                         'like': meta[0].get('like_count'),
+                         'dislike': meta[0].get('dislike_count'),
+                         'avr_rat': meta[0].get('average_rating'),
+                         'id': meta[0].get('id'),
+                         'duration': ftime,
+                         'description': meta[0].get('description'),
+                         })
+        return (None, info)
     # -----------------------------------------------------------------#
 
     def on_show_statistics(self):
@@ -380,14 +321,12 @@ class Downloader(wx.Panel):
         main frame when the 'Statistics' button is pressed.
         """
         if not self.info:
-            for link in self.parent.data_url:
-                ret = self.get_statistics(link)
-                if ret[0] == 'ERROR':
-                    wx.MessageBox(ret[1], _('Videomass - Error!'),
-                                  wx.ICON_ERROR)
-                    del self.info[:]
-                    return None
-                self.info.append(ret[1])
+            ret = self.get_statistics(self.parent.data_url)
+            if ret[0] == 'ERROR':
+                wx.MessageBox(ret[1], _('Videomass - Error!'),
+                              wx.ICON_ERROR)
+                return None
+            self.info.extend(ret[1])
 
         return self.info
     # -----------------------------------------------------------------#
@@ -563,7 +502,7 @@ class Downloader(wx.Panel):
 
         if self.ckbx_pl.IsChecked():
             playlist = [url for url in self.parent.data_url
-                        if '/playlist' in url]
+                        if is_playlist(url)]
             if not playlist:
                 wx.MessageBox(_("URLs have no playlist references"),
                               "Videomass", wx.ICON_INFORMATION, self)
@@ -585,7 +524,8 @@ class Downloader(wx.Panel):
         """
         with Indexing(self,
                       self.parent.data_url,
-                      self.plidx) as idxdialog:
+                      self.plidx,
+                      self.default_statistics_options()) as idxdialog:
             if idxdialog.ShowModal() == wx.ID_OK:
                 data = idxdialog.getvalue()
                 if not data:
@@ -648,6 +588,7 @@ class Downloader(wx.Panel):
         kwa['nocheckcertificate'] = self.appdata["ssl_certificate"]
         kwa['ignoreerrors'] = True  # exit code 1 if any errors
         kwa['noplaylist'] = True
+        kwa['extract_flat'] = 'in_playlist'  # do not resolve the entries
         kwa['no_color'] = True
         kwa['proxy'] = self.appdata["proxy"]
         kwa['username'] = self.appdata["username"]
@@ -712,6 +653,9 @@ class Downloader(wx.Panel):
         data["geo_bypass_country"] = self.appdata["geo_bypass_country"]
         data["geo_bypass_ip_block"] = self.appdata["geo_bypass_ip_block"]
         data['ffmpeg_location'] = f'{self.appdata["ffmpeg_cmd"]}'
+        if self.appdata['ytdlp_download_archive']:
+            data['download_archive'] = os.path.join(self.appdata['confdir'],
+                                                    ARCHIVE)
         data['postprocessors'] = postprocessors
 
         return data
@@ -736,7 +680,7 @@ class Downloader(wx.Panel):
                                                fillvalue='',
                                                ):
             if not self.opt["NO_PLAYLIST"]:
-                if '/playlist' in url:
+                if is_playlist(url):
                     template = subdir + args[0]
                     playlistitems = self.plidx.get(url, None)
                     noplaylist = False
@@ -756,6 +700,8 @@ class Downloader(wx.Panel):
                  'outtmpl': f"{self.appdata['ydlp-outputdir']}/{template}",
                  'noplaylist': noplaylist,
                  'playlist_items': playlistitems,
+                 # resolve the selected entries only, as they come
+                 'lazy_playlist': bool(playlistitems),
                  'postprocessors': data['postprocessors'],
                  **data
                  })